@@ -4,13 +4,27 @@ Foundation for all AI agents with common functionality
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
 from datetime import datetime
+import asyncio
+import time
+import numpy as np
 import structlog
-from openai import OpenAI
+from openai import AsyncOpenAI
 from sqlalchemy.orm import Session
 
+from app.agents.budget import BudgetExceededError, BudgetGovernor
+from app.agents import resilience
+from app.agents.clients import (
+    get_anthropic_client, get_async_anthropic_client, get_async_openai_client, get_openai_client
+)
+from app.agents.failover import anthropic_kwargs, anthropic_text, failover_model
+from app.agents.json_stream import JsonArrayStream
+from app.agents.ledger import cached_prompt_tokens, get_ledger
+from app.agents.pricing import calculate_cost
+from app.agents.tokens import count_message_tokens, count_tokens
 from app.core.config import settings
+from app.core.events import publish_execution_event
 from app.modules.agents.models import AgentExecution
 from app.modules.agents.repository import AgentExecutionRepository
 
@@ -23,10 +37,11 @@ class BaseAgent(ABC):
 
     Provides:
     - LLM integration (OpenAI/Anthropic)
-    - Cost tracking
+    - Cost tracking (per-call ledger, see app.agents.ledger)
     - Error handling
     - Execution logging
-    - Retry logic
+    - Retries, hedging, circuit breaking and Anthropic failover
+      (see app.agents.resilience / app.agents.failover)
     """
 
     def __init__(self, db: Session, agent_type: str):
@@ -41,14 +56,26 @@ class BaseAgent(ABC):
         self.agent_type = agent_type
         self.repository = AgentExecutionRepository(db)
 
-        # Initialize LLM client
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        # Shared, already-connected LLM client (see app.agents.clients)
+        self.openai_client = get_openai_client()
 
         # Tracking
         self.current_execution_id: Optional[int] = None
         self.tokens_used = 0
         self.cost_usd = 0.0
 
+        # Spend limits (see app.agents.budget); input "budget_usd" sets the execution budget
+        self.budget = BudgetGovernor(agent_type, self._calculate_cost)
+        self.budget_usd: Optional[float] = None
+
+        # Completed steps of the current execution (step_key -> payload)
+        self.checkpoints: Dict[str, Any] = {}
+
+    @property
+    def async_openai_client(self) -> AsyncOpenAI:
+        """Shared async client of the running event loop"""
+        return get_async_openai_client()
+
     @abstractmethod
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -62,7 +89,7 @@ class BaseAgent(ABC):
         """
         pass
 
-    async def run(self, input_data: Dict[str, Any]) -> AgentExecution:
+    async def run(self, input_data: Dict[str, Any], execution_id: Optional[int] = None) -> AgentExecution:
         """
         Run the agent with full lifecycle management
 
@@ -70,26 +97,43 @@ class BaseAgent(ABC):
 
         Args:
             input_data: Input parameters for the agent
+            execution_id: Existing (queued) execution record to run under;
+                a new record is created when omitted. Checkpoints saved by
+                earlier attempts of that execution are loaded, so a resumed
+                run skips the steps already done.
 
         Returns:
             AgentExecution record with results
         """
         from app.modules.agents.schemas import AgentExecutionCreate, AgentExecutionUpdate
 
-        # Create execution record
-        execution_data = AgentExecutionCreate(
-            agent_type=self.agent_type,
-            input_data=input_data,
-            status="running"
-        )
-        execution = self.repository.create(execution_data)
+        if execution_id is None:
+            # Create execution record
+            execution_data = AgentExecutionCreate(
+                agent_type=self.agent_type,
+                input_data=input_data,
+                status="running"
+            )
+            execution = self.repository.create(execution_data)
+        else:
+            execution = self.repository.update(execution_id, AgentExecutionUpdate(status="running"))
+            if execution is None:
+                raise ValueError(f"Agent execution {execution_id} not found")
+
+            # Resumed run: continue from the saved steps and the totals spent so far
+            self.checkpoints = self.repository.get_checkpoints(execution.id)
+            self.tokens_used = execution.llm_tokens_used or 0
+            self.cost_usd = float(execution.llm_cost_usd or 0)
         self.current_execution_id = execution.id
+        self.budget_usd = input_data.get("budget_usd")
 
         logger.info(
             "Agent execution started",
             execution_id=execution.id,
-            agent_type=self.agent_type
+            agent_type=self.agent_type,
+            checkpoints=len(self.checkpoints)
         )
+        self.emit("started", agent_type=self.agent_type, checkpoints=len(self.checkpoints))
 
         start_time = datetime.utcnow()
 
@@ -120,6 +164,7 @@ class BaseAgent(ABC):
                 tokens_used=self.tokens_used,
                 cost_usd=self.cost_usd
             )
+            self.emit("completed", duration_seconds=duration, output=output_data)
 
             return execution
 
@@ -146,9 +191,62 @@ class BaseAgent(ABC):
                 error=str(e),
                 duration_seconds=duration
             )
+            self.emit("failed", duration_seconds=duration, error=str(e))
 
             raise
 
+    def emit(self, event_type: str, **data: Any) -> None:
+        """
+        Publish a progress event for the current execution
+
+        Subscribers (SSE / WebSocket) also get the running token and cost totals.
+
+        Args:
+            event_type: e.g. "stage", "trend_analyzed", "idea_stored"
+            **data: Event payload (JSON-serialisable)
+        """
+        if self.current_execution_id is None:
+            return
+        publish_execution_event(
+            self.current_execution_id,
+            event_type,
+            data,
+            tokens_used=self.tokens_used,
+            cost_usd=round(self.cost_usd, 6)
+        )
+
+    def checkpoint(self, step_key: str, payload: Dict[str, Any]) -> None:
+        """
+        Persist the result of a completed step of the current execution
+
+        Saved right after paid work (an LLM call) finishes, so a crash later
+        in the run doesn't waste it. The running token and cost totals are
+        stored with it.
+
+        Args:
+            step_key: Unique step name within the execution, e.g. "trend:42"
+            payload: JSON-serialisable step result
+        """
+        self.checkpoints[step_key] = payload
+        if self.current_execution_id is None:
+            return
+
+        from app.modules.agents.schemas import AgentExecutionUpdate
+
+        try:
+            self.repository.save_checkpoint(self.current_execution_id, step_key, payload)
+            self.repository.update(self.current_execution_id, AgentExecutionUpdate(
+                llm_tokens_used=self.tokens_used,
+                llm_cost_usd=self.cost_usd
+            ))
+        except Exception as e:
+            self.db.rollback()
+            logger.warning("Failed to save checkpoint", step=step_key, error=str(e))
+
+    def get_checkpoint(self, step_key: str) -> Optional[Dict[str, Any]]:
+        """Payload of a step completed by an earlier attempt (or None)"""
+        return self.checkpoints.get(step_key)
+
     def call_llm(
         self,
         messages: list,
@@ -160,6 +258,9 @@ class BaseAgent(ABC):
         """
         Call OpenAI LLM with cost tracking
 
+        Transient failures are retried; if they persist (or the model's circuit
+        is open) the call fails over to Claude when ANTHROPIC_API_KEY is set.
+
         Args:
             messages: List of message dicts with role and content
             model: Model to use (gpt-3.5-turbo, gpt-4o, etc.)
@@ -168,75 +269,370 @@ class BaseAgent(ABC):
             json_mode: Force JSON output
 
         Returns:
-            Response dict with content and usage
+            Response dict with content, usage, cost_usd and the model that answered
+        """
+        model = self._admit(model, messages, max_tokens)
+        kwargs = self._llm_kwargs(messages, model, temperature, max_tokens, json_mode)
+        started = time.monotonic()
+        try:
+            response = resilience.call(
+                model, lambda: self.openai_client.chat.completions.create(**kwargs), max_tokens
+            )
+            return self._track_llm_response(response, model, started)
+
+        except Exception as e:
+            fallback = failover_model(model, e)
+            if fallback is None:
+                logger.error("LLM call failed", error=str(e), model=model)
+                raise
+            self._log_failover(model, fallback, e)
+
+        kwargs = anthropic_kwargs(messages, fallback, temperature, max_tokens, json_mode)
+        started = time.monotonic()
+        response = resilience.call(fallback, lambda: get_anthropic_client().messages.create(**kwargs), max_tokens)
+        return self._track_anthropic_response(response, fallback, started, json_mode)
+
+    async def acall_llm(
+        self,
+        messages: list,
+        model: str = "gpt-3.5-turbo",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        json_mode: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Async variant of call_llm (does not block the event loop)
+
+        Use from agents that run several LLM calls or I/O sources concurrently.
+        Same arguments and return value as call_llm; a call still running
+        after the usual tail latency is hedged with a duplicate request.
+        The losing duplicate is charged at the winner's usage (kind "hedge"),
+        since the provider bills it although it is cancelled.
         """
+        model = await asyncio.to_thread(self._admit, model, messages, max_tokens)
+        kwargs = self._llm_kwargs(messages, model, temperature, max_tokens, json_mode)
+        started = time.monotonic()
+        hedges = []
         try:
-            kwargs = {
-                "model": model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens
-            }
+            response = await resilience.acall(
+                model,
+                lambda: self.async_openai_client.chat.completions.create(**kwargs),
+                max_tokens,
+                hedge=True,
+                on_hedge=lambda: hedges.append(model)
+            )
+            result = self._track_llm_response(response, model, started)
+            for _ in hedges:
+                usage = response.usage
+                self._track_usage(
+                    model, usage.prompt_tokens, usage.completion_tokens,
+                    cached_tokens=cached_prompt_tokens(usage), kind="hedge"
+                )
+            return result
 
-            if json_mode:
-                kwargs["response_format"] = {"type": "json_object"}
+        except Exception as e:
+            fallback = failover_model(model, e)
+            if fallback is None:
+                logger.error("LLM call failed", error=str(e), model=model)
+                raise
+            self._log_failover(model, fallback, e)
 
-            response = self.openai_client.chat.completions.create(**kwargs)
+        return await self._afailover(messages, fallback, temperature, max_tokens, json_mode)
 
-            # Track usage
-            usage = response.usage
-            self.tokens_used += usage.total_tokens
+    async def _afailover(
+        self,
+        messages: list,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool
+    ) -> Dict[str, Any]:
+        """The call on the Anthropic failover model"""
+        kwargs = anthropic_kwargs(messages, model, temperature, max_tokens, json_mode)
+        started = time.monotonic()
+        response = await resilience.acall(
+            model, lambda: get_async_anthropic_client().messages.create(**kwargs), max_tokens
+        )
+        return self._track_anthropic_response(response, model, started, json_mode)
 
-            # Calculate cost (approximate)
-            cost = self._calculate_cost(model, usage.prompt_tokens, usage.completion_tokens)
-            self.cost_usd += cost
+    def _log_failover(self, model: str, fallback: str, error: Exception) -> None:
+        logger.warning("LLM failover", model=model, failover_model=fallback, error=str(error))
+        self.emit("failover", model=model, failover_model=fallback, error=str(error))
 
-            logger.debug(
-                "LLM call completed",
-                model=model,
-                tokens=usage.total_tokens,
-                cost_usd=cost
+    def _llm_kwargs(
+        self,
+        messages: list,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool
+    ) -> Dict[str, Any]:
+        kwargs = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+
+        return kwargs
+
+    async def astream_llm_json(
+        self,
+        messages: list,
+        model: str = "gpt-3.5-turbo",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        json_mode: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a JSON answer and yield each element of its items array as soon as it closes
+
+        For prompts answering `[{...}, ...]` or `{"ideas": [{...}, ...]}`:
+        the first item is available after its own tokens rather than after
+        the whole completion. A single-object answer is yielded at the end.
+        If the answer is cut off (max_tokens), the complete items are still
+        yielded.
+
+        Usage is counted locally with the tokenizer (app.agents.tokens): the
+        pinned openai client cannot request the stream's usage block
+        (stream_options). Prompt tokens come from the messages, completion
+        tokens from the text streamed so far. If the consumer stops early,
+        the stream is closed so the provider stops generating (and billing).
+        """
+        model = await asyncio.to_thread(self._admit, model, messages, max_tokens)
+        kwargs = self._llm_kwargs(messages, model, temperature, max_tokens, json_mode)
+        started = time.monotonic()
+        try:
+            # Opening the stream is retried; a stream broken midway is not
+            stream = await resilience.acall(
+                model,
+                lambda: self.async_openai_client.chat.completions.create(**kwargs, stream=True),
+                max_tokens
             )
+        except Exception as e:
+            fallback = failover_model(model, e)
+            if fallback is None:
+                logger.error("LLM stream failed", error=str(e), model=model, items=0)
+                raise
+            self._log_failover(model, fallback, e)
+            stream = None
+
+        parser = JsonArrayStream()
+        if stream is None:
+            # Failover is not streamed: all items arrive with the complete answer
+            response = await self._afailover(messages, fallback, temperature, max_tokens, json_mode)
+            for item in parser.feed(response["content"] or "") + parser.close():
+                yield item
+            return
 
-            return {
-                "content": response.choices[0].message.content,
-                "usage": {
-                    "prompt_tokens": usage.prompt_tokens,
-                    "completion_tokens": usage.completion_tokens,
-                    "total_tokens": usage.total_tokens
-                },
-                "cost_usd": cost
-            }
+        try:
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                for item in parser.feed(delta):
+                    yield item
 
         except Exception as e:
-            logger.error("LLM call failed", error=str(e), model=model)
+            logger.error("LLM stream failed", error=str(e), model=model, items=parser.items_emitted)
             raise
 
-    def _calculate_cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        finally:
+            try:
+                await stream.close()
+            except Exception as e:
+                logger.warning("Failed to close LLM stream", error=str(e), model=model)
+            self._track_usage(
+                model,
+                count_message_tokens(messages, model),
+                count_tokens(parser.text, model),
+                latency_ms=_elapsed_ms(started),
+                kind="stream"
+            )
+
+        for item in parser.close():
+            yield item
+
+    def _admit(self, model: str, messages: list, max_tokens: int) -> str:
+        """
+        Check a call against the spend budgets; returns the model to use
+
+        Raises:
+            BudgetExceededError: If the call doesn't fit even on the cheaper model
         """
-        Calculate approximate cost for LLM call
+        if not settings.LLM_BUDGET_ENABLED:
+            return model
+
+        decision = self.budget.check(
+            model,
+            messages,
+            max_tokens,
+            execution_spent=self.cost_usd,
+            execution_limit=self.budget_usd
+        )
+        if decision["action"] == "admit":
+            return model
+
+        logger.warning("LLM budget pressure", agent_type=self.agent_type, **decision)
+        self.emit("budget", **decision)
+        if decision["action"] == "refuse":
+            raise BudgetExceededError(decision["reason"])
+        return decision["model"]
+
+    def _track_usage(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int = 0,
+        latency_ms: Optional[int] = None,
+        kind: str = "chat"
+    ) -> float:
+        """
+        Add a call's tokens and cost to the running totals and the ledger
 
-        Pricing (per 1M tokens):
-        - gpt-3.5-turbo: $0.50 input, $1.50 output
-        - gpt-4o: $2.50 input, $10.00 output
-        - gpt-4o-mini: $0.15 input, $0.60 output
+        Returns:
+            The call's cost in USD
         """
-        pricing = {
-            "gpt-3.5-turbo": {"input": 0.50, "output": 1.50},
-            "gpt-4o": {"input": 2.50, "output": 10.00},
-            "gpt-4o-mini": {"input": 0.15, "output": 0.60},
+        self.tokens_used += prompt_tokens + completion_tokens
+
+        cost = self._calculate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
+        self.cost_usd += cost
+        self.budget.record(cost, prompt_tokens + completion_tokens)
+        get_ledger().record(
+            agent_type=self.agent_type,
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            latency_ms=latency_ms,
+            kind=kind,
+            execution_id=self.current_execution_id,
+            cost_usd=cost
+        )
+
+        logger.debug(
+            "LLM call completed",
+            model=model,
+            tokens=prompt_tokens + completion_tokens,
+            cached_tokens=cached_tokens,
+            latency_ms=latency_ms,
+            cost_usd=cost
+        )
+        return cost
+
+    def _track_llm_response(self, response, model: str, started: float) -> Dict[str, Any]:
+        """Track usage/cost of a chat completion and unwrap it"""
+        usage = response.usage
+        cost = self._track_usage(
+            model,
+            usage.prompt_tokens,
+            usage.completion_tokens,
+            cached_tokens=cached_prompt_tokens(usage),
+            latency_ms=_elapsed_ms(started)
+        )
+
+        return {
+            "content": response.choices[0].message.content,
+            "usage": {
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "total_tokens": usage.total_tokens
+            },
+            "cost_usd": cost,
+            "model": model
+        }
+
+    def _track_anthropic_response(self, response, model: str, started: float, json_mode: bool) -> Dict[str, Any]:
+        """Track usage/cost of an Anthropic message and unwrap it like a chat completion"""
+        usage = response.usage
+        cached = getattr(usage, "cache_read_input_tokens", 0) or 0
+        prompt_tokens = usage.input_tokens + cached
+        cost = self._track_usage(
+            model,
+            prompt_tokens,
+            usage.output_tokens,
+            cached_tokens=cached,
+            latency_ms=_elapsed_ms(started)
+        )
+
+        return {
+            "content": anthropic_text(response, json_mode),
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": usage.output_tokens,
+                "total_tokens": prompt_tokens + usage.output_tokens
+            },
+            "cost_usd": cost,
+            "model": model
         }
 
-        if model not in pricing:
-            # Default to gpt-3.5-turbo pricing
-            model = "gpt-3.5-turbo"
+    def embed(self, texts: List[str], model: Optional[str] = None) -> np.ndarray:
+        """
+        Embed texts with OpenAI embeddings with cost tracking
+
+        Args:
+            texts: Texts to embed (sent in a single batched request)
+            model: Embedding model (defaults to OPENAI_EMBEDDING_MODEL)
+
+        Returns:
+            (len(texts), dim) float32 matrix
+        """
+        model = model or settings.OPENAI_EMBEDDING_MODEL
+
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        try:
+            started = time.monotonic()
+            response = resilience.call(
+                model, lambda: self.openai_client.embeddings.create(model=model, input=texts)
+            )
+
+            usage = response.usage
+            cost = self._track_usage(
+                model, usage.prompt_tokens, 0,
+                latency_ms=_elapsed_ms(started), kind="embedding"
+            )
+
+            logger.debug(
+                "Embedding call completed",
+                model=model,
+                texts=len(texts),
+                tokens=usage.total_tokens,
+                cost_usd=cost
+            )
 
-        input_cost = (prompt_tokens / 1_000_000) * pricing[model]["input"]
-        output_cost = (completion_tokens / 1_000_000) * pricing[model]["output"]
+            ordered = sorted(response.data, key=lambda item: item.index)
+            return np.asarray([item.embedding for item in ordered], dtype=np.float32)
 
-        return round(input_cost + output_cost, 4)
+        except Exception as e:
+            logger.error("Embedding call failed", error=str(e), model=model)
+            raise
+
+    def _calculate_cost(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int = 0
+    ) -> float:
+        """
+        Cost of an LLM call in USD (price table in app.agents.pricing, LLM_PRICES overrides)
+
+        Not rounded: a small call costs fractions of a cent, and rounding each
+        one would drop it from the totals.
+        """
+        return calculate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
 
     def reset_tracking(self):
         """Reset tokens and cost tracking"""
         self.tokens_used = 0
         self.cost_usd = 0.0
+
+
+def _elapsed_ms(started: float) -> int:
+    return int((time.monotonic() - started) * 1000)
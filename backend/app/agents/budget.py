@@ -0,0 +1,186 @@
+"""
+LLM Budget Governor
+Admits, degrades or refuses agent LLM calls against spend budgets
+
+Budgets (LLM_BUDGET_*):
+- per execution: the execution's own running cost
+- per agent type per UTC day, and for all agents per UTC day: counters in
+  the llm_spend table, incremented after every call, so every worker and
+  process enforces the same totals
+
+Before a call, its worst-case cost is estimated: the prompt is counted with
+the local tokenizer and max_tokens is assumed for the completion.
+
+- fits every budget, below LLM_BUDGET_DEGRADE_RATIO of each -> admit
+- past the ratio, or over a budget -> degrade to the cheaper model
+  (LLM_DEGRADE_MODELS) if that one fits
+- over a budget with no cheaper model that fits -> refuse (BudgetExceededError)
+
+Concurrent calls are checked against totals that don't include each other
+yet, so a day can overshoot by at most the calls in flight.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import structlog
+
+from app.agents.tokens import count_message_tokens
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.modules.agents.repository import LLMSpendRepository
+
+logger = structlog.get_logger()
+
+TOTAL_SCOPE = "total"
+
+
+class BudgetExceededError(Exception):
+    """An LLM call would exceed a spend budget and has no cheaper fallback"""
+
+
+def agent_scope(agent_type: str) -> str:
+    return f"agent:{agent_type}"
+
+
+class BudgetGovernor:
+    """
+    Budget checks for one agent
+
+    Usage:
+        decision = governor.check("gpt-4o", messages, max_tokens=4000, execution_spent=0.8)
+        # {"action": "degrade", "model": "gpt-4o-mini", "requested_model": "gpt-4o", ...}
+        ...
+        governor.record(cost_usd=0.012, tokens=3100)
+    """
+
+    def __init__(self, agent_type: str, cost_fn: Callable[[str, int, int], float]):
+        """
+        Args:
+            agent_type: Agent type (per-agent daily budget scope)
+            cost_fn: (model, prompt_tokens, completion_tokens) -> USD
+        """
+        self.agent_type = agent_type
+        self.cost_fn = cost_fn
+
+    @property
+    def scopes(self) -> List[str]:
+        return [TOTAL_SCOPE, agent_scope(self.agent_type)]
+
+    def limits(self, execution_limit: Optional[float] = None) -> Dict[str, float]:
+        """Active budgets: scope -> USD (unlimited scopes are omitted)"""
+        limits = {
+            "execution": execution_limit if execution_limit is not None else settings.LLM_BUDGET_EXECUTION_USD,
+            TOTAL_SCOPE: settings.LLM_BUDGET_DAILY_USD,
+            agent_scope(self.agent_type): settings.llm_budget_agent_daily.get(self.agent_type, 0),
+        }
+        return {scope: usd for scope, usd in limits.items() if usd and usd > 0}
+
+    def daily_spend(self) -> Dict[str, float]:
+        db = SessionLocal()
+        try:
+            return LLMSpendRepository(db).get_spend(datetime.utcnow().date(), self.scopes)
+        finally:
+            db.close()
+
+    def check(
+        self,
+        model: str,
+        messages: list,
+        max_tokens: int,
+        execution_spent: float = 0.0,
+        execution_limit: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Decide how to run a call
+
+        Returns:
+            {"action": "admit" | "degrade" | "refuse", "model", "requested_model",
+             "estimated_cost_usd", "scope", "spent_usd", "limit_usd", "reason"}
+        """
+        limits = self.limits(execution_limit)
+        spent = {"execution": execution_spent}
+        if any(scope in limits for scope in self.scopes):
+            spent.update(self.daily_spend())
+
+        estimate = self._estimate(model, messages, max_tokens)
+        over, soft = self._pressure(limits, spent, estimate)
+        decision = {
+            "action": "admit",
+            "model": model,
+            "requested_model": model,
+            "estimated_cost_usd": round(estimate, 6)
+        }
+        if over is None and soft is None:
+            return decision
+
+        scope = over or soft
+        decision.update(scope=scope, spent_usd=round(spent.get(scope, 0.0), 6), limit_usd=limits[scope])
+
+        cheaper = settings.llm_degrade_models.get(model)
+        if cheaper:
+            cheaper_estimate = self._estimate(cheaper, messages, max_tokens)
+            if self._pressure(limits, spent, cheaper_estimate)[0] is None:
+                decision.update(
+                    action="degrade",
+                    model=cheaper,
+                    estimated_cost_usd=round(cheaper_estimate, 6),
+                    reason=f"{scope} budget {'exceeded' if over else 'nearly used'}, using {cheaper}"
+                )
+                return decision
+
+        if over is None:
+            return decision  # Soft pressure only, nothing cheaper: still fits
+
+        decision.update(
+            action="refuse",
+            reason=f"LLM budget '{scope}' exceeded: ${spent.get(scope, 0.0):.4f} spent "
+                   f"+ ~${estimate:.4f} > ${limits[scope]:.2f}"
+        )
+        return decision
+
+    def record(self, cost_usd: float, tokens: int) -> None:
+        """
+        Add a finished call to the shared daily counters (never raises)
+
+        Called on an event loop, the UPDATEs run on the loop's default
+        executor instead of blocking it (as check() does via _admit).
+        """
+        if not settings.LLM_BUDGET_ENABLED:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._add_spend(cost_usd, tokens)
+        else:
+            loop.run_in_executor(None, self._add_spend, cost_usd, tokens)
+
+    def _add_spend(self, cost_usd: float, tokens: int) -> None:
+        db = SessionLocal()
+        try:
+            LLMSpendRepository(db).add_spend(datetime.utcnow().date(), self.scopes, cost_usd, tokens)
+        except Exception as e:
+            db.rollback()
+            logger.warning("Failed to record LLM spend", agent_type=self.agent_type, error=str(e))
+        finally:
+            db.close()
+
+    def _estimate(self, model: str, messages: list, max_tokens: int) -> float:
+        """Worst-case cost: counted prompt + max_tokens of completion"""
+        return self.cost_fn(model, count_message_tokens(messages, model), max_tokens)
+
+    @staticmethod
+    def _pressure(
+        limits: Dict[str, float],
+        spent: Dict[str, float],
+        estimate: float
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """(first scope the call would exceed, first scope past the degrade ratio)"""
+        over = soft = None
+        for scope, limit in limits.items():
+            used = spent.get(scope, 0.0)
+            if over is None and used + estimate > limit:
+                over = scope
+            elif soft is None and used + estimate > limit * settings.LLM_BUDGET_DEGRADE_RATIO:
+                soft = scope
+        return over, soft
@@ -0,0 +1,112 @@
+"""
+Pooled LLM Clients
+Process-level OpenAI clients shared by all agents
+
+Creating an OpenAI client builds a new httpx connection pool, so a client
+per agent run meant a fresh TCP + TLS handshake for every run's first LLM
+call. Agents use these shared clients instead:
+
+- get_openai_client(): one sync client per process (httpx.Client is thread-safe,
+  so job-queue threads share it)
+- get_async_openai_client(): one async client per event loop (the async pool
+  is bound to its loop; job-queue runs and Celery tasks start their own loops).
+  The pool's connections keep the loop alive, so loops that end before the
+  process does close their clients with close_async_clients (done by
+  app.scrapers.runtime.run_with_runtime)
+- get_anthropic_client() / get_async_anthropic_client(): the same for the
+  Anthropic failover provider (optional `anthropic` package)
+
+The SDKs' own retries are off (max_retries=0) and every attempt is bounded by
+LLM_TIMEOUT_SECONDS: retries, hedging and circuit breaking are done once, in
+app.agents.resilience.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Optional
+from openai import AsyncOpenAI, OpenAI
+
+from app.core.config import settings
+
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+_anthropic_client = None
+_async_anthropic_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+def _client_options() -> Dict[str, Any]:
+    return {"max_retries": 0, "timeout": settings.LLM_TIMEOUT_SECONDS}
+
+
+def _openai_options() -> Dict[str, Any]:
+    options = _client_options()
+    if settings.OPENAI_BASE_URL:
+        options["base_url"] = settings.OPENAI_BASE_URL  # e.g. the local fake server (fakes/llm_server.py)
+    return options
+
+
+def get_openai_client() -> OpenAI:
+    """Shared sync OpenAI client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI(api_key=settings.OPENAI_API_KEY, **_openai_options())
+    return _client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Shared async OpenAI client of the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, **_openai_options())
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_clients() -> None:
+    """Close the running loop's async OpenAI / Anthropic clients, if any were created"""
+    loop = asyncio.get_running_loop()
+    for clients in (_async_clients, _async_anthropic_clients):
+        client = clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+
+
+def _anthropic_module():
+    """
+    Raises:
+        RuntimeError: No ANTHROPIC_API_KEY or the anthropic package is missing
+    """
+    if not settings.ANTHROPIC_API_KEY:
+        raise RuntimeError("ANTHROPIC_API_KEY is not set")
+    try:
+        import anthropic
+    except ImportError as e:
+        raise RuntimeError("Anthropic failover requires the 'anthropic' package") from e
+    return anthropic
+
+
+def get_anthropic_client():
+    """Shared sync Anthropic client"""
+    global _anthropic_client
+    if _anthropic_client is None:
+        anthropic = _anthropic_module()
+        with _client_lock:
+            if _anthropic_client is None:
+                _anthropic_client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY, **_client_options())
+    return _anthropic_client
+
+
+def get_async_anthropic_client():
+    """Shared async Anthropic client of the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_anthropic_clients.get(loop)
+    if client is None:
+        anthropic = _anthropic_module()
+        client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY, **_client_options())
+        _async_anthropic_clients[loop] = client
+    return client
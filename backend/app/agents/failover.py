@@ -0,0 +1,72 @@
+"""
+LLM Failover
+Anthropic as the fallback provider for OpenAI chat calls
+
+When an OpenAI model's circuit is open or its retries run out on transient
+errors, BaseAgent repeats the call on the mapped Claude model
+(LLM_FAILOVER_MODELS), if ANTHROPIC_API_KEY is set.
+
+Chat messages are converted to the Messages API: system messages become the
+`system` parameter, consecutive same-role messages are merged. JSON mode has
+no Anthropic equivalent, so the answer is prefilled with "{" and the brace
+is put back on the returned text.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from app.agents.resilience import should_failover
+from app.core.config import settings
+
+
+def failover_model(model: str, error: BaseException) -> Optional[str]:
+    """Claude model to retry a failed call on, or None"""
+    if not settings.LLM_FAILOVER_ENABLED or not settings.ANTHROPIC_API_KEY:
+        return None
+    if not should_failover(error):
+        return None
+    return settings.llm_failover_models.get(model)
+
+
+def anthropic_kwargs(
+    messages: List[Dict[str, Any]],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    json_mode: bool
+) -> Dict[str, Any]:
+    """messages.create arguments equivalent to a chat.completions request"""
+    system = "\n\n".join(str(m.get("content") or "") for m in messages if m.get("role") == "system")
+
+    turns: List[Dict[str, str]] = []
+    for message in messages:
+        role = message.get("role")
+        if role == "system":
+            continue
+        role = "assistant" if role == "assistant" else "user"
+        content = str(message.get("content") or "")
+        if turns and turns[-1]["role"] == role:
+            turns[-1]["content"] += "\n\n" + content
+        else:
+            turns.append({"role": role, "content": content})
+    if not turns or turns[0]["role"] != "user":
+        turns.insert(0, {"role": "user", "content": "."})
+
+    if json_mode:
+        system = (system + "\n\n" if system else "") + "Respond with a single valid JSON object only."
+        turns.append({"role": "assistant", "content": "{"})
+
+    kwargs = {
+        "model": model,
+        "messages": turns,
+        "temperature": min(temperature, 1.0),
+        "max_tokens": max_tokens
+    }
+    if system:
+        kwargs["system"] = system
+    return kwargs
+
+
+def anthropic_text(response: Any, json_mode: bool) -> str:
+    """Text of a Messages API response (with the JSON prefill restored)"""
+    text = "".join(getattr(block, "text", "") for block in response.content or [])
+    return "{" + text if json_mode else text
@@ -5,12 +5,16 @@ Analyzes trends and generates AI-focused business ideas
 ФОКУС: AI-помощники и агенты, решающие РЕАЛЬНЫЕ проблемы бизнеса и физлиц
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
 import json
+import time
 import structlog
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.agents.base_agent import BaseAgent
+from app.agents.trend_clustering import cluster_trends, trend_text
 from app.modules.trends.service import TrendService
 from app.modules.ideas.service import IdeaService
 from app.modules.ideas.schemas import IdeaCreate
@@ -38,11 +42,13 @@ class IdeaAnalystAgent(BaseAgent):
 
     Process:
     1. Fetch trends from database
-    2. Analyze with focus on AI solutions
-    3. Verify data from multiple sources
-    4. Generate AI assistant/agent ideas
-    5. Score each idea on 6 metrics
-    6. Store verified ideas in database
+    2. Cluster related trends, keep one representative per topic
+    3. Analyze with focus on AI solutions
+    4. Verify data from multiple sources
+    5. Generate AI assistant/agent ideas
+    6. Score each idea on 6 metrics
+    7. Store verified ideas in database
+    8. Mark every trend looked at as analysed
     """
 
     def __init__(self, db: Session):
@@ -58,21 +64,31 @@ class IdeaAnalystAgent(BaseAgent):
             {
                 "trend_ids": [1, 2, 3, ...],  # Optional: specific trends to analyze
                 "limit": 10,  # Number of ideas to generate
-                "min_total_score": 60  # Minimum score threshold
+                "min_total_score": 60,  # Minimum score threshold
+                "concurrency": 4,  # Optional: parallel LLM analyses
+                "cluster_trends": True,  # Optional: collapse related trends first
+                "triage": True,  # Optional: cheap-model pre-scoring (IDEA_TRIAGE_*)
+                "triage_top_k": 20  # Optional: trends sent to deep analysis
             }
 
         Output:
             {
                 "trends_analyzed": 5,
+                "clusters": 3,
                 "ideas_generated": 8,
                 "ideas_stored": 5,
                 "avg_score": 72.5,
-                "top_idea": {"id": 123, "title": "...", "score": 85}
+                "top_idea": {"id": 123, "title": "...", "score": 85},
+                "tiers": {
+                    "triage": {"model": "gpt-4o-mini", "calls": 1, "trends": 12, "selected": 6, ...},
+                    "deep": {"model": "gpt-4o", "calls": 6, "tokens": 21000, "cost_usd": 0.12, "seconds": 14.2}
+                }
             }
         """
         trend_ids = input_data.get("trend_ids")
         limit = input_data.get("limit", 10)
         min_score = input_data.get("min_total_score", 60)
+        triage_enabled = input_data.get("triage", settings.IDEA_TRIAGE_ENABLED)
 
         logger.info(
             "Starting idea analysis",
@@ -81,30 +97,93 @@ class IdeaAnalystAgent(BaseAgent):
             min_score=min_score
         )
 
+        # A resumed run analyses the same trends as its first attempt
+        selection = self.get_checkpoint("trends")
+        if selection:
+            trend_ids = selection["trend_ids"]
+
         # Fetch trends
         if trend_ids:
             trends = [self.trend_service.get_trend(tid) for tid in trend_ids]
             trends = [t for t in trends if t is not None]
         else:
-            # Get recent high-engagement trends
-            trends_list = self.trend_service.get_trends(
-                limit=limit * 2,  # Analyze more trends to get enough good ideas
+            # High-engagement trends no earlier run has analysed
+            # Analyze more trends to get enough good ideas; triage can afford a wider pool
+            pool_factor = max(settings.IDEA_TRIAGE_POOL_FACTOR, 2) if triage_enabled else 2
+            trends = self.trend_service.get_unanalyzed(
+                limit=limit * pool_factor,
                 min_engagement=100
             )
-            trends = trends_list.items
+
+        if not selection:
+            self.checkpoint("trends", {"trend_ids": [t.id for t in trends]})
 
         logger.info(f"Analyzing {len(trends)} trends")
+        self.emit("stage", stage="clustering", trends=len(trends))
 
-        # Analyze each trend
-        ideas_generated = []
-        for trend in trends:
-            try:
-                idea = await self._analyze_trend(trend)
-                if idea and idea["total_score"] >= min_score:
-                    ideas_generated.append(idea)
-            except Exception as e:
-                logger.error(f"Failed to analyze trend {trend.id}", error=str(e))
-                continue
+        # Collapse related trends so each topic costs one LLM call
+        clusters = await self._cluster_trends(
+            trends,
+            enabled=input_data.get("cluster_trends", settings.TREND_CLUSTER_ENABLED)
+        )
+
+        # Cheap batched scoring first; only the most promising topics get the deep model
+        tiers: Dict[str, Dict[str, Any]] = {}
+        all_clusters = clusters
+        if triage_enabled:
+            clusters, tiers["triage"] = await self._triage_clusters(
+                clusters,
+                top_k=input_data.get("triage_top_k") or settings.IDEA_TRIAGE_TOP_K or limit * 2
+            )
+
+        self.emit("stage", stage="analysis", clusters=len(clusters))
+        deep_started = time.monotonic()
+        deep_tokens, deep_cost = self.tokens_used, self.cost_usd
+
+        # Analyze one representative per cluster, a few LLM calls at a time
+        semaphore = asyncio.Semaphore(max(input_data.get("concurrency", settings.IDEA_ANALYSIS_CONCURRENCY), 1))
+        progress = {"done": 0}
+
+        async def analyze(cluster: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            trend = cluster["representative"]
+            async with semaphore:
+                try:
+                    idea = await self._analyze_trend_checkpointed(trend, cluster)
+                except Exception as e:
+                    logger.error(f"Failed to analyze trend {trend.id}", error=str(e))
+                    progress["done"] += 1
+                    self.emit("trend_analyzed", trend_id=trend.id, title=trend.title, error=str(e))
+                    return None
+
+            progress["done"] += 1
+            self.emit(
+                "trend_analyzed",
+                trend_id=trend.id,
+                title=trend.title,
+                score=idea["total_score"] if idea else None,
+                progress=f"{progress['done']}/{len(clusters)}"
+            )
+            return idea
+
+        results = await asyncio.gather(*(analyze(cluster) for cluster in clusters))
+        tiers["deep"] = {
+            "model": settings.IDEA_ANALYSIS_MODEL,
+            "calls": len(clusters),
+            "tokens": self.tokens_used - deep_tokens,
+            "cost_usd": round(self.cost_usd - deep_cost, 6),
+            "seconds": round(time.monotonic() - deep_started, 3)
+        }
+        ideas_generated = [idea for idea in results if idea and idea["total_score"] >= min_score]
+
+        # Everything looked at counts as analysed: cluster members, triaged-out
+        # and low-scoring trends too. Failed analyses stay eligible for a retry.
+        failed = {c["representative"].id for c, idea in zip(clusters, results) if idea is None}
+        self.trend_service.mark_analyzed([
+            member.id
+            for cluster in all_clusters
+            if cluster["representative"].id not in failed
+            for member in cluster["members"]
+        ])
 
         # Sort by score and take top N
         ideas_generated.sort(key=lambda x: x["total_score"], reverse=True)
@@ -113,12 +192,21 @@ class IdeaAnalystAgent(BaseAgent):
         # Store in database
         ideas_stored = []
         for idea_data in top_ideas:
+            step_key = f"idea_stored:{idea_data['create_data'].trend_id}"
+            stored = self.get_checkpoint(step_key)
+            if stored:
+                # Stored by an earlier attempt of this execution
+                ideas_stored.append(stored)
+                continue
+
             idea = self.idea_service.create_idea(idea_data["create_data"])
             ideas_stored.append({
                 "id": idea.id,
                 "title": idea.title,
                 "score": idea.total_score
             })
+            self.checkpoint(step_key, ideas_stored[-1])
+            self.emit("idea_stored", **ideas_stored[-1])
 
         # Calculate stats
         avg_score = sum(i["total_score"] for i in ideas_generated) / len(ideas_generated) if ideas_generated else 0
@@ -126,10 +214,12 @@ class IdeaAnalystAgent(BaseAgent):
 
         output = {
             "trends_analyzed": len(trends),
+            "clusters": len(all_clusters),
             "ideas_generated": len(ideas_generated),
             "ideas_stored": len(ideas_stored),
             "avg_score": round(avg_score, 2),
-            "top_idea": top_idea
+            "top_idea": top_idea,
+            "tiers": tiers
         }
 
         logger.info(
@@ -139,12 +229,179 @@ class IdeaAnalystAgent(BaseAgent):
 
         return output
 
-    async def _analyze_trend(self, trend) -> Dict[str, Any]:
+    async def _cluster_trends(self, trends: List[Any], enabled: bool = True) -> List[Dict[str, Any]]:
+        """
+        Group related trends by embedding similarity
+
+        Falls back to one cluster per trend if clustering is disabled
+        or the embedding call fails. The embedding call (with its retry
+        backoff) runs on a thread, off the execution's event loop.
+        """
+        singletons = [
+            {"representative": t, "members": [t], "combined_engagement": t.engagement_score or 0}
+            for t in trends
+        ]
+
+        if not enabled or len(trends) < 2:
+            return singletons
+
+        try:
+            embeddings = await asyncio.to_thread(self.embed, [trend_text(t) for t in trends])
+        except Exception as e:
+            logger.warning("Trend clustering skipped", error=str(e))
+            return singletons
+
+        return cluster_trends(trends, embeddings, settings.TREND_CLUSTER_THRESHOLD)
+
+    async def _triage_clusters(
+        self,
+        clusters: List[Dict[str, Any]],
+        top_k: int
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Score cluster representatives with the cheap model and keep the top K
+
+        Trends are scored IDEA_TRIAGE_BATCH_SIZE per call, all batches at once.
+        Only trends scoring at least IDEA_TRIAGE_MIN_SCORE are kept. If a
+        batch fails, its trends get the threshold score, so an outage in the
+        cheap tier doesn't drop candidates. Scores are checkpointed as
+        "triage", so a resumed run reuses them.
+
+        Returns:
+            (selected clusters, tier stats)
+        """
+        stats = {
+            "model": settings.IDEA_TRIAGE_MODEL,
+            "calls": 0,
+            "trends": len(clusters),
+            "selected": len(clusters),
+            "tokens": 0,
+            "cost_usd": 0.0,
+            "seconds": 0.0
+        }
+        if not clusters:
+            return clusters, stats
+
+        self.emit("stage", stage="triage", clusters=len(clusters))
+        started = time.monotonic()
+        tokens, cost = self.tokens_used, self.cost_usd
+
+        saved = self.get_checkpoint("triage") or {}
+        scores: Dict[int, int] = {int(k): v for k, v in saved.get("scores", {}).items()}
+        pending = [c["representative"] for c in clusters if c["representative"].id not in scores]
+
+        batch_size = max(settings.IDEA_TRIAGE_BATCH_SIZE, 1)
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        for batch_scores in await asyncio.gather(*(self._triage_batch(batch) for batch in batches)):
+            scores.update(batch_scores)
+
+        if batches:
+            self.checkpoint("triage", {"scores": {str(k): v for k, v in scores.items()}})
+
+        ranked = sorted(
+            (c for c in clusters if scores.get(c["representative"].id, 0) >= settings.IDEA_TRIAGE_MIN_SCORE),
+            key=lambda c: (scores[c["representative"].id], c["combined_engagement"]),
+            reverse=True
+        )
+        selected = ranked[:top_k]
+
+        stats.update({
+            "calls": len(batches),
+            "selected": len(selected),
+            "tokens": self.tokens_used - tokens,
+            "cost_usd": round(self.cost_usd - cost, 6),
+            "seconds": round(time.monotonic() - started, 3)
+        })
+        logger.info("Trends triaged", **stats)
+        self.emit("triage_completed", **stats)
+        return selected, stats
+
+    async def _triage_batch(self, trends: List[Any]) -> Dict[int, int]:
+        """Triage scores (0-100) for one batch of trends"""
+        items = "\n".join(
+            f"{t.id}. {t.title} — {(t.description or '')[:200]} "
+            f"[{t.category}, популярность {t.engagement_score or 0}]"
+            for t in trends
+        )
+        prompt = f"""
+        Оцени потенциал каждого тренда как основы для бизнес-идеи на базе AI-помощника или AI-агента.
+
+        Критерии: реальная проблема, спрос, готовность платить, реализуемость с AI.
+        Балл 0-100: 80+ сильный кандидат, 40-79 средний, <40 слабый.
+
+        Тренды (id. название — описание):
+        {items}
+
+        Верни JSON: {{"scores": [{{"id": 12, "score": 75}}, ...]}} - по одному элементу на каждый id.
+        """
+
+        try:
+            response = await self.acall_llm(
+                messages=[
+                    {"role": "system", "content": "Ты венчурный аналитик. Быстро и честно оцениваешь потенциал идей. Отвечай только JSON."},
+                    {"role": "user", "content": prompt}
+                ],
+                model=settings.IDEA_TRIAGE_MODEL,
+                temperature=0.2,
+                max_tokens=30 * len(trends) + 100,
+                json_mode=True
+            )
+            answer = json.loads(response["content"])
+            scored = {
+                int(item["id"]): max(0, min(100, int(item["score"])))
+                for item in answer.get("scores", [])
+                if isinstance(item, dict) and "id" in item and "score" in item
+            }
+        except Exception as e:
+            logger.warning("Triage batch failed, passing trends through", trends=len(trends), error=str(e))
+            scored = {}
+
+        # Unscored trends (failed batch, omitted ids) pass with the threshold score
+        return {t.id: scored.get(t.id, settings.IDEA_TRIAGE_MIN_SCORE) for t in trends}
+
+    async def _analyze_trend_checkpointed(self, trend, cluster: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        _analyze_trend, reusing the result saved by an earlier attempt
+
+        Each fresh analysis is checkpointed as "trend:<id>" together with the
+        raw LLM output, so resuming a failed run only pays for the trends
+        that were not analysed yet.
+        """
+        step_key = f"trend:{trend.id}"
+
+        saved = self.get_checkpoint(step_key)
+        if saved is not None:
+            logger.info("Trend analysis restored from checkpoint", trend_id=trend.id)
+            return {
+                "total_score": saved["total_score"],
+                "create_data": IdeaCreate(**saved["create_data"]),
+                "raw": saved.get("raw")
+            }
+
+        idea = await self._analyze_trend(trend, cluster)
+        self.checkpoint(step_key, {
+            "total_score": idea["total_score"],
+            "create_data": idea["create_data"].model_dump(mode="json"),
+            "raw": idea.get("raw")
+        })
+        return idea
+
+    async def _analyze_trend(self, trend, cluster: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Analyze a single trend and generate business idea with scoring
 
+        If the trend represents a cluster, the combined engagement and the
+        titles of related trends are included in the prompt.
+
         Returns dict with idea data and scores
         """
+        engagement = cluster["combined_engagement"] if cluster else trend.engagement_score
+        related = [m.title for m in cluster["members"] if m.id != trend.id][:10] if cluster else []
+        related_block = (
+            "- Похожие обсуждения: " + "; ".join(related)
+            if related else ""
+        )
+
         prompt = f"""
         🎯 ЗАДАЧА: Создай бизнес-идею на базе AI-ПОМОЩНИКА или AI-АГЕНТА
 
@@ -153,8 +410,9 @@ class IdeaAnalystAgent(BaseAgent):
         - Описание: {trend.description}
         - Источник: {trend.source}
         - Категория: {trend.category}
-        - Популярность: {trend.engagement_score}
+        - Популярность: {engagement}
         - Теги: {', '.join(trend.tags) if trend.tags else 'N/A'}
+        {related_block}
 
         ═══════════════════════════════════════════════════════════════
         🤖 ФОКУС: AI-ПОМОЩНИКИ И АГЕНТЫ
@@ -277,7 +535,7 @@ class IdeaAnalystAgent(BaseAgent):
         ⚠️ НЕ ВЫДУМЫВАЙ ДАННЫЕ - ИСПОЛЬЗУЙ РЕАЛЬНЫЕ!
         """
 
-        response = self.call_llm(
+        response = await self.acall_llm(
             messages=[
                 {
                     "role": "system",
@@ -296,7 +554,7 @@ class IdeaAnalystAgent(BaseAgent):
                 },
                 {"role": "user", "content": prompt}
             ],
-            model="gpt-4o",  # GPT-4 для глубокого анализа
+            model=settings.IDEA_ANALYSIS_MODEL,  # GPT-4 для глубокого анализа
             temperature=0.5,  # Меньше креативности, больше точности
             max_tokens=4000,
             json_mode=True
@@ -328,7 +586,7 @@ class IdeaAnalystAgent(BaseAgent):
         financial = analysis.get("financial", {})
 
         # Determine if trending based on engagement
-        is_trending = trend.engagement_score > 500 if hasattr(trend, 'engagement_score') else False
+        is_trending = (engagement or 0) > 500
 
         # Determine region relevance
         is_russia_relevant = analysis.get("is_russia_relevant", False)
@@ -363,5 +621,6 @@ class IdeaAnalystAgent(BaseAgent):
 
         return {
             "total_score": total_score,
-            "create_data": idea_create
+            "create_data": idea_create,
+            "raw": analysis
         }
@@ -0,0 +1,338 @@
+"""
+Agent Job Queue
+Durable background execution of agent runs
+
+    POST /agents/run -> enqueue() -> agent_executions row (status=pending)
+    POST /agents/executions/{id}/resume -> resume() -^
+                                          |
+               AgentJobQueue dispatcher <-+  (priority desc, then FIFO)
+                        |
+               per-agent-type slots -> agent.run(execution_id=...)
+
+The queue lives in the agent_executions table, so it needs no Redis and
+survives restarts:
+- claims are a conditional UPDATE (pending -> running), safe across processes;
+  the per-agent-type limit counts running rows, and claims of one type are
+  serialised (advisory lock on PostgreSQL), so it holds across workers
+- running jobs refresh heartbeat_at; jobs whose heartbeat goes stale
+  (crashed worker) are put back to pending on startup and periodically
+- each job runs on a pool thread with its own event loop, and the
+  dispatcher's own DB calls go through asyncio.to_thread, so blocking code
+  never stalls the API
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+import structlog
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.events import publish_execution_event
+from app.agents.runner import AGENT_REGISTRY, check_agent_type, create_agent
+from app.modules.agents.models import AgentExecution
+from app.modules.agents.repository import AgentExecutionRepository
+from app.modules.agents.schemas import AgentExecutionCreate, AgentExecutionUpdate
+from app.scrapers.runtime import run_with_runtime
+
+logger = structlog.get_logger()
+
+
+def enqueue(
+    db,
+    agent_type: str,
+    params: Dict[str, Any],
+    priority: int = 0
+) -> AgentExecution:
+    """
+    Queue an agent run and return its pending execution record
+
+    Raises:
+        NotImplementedError: If the agent type is planned but not implemented
+        ValueError: If agent_type is not supported
+    """
+    check_agent_type(agent_type)
+
+    execution = AgentExecutionRepository(db).create(AgentExecutionCreate(
+        agent_type=agent_type,
+        input_data=params,
+        status="pending",
+        priority=priority,
+        queued_at=datetime.utcnow()
+    ))
+
+    logger.info(
+        "Agent run queued",
+        execution_id=execution.id,
+        agent_type=agent_type,
+        priority=priority
+    )
+
+    publish_execution_event(execution.id, "queued", {"agent_type": agent_type, "priority": priority})
+    job_queue.wake()
+    return execution
+
+
+def resume(db, execution_id: int) -> AgentExecution:
+    """
+    Queue a failed or cancelled execution again under the same id
+
+    The agent reloads the checkpoints of the earlier attempt and only does
+    the remaining steps.
+
+    Raises:
+        LookupError: If the execution does not exist
+        ValueError: If the execution is not failed or cancelled
+    """
+    repository = AgentExecutionRepository(db)
+
+    execution = repository.get_by_id(execution_id)
+    if execution is None:
+        raise LookupError(f"Agent execution with id {execution_id} not found")
+
+    if not repository.requeue(execution_id):
+        raise ValueError(
+            f"Only failed or cancelled executions can be resumed (status: {execution.status})"
+        )
+
+    db.refresh(execution)
+    checkpoints = len(repository.get_checkpoints(execution_id))
+
+    logger.info(
+        "Agent run resumed",
+        execution_id=execution_id,
+        agent_type=execution.agent_type,
+        checkpoints=checkpoints
+    )
+
+    publish_execution_event(execution_id, "queued", {
+        "agent_type": execution.agent_type,
+        "priority": execution.priority,
+        "resumed": True,
+        "checkpoints": checkpoints
+    })
+    job_queue.wake()
+    return execution
+
+
+class AgentJobQueue:
+    """
+    In-process asyncio worker pool over the agent_executions table
+
+    Usage (app startup/shutdown):
+        await job_queue.start()
+        await job_queue.stop()
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        poll_seconds: Optional[float] = None,
+        stale_seconds: Optional[int] = None
+    ):
+        """
+        Args:
+            workers: Max jobs running at once in this process
+            concurrency: Agent type -> max concurrent jobs of that type
+            poll_seconds: How often to look for jobs queued by other processes
+            stale_seconds: Heartbeat age after which a running job is requeued
+        """
+        self.workers = workers or settings.JOB_WORKERS
+        self.concurrency = concurrency if concurrency is not None else settings.job_concurrency
+        self.poll_seconds = poll_seconds or settings.JOB_POLL_SECONDS
+        self.stale_seconds = stale_seconds or settings.JOB_STALE_SECONDS
+
+        self._running: Dict[int, asyncio.Task] = {}
+        self._running_types: Dict[int, str] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def wake(self) -> None:
+        """Nudge the dispatcher (new job or freed slot)"""
+        if self._wake is not None:
+            self._wake.set()
+
+    def _limits(self) -> Dict[str, int]:
+        """Agent type -> max jobs of that type running across all processes"""
+        return {
+            agent_type: self.concurrency.get(agent_type, settings.JOB_DEFAULT_CONCURRENCY)
+            for agent_type in AGENT_REGISTRY
+        }
+
+    async def start(self) -> None:
+        """Requeue stale jobs and start dispatching"""
+        if self._dispatcher is not None:
+            return
+
+        self._wake = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="agent-job")
+        await asyncio.to_thread(self._requeue_stale)
+        self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+        logger.info("Agent job queue started", workers=self.workers, concurrency=self.concurrency)
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop taking new jobs and wait for in-flight ones
+
+        In-flight jobs keep heart-beating until they finish, so other
+        processes don't requeue (and re-run) them meanwhile. Jobs still
+        running after `timeout` seconds (JOB_STOP_TIMEOUT_SECONDS) are left
+        behind: their heartbeat goes stale and they are requeued, as when
+        the process is killed.
+        """
+        if self._dispatcher is None:
+            return
+
+        self._dispatcher.cancel()
+        await asyncio.gather(self._dispatcher, return_exceptions=True)
+
+        timeout = settings.JOB_STOP_TIMEOUT_SECONDS if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        if self._running:
+            logger.info("Waiting for in-flight agent jobs", in_flight=len(self._running), timeout=timeout)
+        while self._running:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                logger.warning("Agent jobs still running at shutdown", execution_ids=list(self._running))
+                break
+            await asyncio.wait(list(self._running.values()), timeout=min(self.poll_seconds, remaining))
+            if self._running:
+                await asyncio.to_thread(self._heartbeat)
+
+        self._executor.shutdown(wait=False)
+        self._dispatcher = None
+        self._wake = None
+
+        logger.info("Agent job queue stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        """Current pool usage and queue depth"""
+        db = SessionLocal()
+        try:
+            pending = AgentExecutionRepository(db).count_by_status("pending")
+        finally:
+            db.close()
+
+        running: Dict[str, int] = {}
+        for agent_type in self._running_types.values():
+            running[agent_type] = running.get(agent_type, 0) + 1
+
+        return {
+            "active": self._dispatcher is not None,
+            "workers": self.workers,
+            "concurrency": self.concurrency,
+            "running": running,
+            "pending": pending
+        }
+
+    def _requeue_stale(self) -> int:
+        db = SessionLocal()
+        try:
+            before = datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+            count = AgentExecutionRepository(db).requeue_stale(before)
+        finally:
+            db.close()
+
+        if count:
+            logger.warning("Requeued stale agent jobs", count=count)
+        return count
+
+    def _heartbeat(self) -> None:
+        db = SessionLocal()
+        try:
+            AgentExecutionRepository(db).heartbeat(list(self._running))
+        finally:
+            db.close()
+
+    def _claim(self) -> Optional[AgentExecution]:
+        if len(self._running) >= self.workers:
+            return None
+
+        db = SessionLocal()
+        try:
+            return AgentExecutionRepository(db).claim_next(self._limits())
+        finally:
+            db.close()
+
+    async def _dispatch(self) -> None:
+        last_maintenance = asyncio.get_running_loop().time()
+
+        while True:
+            try:
+                # Fill every free slot
+                while True:
+                    execution = await asyncio.to_thread(self._claim)
+                    if execution is None:
+                        break
+                    self._running_types[execution.id] = execution.agent_type
+                    self._running[execution.id] = asyncio.ensure_future(
+                        self._execute(execution.id, execution.agent_type, execution.input_data or {})
+                    )
+
+                now = asyncio.get_running_loop().time()
+                if now - last_maintenance >= self.poll_seconds:
+                    last_maintenance = now
+                    await asyncio.to_thread(self._heartbeat)
+                    await asyncio.to_thread(self._requeue_stale)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Agent job dispatch failed", error=str(e))
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, execution_id: int, agent_type: str, input_data: Dict[str, Any]) -> None:
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, _run_job, execution_id, agent_type, input_data
+            )
+        except Exception as e:
+            logger.error("Agent job crashed", execution_id=execution_id, error=str(e))
+        finally:
+            self._running.pop(execution_id, None)
+            self._running_types.pop(execution_id, None)
+            self.wake()
+
+
+def _run_job(execution_id: int, agent_type: str, input_data: Dict[str, Any]) -> None:
+    """
+    Run one claimed job on a pool thread with its own event loop and session
+
+    Agents still make blocking calls (sync LLM client, PRAW), so they run
+    off the API event loop.
+    """
+    db = SessionLocal()
+    try:
+        try:
+            agent = create_agent(db, agent_type)
+        except Exception as e:
+            logger.error("Agent job failed to start", execution_id=execution_id, error=str(e))
+            AgentExecutionRepository(db).update(execution_id, AgentExecutionUpdate(
+                status="failed",
+                error=str(e),
+                completed_at=datetime.utcnow()
+            ))
+            return
+
+        try:
+            run_with_runtime(agent.run(input_data, execution_id=execution_id))
+        except Exception:
+            pass  # agent.run has recorded the failure on the execution
+
+    finally:
+        db.close()
+
+
+# Process-wide queue (started from app startup when JOB_QUEUE_ENABLED)
+job_queue = AgentJobQueue()
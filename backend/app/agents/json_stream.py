@@ -0,0 +1,112 @@
+"""
+Streaming JSON
+Incremental parsing of JSON arrays streamed by the LLM
+
+    parser = JsonArrayStream()
+    async for delta in stream:
+        for item in parser.feed(delta):
+            store(item)          # as soon as the object's closing brace arrives
+    for item in parser.close():  # single-object answers
+        store(item)
+
+The items array is the first array of objects at the root or directly under
+the root object, so both `[{...}, {...}]` and `{"ideas": [{...}, {...}]}` work.
+Each chunk is scanned once; only the text of the current item is kept.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+import structlog
+
+logger = structlog.get_logger()
+
+
+class JsonArrayStream:
+    """
+    Emits each object element of the items array once it is complete
+
+    A truncated answer still yields every element that closed before the cut.
+    """
+
+    def __init__(self):
+        self.items_emitted = 0
+        self.array_found = False
+        self.array_closed = False
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._array_depth: Optional[int] = None  # Depth inside the items array
+        self._item_parts: Optional[List[str]] = None  # Text of the current element
+        self._text: List[str] = []
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a chunk; return the elements completed by it"""
+        self._text.append(chunk)
+        items = []
+        start = 0 if self._item_parts is not None else None
+
+        for i, ch in enumerate(chunk):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if ch == "[" and self._array_depth is None and self._depth <= 1 and not self.array_closed:
+                    self._array_depth = self._depth + 1  # Candidate until it holds an object
+                self._depth += 1
+                if ch == "{" and self._array_depth is not None and self._depth == self._array_depth + 1:
+                    self.array_found = True
+                    self._item_parts = []
+                    start = i
+            elif ch in "}]":
+                if ch == "}" and self._item_parts is not None and self._depth == self._array_depth + 1:
+                    self._item_parts.append(chunk[start:i + 1])
+                    item = self._decode("".join(self._item_parts))
+                    if item is not None:
+                        items.append(item)
+                    self._item_parts = None
+                    start = None
+                self._depth -= 1
+                if ch == "]" and self._array_depth is not None and self._depth == self._array_depth - 1:
+                    # An array of scalars (e.g. "tags") is not the items array: keep looking
+                    self._array_depth = None
+                    self.array_closed = self.array_found
+
+        if self._item_parts is not None and start is not None:
+            self._item_parts.append(chunk[start:])
+
+        self.items_emitted += len(items)
+        return items
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        Finish the stream
+
+        Returns the whole answer as one item if it was a single object with
+        no items array (e.g. one idea instead of a list); otherwise nothing.
+        """
+        if self.array_found:
+            return []
+        root = self._decode("".join(self._text))
+        return [root] if root is not None else []
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        return "".join(self._text)
+
+    def _decode(self, text: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = json.loads(text, strict=False)
+        except ValueError as e:
+            logger.debug("Skipping malformed streamed JSON item", error=str(e), text=text[:200])
+            return None
+        return value if isinstance(value, dict) else None
@@ -0,0 +1,167 @@
+"""
+LLM Call Ledger
+One llm_calls row per LLM call, written off the request path
+
+Calls are queued in memory and a background thread inserts them in batches
+(LLM_LEDGER_BATCH_SIZE rows, or whatever arrived within
+LLM_LEDGER_FLUSH_SECONDS), so an agent's LLM call never waits on the
+ledger insert. The queue is flushed on app shutdown and at interpreter
+exit (cron / worker processes).
+
+If the queue is full (database down for a long time) new rows are dropped
+and counted; budgets and execution totals are tracked separately and are
+not affected.
+"""
+
+import atexit
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import structlog
+
+from app.agents.pricing import calculate_cost
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.modules.agents.repository import LLMCallRepository
+
+logger = structlog.get_logger()
+
+
+class LLMLedger:
+    """
+    Batched, asynchronous writer of the llm_calls table
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, flush_seconds: Optional[float] = None):
+        self.batch_size = batch_size or settings.LLM_LEDGER_BATCH_SIZE
+        self.flush_seconds = flush_seconds or settings.LLM_LEDGER_FLUSH_SECONDS
+        self.written = 0
+        self.dropped = 0
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=settings.LLM_LEDGER_MAX_PENDING)
+        self._wake = threading.Event()
+        self._write_lock = threading.Lock()  # One writer at a time: the thread or flush()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(
+        self,
+        agent_type: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int = 0,
+        latency_ms: Optional[int] = None,
+        kind: str = "chat",
+        execution_id: Optional[int] = None,
+        cost_usd: Optional[float] = None
+    ) -> None:
+        """Queue a call for the ledger (never blocks, never raises)"""
+        if not settings.LLM_LEDGER_ENABLED:
+            return
+
+        if cost_usd is None:
+            cost_usd = calculate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
+        row = {
+            "execution_id": execution_id,
+            "agent_type": agent_type,
+            "model": model,
+            "kind": kind,
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens or 0,
+            "completion_tokens": completion_tokens,
+            "latency_ms": latency_ms,
+            "cost_usd": cost_usd,
+            "created_at": datetime.utcnow()
+        }
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning("LLM ledger queue full, dropping rows", dropped=self.dropped)
+            return
+
+        self._ensure_thread()
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write every queued row now; returns the number written"""
+        return self._drain()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="llm-ledger", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self._drain()
+            except Exception as e:  # Keep the writer alive
+                logger.error("LLM ledger writer error", error=str(e))
+
+    def _drain(self) -> int:
+        written = 0
+        with self._write_lock:
+            while True:
+                batch = self._take(self.batch_size)
+                if not batch:
+                    return written
+                written += self._write(batch)
+
+    def _take(self, limit: int) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[Dict[str, Any]]) -> int:
+        db = SessionLocal()
+        try:
+            LLMCallRepository(db).bulk_create(batch)
+            self.written += len(batch)
+            return len(batch)
+        except Exception as e:
+            db.rollback()
+            self.dropped += len(batch)
+            logger.warning("Failed to write LLM ledger batch", rows=len(batch), error=str(e))
+            return 0
+        finally:
+            db.close()
+
+
+_ledger: Optional[LLMLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger() -> LLMLedger:
+    """Process-wide ledger (flushed at interpreter exit)"""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = LLMLedger()
+                atexit.register(_ledger.flush)
+    return _ledger
+
+
+def cached_prompt_tokens(usage: Any) -> int:
+    """Prompt tokens served from the provider cache (usage.prompt_tokens_details.cached_tokens)"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    if isinstance(details, dict):
+        return int(details.get("cached_tokens") or 0)
+    return int(getattr(details, "cached_tokens", 0) or 0)
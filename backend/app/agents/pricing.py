@@ -0,0 +1,86 @@
+"""
+LLM Pricing
+Price table for cost accounting (USD per 1M tokens)
+
+Models are matched by longest prefix, so dated snapshots
+("gpt-4o-2024-08-06", "claude-opus-4-5-20251101") use their family's row.
+LLM_PRICES overrides or extends the table:
+
+    LLM_PRICES='{"gpt-4o": [2.5, 1.25, 10], "my-finetune": [3, 3, 12]}'
+
+Unknown models are priced at the most expensive row (and logged once), so
+they are over- rather than under-counted by budgets.
+"""
+
+from typing import Dict, Tuple
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# model prefix -> (input, cached input, output)
+DEFAULT_PRICES: Dict[str, Tuple[float, float, float]] = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4-turbo": (10.00, 10.00, 30.00),
+    "gpt-4": (30.00, 30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 0.50, 1.50),
+    "text-embedding-3-small": (0.02, 0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.13, 0.0),
+    "text-embedding-ada-002": (0.10, 0.10, 0.0),
+    "claude-opus-4-5": (5.00, 0.50, 25.00),
+    "claude-opus-4": (15.00, 1.50, 75.00),
+    "claude-sonnet-4": (3.00, 0.30, 15.00),
+    "claude-3-opus": (15.00, 1.50, 75.00),
+    "claude-3-5-sonnet": (3.00, 0.30, 15.00),
+    "claude-3-5-haiku": (0.80, 0.08, 4.00),
+    "claude-3-haiku": (0.25, 0.03, 1.25),
+}
+
+_warned_models = set()
+
+
+def price_table() -> Dict[str, Tuple[float, float, float]]:
+    """Default prices merged with LLM_PRICES overrides"""
+    table = dict(DEFAULT_PRICES)
+    for model, prices in settings.LLM_PRICES.items():
+        prices = list(prices)
+        if len(prices) == 2:  # [input, output]: no cache discount
+            prices = [prices[0], prices[0], prices[1]]
+        table[model] = tuple(float(p) for p in prices[:3])
+    return table
+
+
+def get_price(model: str) -> Tuple[float, float, float]:
+    """(input, cached input, output) USD per 1M tokens for a model"""
+    table = price_table()
+    matches = [prefix for prefix in table if model == prefix or model.startswith(prefix)]
+    if matches:
+        return table[max(matches, key=len)]
+
+    if model not in _warned_models:
+        _warned_models.add(model)
+        logger.warning("No price for LLM model, using the highest known price", model=model)
+    return max(table.values(), key=lambda p: p[0] + p[2])
+
+
+def calculate_cost(
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    cached_tokens: int = 0
+) -> float:
+    """
+    USD cost of one call (not rounded)
+
+    Args:
+        cached_tokens: Part of prompt_tokens served from the provider's prompt cache
+    """
+    input_price, cached_price, output_price = get_price(model)
+    cached_tokens = min(cached_tokens or 0, prompt_tokens)
+    return (
+        (prompt_tokens - cached_tokens) * input_price
+        + cached_tokens * cached_price
+        + completion_tokens * output_price
+    ) / 1_000_000
@@ -0,0 +1,318 @@
+"""
+LLM Resilience
+Retries, hedging and circuit breaking for LLM provider calls
+
+- Retry: transient failures (429, 408/409, 5xx, timeouts, connection
+  errors) are retried LLM_RETRY_ATTEMPTS times with full-jitter exponential
+  backoff; Retry-After / retry-after-ms from the provider wins when present.
+  The SDK clients have their own retries turned off (see app.agents.clients),
+  so this is the only retry loop.
+- Hedging (async, idempotent calls): if a call is still running after the
+  LLM_HEDGE_QUANTILE latency of recent calls of the same model and size, a
+  duplicate is sent and the first answer wins; the other is cancelled.
+  The provider usually bills the cancelled one anyway, so callers pass
+  `on_hedge` to account for it. No hedging until LLM_HEDGE_MIN_SAMPLES
+  latencies are known.
+- Circuit breaker per model: LLM_BREAKER_FAILURES consecutive transient
+  failures open it; calls then fail fast with CircuitOpenError for
+  LLM_BREAKER_COOLDOWN_SECONDS, after which one probe call is let through.
+
+Failover to another provider is decided by the caller (BaseAgent) on
+`should_failover(error)`.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504, 529}
+# Timeout / connection errors of the OpenAI and Anthropic SDKs (same class names)
+TRANSIENT_ERRORS = {"APITimeoutError", "APIConnectionError", "TimeoutException", "TransportError", "TimeoutError"}
+
+
+class CircuitOpenError(Exception):
+    """The model's circuit is open: recent calls kept failing"""
+
+    def __init__(self, model: str, retry_in: float):
+        super().__init__(f"Circuit open for {model}, retry in {retry_in:.0f}s")
+        self.model = model
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker (closed -> open -> half-open -> closed)
+
+    Thread-safe: sync agents in job-queue threads and async agents share it.
+    """
+
+    def __init__(self, model: str, failures: Optional[int] = None, cooldown: Optional[float] = None):
+        self.model = model
+        self.max_failures = failures or settings.LLM_BREAKER_FAILURES
+        self.cooldown = cooldown or settings.LLM_BREAKER_COOLDOWN_SECONDS
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        """
+        Raises:
+            CircuitOpenError: While open, or while the half-open probe is running
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+        raise CircuitOpenError(self.model, retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info("LLM circuit closed", model=self.model)
+            self.failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            probe_failed = self._probe_in_flight
+            self._probe_in_flight = False
+            if probe_failed or (self.opened_at is None and self.failures >= self.max_failures):
+                self.opened_at = time.monotonic()
+                logger.warning("LLM circuit opened", model=self.model, failures=self.failures, cooldown=self.cooldown)
+
+    def release_probe(self) -> None:
+        """The probe ended without a verdict (e.g. a 400 or a cancelled hedge)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"model": self.model, "state": self.state, "failures": self.failures}
+
+
+class LatencyTracker:
+    """Recent call latencies per (model, size bucket) for the hedge delay"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[Tuple[str, int], Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bucket(max_tokens: int) -> int:
+        """Power-of-two bucket of max_tokens: long answers take longer"""
+        return max(1, int(max_tokens or 1)).bit_length()
+
+    def add(self, model: str, max_tokens: int, seconds: float) -> None:
+        key = (model, self.bucket(max_tokens))
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def hedge_delay(self, model: str, max_tokens: int) -> Optional[float]:
+        """Seconds after which to send a duplicate (None: not enough samples)"""
+        with self._lock:
+            samples = sorted(self._samples.get((model, self.bucket(max_tokens)), ()))
+        if len(samples) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * settings.LLM_HEDGE_QUANTILE))
+        return max(settings.LLM_HEDGE_MIN_DELAY_SECONDS, samples[index])
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+latencies = LatencyTracker()
+
+
+def get_breaker(model: str) -> CircuitBreaker:
+    """Process-wide breaker of a model"""
+    breaker = _breakers.get(model)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(model, CircuitBreaker(model))
+    return breaker
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    return {model: breaker.to_dict() for model, breaker in list(_breakers.items())}
+
+
+def is_transient(error: BaseException) -> bool:
+    """True for rate limits, overload, server errors, timeouts and dropped connections"""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRY_STATUSES
+    return any(cls.__name__ in TRANSIENT_ERRORS for cls in type(error).__mro__)
+
+
+def should_failover(error: BaseException) -> bool:
+    """Worth trying another provider: the circuit is open or retries ran out on transient errors"""
+    return isinstance(error, CircuitOpenError) or is_transient(error)
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds from the provider's retry-after-ms / Retry-After header, if any"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def backoff_delay(attempt: int, error: Optional[BaseException] = None) -> float:
+    """Full-jitter backoff; the provider's Retry-After wins when present (both capped)"""
+    cap = settings.LLM_RETRY_BACKOFF_MAX
+    hinted = retry_after(error) if error is not None else None
+    if hinted is not None:
+        return min(hinted, cap)
+    return random.uniform(0, min(cap, settings.LLM_RETRY_BACKOFF_BASE * (2 ** attempt)))
+
+
+async def acall(
+    model: str,
+    send: Callable[[], Awaitable[T]],
+    max_tokens: int = 0,
+    hedge: bool = False,
+    on_hedge: Optional[Callable[[], None]] = None
+) -> T:
+    """
+    Run an async provider call with the breaker, retries and (optionally) hedging
+
+    Args:
+        model: Breaker / latency key
+        send: Makes one request (called again for every retry and hedge)
+        max_tokens: Answer size, for the hedge delay
+        hedge: The call is idempotent and may be duplicated
+        on_hedge: Called each time a duplicate request is sent
+
+    Raises:
+        CircuitOpenError: The model's circuit is open
+        Exception: The last error once retries are exhausted, or a non-transient one
+    """
+    breaker = get_breaker(model)
+    attempts = max(1, settings.LLM_RETRY_ATTEMPTS)
+
+    for attempt in range(attempts):
+        breaker.before_call()
+        started = time.monotonic()
+        try:
+            delay = latencies.hedge_delay(model, max_tokens) if hedge and settings.LLM_HEDGE_ENABLED else None
+            result = await (_hedged(send, delay, model, on_hedge) if delay is not None else send())
+        except asyncio.CancelledError:
+            breaker.release_probe()
+            raise
+        except Exception as e:
+            if not is_transient(e):
+                breaker.release_probe()
+                raise
+            breaker.record_failure()
+            if attempt == attempts - 1 or breaker.state != "closed":
+                raise
+            wait = backoff_delay(attempt, e)
+            logger.warning("LLM call retry", model=model, attempt=attempt + 1, delay=round(wait, 2), error=str(e))
+            await asyncio.sleep(wait)
+            continue
+
+        breaker.record_success()
+        latencies.add(model, max_tokens, time.monotonic() - started)
+        return result
+
+
+def call(model: str, send: Callable[[], T], max_tokens: int = 0) -> T:
+    """
+    Sync variant of acall (no hedging)
+    """
+    breaker = get_breaker(model)
+    attempts = max(1, settings.LLM_RETRY_ATTEMPTS)
+
+    for attempt in range(attempts):
+        breaker.before_call()
+        started = time.monotonic()
+        try:
+            result = send()
+        except Exception as e:
+            if not is_transient(e):
+                breaker.release_probe()
+                raise
+            breaker.record_failure()
+            if attempt == attempts - 1 or breaker.state != "closed":
+                raise
+            wait = backoff_delay(attempt, e)
+            logger.warning("LLM call retry", model=model, attempt=attempt + 1, delay=round(wait, 2), error=str(e))
+            time.sleep(wait)
+            continue
+
+        breaker.record_success()
+        latencies.add(model, max_tokens, time.monotonic() - started)
+        return result
+
+
+async def _hedged(
+    send: Callable[[], Awaitable[T]],
+    delay: float,
+    model: str,
+    on_hedge: Optional[Callable[[], None]] = None
+) -> T:
+    """First successful answer of the call and (after `delay`) one duplicate"""
+    primary = asyncio.ensure_future(send())
+    done, _ = await asyncio.wait({primary}, timeout=delay)
+    if done:
+        return primary.result()
+
+    logger.info("LLM hedged request sent", model=model, after_seconds=round(delay, 2))
+    pending = {primary, asyncio.ensure_future(send())}
+    if on_hedge is not None:
+        on_hedge()
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
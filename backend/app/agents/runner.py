@@ -1,19 +1,79 @@
 """
 Agent Runner
-Simple runner for executing AI agents (temporary until Celery is set up)
+Creates and runs AI agents (inline; see job_queue for background runs)
+
+Agents are built by factories in AGENT_REGISTRY. Expensive clients are
+pooled (OpenAI per process in app.agents.clients, PRAW per thread in
+get_reddit_client), so a factory call only creates per-run state: the DB
+session wrappers and token/cost counters.
 """
 
-import asyncio
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
 from sqlalchemy.orm import Session
 import structlog
 
+from app.agents.base_agent import BaseAgent
 from app.agents.trend_scout_agent import TrendScoutAgent
 from app.agents.idea_analyst_agent import IdeaAnalystAgent
 from app.modules.agents.models import AgentExecution
 
 logger = structlog.get_logger()
 
+AgentFactory = Callable[[Session], BaseAgent]
+
+# agent_type -> factory(db) -> agent
+AGENT_REGISTRY: Dict[str, AgentFactory] = {}
+
+PLANNED_AGENTS = {
+    "dev_agent": "DevAgent",
+    "marketing_agent": "MarketingAgent",
+    "sales_agent": "SalesAgent",
+}
+
+
+def register_agent(agent_type: str, factory: Optional[AgentFactory] = None):
+    """
+    Register an agent factory (an agent class works as one)
+
+    Usable directly or as a class decorator:
+        register_agent("trend_scout", TrendScoutAgent)
+
+        @register_agent("dev_agent")
+        class DevAgent(BaseAgent): ...
+    """
+    def register(factory: AgentFactory) -> AgentFactory:
+        AGENT_REGISTRY[agent_type] = factory
+        PLANNED_AGENTS.pop(agent_type, None)
+        return factory
+
+    return register(factory) if factory is not None else register
+
+
+register_agent("trend_scout", TrendScoutAgent)
+register_agent("idea_analyst", IdeaAnalystAgent)
+
+
+def warm_up_agents() -> None:
+    """
+    Create the pooled clients ahead of the first run (blocking; call off-loop)
+
+    Reddit authentication is a network round trip; a failure here is only
+    logged and retried by the first run that needs Reddit.
+    """
+    from app.agents.clients import get_openai_client
+    from app.scrapers.base_scraper import ScraperError
+    from app.scrapers.reddit_scraper import get_reddit_client
+    from app.scrapers.taxonomy import get_matcher
+
+    get_openai_client()
+    get_matcher()
+    try:
+        get_reddit_client()
+    except ScraperError as e:
+        logger.warning("Reddit client not warmed up", error=str(e))
+
+    logger.info("Agent clients warmed up", agents=list(AGENT_REGISTRY))
+
 
 async def run_agent_async(
     db: Session,
@@ -40,19 +100,7 @@ async def run_agent_async(
         params=params
     )
 
-    # Create appropriate agent
-    if agent_type == "trend_scout":
-        agent = TrendScoutAgent(db)
-    elif agent_type == "idea_analyst":
-        agent = IdeaAnalystAgent(db)
-    elif agent_type == "dev_agent":
-        raise NotImplementedError("DevAgent not yet implemented")
-    elif agent_type == "marketing_agent":
-        raise NotImplementedError("MarketingAgent not yet implemented")
-    elif agent_type == "sales_agent":
-        raise NotImplementedError("SalesAgent not yet implemented")
-    else:
-        raise ValueError(f"Unknown agent type: {agent_type}")
+    agent = create_agent(db, agent_type)
 
     # Run the agent
     execution = await agent.run(params)
@@ -60,6 +108,33 @@ async def run_agent_async(
     return execution
 
 
+def create_agent(db: Session, agent_type: str) -> BaseAgent:
+    """
+    Create an agent instance by type
+
+    Raises:
+        NotImplementedError: If the agent type is planned but not implemented
+        ValueError: If agent_type is not supported
+    """
+    check_agent_type(agent_type)
+    return AGENT_REGISTRY[agent_type](db)
+
+
+def check_agent_type(agent_type: str) -> None:
+    """
+    Validate an agent type without instantiating the agent
+
+    Raises:
+        NotImplementedError: If the agent type is planned but not implemented
+        ValueError: If agent_type is not supported
+    """
+    if agent_type in AGENT_REGISTRY:
+        return
+    if agent_type in PLANNED_AGENTS:
+        raise NotImplementedError(f"{PLANNED_AGENTS[agent_type]} not yet implemented")
+    raise ValueError(f"Unknown agent type: {agent_type}")
+
+
 def run_agent_sync(
     db: Session,
     agent_type: str,
@@ -78,4 +153,6 @@ def run_agent_sync(
     Returns:
         AgentExecution record with results
     """
-    return asyncio.run(run_agent_async(db, agent_type, params))
+    from app.scrapers.runtime import run_with_runtime
+
+    return run_with_runtime(run_agent_async(db, agent_type, params))
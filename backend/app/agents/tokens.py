@@ -0,0 +1,58 @@
+"""
+Token Counting
+Local token counts for prompts and streamed answers
+
+Uses tiktoken (the OpenAI tokenizer, installed with langchain-openai) when
+available; otherwise falls back to ~4 characters per token, which is close
+enough for budgeting English and slightly low for Cyrillic text.
+"""
+
+import math
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+
+@lru_cache(maxsize=16)
+def _encoding(model: Optional[str]):
+    """
+    tiktoken encoding for a model, or None to use the estimate
+
+    Counting must never fail a call: a model unknown to the installed
+    tiktoken (gpt-4o needs o200k_base, added in tiktoken 0.7) falls back to
+    cl100k_base, and an encoding that cannot be loaded (e.g. no network to
+    fetch the BPE file) falls back to the estimate.
+    """
+    if tiktoken is None:
+        return None
+    if model:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except Exception:
+            pass
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return math.ceil(len(text or "") / 4)
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Token count of a text for a model (tiktoken, or the estimate)"""
+    encoding = _encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text or "", disallowed_special=()))
+
+
+def count_message_tokens(messages: List[Dict[str, Any]], model: Optional[str] = None) -> int:
+    """Prompt tokens of a chat request (content plus ~4 tokens per message)"""
+    return sum(count_tokens(str(m.get("content") or ""), model) + 4 for m in messages) + 2
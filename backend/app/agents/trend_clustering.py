@@ -0,0 +1,100 @@
+"""
+Trend Clustering
+Collapses near-duplicate trends before LLM analysis
+
+Trends are embedded once, then grouped with a vectorised greedy
+agglomerative pass over the cosine-similarity matrix: the most engaging
+unassigned trend becomes a cluster representative and absorbs every
+unassigned trend above the similarity threshold. Only representatives are
+sent to the expensive analysis step, so LLM calls scale with the number of
+topics rather than the number of posts.
+"""
+
+from typing import List, Dict, Any, Sequence
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+
+def trend_text(trend) -> str:
+    """Text used to embed a trend (title + short description)"""
+    description = (trend.description or "")[:500]
+    return f"{trend.title}\n{description}".strip()
+
+
+def cluster_embeddings(
+    embeddings: np.ndarray,
+    weights: Sequence[float],
+    threshold: float
+) -> np.ndarray:
+    """
+    Group rows of `embeddings` by cosine similarity
+
+    Args:
+        embeddings: (n, d) matrix, one row per item
+        weights: Priority of each item; heavier items become representatives first
+        threshold: Minimum cosine similarity to join a representative's cluster
+
+    Returns:
+        Array of length n with the index of each item's representative
+    """
+    n = embeddings.shape[0]
+    if n == 0:
+        return np.empty(0, dtype=int)
+
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    unit = embeddings / np.maximum(norms, 1e-12)
+    similarity = unit @ unit.T
+
+    labels = np.full(n, -1, dtype=int)
+    for idx in np.argsort(-np.asarray(weights, dtype=float), kind="stable"):
+        if labels[idx] != -1:
+            continue
+        members = (labels == -1) & (similarity[idx] >= threshold)
+        members[idx] = True
+        labels[members] = idx
+
+    return labels
+
+
+def cluster_trends(
+    trends: List[Any],
+    embeddings: np.ndarray,
+    threshold: float
+) -> List[Dict[str, Any]]:
+    """
+    Cluster trends and pick one representative per cluster
+
+    Args:
+        trends: Trend objects (need engagement_score)
+        embeddings: (len(trends), d) embedding matrix
+        threshold: Cosine similarity threshold
+
+    Returns:
+        Clusters ordered by combined engagement:
+        [{"representative": trend, "members": [trend, ...], "combined_engagement": int}]
+    """
+    weights = [t.engagement_score or 0 for t in trends]
+    labels = cluster_embeddings(embeddings, weights, threshold)
+
+    clusters: Dict[int, Dict[str, Any]] = {}
+    for trend, label in zip(trends, labels):
+        cluster = clusters.setdefault(int(label), {
+            "representative": trends[int(label)],
+            "members": [],
+            "combined_engagement": 0
+        })
+        cluster["members"].append(trend)
+        cluster["combined_engagement"] += trend.engagement_score or 0
+
+    result = sorted(clusters.values(), key=lambda c: c["combined_engagement"], reverse=True)
+
+    logger.info(
+        "Trends clustered",
+        trends=len(trends),
+        clusters=len(result),
+        threshold=threshold
+    )
+
+    return result
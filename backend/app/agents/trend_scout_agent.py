@@ -5,17 +5,28 @@ Discovers emerging AI trends from various data sources
 🎯 ФОКУС: AI-помощники, AI-агенты, автоматизация
 """
 
-from typing import Dict, Any, List
+import asyncio
+from contextlib import aclosing
+from datetime import date
+from typing import Dict, Any, List, AsyncIterator, Optional, Tuple
 import structlog
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.agents.base_agent import BaseAgent
 from app.modules.trends.service import TrendService
-from app.modules.trends.schemas import TrendCreate
+from app.modules.trends.schemas import TrendCreate, TrendSnapshotCreate
+from app.scrapers import archive
+from app.scrapers.base_scraper import BaseScraper
 from app.scrapers.reddit_scraper import RedditScraper
+from app.scrapers.hackernews_scraper import HackerNewsScraper
+from app.scrapers.producthunt_scraper import ProductHuntScraper
+from app.scrapers.pipeline import StreamingPipeline, merge_streams
 
 logger = structlog.get_logger()
 
+
 # AI-focused subreddits for trend discovery
 AI_SUBREDDITS = [
     "MachineLearning",
@@ -38,6 +49,23 @@ AI_KEYWORDS = [
     "нейросеть", "искусственный интеллект",
 ]
 
+# Hacker News search queries
+HN_QUERIES = ["AI agent", "AI assistant", "LLM", "GPT", "automation", "Show HN AI"]
+
+# Product Hunt topics (slugs)
+PH_TOPICS = ["artificial-intelligence", "productivity", "developer-tools", "saas", "no-code"]
+
+
+async def _apply_stages(items: AsyncIterator[Any], stages: List[Tuple[str, Any]]) -> AsyncIterator[Any]:
+    """Run each item through sync stages in order; a None result drops the item"""
+    async for item in items:
+        for _, fn in stages:
+            item = fn(item)
+            if item is None:
+                break
+        else:
+            yield item
+
 
 class TrendScoutAgent(BaseAgent):
     """
@@ -52,7 +80,7 @@ class TrendScoutAgent(BaseAgent):
     Data sources:
     - Reddit (AI & startup subreddits)
     - Google Trends (AI keywords)
-    - Product Hunt (AI category)
+    - Product Hunt (AI & productivity topics)
     - Hacker News (AI news)
     - Twitter/X (AI discussions)
     - Telegram channels (AI news RU)
@@ -67,16 +95,27 @@ class TrendScoutAgent(BaseAgent):
     6. Store in database
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, offline: bool = False):
+        """
+        Args:
+            db: Database session
+            offline: Build no live clients (no Reddit login); for reprocess_archive
+        """
         super().__init__(db, agent_type="trend_scout")
         self.trend_service = TrendService(db)
 
         # Initialize scrapers
-        try:
-            self.reddit_scraper = RedditScraper()
-        except Exception as e:
-            logger.warning(f"Reddit scraper initialization failed: {e}")
-            self.reddit_scraper = None
+        self.reddit_scraper = None
+        if not offline:
+            try:
+                self.reddit_scraper = RedditScraper()
+            except Exception as e:
+                logger.warning(f"Reddit scraper initialization failed: {e}")
+
+        # Public API, no credentials needed
+        self.hackernews_scraper = HackerNewsScraper()
+        # Needs PRODUCTHUNT_API_TOKEN; without it the source reports an error
+        self.producthunt_scraper = ProductHuntScraper()
 
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -84,10 +123,13 @@ class TrendScoutAgent(BaseAgent):
 
         Input:
             {
-                "sources": ["reddit", "google_trends", ...],
+                "sources": ["reddit", "hackernews", "product_hunt", "google_trends", ...],
                 "limit": 100,
                 "subreddits": ["SideProject", "startups"],  # for reddit
-                "keywords": ["AI", "SaaS"]  # for google trends
+                "queries": ["AI agent", "LLM"],  # for hackernews
+                "topics": ["artificial-intelligence"],  # for product_hunt
+                "keywords": ["AI", "SaaS"],  # for google trends
+                "source_timeout": 120  # seconds per source
             }
 
         Output:
@@ -95,7 +137,12 @@ class TrendScoutAgent(BaseAgent):
                 "trends_discovered": 156,
                 "trends_stored": 142,
                 "duplicates_filtered": 14,
-                "breakdown_by_source": {"reddit": 89, "google_trends": 67}
+                "breakdown_by_source": {
+                    "reddit": {"discovered": 89, "status": "ok", "seconds": 4.2},
+                    "google_trends": {"discovered": 0, "status": "timeout", "seconds": 120.0,
+                                      "error": "timed out after 120s"}
+                },
+                "failed_sources": ["google_trends"]
             }
         """
         sources = input_data.get("sources", ["reddit"])
@@ -107,43 +154,47 @@ class TrendScoutAgent(BaseAgent):
             limit=limit
         )
 
-        trends_discovered = []
-        breakdown = {}
+        self.emit("stage", stage="discovery", sources=sources)
 
-        # Process each source
+        # All sources run concurrently and feed one shared dedup + batched-write stage,
+        # so total latency is that of the slowest source
+        report: Dict[str, Dict[str, Any]] = {}
+        streams = {}
         for source in sources:
-            if source == "reddit":
-                source_trends = await self._discover_from_reddit(input_data)
-            elif source == "google_trends":
-                source_trends = await self._discover_from_google_trends(input_data)
-            else:
+            stream = self._source_trends(source, input_data)
+            if stream is None:
                 logger.warning(f"Unsupported source: {source}")
+                report[source] = {"status": "unsupported", "items": 0}
                 continue
-
-            trends_discovered.extend(source_trends)
-            breakdown[source] = len(source_trends)
-
-        # Store trends in database
-        trends_stored = 0
-        duplicates_filtered = 0
-
-        for trend_data in trends_discovered:
-            # TrendService handles duplicate detection
-            trend = self.trend_service.create_trend(trend_data)
-
-            # Check if it was a duplicate (same ID returned)
-            existing_count = len([t for t in trends_discovered[:trends_discovered.index(trend_data)]
-                                 if t.title == trend_data.title])
-            if existing_count > 0:
-                duplicates_filtered += 1
-            else:
-                trends_stored += 1
+            streams[source] = stream
+
+        counts = await self._ingest(
+            merge_streams(
+                streams,
+                timeout=input_data.get("source_timeout", settings.TREND_SOURCE_TIMEOUT_SECONDS),
+                queue_size=settings.INGEST_QUEUE_SIZE,
+                report=report
+            ),
+            [],
+            seen=set()
+        )
 
         output = {
-            "trends_discovered": len(trends_discovered),
-            "trends_stored": trends_stored,
-            "duplicates_filtered": duplicates_filtered,
-            "breakdown_by_source": breakdown
+            "trends_discovered": counts["discovered"],
+            "trends_stored": counts["stored"],
+            "duplicates_filtered": counts["duplicates"],
+            "snapshots_recorded": counts["snapshots"],
+            "breakdown_by_source": {
+                source: {
+                    "discovered": entry["items"],
+                    **{k: v for k, v in entry.items() if k != "items"}
+                }
+                for source, entry in report.items()
+            },
+            "failed_sources": [
+                source for source, entry in report.items()
+                if entry["status"] in ("timeout", "error")
+            ]
         }
 
         logger.info(
@@ -153,69 +204,245 @@ class TrendScoutAgent(BaseAgent):
 
         return output
 
-    async def _discover_from_reddit(self, input_data: Dict[str, Any]) -> List[TrendCreate]:
+    def _source_trends(
+        self,
+        source: str,
+        input_data: Dict[str, Any]
+    ) -> Optional[AsyncIterator[TrendCreate]]:
+        """
+        Stream of TrendCreate for one source, or None if the source is not supported
+        """
+        if source == "reddit":
+            return self._reddit_trends(input_data)
+
+        if source == "hackernews":
+            items = self.hackernews_scraper.iter_raw({
+                "queries": input_data.get("queries", HN_QUERIES),
+                "limit": input_data.get("limit", 100),
+                "time_filter": input_data.get("time_filter", "week")
+            })
+            return _apply_stages(items, self._scraper_stages(self.hackernews_scraper))
+
+        if source == "product_hunt":
+            items = self.producthunt_scraper.iter_raw({
+                "topics": input_data.get("topics", PH_TOPICS),
+                "limit": input_data.get("limit", 100),
+                "time_filter": input_data.get("time_filter", "week")
+            })
+            return _apply_stages(items, self._scraper_stages(self.producthunt_scraper))
+
+        if source == "google_trends":
+            return self._discover_from_google_trends(input_data)
+
+        return None
+
+    async def _reddit_trends(self, input_data: Dict[str, Any]) -> AsyncIterator[TrendCreate]:
+        """Reddit stream, falling back to LLM generation if scraping is unavailable"""
+        if self.reddit_scraper:
+            produced = 0
+            try:
+                items, stages = self._discover_from_reddit(input_data)
+                async for trend in _apply_stages(items, stages):
+                    produced += 1
+                    yield trend
+                return
+            except Exception as e:
+                if produced:
+                    raise
+                logger.error(f"Reddit scraping failed: {e}")
+                logger.warning("Falling back to LLM generation")
+        else:
+            logger.warning("Reddit scraper not available, falling back to LLM generation")
+
+        async for trend in self._generate_reddit_trends_with_llm(input_data):
+            yield trend
+
+    async def reprocess_archive(
+        self,
+        source: str = "reddit",
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Re-run processing over archived raw payloads, without any network
+
+        Use after changing cleaning, categorisation or tagging logic: new
+        trends are created, existing ones get their category and tags
+        refreshed. No snapshots are recorded.
+
+        Args:
+            source: Archived scraper source ("reddit", "hackernews" or "product_hunt")
+            since: First UTC day to replay (inclusive)
+            until: Last UTC day to replay (inclusive)
+        """
+        if source == "reddit":
+            scraper = RedditScraper(offline=True)
+        elif source == "hackernews":
+            scraper = self.hackernews_scraper
+        elif source == "product_hunt":
+            scraper = self.producthunt_scraper
+        else:
+            raise ValueError(f"Archive replay is not supported for source: {source}")
+
+        counts = await self._ingest(
+            archive.replay(source, since=since, until=until),
+            self._scraper_stages(scraper),
+            seen=set(),
+            reprocess=True
+        )
+
+        logger.info("Archive reprocessed", source=source, **counts)
+
+        return counts
+
+    async def _ingest(
+        self,
+        items: AsyncIterator[Any],
+        stages: List[Tuple[str, Any]],
+        seen: set,
+        reprocess: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run items through source stages, then dedup and batched DB writes
+
+        Bounded queues between stages keep memory flat; the first batch is
+        written (on a worker thread) while the source is still producing. With `reprocess`,
+        existing trends are reclassified instead of snapshotted.
+        """
+        counts = {"discovered": 0, "stored": 0, "duplicates": 0, "snapshots": 0}
+
+        def dedup(trend: TrendCreate) -> Optional[TrendCreate]:
+            counts["discovered"] += 1
+            key = (trend.title, trend.url)
+            if key in seen:
+                counts["duplicates"] += 1
+                return None
+            seen.add(key)
+            return trend
+
+        def write(batch: List[TrendCreate]) -> int:
+            if reprocess:
+                results = self.trend_service.reclassify_trends_bulk(batch)
+            else:
+                results = self.trend_service.create_trends_bulk(batch)
+
+            snapshots = []
+            for trend_data, (trend_id, created) in zip(batch, results):
+                if created:
+                    counts["stored"] += 1
+                else:
+                    counts["duplicates"] += 1
+
+                # Re-scrapes of an existing trend add a point to its time-series
+                if not reprocess and "upvotes" in trend_data.metadata:
+                    snapshots.append(TrendSnapshotCreate(
+                        trend_id=trend_id,
+                        upvotes=max(trend_data.metadata.get("upvotes") or 0, 0),
+                        comments=trend_data.metadata.get("num_comments") or 0,
+                        awards=trend_data.metadata.get("awards") or 0
+                    ))
+
+            counts["snapshots"] += self.trend_service.record_snapshots(snapshots)
+
+            self.emit(
+                "trends_stored",
+                batch=len(batch),
+                stored=counts["stored"],
+                duplicates=counts["duplicates"]
+            )
+            return len(batch)
+
+        async def write_batch(batch: List[TrendCreate]) -> int:
+            # Bulk INSERT + commit run on a worker thread, off the event loop.
+            # A cancelled ingest (the pipeline may cancel more than once) still
+            # waits for the write in progress, so the Session is never used
+            # from two threads at once.
+            write_task = asyncio.ensure_future(asyncio.to_thread(write, batch))
+            cancelled = False
+            while not write_task.done():
+                try:
+                    await asyncio.wait({write_task})
+                except asyncio.CancelledError:
+                    cancelled = True
+            if cancelled:
+                write_task.exception()  # Retrieved: the cancellation wins
+                raise asyncio.CancelledError()
+            return write_task.result()
+
+        pipeline = StreamingPipeline(
+            stages=stages + [("dedup", dedup)],
+            sink=write_batch,
+            batch_size=settings.INGEST_BATCH_SIZE,
+            queue_size=settings.INGEST_QUEUE_SIZE,
+            flush_interval=settings.INGEST_FLUSH_SECONDS,
+            name="trend_ingest"
+        )
+        stats = await pipeline.run(items)
+
+        counts["first_write_seconds"] = stats["first_write_seconds"]
+        return counts
+
+    def _discover_from_reddit(
+        self,
+        input_data: Dict[str, Any]
+    ) -> Tuple[AsyncIterator[Dict[str, Any]], List[Tuple[str, Any]]]:
         """
         Discover AI-focused trends from Reddit
 
-        Uses PRAW to scrape hot posts from AI-related subreddits
+        Uses PRAW to scrape hot posts from AI-related subreddits.
+
+        Returns:
+            (raw post stream, processing stages that turn raw posts into TrendCreate)
         """
         subreddits = input_data.get("subreddits", AI_SUBREDDITS)
         limit = input_data.get("limit", 100)
         time_filter = input_data.get("time_filter", "week")
         sort = input_data.get("sort", "hot")
 
-        logger.info(
-            "Scraping Reddit",
-            subreddits=subreddits,
-            limit=limit,
-            sort=sort,
-            time_filter=time_filter
-        )
-
-        # Check if Reddit scraper is available
-        if not self.reddit_scraper:
-            logger.warning("Reddit scraper not available, falling back to LLM generation")
-            return await self._generate_reddit_trends_with_llm(input_data)
-
+        items = self.reddit_scraper.iter_raw({
+            "subreddits": subreddits,
+            "limit": limit,
+            "time_filter": time_filter,
+            "sort": sort
+        })
+
+        return items, self._scraper_stages(self.reddit_scraper)
+
+    def _scraper_stages(self, scraper: BaseScraper) -> List[Tuple[str, Any]]:
+        """Stages turning raw scraper payloads into TrendCreate (live or replayed)"""
+        return [
+            ("clean", scraper.clean_post),
+            ("validate", lambda post: post if scraper.validate_item(post) else None),
+            ("tag", scraper.tag_post),
+            ("to_trend", self._post_to_trend),
+        ]
+
+    def _post_to_trend(self, post: Dict[str, Any]) -> Optional[TrendCreate]:
+        """Convert a processed scraper post to TrendCreate (None if invalid)"""
         try:
-            # Scrape Reddit using PRAW
-            scraped_posts = await self.reddit_scraper.scrape({
-                "subreddits": subreddits,
-                "limit": limit,
-                "time_filter": time_filter,
-                "sort": sort
-            })
+            return TrendCreate(
+                title=post["title"],
+                description=post["description"],
+                url=post["url"],
+                source=post["source"],
+                category=post["category"],
+                tags=post["tags"],
+                engagement_score=max(post["engagement_score"], 0),
+                velocity=post["velocity"],
+                metadata=post["metadata"]
+            )
+        except ValidationError as e:
+            logger.debug("Skipping invalid post", title=post.get("title"), error=str(e))
+            return None
 
-            # Convert scraped posts to TrendCreate objects
-            trends = []
-            for post in scraped_posts:
-                trend = TrendCreate(
-                    title=post["title"],
-                    description=post["description"],
-                    url=post["url"],
-                    source=post["source"],
-                    category=post["category"],
-                    tags=post["tags"],
-                    engagement_score=post["engagement_score"],
-                    velocity=post["velocity"],
-                    metadata=post["metadata"]
-                )
-                trends.append(trend)
-
-            logger.info(f"Scraped {len(trends)} trends from Reddit")
-            return trends
-
-        except Exception as e:
-            logger.error(f"Reddit scraping failed: {e}")
-            # Fallback to LLM generation
-            logger.warning("Falling back to LLM generation")
-            return await self._generate_reddit_trends_with_llm(input_data)
-
-    async def _generate_reddit_trends_with_llm(self, input_data: Dict[str, Any]) -> List[TrendCreate]:
+    async def _generate_reddit_trends_with_llm(self, input_data: Dict[str, Any]) -> AsyncIterator[TrendCreate]:
         """
         Generate AI-focused trends using LLM
 
         🎯 ФОКУС: AI-помощники и агенты для решения реальных проблем
+
+        The answer is streamed: each trend goes to the ingest pipeline as soon
+        as its JSON object is complete.
         """
         subreddits = input_data.get("subreddits", AI_SUBREDDITS)
         limit = input_data.get("limit", 100)
@@ -270,7 +497,8 @@ class TrendScoutAgent(BaseAgent):
         ВСЕ НАЗВАНИЯ И ОПИСАНИЯ НА РУССКОМ ЯЗЫКЕ!
         """
 
-        response = self.call_llm(
+        produced = 0
+        stream = self.astream_llm_json(
             messages=[
                 {
                     "role": "system",
@@ -287,38 +515,35 @@ class TrendScoutAgent(BaseAgent):
             temperature=0.7,
             json_mode=True
         )
-
-        import json
-        trends_data = json.loads(response["content"])
-
-        # Handle different response formats
-        trend_list = trends_data if isinstance(trends_data, list) else trends_data.get("trends", trends_data.get("items", []))
-
-        trends = []
-        for trend in trend_list[:limit]:
-            trends.append(
-                TrendCreate(
-                    title=trend["title"],
-                    description=trend["description"],
-                    source="reddit",
-                    category=trend["category"],
-                    tags=trend["tags"],
-                    engagement_score=trend["engagement_score"],
-                    url=f"https://reddit.com/r/{subreddits[0]}/",
-                    metadata={
-                        "subreddit": subreddits[0],
-                        "generated": True  # LLM-generated fallback
-                    }
-                )
-            )
-
-        return trends
-
-    async def _discover_from_google_trends(self, input_data: Dict[str, Any]) -> List[TrendCreate]:
+        async with aclosing(stream):
+            async for trend in stream:
+                try:
+                    trend_data = TrendCreate(
+                        title=trend["title"],
+                        description=trend["description"],
+                        source="reddit",
+                        category=trend["category"],
+                        tags=trend["tags"],
+                        engagement_score=trend["engagement_score"],
+                        url=f"https://reddit.com/r/{subreddits[0]}/",
+                        metadata={
+                            "subreddit": subreddits[0],
+                            "generated": True  # LLM-generated fallback
+                        }
+                    )
+                except (KeyError, ValidationError) as e:
+                    logger.debug("Skipping invalid generated trend", error=str(e))
+                    continue
+                produced += 1
+                yield trend_data
+                if produced >= limit:
+                    break
+
+    async def _discover_from_google_trends(self, input_data: Dict[str, Any]) -> AsyncIterator[TrendCreate]:
         """
         Discover trends from Google Trends
 
-        Uses pytrends to get trending searches
+        Uses pytrends to get trending searches (streamed like the LLM fallback)
         """
         keywords = input_data.get("keywords", ["AI", "SaaS", "startup"])
         limit = input_data.get("limit", 50)
@@ -341,7 +566,8 @@ class TrendScoutAgent(BaseAgent):
         Focus on emerging trends with business potential.
         """
 
-        response = self.call_llm(
+        produced = 0
+        stream = self.astream_llm_json(
             messages=[
                 {"role": "system", "content": "You are a Google Trends analysis expert."},
                 {"role": "user", "content": prompt}
@@ -350,28 +576,25 @@ class TrendScoutAgent(BaseAgent):
             temperature=0.7,
             json_mode=True
         )
-
-        import json
-        trends_data = json.loads(response["content"])
-
-        # Handle different response formats
-        trend_list = trends_data if isinstance(trends_data, list) else trends_data.get("trends", trends_data.get("items", []))
-
-        trends = []
-        for trend in trend_list[:limit]:
-            trends.append(
-                TrendCreate(
-                    title=trend["title"],
-                    description=trend["description"],
-                    source="google_trends",
-                    category=trend.get("category", "tech"),
-                    tags=trend.get("tags", []),
-                    velocity=trend.get("velocity", 0.5),
-                    metadata={
-                        "keywords": keywords,
-                        "generated": True  # Placeholder until real scraper
-                    }
-                )
-            )
-
-        return trends
+        async with aclosing(stream):
+            async for trend in stream:
+                try:
+                    trend_data = TrendCreate(
+                        title=trend["title"],
+                        description=trend["description"],
+                        source="google_trends",
+                        category=trend.get("category", "tech"),
+                        tags=trend.get("tags", []),
+                        velocity=trend.get("velocity", 0.5),
+                        metadata={
+                            "keywords": keywords,
+                            "generated": True  # Placeholder until real scraper
+                        }
+                    )
+                except (KeyError, ValidationError) as e:
+                    logger.debug("Skipping invalid generated trend", error=str(e))
+                    continue
+                produced += 1
+                yield trend_data
+                if produced >= limit:
+                    break
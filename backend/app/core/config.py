@@ -3,10 +3,22 @@ Application Configuration
 Loads settings from environment variables
 """
 
-from typing import List
+from typing import Callable, Dict, List, TypeVar
 from pydantic_settings import BaseSettings
 from pydantic import validator
 
+T = TypeVar("T")
+
+
+def _parse_mapping(value: str, cast: Callable[[str], T]) -> Dict[str, T]:
+    """Parse a "key=value,key=value" setting; entries without a key or value are skipped"""
+    mapping = {}
+    for item in value.split(","):
+        key, _, raw = item.partition("=")
+        if key.strip() and raw.strip():
+            mapping[key.strip()] = cast(raw.strip())
+    return mapping
+
 
 class Settings(BaseSettings):
     """
@@ -37,6 +49,7 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4o"
     OPENAI_EMBEDDING_MODEL: str = "text-embedding-3-small"
+    OPENAI_BASE_URL: str = ""  # OpenAI-compatible endpoint, e.g. fakes/llm_server.py; empty = api.openai.com
 
     # Anthropic (Optional - Fallback)
     ANTHROPIC_API_KEY: str = ""
@@ -76,12 +89,134 @@ class Settings(BaseSettings):
     ENABLE_BATCH_EMBEDDINGS: bool = True
     ENABLE_PROMPT_CACHING: bool = True
 
+    # Agent job queue (in-process workers over agent_executions)
+    JOB_QUEUE_ENABLED: bool = True  # Run workers in this API process
+    JOB_WORKERS: int = 4  # Max concurrent agent runs per process
+    JOB_CONCURRENCY: str = "trend_scout=1,idea_analyst=2"  # agent_type=max,...
+    JOB_DEFAULT_CONCURRENCY: int = 1
+    JOB_POLL_SECONDS: float = 5.0  # Poll for jobs queued by other processes + heartbeat
+    JOB_STALE_SECONDS: int = 300  # Requeue running jobs without a heartbeat this long
+    JOB_STOP_TIMEOUT_SECONDS: float = 60.0  # Max wait for in-flight jobs on shutdown
+
+    @property
+    def job_concurrency(self) -> Dict[str, int]:
+        """Parse JOB_CONCURRENCY into {agent_type: max concurrent jobs}"""
+        return _parse_mapping(self.JOB_CONCURRENCY, int)
+
+    # LLM budgets (checked before every agent LLM call)
+    LLM_BUDGET_ENABLED: bool = True
+    LLM_BUDGET_EXECUTION_USD: float = 2.0  # Per agent execution (input "budget_usd" overrides)
+    LLM_BUDGET_DAILY_USD: float = 20.0  # All agents, per UTC day; 0 = unlimited
+    LLM_BUDGET_AGENT_DAILY_USD: str = "trend_scout=5,idea_analyst=10"  # agent_type=usd,... per UTC day
+    LLM_BUDGET_DEGRADE_RATIO: float = 0.8  # Past this share of a budget, use the cheaper model
+    LLM_DEGRADE_MODELS: str = "gpt-4o=gpt-4o-mini,gpt-4-turbo=gpt-4o-mini,gpt-3.5-turbo=gpt-4o-mini"  # model=cheaper,...
+
+    @property
+    def llm_budget_agent_daily(self) -> Dict[str, float]:
+        """Parse LLM_BUDGET_AGENT_DAILY_USD into {agent_type: usd per day}"""
+        return _parse_mapping(self.LLM_BUDGET_AGENT_DAILY_USD, float)
+
+    @property
+    def llm_degrade_models(self) -> Dict[str, str]:
+        """Parse LLM_DEGRADE_MODELS into {model: cheaper model}"""
+        return _parse_mapping(self.LLM_DEGRADE_MODELS, str)
+
+    # LLM cost accounting (see app.agents.pricing / app.agents.ledger)
+    LLM_PRICES: Dict[str, List[float]] = {}  # JSON {"model-prefix": [input, cached_input, output]} USD per 1M tokens
+    LLM_LEDGER_ENABLED: bool = True  # One llm_calls row per call
+    LLM_LEDGER_BATCH_SIZE: int = 100  # Rows per insert
+    LLM_LEDGER_FLUSH_SECONDS: float = 5.0  # Max delay before queued rows are written
+    LLM_LEDGER_MAX_PENDING: int = 10000  # Queue bound; rows beyond it are dropped
+
+    # LLM resilience (see app.agents.resilience)
+    LLM_TIMEOUT_SECONDS: float = 120.0  # Per attempt
+    LLM_RETRY_ATTEMPTS: int = 3
+    LLM_RETRY_BACKOFF_BASE: float = 1.0  # First backoff ceiling in seconds
+    LLM_RETRY_BACKOFF_MAX: float = 30.0  # Backoff ceiling, also caps Retry-After
+    LLM_HEDGE_ENABLED: bool = True  # Duplicate slow idempotent async calls
+    LLM_HEDGE_QUANTILE: float = 0.95  # Hedge after this latency quantile of recent calls
+    LLM_HEDGE_MIN_SAMPLES: int = 20  # No hedging before this many latencies are known
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+    LLM_BREAKER_FAILURES: int = 5  # Consecutive transient failures that open a model's circuit
+    LLM_BREAKER_COOLDOWN_SECONDS: float = 30.0
+    LLM_FAILOVER_ENABLED: bool = True  # Use Anthropic (ANTHROPIC_API_KEY) when OpenAI fails
+    LLM_FAILOVER_MODELS: str = (
+        "gpt-4o=claude-3-5-sonnet-20241022,gpt-4-turbo=claude-3-5-sonnet-20241022,"
+        "gpt-4o-mini=claude-3-5-haiku-20241022,gpt-3.5-turbo=claude-3-5-haiku-20241022"
+    )  # model=failover model,...
+
+    @property
+    def llm_failover_models(self) -> Dict[str, str]:
+        """Parse LLM_FAILOVER_MODELS into {model: failover model}"""
+        return _parse_mapping(self.LLM_FAILOVER_MODELS, str)
+
+    # Execution events (SSE / WebSocket progress)
+    EVENT_BUS_BACKEND: str = "memory"  # memory | redis (multi-process)
+    EVENT_HISTORY_SIZE: int = 200  # Events kept per execution for late subscribers
+    EVENT_KEEPALIVE_SECONDS: float = 15.0
+
+    # Cron
+    CRON_LOCK_BACKEND: str = "database"  # database | redis (lease backend for single-run jobs)
+    CRON_LOCK_TTL_SECONDS: float = 120.0  # Lease lifetime; renewed every TTL/3 while a job runs
+
+    # Workflows (DAG pipelines)
+    PIPELINE_CACHE_DIR: str = "pipeline_cache"  # Stage outputs on disk; empty = memory only
+    PIPELINE_CACHE_TTL_SECONDS: float = 3600.0  # Reuse cached scraping / LLM stage outputs
+
+    # Trends
+    TREND_VELOCITY_ALPHA: float = 0.3  # EWMA smoothing for velocity/acceleration
+    TREND_SNAPSHOT_MIN_INTERVAL_SECONDS: float = 900.0  # Closer re-scrapes of a trend add no snapshot
+    TREND_RISING_WINDOW_HOURS: int = 48
+    TREND_CLUSTER_ENABLED: bool = True
+    TREND_CLUSTER_THRESHOLD: float = 0.85  # Cosine similarity to merge trends
+    IDEA_ANALYSIS_CONCURRENCY: int = 4  # Trends analysed by the LLM at once
+    IDEA_ANALYSIS_MODEL: str = "gpt-4o"  # Deep analysis of each selected trend
+    IDEA_TRIAGE_ENABLED: bool = True  # Score candidates with a cheap model before deep analysis
+    IDEA_TRIAGE_MODEL: str = "gpt-4o-mini"
+    IDEA_TRIAGE_BATCH_SIZE: int = 25  # Trends scored per triage call
+    IDEA_TRIAGE_POOL_FACTOR: int = 4  # Candidates fetched for triage = limit x factor
+    IDEA_TRIAGE_TOP_K: int = 0  # Trends sent to deep analysis; 0 = 2 x limit
+    IDEA_TRIAGE_MIN_SCORE: int = 40  # Triage score (0-100) needed for deep analysis
+
+    # Scrapers
+    INGEST_BATCH_SIZE: int = 50  # Trends per bulk INSERT
+    INGEST_QUEUE_SIZE: int = 100  # Capacity of each pipeline stage queue
+    INGEST_FLUSH_SECONDS: float = 1.0  # Max wait before writing a partial batch
+    TREND_SOURCE_TIMEOUT_SECONDS: float = 120.0  # Per-source budget in TrendScoutAgent
+    SCRAPER_TAXONOMY_PATH: str = ""  # JSON {"categories": {...}, "tags": [...]}; empty = built-in
+    SCRAPE_ARCHIVE_ENABLED: bool = True  # Keep raw payloads for offline replay
+    SCRAPE_ARCHIVE_DIR: str = "scrape_archive"
+    SCRAPE_ARCHIVE_SEGMENT_MB: int = 64  # Rotate gzip segments at this compressed size
+    SCRAPER_HTTP_TIMEOUT: float = 15.0
+    SCRAPER_MAX_CONNECTIONS: int = 20
+    SCRAPER_MAX_RETRIES: int = 3
+    SCRAPER_DEFAULT_RATE: float = 2.0  # Requests/sec for hosts not in SCRAPER_RATE_LIMITS
+    SCRAPER_RATE_LIMITS: str = "hn.algolia.com=5,api.producthunt.com=1,google.serper.dev=10"  # host=req/sec,...
+    SCRAPER_HTTP_CACHE_SIZE: int = 512  # Cached ETag/Last-Modified responses
+    SCRAPER_SOURCE_INTERVALS: str = "hackernews=60,reddit=180,product_hunt=360"  # source=minutes between scrapes,...
+
+    @property
+    def scraper_rate_limits(self) -> Dict[str, float]:
+        """Parse SCRAPER_RATE_LIMITS into {host: requests per second}"""
+        return _parse_mapping(self.SCRAPER_RATE_LIMITS, float)
+
+    @property
+    def scraper_source_intervals(self) -> Dict[str, float]:
+        """Parse SCRAPER_SOURCE_INTERVALS into {source: minutes} (ScraperScheduler)"""
+        return _parse_mapping(self.SCRAPER_SOURCE_INTERVALS, float)
+
     # Data Sources (все опциональные)
     REDDIT_CLIENT_ID: str = ""
     REDDIT_CLIENT_SECRET: str = ""
     REDDIT_USER_AGENT: str = "BusinessPortfolioBot/1.0"
     REDDIT_USERNAME: str = ""
     REDDIT_PASSWORD: str = ""
+    REDDIT_CLIENT_RETRY_SECONDS: float = 300.0  # Wait before retrying a failed Reddit login
+
+    HACKERNEWS_API_URL: str = "https://hn.algolia.com/api/v1"  # Algolia HN Search API
+
+    PRODUCTHUNT_API_URL: str = "https://api.producthunt.com/v2/api/graphql"
+    PRODUCTHUNT_API_TOKEN: str = ""  # Developer token; empty = Product Hunt source reports an error
 
     TELEGRAM_BOT_TOKEN: str = ""
     TELEGRAM_API_ID: str = ""
@@ -96,6 +231,15 @@ class Settings(BaseSettings):
 
     YOUTUBE_API_KEY: str = ""
 
+    # Daily analysis (DailyAnalysisAgent)
+    DAILY_IDEAS_PER_REQUEST: int = 2  # Ideas per parallel generation request
+    MARKET_SEARCH_BACKEND: str = "serper"  # serper | none
+    SERPER_API_KEY: str = ""  # Empty = no web search, built-in market overview only
+    MARKET_SEARCH_BASE_URL: str = "https://google.serper.dev"  # Point at a local fixture server in tests
+    MARKET_SEARCH_RESULTS: int = 8  # Results requested per query
+    MARKET_SEARCH_CACHE_SECONDS: float = 86400.0  # Results are cached per query per day
+    MARKET_CONTEXT_TOKEN_BUDGET: int = 1500  # Max tokens of search snippets in the prompt
+
     # GitHub Integration (Optional)
     GITHUB_TOKEN: str = ""
     GITHUB_REPO: str = ""
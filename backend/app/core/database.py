@@ -78,6 +78,26 @@ def init_db():
     run_migrations()
 
 
+TREND_SOURCES_SQL = (
+    "'reddit', 'google_trends', 'telegram', 'vk', 'youtube', 'instagram', "
+    "'facebook', 'product_hunt', 'hackernews'"
+)
+
+
+def _add_column_if_missing(conn, table: str, column: str, ddl: str):
+    """
+    Add a column to an existing table if it is not there yet
+
+    Uses the SQLAlchemy inspector so it works on both SQLite and PostgreSQL.
+    """
+    from sqlalchemy import inspect, text
+
+    existing = {col["name"] for col in inspect(conn).get_columns(table)}
+    if column not in existing:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        conn.commit()
+
+
 def run_migrations():
     """
     Run database migrations to add new columns
@@ -138,6 +158,87 @@ def run_migrations():
         except:
             pass
 
+        # Trend velocity tracking (trend_snapshots)
+        try:
+            _add_column_if_missing(conn, "trends", "acceleration", "FLOAT DEFAULT 0")
+            _add_column_if_missing(conn, "trends", "last_snapshot_at", "TIMESTAMP")
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_trends_last_snapshot_at ON trends(last_snapshot_at)"))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+
+        # Analysed-trend marker; trends that already have an idea count as analysed
+        try:
+            _add_column_if_missing(conn, "trends", "analyzed_at", "TIMESTAMP")
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_trends_analyzed_at ON trends(analyzed_at)"))
+            conn.execute(text("""
+                UPDATE trends SET analyzed_at = discovered_at
+                WHERE analyzed_at IS NULL
+                  AND EXISTS (SELECT 1 FROM ideas WHERE ideas.trend_id = trends.id)
+            """))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+
+        # Agent job queue
+        try:
+            _add_column_if_missing(conn, "agent_executions", "priority", "INTEGER DEFAULT 0 NOT NULL")
+            _add_column_if_missing(conn, "agent_executions", "queued_at", "TIMESTAMP")
+            _add_column_if_missing(conn, "agent_executions", "heartbeat_at", "TIMESTAMP")
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_executions_queue ON agent_executions(status, priority, id)"
+            ))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+
+        # Idea duplicate detection by normalized title
+        try:
+            _add_column_if_missing(conn, "ideas", "normalized_title", "VARCHAR(500)")
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_ideas_normalized_title ON ideas(normalized_title)"
+            ))
+            conn.commit()
+            _backfill_normalized_titles(conn)
+        except Exception:
+            conn.rollback()
+
+        # Allow new trend sources in the init.sql CHECK constraint (PostgreSQL only)
+        if engine.dialect.name == "postgresql":
+            try:
+                conn.execute(text("ALTER TABLE trends DROP CONSTRAINT IF EXISTS valid_source"))
+                conn.execute(text(f"""
+                    ALTER TABLE trends ADD CONSTRAINT valid_source CHECK (source IN ({TREND_SOURCES_SQL}))
+                """))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+
+            # Sub-cent execution costs (SQLite doesn't enforce DECIMAL precision)
+            try:
+                conn.execute(text("ALTER TABLE agent_executions ALTER COLUMN llm_cost_usd TYPE DECIMAL(12, 6)"))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+
+
+def _backfill_normalized_titles(conn, batch_size: int = 1000):
+    """Fill ideas.normalized_title for rows created before the column existed"""
+    from sqlalchemy import text
+    from app.modules.ideas.models import normalize_title
+
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, title FROM ideas WHERE normalized_title IS NULL LIMIT :limit"
+        ), {"limit": batch_size}).fetchall()
+        if not rows:
+            return
+        conn.execute(
+            text("UPDATE ideas SET normalized_title = :key WHERE id = :id"),
+            [{"id": row.id, "key": normalize_title(row.title)} for row in rows]
+        )
+        conn.commit()
+
 
 def drop_db():
     """
@@ -0,0 +1,256 @@
+"""
+Execution Event Bus
+Push progress of agent executions to API clients (SSE / WebSocket)
+
+Agents publish small JSON events to channel "execution:<id>":
+
+    {"id": 7, "execution_id": 42, "type": "idea_stored", "ts": "...",
+     "tokens_used": 1830, "cost_usd": 0.012, "data": {...}}
+
+Backends:
+- memory (default): in-process pub/sub. publish() is thread-safe, so
+  agents running on job-queue threads with their own loops can publish
+  to subscribers on the API loop.
+- redis (EVENT_BUS_BACKEND=redis): Redis pub/sub plus a capped history
+  list per channel, for multi-process / multi-worker deployments.
+  publish() only queues the event; a writer thread sends them in order,
+  so agents never wait on Redis from their event loop.
+
+Each channel keeps its last EVENT_HISTORY_SIZE events, so late subscribers
+(and SSE reconnects with Last-Event-ID) catch up before live events.
+"""
+
+import asyncio
+import atexit
+import json
+import threading
+from collections import OrderedDict, deque
+from queue import Full, Queue
+from datetime import datetime
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# Event types that end an execution stream
+TERMINAL_EVENTS = ("completed", "failed", "cancelled")
+
+
+def execution_channel(execution_id: int) -> str:
+    return f"execution:{execution_id}"
+
+
+class InMemoryEventBus:
+    """
+    In-process pub/sub with per-channel history
+    """
+
+    def __init__(self, history_size: int = 200, max_channels: int = 500):
+        self.history_size = history_size
+        self.max_channels = max_channels
+        self._lock = threading.Lock()
+        self._history: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self._seq: Dict[str, int] = {}
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def publish(self, channel: str, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Publish an event (callable from any thread); returns it with its id"""
+        with self._lock:
+            self._seq[channel] = self._seq.get(channel, 0) + 1
+            event = {"id": self._seq[channel], **event}
+            self._history.setdefault(channel, deque(maxlen=self.history_size)).append(event)
+            self._history.move_to_end(channel)
+            self._evict()
+            subscribers = list(self._subscribers.get(channel, ()))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                pass  # Subscriber loop already closed
+
+        return event
+
+    def _evict(self) -> None:
+        """Drop history of the least recently active channels nobody listens to"""
+        for channel in list(self._history):
+            if len(self._history) <= self.max_channels:
+                return
+            if channel not in self._subscribers:
+                del self._history[channel]
+                self._seq.pop(channel, None)
+
+    async def subscribe(self, channel: str, after_id: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield history newer than `after_id`, then live events
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        with self._lock:
+            backlog = [e for e in self._history.get(channel, ()) if e["id"] > after_id]
+            self._subscribers.setdefault(channel, []).append((loop, queue))
+
+        try:
+            last_id = after_id
+            for event in backlog:
+                last_id = event["id"]
+                yield event
+
+            while True:
+                event = await queue.get()
+                if event["id"] <= last_id:
+                    continue  # Already sent from the backlog
+                last_id = event["id"]
+                yield event
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(channel, [])
+                if (loop, queue) in subscribers:
+                    subscribers.remove((loop, queue))
+                if not subscribers:
+                    self._subscribers.pop(channel, None)
+
+
+class RedisEventBus:
+    """
+    Redis pub/sub with a capped history list per channel
+
+    Requires the `redis` package (redis.asyncio for subscribers).
+
+    Publishing is two Redis round trips, too slow for an agent's event loop,
+    so publish() only queues the event: one writer thread sends them in
+    publish order (ids are assigned by Redis as they are written). Events
+    still queued at interpreter exit are flushed then; if Redis is down long
+    enough to fill the queue, new events are dropped.
+    """
+
+    def __init__(self, url: str, history_size: int = 200, history_ttl: int = 86400, max_pending: int = 10000):
+        import redis
+        import redis.asyncio as aioredis
+
+        self.url = url
+        self.history_size = history_size
+        self.history_ttl = history_ttl
+        self._client = redis.Redis.from_url(url)
+        self._aioredis = aioredis
+
+        self._queue: "Queue[Tuple[Optional[str], Any]]" = Queue(maxsize=max_pending)
+        threading.Thread(target=self._run, name="event-bus-writer", daemon=True).start()
+        atexit.register(self.flush)
+
+    def publish(self, channel: str, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue an event (never blocks); its id is assigned when it is written"""
+        try:
+            self._queue.put_nowait((channel, event))
+        except Full:
+            logger.warning("Event bus queue full, dropping event", channel=channel, type=event.get("type"))
+        return event
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until the events queued so far are written; False on timeout"""
+        written = threading.Event()
+        try:
+            # Marker behind the queued events: the writer sets it when it gets there
+            self._queue.put((None, written), timeout=timeout)
+        except Full:
+            return False
+        return written.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            channel, event = self._queue.get()
+            if channel is None:
+                event.set()
+                continue
+            self._write(channel, event)
+
+    def _write(self, channel: str, event: Dict[str, Any]) -> None:
+        try:
+            event = {"id": self._client.incr(f"{channel}:seq"), **event}
+            payload = json.dumps(event, default=str)
+
+            pipe = self._client.pipeline()
+            pipe.rpush(f"{channel}:history", payload)
+            pipe.ltrim(f"{channel}:history", -self.history_size, -1)
+            pipe.expire(f"{channel}:history", self.history_ttl)
+            pipe.expire(f"{channel}:seq", self.history_ttl)
+            pipe.publish(channel, payload)
+            pipe.execute()
+        except Exception as e:
+            logger.warning("Failed to publish execution event", channel=channel, error=str(e))
+
+    async def subscribe(self, channel: str, after_id: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        client = self._aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+
+        try:
+            # Subscribe before reading history so nothing falls in between
+            await pubsub.subscribe(channel)
+
+            last_id = after_id
+            for payload in await client.lrange(f"{channel}:history", 0, -1):
+                event = json.loads(payload)
+                if event["id"] > last_id:
+                    last_id = event["id"]
+                    yield event
+
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                event = json.loads(message["data"])
+                if event["id"] <= last_id:
+                    continue
+                last_id = event["id"]
+                yield event
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.close()
+            await client.close()
+
+
+def _create_bus():
+    if settings.EVENT_BUS_BACKEND == "redis":
+        try:
+            return RedisEventBus(settings.REDIS_URL, history_size=settings.EVENT_HISTORY_SIZE)
+        except Exception as e:
+            logger.warning("Redis event bus unavailable, using in-process bus", error=str(e))
+    return InMemoryEventBus(history_size=settings.EVENT_HISTORY_SIZE)
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus():
+    """Process-wide event bus (backend chosen by EVENT_BUS_BACKEND)"""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = _create_bus()
+    return _bus
+
+
+def publish_execution_event(
+    execution_id: int,
+    event_type: str,
+    data: Optional[Dict[str, Any]] = None,
+    **fields: Any
+) -> Optional[Dict[str, Any]]:
+    """
+    Publish an event for an execution; never raises (progress is best-effort)
+    """
+    try:
+        return get_event_bus().publish(execution_channel(execution_id), {
+            "execution_id": execution_id,
+            "type": event_type,
+            "ts": datetime.utcnow().isoformat(),
+            **fields,
+            "data": data or {}
+        })
+    except Exception as e:
+        logger.warning("Failed to publish execution event", execution_id=execution_id, error=str(e))
+        return None
@@ -6,31 +6,41 @@ Daily Analysis Cron Job
 1. Ищет актуальные тренды через веб-поиск
 2. Анализирует потребности рынка с помощью GPT-4
 3. Генерирует 3-5 бизнес-идей с высокими оценками
-4. Сохраняет их в базу данных
+4. Сохраняет их в базу данных (напрямую через IdeaService)
 """
 
 import os
-import json
-import httpx
+import asyncio
 from datetime import datetime
-from typing import List, Dict, Any
-from openai import OpenAI
+from typing import List, Dict, Any, Optional
 import structlog
+from sqlalchemy.orm import Session
+
+from app.agents.base_agent import BaseAgent
+from app.core.config import settings
+from app.cron.market_search import gather_search_context, is_near_duplicate
+from app.modules.ideas.models import normalize_title
+from app.modules.ideas.schemas import IdeaCreate
+from app.modules.ideas.service import IdeaService
 
 logger = structlog.get_logger()
 
 # Конфигурация
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-SERPER_API_KEY = os.getenv("SERPER_API_KEY", "")  # Опционально для веб-поиска
 
 
-class DailyAnalysisAgent:
+class DailyAnalysisAgent(BaseAgent):
     """
     Агент для ежедневного анализа рынка и генерации бизнес-идей
+
+    LLM calls go through BaseAgent (budget checks, failover, ledger), under
+    the "daily_analysis" agent type. The morning workflow calls
+    gather_market_context / generate_ideas directly, without an execution
+    record, so no DB session is needed there.
     """
 
-    def __init__(self):
-        self.openai = OpenAI(api_key=OPENAI_API_KEY)
+    def __init__(self, db: Optional[Session] = None):
+        super().__init__(db, agent_type="daily_analysis")
         self.search_queries = [
             "AI startup trends 2025 2026",
             "новые AI стартапы идеи бизнес",
@@ -41,24 +51,29 @@ class DailyAnalysisAgent:
             "AI SaaS product ideas trending",
         ]
 
-    async def run(self, ideas_count: int = 5, min_score: int = 65) -> Dict[str, Any]:
+    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Запустить ежедневный анализ
 
-        Args:
-            ideas_count: Количество идей для генерации (3-5)
-            min_score: Минимальный общий балл для идеи
+        Input:
+            {
+                "ideas_count": 5,  # Количество идей для генерации (3-5)
+                "min_score": 65  # Минимальный общий балл для идеи
+            }
 
         Returns:
             Результат анализа с созданными идеями
         """
+        ideas_count = input_data.get("ideas_count", 5)
+        min_score = input_data.get("min_score", 65)
+
         logger.info("🌅 Starting daily analysis", ideas_count=ideas_count)
 
         # 1. Собираем контекст о текущих трендах
-        market_context = await self._gather_market_context()
+        market_context = await self.gather_market_context()
 
         # 2. Генерируем идеи с помощью GPT-4
-        ideas = await self._generate_ideas(market_context, ideas_count, min_score)
+        ideas = await self.generate_ideas(market_context, ideas_count, min_score)
 
         # 3. Фильтруем по минимальному баллу
         qualified_ideas = [i for i in ideas if i.get("total_score", 0) >= min_score]
@@ -77,14 +92,26 @@ class DailyAnalysisAgent:
             "ideas": qualified_ideas
         }
 
-    async def _gather_market_context(self) -> str:
+    async def gather_market_context(self, analysis_date: Optional[str] = None) -> str:
         """
         Собрать контекст о текущих трендах рынка
+
+        Runs all search_queries concurrently (see app.cron.market_search);
+        without a search backend only the built-in overview is used.
+
+        Args:
+            analysis_date: YYYY-MM-DD (default: today); search results are cached per day
         """
+        analysis_date = analysis_date or datetime.now().strftime('%Y-%m-%d')
         context_parts = []
 
         # Добавляем текущую дату для контекста
-        context_parts.append(f"Дата анализа: {datetime.now().strftime('%Y-%m-%d')}")
+        context_parts.append(f"Дата анализа: {analysis_date}")
+
+        # Свежие результаты веб-поиска
+        search_context = await gather_search_context(self.search_queries, day=analysis_date)
+        if search_context:
+            context_parts.append(f"Свежие новости и публикации (веб-поиск):\n{search_context}")
 
         # Базовый контекст о текущих трендах AI
         context_parts.append("""
@@ -118,7 +145,7 @@ class DailyAnalysisAgent:
 
         return "\n\n".join(context_parts)
 
-    async def _generate_ideas(
+    async def generate_ideas(
         self,
         context: str,
         count: int,
@@ -126,14 +153,92 @@ class DailyAnalysisAgent:
     ) -> List[Dict[str, Any]]:
         """
         Генерировать бизнес-идеи с помощью GPT-4
+
+        The ideas are requested in parallel chunks of DAILY_IDEAS_PER_REQUEST,
+        each with its own focus (IDEA_FOCUSES) so chunks don't repeat each
+        other. A failed or truncated chunk loses only its own unfinished
+        ideas; one top-up round replaces them. Results are merged, de-duplicated by
+        title and sorted by total_score.
         """
-        prompt = f"""
+        per_request = max(1, settings.DAILY_IDEAS_PER_REQUEST)
+        ideas: List[Dict[str, Any]] = []
+        seen_titles: List[set] = []
+        chunk_index = 0
+
+        for _ in range(2):  # Initial round + one top-up for failed chunks / duplicates
+            missing = count - len(ideas)
+            if missing <= 0:
+                break
+
+            sizes = [min(per_request, missing - i) for i in range(0, missing, per_request)]
+            chunks = await asyncio.gather(*(
+                self._generate_chunk(context, size, min_score, IDEA_FOCUSES[(chunk_index + i) % len(IDEA_FOCUSES)])
+                for i, size in enumerate(sizes)
+            ))
+            chunk_index += len(sizes)
+
+            for idea in (idea for chunk in chunks for idea in chunk):
+                words = set(normalize_title(idea.get("title", "")).split())
+                if not words or is_near_duplicate(words, seen_titles):
+                    continue
+                seen_titles.append(words)
+                ideas.append(idea)
+
+        ideas.sort(key=lambda i: i.get("total_score", 0), reverse=True)
+        logger.info(f"Generated {len(ideas)} ideas", requested=count, chunks=chunk_index)
+        return ideas[:count]
+
+    async def _generate_chunk(
+        self,
+        context: str,
+        count: int,
+        min_score: int,
+        focus: str
+    ) -> List[Dict[str, Any]]:
+        """
+        One small generation request
+
+        The answer is streamed and parsed incrementally (astream_llm_json),
+        so ideas that closed before a failure or truncation are kept.
+        """
+        ideas: List[Dict[str, Any]] = []
+        messages = [
+            {"role": "system", "content": IDEAS_SYSTEM_PROMPT},
+            {"role": "user", "content": self._ideas_prompt(context, count, min_score, focus)}
+        ]
+        try:
+            async for idea in self.astream_llm_json(
+                messages,
+                model=IDEAS_MODEL,
+                temperature=0.7,
+                max_tokens=min(8000, 2000 * count)
+            ):
+                ideas.append(idea)
+        except Exception as e:
+            logger.error("Error generating ideas", focus=focus, kept=len(ideas), error=str(e))
+
+        scored = []
+        for idea in ideas:
+            try:
+                coerce_scores(idea)
+                idea["total_score"] = total_score(idea)
+            except (TypeError, ValueError) as e:
+                logger.warning("Skipping idea with unreadable scores", title=idea.get("title"), error=str(e))
+                continue
+            scored.append(idea)
+        return scored[:count]
+
+    def _ideas_prompt(self, context: str, count: int, min_score: int, focus: str) -> str:
+        return f"""
 {context}
 
 ═══════════════════════════════════════════════════════════════════════════════
 🎯 ЗАДАЧА: Создай {count} НОВЫХ и АКТУАЛЬНЫХ бизнес-идей на базе AI
 ═══════════════════════════════════════════════════════════════════════════════
 
+🧭 ФОКУС этой подборки: {focus}
+Другие подборки генерируются параллельно по другим направлениям - держись своего фокуса.
+
 КРИТЕРИИ ОТБОРА ИДЕЙ:
 1. ✅ Решает РЕАЛЬНУЮ проблему (не выдуманную)
 2. ✅ AI/ML действительно нужен для решения
@@ -212,13 +317,10 @@ class DailyAnalysisAgent:
 Верни JSON объект в формате: {{"ideas": [массив из {count} идей]}}
 """
 
-        try:
-            response = self.openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """Ты эксперт по AI-продуктам и венчурному рынку.
+
+IDEAS_MODEL = "gpt-4o"
+
+IDEAS_SYSTEM_PROMPT = """Ты эксперт по AI-продуктам и венчурному рынку.
 
 Твоя задача - генерировать КАЧЕСТВЕННЫЕ бизнес-идеи на базе AI.
 
@@ -230,137 +332,147 @@ class DailyAnalysisAgent:
 
 Отвечай ТОЛЬКО на русском языке.
 Возвращай ТОЛЬКО валидный JSON."""
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=8000,
-                response_format={"type": "json_object"}
-            )
 
-            content = response.choices[0].message.content
+# Направления для параллельных подборок (по одному на запрос)
+IDEA_FOCUSES = [
+    "B2B: автоматизация процессов малого и среднего бизнеса",
+    "B2C: персональные AI-помощники и потребительские сервисы",
+    "Вертикальные AI-агенты для отраслей (медицина, право, финансы, образование)",
+    "Инструменты для разработчиков и AI-инфраструктура",
+    "Локальные рынки: Россия, Армения, СНГ",
+    "Контент, медиа и e-commerce",
+]
 
-            # Парсим JSON
-            try:
-                # Пробуем распарсить как массив
-                ideas = json.loads(content)
-                if isinstance(ideas, dict) and "ideas" in ideas:
-                    ideas = ideas["ideas"]
-                elif isinstance(ideas, dict):
-                    ideas = [ideas]
-            except json.JSONDecodeError:
-                # Пробуем найти JSON массив в тексте
-                import re
-                match = re.search(r'\[[\s\S]*\]', content)
-                if match:
-                    ideas = json.loads(match.group())
-                else:
-                    logger.error("Failed to parse ideas JSON", content=content[:500])
-                    ideas = []
-
-            # Добавляем total_score к каждой идее
-            for idea in ideas:
-                scores = [
-                    idea.get("market_size_score", 0),
-                    idea.get("competition_score", 0),
-                    idea.get("demand_score", 0),
-                    idea.get("monetization_score", 0),
-                    idea.get("feasibility_score", 0),
-                    idea.get("time_to_market_score", 0),
-                ]
-                idea["total_score"] = sum(scores) // 6
-
-            logger.info(f"Generated {len(ideas)} ideas")
-            return ideas
+SCORE_KEYS = (
+    "market_size_score", "competition_score", "demand_score",
+    "monetization_score", "feasibility_score", "time_to_market_score",
+)
 
-        except Exception as e:
-            logger.error("Error generating ideas", error=str(e))
-            return []
 
+def total_score(idea: Dict[str, Any]) -> int:
+    """Average of the six criterion scores"""
+    return sum(idea.get(key) or 0 for key in SCORE_KEYS) // 6
 
-async def run_daily_analysis(db_session=None, api_base_url: str = None) -> Dict[str, Any]:
+
+def coerce_scores(idea: Dict[str, Any]) -> None:
+    """Turn criterion scores given as strings ("80") into ints, in place"""
+    for key in SCORE_KEYS:
+        if idea.get(key) is not None:
+            idea[key] = int(float(idea[key]))
+
+
+async def run_daily_analysis(ideas_count: int = 5) -> Dict[str, Any]:
     """
     Запустить ежедневный анализ и сохранить идеи
 
+    Runs the market branch of the morning workflow (context -> ideas -> store).
+
     Args:
-        db_session: SQLAlchemy сессия (опционально)
-        api_base_url: URL API для сохранения идей
+        ideas_count: Количество идей для генерации
 
     Returns:
         Результат анализа
     """
-    agent = DailyAnalysisAgent()
-    result = await agent.run(ideas_count=5, min_score=50)  # Снижен порог для большего количества идей
+    from app.workflows.morning import MARKET_TARGETS, run_morning_pipeline
+
+    pipeline = await run_morning_pipeline(
+        {
+            "ideas_count": ideas_count,
+            "market_min_score": 50,  # Снижен порог для большего количества идей
+        },
+        targets=MARKET_TARGETS
+    )
+
+    outputs = pipeline["outputs"]
+    if "market_ideas" not in outputs:
+        return {
+            "status": "error",
+            "timestamp": datetime.now().isoformat(),
+            "message": pipeline["stages"]["market_ideas"].get("error"),
+            "stages": pipeline["stages"]
+        }
 
-    if result["status"] != "success" or not result["ideas"]:
-        return result
+    market = outputs["market_ideas"]
+    store = pipeline["stages"]["store_market_ideas"]
+    if store["status"] != "ok":
+        return {
+            "status": "error",
+            "timestamp": datetime.now().isoformat(),
+            "message": f"Ideas generated but not saved: {store.get('error')}",
+            "ideas_generated": market["ideas_generated"],
+            "ideas_qualified": market["ideas_qualified"],
+            "ideas": market["ideas"],
+            "stages": pipeline["stages"]
+        }
+    stored = outputs["store_market_ideas"]
 
-    # Сохраняем идеи через API
-    saved_ideas = []
+    return {
+        "status": "success",
+        "timestamp": datetime.now().isoformat(),
+        "ideas_generated": market["ideas_generated"],
+        "ideas_qualified": market["ideas_qualified"],
+        "ideas": market["ideas"],
+        "saved_ideas": stored["saved_ideas"],
+        "saved_count": stored["saved_count"],
+        "stages": pipeline["stages"]
+    }
 
-    if api_base_url:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            # Получаем существующие идеи для проверки дубликатов
-            existing_titles = set()
-            try:
-                response = await client.get(f"{api_base_url}/api/v1/ideas/?limit=100")
-                if response.status_code == 200:
-                    existing = response.json()
-                    existing_titles = {idea["title"].lower().strip() for idea in existing.get("items", [])}
-                    logger.info(f"Loaded {len(existing_titles)} existing ideas for duplicate check")
-            except Exception as e:
-                logger.warning(f"Could not load existing ideas: {e}")
-
-            for idea in result["ideas"]:
-                # Проверка на дубликаты
-                if idea["title"].lower().strip() in existing_titles:
-                    logger.info(f"⏭️ Skipping duplicate: {idea['title']}")
-                    continue
 
-                try:
-                    # Формируем данные для API
-                    idea_data = {
-                        "title": idea["title"],
-                        "description": idea["description"],
-                        "emoji": idea.get("emoji", "💡"),
-                        "source": idea.get("source", "Daily AI Analysis"),
-                        "category": idea.get("category", "ai"),
-                        "is_russia_relevant": idea.get("is_russia_relevant", True),
-                        "is_armenia_relevant": idea.get("is_armenia_relevant", False),
-                        "is_global_relevant": idea.get("is_global_relevant", True),
-                        "market_size_score": idea["market_size_score"],
-                        "competition_score": idea["competition_score"],
-                        "demand_score": idea["demand_score"],
-                        "monetization_score": idea["monetization_score"],
-                        "feasibility_score": idea["feasibility_score"],
-                        "time_to_market_score": idea["time_to_market_score"],
-                        "investment": idea.get("investment", 100000),
-                        "payback_months": idea.get("payback_months", 12),
-                        "margin": idea.get("margin", 50),
-                        "arr": idea.get("arr", 500000),
-                        "analysis": idea.get("analysis", {})
-                    }
-
-                    response = await client.post(
-                        f"{api_base_url}/api/v1/ideas/",
-                        json=idea_data
-                    )
-
-                    if response.status_code in [200, 201]:
-                        saved_idea = response.json()
-                        saved_ideas.append({
-                            "id": saved_idea.get("id"),
-                            "title": idea["title"],
-                            "score": idea["total_score"]
-                        })
-                        logger.info(f"✅ Saved idea: {idea['title']}")
-                    else:
-                        logger.error(f"Failed to save idea: {response.status_code}")
-
-                except Exception as e:
-                    logger.error(f"Error saving idea: {e}")
-
-    result["saved_ideas"] = saved_ideas
-    result["saved_count"] = len(saved_ideas)
-
-    return result
+def to_idea_create(idea: Dict[str, Any]) -> IdeaCreate:
+    """
+    Build IdeaCreate from an LLM-generated idea
+
+    Raises:
+        pydantic.ValidationError: If required fields are missing or out of range
+    """
+    return IdeaCreate(
+        title=idea["title"],
+        description=idea.get("description"),
+        emoji=idea.get("emoji", "💡"),
+        source=idea.get("source", "Daily AI Analysis"),
+        category=idea.get("category", "ai"),
+        is_russia_relevant=idea.get("is_russia_relevant", True),
+        is_armenia_relevant=idea.get("is_armenia_relevant", False),
+        is_global_relevant=idea.get("is_global_relevant", True),
+        market_size_score=idea["market_size_score"],
+        competition_score=idea["competition_score"],
+        demand_score=idea["demand_score"],
+        monetization_score=idea["monetization_score"],
+        feasibility_score=idea["feasibility_score"],
+        time_to_market_score=idea["time_to_market_score"],
+        investment=idea.get("investment", 100000),
+        payback_months=idea.get("payback_months", 12),
+        margin=idea.get("margin", 50),
+        arr=idea.get("arr", 500000),
+        analysis=idea.get("analysis", {})
+    )
+
+
+def save_ideas(db, ideas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Сохранить идеи в базу одной транзакцией (пропуская дубликаты)
+
+    Duplicates are detected by normalized title against the whole ideas
+    table, not just the latest ideas.
+
+    Returns:
+        Saved ideas as {"id", "title", "score"}
+    """
+    valid = []
+    for idea in ideas:
+        try:
+            valid.append((idea, to_idea_create(idea)))
+        except (KeyError, ValueError) as e:
+            logger.error(f"Skipping invalid idea: {idea.get('title')}", error=str(e))
+
+    results = IdeaService(db).create_ideas_bulk([create for _, create in valid])
+
+    saved_ideas = []
+    for (idea, _), (idea_id, created) in zip(valid, results):
+        if not created:
+            logger.info(f"⏭️ Skipping duplicate: {idea['title']}")
+            continue
+        saved_ideas.append({"id": idea_id, "title": idea["title"], "score": idea["total_score"]})
+        logger.info(f"✅ Saved idea: {idea['title']}")
+
+    return saved_ideas
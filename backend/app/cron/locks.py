@@ -0,0 +1,251 @@
+"""
+Cron Job Leases
+One run of a job at a time across API replicas
+
+A lease is a lock with an expiry. The holder renews it every TTL/3 while the
+job runs; if the process dies, the lease expires and the next trigger can
+take over. If a renewal fails (the lease expired and another replica took
+it), the job is cancelled so two runs never overlap for long.
+
+Backends (CRON_LOCK_BACKEND):
+- database: a row in job_locks, taken with conditional INSERT/UPDATE (works
+  on PostgreSQL and SQLite)
+- redis: SET NX PX plus compare-and-set scripts (requires the `redis` package)
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+import structlog
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.cron.repository import CronRunRepository, JobLockRepository
+
+logger = structlog.get_logger()
+
+
+def new_owner_id() -> str:
+    """Unique holder id: host:pid:token"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:12]}"
+
+
+class DatabaseLease:
+    """
+    Lease stored in the job_locks table
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, owner: Optional[str] = None):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.owner = owner or new_owner_id()
+
+    def acquire(self) -> bool:
+        db = SessionLocal()
+        try:
+            return JobLockRepository(db).try_acquire(self.name, self.owner, self.ttl_seconds)
+        finally:
+            db.close()
+
+    def renew(self) -> bool:
+        db = SessionLocal()
+        try:
+            return JobLockRepository(db).renew(self.name, self.owner, self.ttl_seconds)
+        finally:
+            db.close()
+
+    def release(self) -> None:
+        db = SessionLocal()
+        try:
+            JobLockRepository(db).release(self.name, self.owner)
+        finally:
+            db.close()
+
+    def holder(self) -> Optional[str]:
+        """Current holder of the lease (anyone), or None if free"""
+        db = SessionLocal()
+        try:
+            return JobLockRepository(db).get_holder(self.name)
+        finally:
+            db.close()
+
+
+# Only touch the key while we still own it
+_RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLease:
+    """
+    Lease stored as a Redis key with a TTL
+
+    Requires the `redis` package.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, owner: Optional[str] = None, url: Optional[str] = None):
+        import redis
+
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.owner = owner or new_owner_id()
+        self._client = redis.Redis.from_url(url or settings.REDIS_URL)
+        self._key = f"lock:{name}"
+
+    @property
+    def _ttl_ms(self) -> int:
+        return int(self.ttl_seconds * 1000)
+
+    def acquire(self) -> bool:
+        if self._client.set(self._key, self.owner, nx=True, px=self._ttl_ms):
+            return True
+        return self.renew()  # Re-entrant for the same owner
+
+    def renew(self) -> bool:
+        return bool(self._client.eval(_RENEW_SCRIPT, 1, self._key, self.owner, self._ttl_ms))
+
+    def release(self) -> None:
+        self._client.eval(_RELEASE_SCRIPT, 1, self._key, self.owner)
+
+    def holder(self) -> Optional[str]:
+        value = self._client.get(self._key)
+        return value.decode() if isinstance(value, bytes) else value
+
+
+def get_lease(name: str, ttl_seconds: Optional[float] = None):
+    """New lease handle for a job (backend chosen by CRON_LOCK_BACKEND)"""
+    ttl_seconds = ttl_seconds or settings.CRON_LOCK_TTL_SECONDS
+    if settings.CRON_LOCK_BACKEND == "redis":
+        try:
+            return RedisLease(name, ttl_seconds)
+        except Exception as e:
+            logger.warning("Redis lock unavailable, using database lease", error=str(e))
+    return DatabaseLease(name, ttl_seconds)
+
+
+class LeaseLostError(Exception):
+    """The lease expired and was taken by another holder while the job ran"""
+
+
+async def run_with_lease(
+    lease,
+    job: str,
+    work: Callable[[], Awaitable[Dict[str, Any]]],
+    run_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run `work` under an acquired lease and record the outcome in cron_runs
+
+    Renews the lease every TTL/3 and cancels the work if a renewal fails.
+    The run row is finished and the lease released whatever happens.
+
+    Args:
+        lease: Acquired lease (DatabaseLease / RedisLease)
+        job: Job name stored on the run row
+        work: Coroutine factory producing the job result
+        run_id: Existing run row (created here if None)
+
+    Returns:
+        Job result
+
+    Raises:
+        LeaseLostError: If the lease was lost mid-run
+        Exception: Whatever `work` raised
+    """
+    if run_id is None:
+        run_id = await asyncio.to_thread(start_run, job, lease.owner)
+
+    work_task = asyncio.ensure_future(work())
+    lost = False
+
+    async def heartbeat() -> None:
+        nonlocal lost
+        interval = max(lease.ttl_seconds / 3, 0.1)
+        while not work_task.done():
+            await asyncio.sleep(interval)
+            try:
+                renewed = await asyncio.to_thread(lease.renew)
+            except Exception as e:
+                # Transient DB/Redis error: keep the job, the lease may still be valid
+                logger.warning("Lease renewal failed", job=job, error=str(e))
+                continue
+            if not renewed:
+                lost = True
+                logger.error("Lease lost, cancelling job", job=job, owner=lease.owner)
+                work_task.cancel()
+                return
+
+    heartbeat_task = asyncio.ensure_future(heartbeat())
+    status, result, error = "failed", None, None
+    try:
+        try:
+            result = await work_task
+        except asyncio.CancelledError:
+            if lost:
+                raise LeaseLostError(f"Lease for {job} was lost")
+            raise
+        status = "completed"
+        return result
+    except BaseException as e:
+        error = str(e) or type(e).__name__
+        raise
+    finally:
+        heartbeat_task.cancel()
+        await asyncio.to_thread(_finish_and_release, lease, run_id, status, result, error)
+
+
+def start_run(job: str, owner: str) -> int:
+    db = SessionLocal()
+    try:
+        return CronRunRepository(db).start(job, owner).id
+    finally:
+        db.close()
+
+
+def _finish_and_release(lease, run_id: int, status: str, result: Optional[dict], error: Optional[str]) -> None:
+    db = SessionLocal()
+    try:
+        CronRunRepository(db).finish(run_id, status, result=result, error=error)
+    except Exception as e:
+        logger.error("Failed to record cron run", run_id=run_id, error=str(e))
+    finally:
+        db.close()
+    try:
+        lease.release()
+    except Exception as e:
+        # Expires on its own after one TTL
+        logger.warning("Failed to release lease", error=str(e))
+
+
+def get_latest_run(job: str, lease=None) -> Optional[Dict[str, Any]]:
+    """
+    Latest run of a job as a dict
+
+    A "running" row whose lease is no longer held belongs to a process that
+    died mid-run; it is marked failed so the status stops reporting it.
+    """
+    db = SessionLocal()
+    try:
+        repository = CronRunRepository(db)
+        run = repository.get_latest(job)
+        if run is None:
+            return None
+
+        if run.status == "running" and lease is not None and lease.holder() is None:
+            repository.finish(run.id, "failed", error="abandoned: lease expired before the run finished")
+            db.refresh(run)
+        return run.to_dict()
+    finally:
+        db.close()
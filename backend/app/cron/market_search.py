@@ -0,0 +1,243 @@
+"""
+Market Search
+Fresh web-search context for DailyAnalysisAgent
+
+All search queries run concurrently through the shared scraper runtime
+(pooled httpx client, per-host rate limit, retries), so the stage takes
+about as long as the slowest query rather than the sum of them.
+
+- Backends are pluggable (MARKET_SEARCH_BACKEND); SerperSearch talks to
+  MARKET_SEARCH_BASE_URL, which tests point at a local fixture server
+  (see fakes/search_server.py)
+- Results are cached per query per day in the pipeline stage cache, so
+  re-runs and other replicas (disk cache) don't repeat the searches
+- Snippets are cleaned, shortened and de-duplicated across queries, then
+  packed round-robin (top results of every query first) into
+  MARKET_CONTEXT_TOKEN_BUDGET tokens
+"""
+
+import asyncio
+import re
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+import structlog
+
+from app.agents.tokens import count_tokens
+from app.core.config import settings
+from app.modules.ideas.models import normalize_title
+from app.scrapers.runtime import ScraperRuntime, get_runtime
+from app.workflows.dag import get_stage_cache, stable_hash
+
+logger = structlog.get_logger()
+
+
+class SearchBackend(ABC):
+    """
+    Web search backend
+
+    Subclasses implement `search`, returning results as
+    {"title", "snippet", "link", "date"?}. `name` and `base_url` are part
+    of the result cache key, so a fixture server's answers are never served
+    to runs against the real API.
+    """
+
+    name = "base"
+    base_url = ""
+
+    @abstractmethod
+    async def search(self, query: str, num: int) -> List[Dict[str, Any]]:
+        """Results of one query (at most `num`)"""
+        pass
+
+
+class SerperSearch(SearchBackend):
+    """
+    Google results via serper.dev (POST /search)
+    """
+
+    name = "serper"
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        runtime: Optional[ScraperRuntime] = None
+    ):
+        """
+        Args:
+            api_key: serper.dev API key
+            base_url: API root (defaults to MARKET_SEARCH_BASE_URL)
+            runtime: HTTP runtime (defaults to the shared one of the event loop)
+        """
+        self.api_key = api_key
+        self.base_url = (base_url or settings.MARKET_SEARCH_BASE_URL).rstrip("/")
+        self._runtime = runtime
+
+    async def search(self, query: str, num: int) -> List[Dict[str, Any]]:
+        data = await (self._runtime or get_runtime()).post_json(
+            f"{self.base_url}/search",
+            json={"q": query, "num": num},
+            headers={"X-API-KEY": self.api_key}
+        )
+
+        results = []
+        for item in (data.get("news") or []) + (data.get("organic") or []):
+            if item.get("snippet") or item.get("title"):
+                results.append({
+                    "title": item.get("title", ""),
+                    "snippet": item.get("snippet", ""),
+                    "link": item.get("link", ""),
+                    "date": item.get("date")
+                })
+        return results[:num]
+
+
+SEARCH_BACKENDS = {
+    "serper": lambda: SerperSearch(settings.SERPER_API_KEY) if settings.SERPER_API_KEY else None,
+}
+
+
+def get_search_backend() -> Optional[SearchBackend]:
+    """Configured backend, or None when search is disabled / has no key"""
+    factory = SEARCH_BACKENDS.get(settings.MARKET_SEARCH_BACKEND)
+    return factory() if factory else None
+
+
+async def search_queries(
+    backend: SearchBackend,
+    queries: List[str],
+    day: Optional[str] = None,
+    use_cache: bool = True
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run all queries concurrently (cached per query per day)
+
+    A failed query is logged and returns no results; the others are kept.
+
+    Returns:
+        Query -> results
+    """
+    day = day or date.today().isoformat()
+    cache = get_stage_cache()
+    num = settings.MARKET_SEARCH_RESULTS
+
+    async def search_one(query: str) -> List[Dict[str, Any]]:
+        key = stable_hash({
+            "search": backend.name,
+            "base_url": backend.base_url,
+            "query": query,
+            "day": day,
+            "num": num
+        })
+        if use_cache:
+            hit, results = cache.get(key, settings.MARKET_SEARCH_CACHE_SECONDS)
+            if hit:
+                return results
+        try:
+            results = await backend.search(query, num)
+        except Exception as e:
+            logger.warning("Market search query failed", query=query, error=str(e))
+            return []
+        cache.put(key, results)
+        return results
+
+    results = await asyncio.gather(*(search_one(q) for q in queries))
+    return dict(zip(queries, results))
+
+
+# "Jan 5, 2025 ... ", "3 days ago — " and similar prefixes carry no content
+_DATE_PREFIX = re.compile(r"^\s*(?:\d+\s+\w+\s+ago|\w{3,9}\.? \d{1,2}, \d{4}|\d{1,2} \w+\.? \d{4})\s*(?:\.{3}|[—–-])\s*")
+_ELLIPSIS = re.compile(r"\s*(?:\.{3}|…)\s*")
+
+
+def compress_snippet(text: str, max_chars: int = 240) -> str:
+    """Strip date prefixes and ellipses, collapse whitespace, cut at a word boundary"""
+    text = _DATE_PREFIX.sub("", text or "")
+    text = _ELLIPSIS.sub(" ", text)
+    text = " ".join(text.split())
+    if len(text) > max_chars:
+        text = text[:max_chars].rsplit(" ", 1)[0].rstrip(",;:") + "…"
+    return text
+
+
+def is_near_duplicate(words: set, seen: List[set], threshold: float = 0.8) -> bool:
+    """True if the word set overlaps (Jaccard >= threshold) with one already seen"""
+    for other in seen:
+        union = len(words | other)
+        if union and len(words & other) / union >= threshold:
+            return True
+    return False
+
+
+def build_search_context(
+    results_by_query: Dict[str, List[Dict[str, Any]]],
+    token_budget: Optional[int] = None
+) -> str:
+    """
+    Pack de-duplicated snippets into a prompt section within the token budget
+
+    Results are taken round-robin across queries (every query's best result,
+    then every query's second...), so the budget covers all queries.
+    """
+    token_budget = token_budget or settings.MARKET_CONTEXT_TOKEN_BUDGET
+    queues = [list(results) for results in results_by_query.values()]
+
+    lines: List[str] = []
+    seen_links = set()
+    seen_words: List[set] = []
+    used = 0
+
+    while any(queues):
+        for queue in queues:
+            if not queue:
+                continue
+            item = queue.pop(0)
+
+            link = item.get("link") or ""
+            if link and link in seen_links:
+                continue
+            snippet = compress_snippet(item.get("snippet", ""))
+            title = compress_snippet(item.get("title", ""), max_chars=100)
+            words = set(normalize_title(f"{title} {snippet}").split())
+            if not words or is_near_duplicate(words, seen_words):
+                continue
+
+            host = urlsplit(link).hostname or ""
+            line = f"- {title}: {snippet}" + (f" ({host.removeprefix('www.')})" if host else "")
+            cost = count_tokens(line)
+            if used + cost > token_budget:
+                return "\n".join(lines)
+
+            lines.append(line)
+            seen_links.add(link)
+            seen_words.append(words)
+            used += cost
+
+    return "\n".join(lines)
+
+
+async def gather_search_context(
+    queries: List[str],
+    day: Optional[str] = None,
+    backend: Optional[SearchBackend] = None,
+    use_cache: bool = True
+) -> str:
+    """
+    Search all queries and return the packed context ("" if search is off)
+    """
+    backend = backend or get_search_backend()
+    if backend is None:
+        return ""
+
+    results = await search_queries(backend, queries, day=day, use_cache=use_cache)
+    context = build_search_context(results)
+    logger.info(
+        "Market search context gathered",
+        queries=len(queries),
+        results=sum(len(r) for r in results.values()),
+        snippets=context.count("\n") + 1 if context else 0,
+        tokens=count_tokens(context)
+    )
+    return context
@@ -0,0 +1,66 @@
+"""
+SQLAlchemy Models for Cron Jobs
+"""
+
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, JSON, Index
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class JobLock(Base):
+    """
+    JobLock model - lease held by the process currently running a job
+
+    A lease is valid until expires_at; the holder keeps extending it while
+    it works, so a crashed holder frees the job after one TTL.
+    """
+    __tablename__ = "job_locks"
+
+    name = Column(String(100), primary_key=True)  # e.g. cron:daily-analysis
+    owner = Column(String(200), nullable=False)  # host:pid:token of the holder
+    acquired_at = Column(TIMESTAMP, default=datetime.utcnow)
+    expires_at = Column(TIMESTAMP, nullable=False)
+
+    def __repr__(self):
+        return f"<JobLock(name={self.name}, owner={self.owner}, expires_at={self.expires_at})>"
+
+
+class CronRun(Base):
+    """
+    CronRun model - persisted status of each cron job run
+    """
+    __tablename__ = "cron_runs"
+
+    __table_args__ = (
+        Index("idx_cron_runs_job_started", "job", "started_at"),
+    )
+
+    # Primary Key
+    id = Column(Integer, primary_key=True)
+
+    job = Column(String(100), nullable=False)  # daily-analysis
+    status = Column(String(20), default="running", nullable=False)  # running, completed, failed
+    owner = Column(String(200), nullable=True)
+
+    started_at = Column(TIMESTAMP, default=datetime.utcnow)
+    completed_at = Column(TIMESTAMP, nullable=True)
+
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<CronRun(id={self.id}, job={self.job}, status={self.status})>"
+
+    def to_dict(self):
+        """Convert to dictionary for API responses"""
+        return {
+            "id": self.id,
+            "job": self.job,
+            "status": self.status,
+            "owner": self.owner,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "result": self.result,
+            "error": self.error
+        }
@@ -0,0 +1,105 @@
+"""
+Cron Repository - Data Access Layer
+Job leases and persisted run status
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import desc, delete, update
+from sqlalchemy.exc import IntegrityError
+from typing import Any, Dict, Optional
+from datetime import datetime, timedelta
+
+from app.cron.models import CronRun, JobLock
+
+
+class JobLockRepository:
+    """
+    Lease rows in job_locks
+
+    Every method is a single conditional statement, so concurrent callers
+    in other processes can't both succeed.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def try_acquire(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """Take the lease if it is free, expired, or already ours"""
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=ttl_seconds)
+
+        try:
+            self.db.add(JobLock(name=name, owner=owner, acquired_at=now, expires_at=expires_at))
+            self.db.commit()
+            return True
+        except IntegrityError:
+            self.db.rollback()
+
+        taken = self.db.execute(
+            update(JobLock)
+            .where(JobLock.name == name)
+            .where((JobLock.expires_at < now) | (JobLock.owner == owner))
+            .values(owner=owner, acquired_at=now, expires_at=expires_at)
+        ).rowcount
+        self.db.commit()
+        return bool(taken)
+
+    def renew(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """Extend our lease; False if it expired and someone else took it"""
+        renewed = self.db.execute(
+            update(JobLock)
+            .where(JobLock.name == name, JobLock.owner == owner)
+            .values(expires_at=datetime.utcnow() + timedelta(seconds=ttl_seconds))
+        ).rowcount
+        self.db.commit()
+        return bool(renewed)
+
+    def release(self, name: str, owner: str) -> None:
+        self.db.execute(delete(JobLock).where(JobLock.name == name, JobLock.owner == owner))
+        self.db.commit()
+
+    def get_holder(self, name: str) -> Optional[str]:
+        """Owner of an unexpired lease, or None"""
+        lock = self.db.query(JobLock).filter(JobLock.name == name).first()
+        if lock is None or lock.expires_at < datetime.utcnow():
+            return None
+        return lock.owner
+
+
+class CronRunRepository:
+    """
+    Data access layer for cron run status
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def start(self, job: str, owner: str) -> CronRun:
+        run = CronRun(job=job, owner=owner, status="running", started_at=datetime.utcnow())
+        self.db.add(run)
+        self.db.commit()
+        self.db.refresh(run)
+        return run
+
+    def finish(
+        self,
+        run_id: int,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> bool:
+        """Close a running run; False if it was already finished"""
+        finished = self.db.execute(
+            update(CronRun)
+            .where(CronRun.id == run_id, CronRun.status == "running")
+            .values(status=status, result=result, error=error, completed_at=datetime.utcnow())
+        ).rowcount
+        self.db.commit()
+        return bool(finished)
+
+    def get_latest(self, job: str, status: Optional[str] = None) -> Optional[CronRun]:
+        """Most recent run of a job (optionally with a given status)"""
+        query = self.db.query(CronRun).filter(CronRun.job == job)
+        if status:
+            query = query.filter(CronRun.status == status)
+        return query.order_by(desc(CronRun.started_at), desc(CronRun.id)).first()
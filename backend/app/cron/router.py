@@ -7,10 +7,10 @@ from fastapi import APIRouter, HTTPException, Query, Header
 from typing import Optional
 import os
 import asyncio
-from datetime import datetime
 import structlog
 
 from app.cron.daily_analysis import run_daily_analysis
+from app.cron.locks import get_lease, get_latest_run, run_with_lease, start_run
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -18,41 +18,28 @@ logger = structlog.get_logger()
 # Секретный ключ для защиты cron endpoints
 CRON_SECRET = os.getenv("CRON_SECRET", "your-secret-key-change-me")
 
-# Хранение статуса последнего запуска
-_last_run_status = {
-    "running": False,
-    "last_started": None,
-    "last_completed": None,
-    "last_result": None
-}
+DAILY_ANALYSIS_JOB = "daily-analysis"
 
 
-async def _run_analysis_background():
-    """Фоновая задача для генерации идей"""
-    global _last_run_status
+def _daily_analysis_lease():
+    return get_lease(f"cron:{DAILY_ANALYSIS_JOB}")
+
 
+async def _run_analysis_background(lease, run_id: int, ideas_count: int = 5):
+    """Фоновая задача для генерации идей"""
     try:
-        api_base_url = os.getenv(
-            "API_BASE_URL",
-            "https://ai-portfolio-api-czhs.onrender.com"
+        result = await run_with_lease(
+            lease, DAILY_ANALYSIS_JOB,
+            lambda: run_daily_analysis(ideas_count=ideas_count),
+            run_id=run_id
+        )
+        logger.info(
+            "✅ Background analysis completed",
+            ideas_saved=result.get("saved_count", 0),
+            ideas_generated=result.get("ideas_generated", 0)
         )
-
-        result = await run_daily_analysis(api_base_url=api_base_url)
-
-        _last_run_status["last_completed"] = datetime.now().isoformat()
-        _last_run_status["last_result"] = {
-            "success": True,
-            "ideas_saved": result.get("saved_count", 0),
-            "ideas_generated": result.get("ideas_generated", 0)
-        }
-        logger.info("✅ Background analysis completed", result=_last_run_status["last_result"])
-
     except Exception as e:
-        _last_run_status["last_completed"] = datetime.now().isoformat()
-        _last_run_status["last_result"] = {"success": False, "error": str(e)}
         logger.error("❌ Background analysis failed", error=str(e))
-    finally:
-        _last_run_status["running"] = False
 
 
 @router.post("/daily-analysis")
@@ -66,43 +53,48 @@ async def trigger_daily_analysis(
 
     По умолчанию запускает в фоне и сразу возвращает ответ (для cron-job.org).
     Добавьте ?wait=true чтобы дождаться результата.
+
+    Only one run at a time across all replicas: the run holds a lease
+    (CRON_LOCK_BACKEND) and its status is stored in cron_runs.
     """
-    global _last_run_status
+    lease = _daily_analysis_lease()
 
-    # Если уже запущено - не запускать повторно
-    if _last_run_status["running"]:
+    # Если уже запущено (в любом процессе) - не запускать повторно
+    if not await asyncio.to_thread(lease.acquire):
+        latest = await asyncio.to_thread(get_latest_run, DAILY_ANALYSIS_JOB)
         return {
             "success": True,
             "message": "Analysis already running",
-            "started_at": _last_run_status["last_started"]
+            "started_at": latest["started_at"] if latest else None
         }
 
-    _last_run_status["running"] = True
-    _last_run_status["last_started"] = datetime.now().isoformat()
+    try:
+        run_id = await asyncio.to_thread(start_run, DAILY_ANALYSIS_JOB, lease.owner)
+    except Exception:
+        await asyncio.to_thread(lease.release)
+        raise
 
     if wait:
         # Синхронный режим - ждём результат (для тестирования)
         try:
-            api_base_url = os.getenv(
-                "API_BASE_URL",
-                "https://ai-portfolio-api-czhs.onrender.com"
+            result = await run_with_lease(
+                lease, DAILY_ANALYSIS_JOB,
+                lambda: run_daily_analysis(ideas_count=ideas_count),
+                run_id=run_id
             )
-            result = await run_daily_analysis(api_base_url=api_base_url)
-            _last_run_status["running"] = False
-            _last_run_status["last_completed"] = datetime.now().isoformat()
-            _last_run_status["last_result"] = {"success": True, "data": result}
-            return {"success": True, "data": result}
+            return {"success": True, "run_id": run_id, "data": result}
         except Exception as e:
-            _last_run_status["running"] = False
             raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
     else:
         # Асинхронный режим - запускаем в фоне, сразу отвечаем
-        asyncio.create_task(_run_analysis_background())
+        asyncio.create_task(_run_analysis_background(lease, run_id, ideas_count))
 
+        latest = await asyncio.to_thread(get_latest_run, DAILY_ANALYSIS_JOB)
         return {
             "success": True,
             "message": "Analysis started in background",
-            "started_at": _last_run_status["last_started"],
+            "run_id": run_id,
+            "started_at": latest["started_at"] if latest else None,
             "check_status": "/api/v1/cron/status"
         }
 
@@ -112,26 +104,46 @@ async def cron_status():
     """
     Проверить статус cron системы и последний запуск
     """
+    latest = await asyncio.to_thread(get_latest_run, DAILY_ANALYSIS_JOB, _daily_analysis_lease())
+
     return {
         "status": "active",
         "scheduled_tasks": [
             {
-                "name": "daily-analysis",
+                "name": DAILY_ANALYSIS_JOB,
                 "schedule": "0 9 * * *",
                 "description": "Ежедневный анализ рынка и генерация идей в 9:00 МСК"
             }
         ],
         "openai_configured": bool(os.getenv("OPENAI_API_KEY")),
-        "api_base_url": os.getenv("API_BASE_URL", "https://ai-portfolio-api-czhs.onrender.com"),
         "last_run": {
-            "is_running": _last_run_status["running"],
-            "started_at": _last_run_status["last_started"],
-            "completed_at": _last_run_status["last_completed"],
-            "result": _last_run_status["last_result"]
+            "id": latest["id"] if latest else None,
+            "is_running": bool(latest) and latest["status"] == "running",
+            "status": latest["status"] if latest else None,
+            "owner": latest["owner"] if latest else None,
+            "started_at": latest["started_at"] if latest else None,
+            "completed_at": latest["completed_at"] if latest else None,
+            "result": _run_result(latest)
         }
     }
 
 
+def _run_result(run: Optional[dict]) -> Optional[dict]:
+    """Summary of a finished run, shaped like the previous in-memory status"""
+    if not run or run["status"] == "running":
+        return None
+    if run["status"] == "failed":
+        return {"success": False, "error": run["error"]}
+    result = run["result"] or {}
+    if result.get("status") == "error":
+        return {"success": False, "error": result.get("message")}
+    return {
+        "success": True,
+        "ideas_saved": result.get("saved_count", 0),
+        "ideas_generated": result.get("ideas_generated", 0)
+    }
+
+
 @router.post("/migrate")
 async def run_migration():
     """
@@ -2,6 +2,8 @@
 AI Business Portfolio Manager - FastAPI Application Entry Point
 """
 
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -13,6 +15,11 @@ from app.modules.trends import router as trends_router
 from app.modules.ideas import router as ideas_router
 from app.modules.agents import router as agents_router
 from app.cron.router import router as cron_router
+from app.agents.clients import close_async_clients
+from app.agents.job_queue import job_queue
+from app.agents.ledger import get_ledger
+from app.agents.runner import warm_up_agents
+from app.scrapers.runtime import close_runtime
 
 # Initialize structured logging
 logger = structlog.get_logger()
@@ -122,6 +129,13 @@ async def startup_event():
     init_db()
     logger.info("Database tables initialized")
 
+    # Background agent workers
+    if settings.JOB_QUEUE_ENABLED:
+        await job_queue.start()
+
+    # Pooled LLM / Reddit clients, so the first agent run starts warm
+    asyncio.get_running_loop().run_in_executor(None, warm_up_agents)
+
 
 # Shutdown Event
 @app.on_event("shutdown")
@@ -131,6 +145,13 @@ async def shutdown_event():
     """
     logger.info("Shutting down AI Business Portfolio Manager API")
 
+    await job_queue.stop()
+    await close_runtime()
+    await close_async_clients()
+
+    # Write the LLM calls still queued for the ledger
+    await asyncio.to_thread(get_ledger().flush)
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -2,7 +2,7 @@
 SQLAlchemy Models for Agent Executions
 """
 
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, DECIMAL, JSON
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, DECIMAL, JSON, Date, ForeignKey, Index, UniqueConstraint
 from datetime import datetime
 
 from app.core.database import Base
@@ -32,6 +32,11 @@ class AgentExecution(Base):
     )  # pending, running, completed, failed, cancelled
     error = Column(Text, nullable=True)
 
+    # Job queue (pending executions are picked up by the worker pool)
+    priority = Column(Integer, default=0, nullable=False)  # Higher runs first
+    queued_at = Column(TIMESTAMP, nullable=True)
+    heartbeat_at = Column(TIMESTAMP, nullable=True)  # Refreshed while running
+
     # Timing
     started_at = Column(TIMESTAMP, default=datetime.utcnow, index=True)
     completed_at = Column(TIMESTAMP, nullable=True)
@@ -39,11 +44,15 @@ class AgentExecution(Base):
 
     # Cost tracking
     llm_tokens_used = Column(Integer, default=0)
-    llm_cost_usd = Column(DECIMAL(10, 4), default=0.0)
+    llm_cost_usd = Column(DECIMAL(12, 6), default=0.0)
 
     # Additional metadata
     extra_metadata = Column(JSON, default=dict)
 
+    __table_args__ = (
+        Index("idx_executions_queue", "status", "priority", "id"),
+    )
+
     def __repr__(self):
         return f"<AgentExecution(id={self.id}, agent={self.agent_type}, status={self.status})>"
 
@@ -58,7 +67,9 @@ class AgentExecution(Base):
             "duration_seconds": self.duration_seconds,
             "llm_tokens_used": self.llm_tokens_used,
             "llm_cost_usd": float(self.llm_cost_usd) if self.llm_cost_usd else 0.0,
-            "error": self.error
+            "error": self.error,
+            "priority": self.priority or 0,
+            "queued_at": self.queued_at.isoformat() if self.queued_at else None
         }
 
     def to_dict_detailed(self):
@@ -70,3 +81,89 @@ class AgentExecution(Base):
             "metadata": self.extra_metadata or {}
         })
         return base_dict
+
+
+class AgentCheckpoint(Base):
+    """
+    AgentCheckpoint model - result of one completed step of an execution
+
+    Agents save a checkpoint per unit of paid work (e.g. "trend:42" with the
+    raw LLM analysis); a resumed execution reloads them and skips those steps.
+    """
+    __tablename__ = "agent_checkpoints"
+
+    __table_args__ = (
+        UniqueConstraint("execution_id", "step_key", name="uq_agent_checkpoints_step"),
+    )
+
+    # Primary Key
+    id = Column(Integer, primary_key=True)
+
+    # Foreign Key
+    execution_id = Column(Integer, ForeignKey("agent_executions.id", ondelete="CASCADE"), nullable=False)
+
+    # Step
+    step_key = Column(String(200), nullable=False)  # trend:42, idea_stored:42, ...
+    payload = Column(JSON, default=dict)
+    created_at = Column(TIMESTAMP, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<AgentCheckpoint(execution_id={self.execution_id}, step={self.step_key})>"
+
+
+class LLMSpend(Base):
+    """
+    LLMSpend model - LLM spend per day and budget scope
+
+    One row per (day, scope), incremented atomically after every LLM call,
+    so all workers and processes see the same running totals.
+    Scopes: "total" and "agent:<agent_type>".
+    """
+    __tablename__ = "llm_spend"
+
+    day = Column(Date, primary_key=True)
+    scope = Column(String(100), primary_key=True)
+
+    cost_usd = Column(DECIMAL(12, 6), default=0, nullable=False)
+    tokens = Column(Integer, default=0, nullable=False)
+    calls = Column(Integer, default=0, nullable=False)
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<LLMSpend(day={self.day}, scope={self.scope}, cost_usd={self.cost_usd})>"
+
+
+class LLMCall(Base):
+    """
+    LLMCall model - ledger row per LLM call (chat, stream or embedding)
+
+    Written in batches by app.agents.ledger; the source for cost and latency
+    breakdowns by agent, model and day.
+    """
+    __tablename__ = "llm_calls"
+
+    __table_args__ = (
+        Index("idx_llm_calls_created", "created_at"),
+        Index("idx_llm_calls_agent_created", "agent_type", "created_at"),
+        Index("idx_llm_calls_execution", "execution_id"),
+    )
+
+    # Primary Key
+    id = Column(Integer, primary_key=True)
+
+    # Foreign Key (calls outside an execution, e.g. cron analysis, have none)
+    execution_id = Column(Integer, ForeignKey("agent_executions.id", ondelete="SET NULL"), nullable=True)
+
+    # Call
+    agent_type = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False)
+    kind = Column(String(20), default="chat", nullable=False)  # chat, stream (tokens counted locally), embedding, hedge (estimated cancelled duplicate)
+    prompt_tokens = Column(Integer, default=0, nullable=False)
+    cached_tokens = Column(Integer, default=0, nullable=False)  # Part of prompt_tokens from the prompt cache
+    completion_tokens = Column(Integer, default=0, nullable=False)
+    latency_ms = Column(Integer)
+    cost_usd = Column(DECIMAL(14, 8), default=0, nullable=False)
+    created_at = Column(TIMESTAMP, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<LLMCall(id={self.id}, agent_type={self.agent_type}, model={self.model}, cost_usd={self.cost_usd})>"
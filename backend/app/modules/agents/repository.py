@@ -3,15 +3,23 @@ Agent Executions Repository - Data Access Layer
 Handles all database operations for agent executions
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from typing import List, Tuple, Optional
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, desc, select, update
+from typing import Any, Dict, List, Tuple, Optional, Iterable
+from datetime import date, datetime
 from decimal import Decimal
+import zlib
+from sqlalchemy.exc import IntegrityError
 
-from app.modules.agents.models import AgentExecution
+from app.modules.agents.models import AgentCheckpoint, AgentExecution, LLMCall, LLMSpend
 from app.modules.agents.schemas import AgentExecutionCreate, AgentExecutionUpdate
 
 
+def claim_lock_key(agent_type: str) -> int:
+    """Stable advisory lock key of an agent type's job claims"""
+    return zlib.crc32(f"agent_jobs:{agent_type}".encode("utf-8"))
+
+
 class AgentExecutionRepository:
     """
     Data access layer for Agent Executions
@@ -66,7 +74,9 @@ class AgentExecutionRepository:
             agent_type=execution_data.agent_type,
             input_data=execution_data.input_data,
             status=execution_data.status,
-            metadata=execution_data.metadata
+            priority=execution_data.priority,
+            queued_at=execution_data.queued_at,
+            extra_metadata=execution_data.metadata
         )
 
         self.db.add(execution)
@@ -168,3 +178,271 @@ class AgentExecutionRepository:
             .limit(limit)
             .all()
         )
+
+    def claim_next(self, limits: Dict[str, int]) -> Optional[AgentExecution]:
+        """
+        Atomically take the next pending execution whose agent type has room
+
+        Highest priority first, then FIFO. The conditional UPDATE makes the
+        claim safe across processes: only one claimer flips pending -> running,
+        and only while fewer than limits[agent_type] executions of that type
+        are running anywhere.
+
+        On PostgreSQL (READ COMMITTED) two claimers of different pending rows
+        of one type would each count the other's row as still pending, so
+        claims of a type are serialised with a transaction-level advisory
+        lock, taken before the count and released by the commit. SQLite
+        serialises all writers already.
+        """
+        if not limits:
+            return None
+
+        serialise = self.db.get_bind().dialect.name == "postgresql"
+
+        candidates = (
+            self.db.query(AgentExecution.id, AgentExecution.agent_type)
+            .filter(AgentExecution.status == "pending")
+            .filter(AgentExecution.agent_type.in_(list(limits)))
+            .order_by(desc(AgentExecution.priority), AgentExecution.id)
+            .limit(5)
+            .all()
+        )
+
+        running = aliased(AgentExecution)
+        now = datetime.utcnow()
+        for execution_id, agent_type in candidates:
+            if serialise:
+                self.db.execute(select(func.pg_advisory_xact_lock(claim_lock_key(agent_type))))
+            running_count = (
+                select(func.count(running.id))
+                .where(running.status == "running", running.agent_type == agent_type)
+                .scalar_subquery()
+            )
+            claimed = self.db.execute(
+                update(AgentExecution)
+                .where(
+                    AgentExecution.id == execution_id,
+                    AgentExecution.status == "pending",
+                    running_count < limits[agent_type]
+                )
+                .values(status="running", started_at=now, heartbeat_at=now)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self.db.commit()
+            if claimed:
+                return self.get_by_id(execution_id)
+
+        return None
+
+    def heartbeat(self, execution_ids: List[int]) -> None:
+        """Mark running executions as alive"""
+        if not execution_ids:
+            return
+        self.db.execute(
+            update(AgentExecution)
+            .where(AgentExecution.id.in_(execution_ids), AgentExecution.status == "running")
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        self.db.commit()
+
+    def requeue_stale(self, before: datetime) -> int:
+        """
+        Return queued executions whose worker stopped heart-beating to pending
+
+        Only executions that went through the queue (queued_at set) are touched.
+        """
+        count = self.db.execute(
+            update(AgentExecution)
+            .where(
+                AgentExecution.status == "running",
+                AgentExecution.queued_at.isnot(None),
+                (AgentExecution.heartbeat_at.is_(None)) | (AgentExecution.heartbeat_at < before)
+            )
+            .values(status="pending", heartbeat_at=None)
+        ).rowcount
+        self.db.commit()
+        return count
+
+    def count_by_status(self, status: str) -> dict:
+        """Count executions with a status, grouped by agent type"""
+        rows = (
+            self.db.query(AgentExecution.agent_type, func.count(AgentExecution.id))
+            .filter(AgentExecution.status == status)
+            .group_by(AgentExecution.agent_type)
+            .all()
+        )
+        return {agent_type: count for agent_type, count in rows}
+
+    def requeue(self, execution_id: int, statuses: Iterable[str] = ("failed", "cancelled")) -> bool:
+        """
+        Put a finished execution back in the queue (pending) to be resumed
+
+        Conditional on the current status, so a run can't be requeued twice.
+        """
+        count = self.db.execute(
+            update(AgentExecution)
+            .where(AgentExecution.id == execution_id, AgentExecution.status.in_(list(statuses)))
+            .values(
+                status="pending",
+                queued_at=datetime.utcnow(),
+                heartbeat_at=None,
+                completed_at=None,
+                error=None
+            )
+        ).rowcount
+        self.db.commit()
+        return bool(count)
+
+    def save_checkpoint(self, execution_id: int, step_key: str, payload: Dict[str, Any]) -> None:
+        """Store (or overwrite) the result of one step of an execution"""
+        checkpoint = (
+            self.db.query(AgentCheckpoint)
+            .filter(AgentCheckpoint.execution_id == execution_id, AgentCheckpoint.step_key == step_key)
+            .first()
+        )
+        if checkpoint is None:
+            self.db.add(AgentCheckpoint(execution_id=execution_id, step_key=step_key, payload=payload))
+        else:
+            checkpoint.payload = payload
+            checkpoint.created_at = datetime.utcnow()
+
+        self.db.commit()
+
+    def get_checkpoints(self, execution_id: int) -> Dict[str, Any]:
+        """Checkpoints of an execution as step_key -> payload"""
+        rows = (
+            self.db.query(AgentCheckpoint.step_key, AgentCheckpoint.payload)
+            .filter(AgentCheckpoint.execution_id == execution_id)
+            .all()
+        )
+        return {step_key: payload for step_key, payload in rows}
+
+
+class LLMSpendRepository:
+    """
+    Data access layer for daily LLM spend counters
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_spend(self, day: date, scopes: Iterable[str]) -> Dict[str, float]:
+        """Spent USD per scope for a day (0 for scopes without calls)"""
+        scopes = list(scopes)
+        rows = (
+            self.db.query(LLMSpend.scope, LLMSpend.cost_usd)
+            .filter(LLMSpend.day == day, LLMSpend.scope.in_(scopes))
+            .all()
+        )
+        spend = {scope: 0.0 for scope in scopes}
+        spend.update({scope: float(cost or 0) for scope, cost in rows})
+        return spend
+
+    def add_spend(self, day: date, scopes: Iterable[str], cost_usd: float, tokens: int) -> None:
+        """Atomically add one call's cost and tokens to each scope"""
+        for scope in scopes:
+            values = dict(
+                cost_usd=LLMSpend.cost_usd + Decimal(str(cost_usd)),
+                tokens=LLMSpend.tokens + tokens,
+                calls=LLMSpend.calls + 1,
+                updated_at=datetime.utcnow()
+            )
+            query = update(LLMSpend).where(LLMSpend.day == day, LLMSpend.scope == scope)
+            if not self.db.execute(query.values(**values)).rowcount:
+                try:
+                    self.db.add(LLMSpend(day=day, scope=scope, cost_usd=Decimal(str(cost_usd)), tokens=tokens, calls=1))
+                    self.db.flush()
+                except IntegrityError:
+                    # Another worker created the row first
+                    self.db.rollback()
+                    self.db.execute(query.values(**values))
+            self.db.commit()
+
+    def get_days(self, since: date) -> List[LLMSpend]:
+        """All counters since a day, newest first"""
+        return (
+            self.db.query(LLMSpend)
+            .filter(LLMSpend.day >= since)
+            .order_by(desc(LLMSpend.day), LLMSpend.scope)
+            .all()
+        )
+
+
+class LLMCallRepository:
+    """
+    Data access layer for the LLM call ledger
+    """
+
+    GROUP_COLUMNS = {
+        "agent": LLMCall.agent_type,
+        "model": LLMCall.model,
+        "day": func.date(LLMCall.created_at),
+    }
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def bulk_create(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert a batch of ledger rows in one statement"""
+        if not rows:
+            return 0
+        self.db.bulk_insert_mappings(LLMCall, rows)
+        self.db.commit()
+        return len(rows)
+
+    def aggregate(
+        self,
+        group_by: str,
+        since: datetime,
+        agent_type: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Calls, tokens, cost and latency per agent, model or day
+
+        Args:
+            group_by: "agent", "model" or "day"
+            since: Only calls made at or after this time
+        """
+        key = self.GROUP_COLUMNS[group_by]
+        query = (
+            self.db.query(
+                key.label("key"),
+                func.count(LLMCall.id),
+                func.sum(LLMCall.prompt_tokens),
+                func.sum(LLMCall.cached_tokens),
+                func.sum(LLMCall.completion_tokens),
+                func.sum(LLMCall.cost_usd),
+                func.avg(LLMCall.latency_ms),
+                func.max(LLMCall.latency_ms)
+            )
+            .filter(LLMCall.created_at >= since)
+        )
+        if agent_type:
+            query = query.filter(LLMCall.agent_type == agent_type)
+        if model:
+            query = query.filter(LLMCall.model == model)
+
+        rows = query.group_by(key).order_by(desc(func.sum(LLMCall.cost_usd))).all()
+        return [
+            {
+                group_by: str(row[0]),
+                "calls": row[1],
+                "prompt_tokens": int(row[2] or 0),
+                "cached_tokens": int(row[3] or 0),
+                "completion_tokens": int(row[4] or 0),
+                "cost_usd": float(row[5] or 0),
+                "avg_latency_ms": round(float(row[6]), 1) if row[6] is not None else None,
+                "max_latency_ms": row[7]
+            }
+            for row in rows
+        ]
+
+    def get_by_execution(self, execution_id: int) -> List[LLMCall]:
+        """Calls of one execution, in order"""
+        return (
+            self.db.query(LLMCall)
+            .filter(LLMCall.execution_id == execution_id)
+            .order_by(LLMCall.id)
+            .all()
+        )
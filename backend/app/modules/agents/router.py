@@ -3,12 +3,16 @@ Agents API Router
 Endpoints for AI agent management and execution
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from app.core.database import get_db
 from app.modules.agents.service import AgentExecutionService
+from app.modules.agents.streaming import execution_events, format_sse
 from app.modules.agents.schemas import (
     RunAgentRequest, RunAgentResponse,
     AgentExecutionOut, AgentExecutionDetailedOut,
@@ -27,13 +31,17 @@ async def get_agents_status(db: Session = Depends(get_db)):
     return service.get_stats()
 
 
-@router.post("/run", response_model=RunAgentResponse)
+@router.post("/run", response_model=RunAgentResponse, status_code=status.HTTP_202_ACCEPTED)
 async def run_agent(
     request: RunAgentRequest,
     db: Session = Depends(get_db)
 ):
     """
-    Trigger an AI agent execution
+    Queue an AI agent execution
+
+    Returns immediately with the execution id; the run is picked up by the
+    background worker pool (higher priority first, limited per agent type).
+    Poll /api/v1/agents/executions/{execution_id} for progress and results.
 
     Available agents:
     - trend_scout: Discovers trends from data sources
@@ -41,21 +49,18 @@ async def run_agent(
     - dev_agent: Generates code for business MVP (not yet implemented)
     - marketing_agent: Creates marketing strategy (not yet implemented)
     - sales_agent: Automates sales processes (not yet implemented)
-
-    NOTE: Currently runs synchronously. Will be moved to Celery for async execution.
     """
-    from app.agents.runner import run_agent_async
+    from app.agents.job_queue import enqueue
 
     try:
-        # Run the agent asynchronously (but wait for completion)
-        # TODO: Move to Celery background task for true async execution
-        execution = await run_agent_async(db, request.agent_type, request.params)
+        execution = enqueue(db, request.agent_type, request.params, priority=request.priority)
 
         return RunAgentResponse(
             job_id=f"{request.agent_type}-{execution.id}",
+            execution_id=execution.id,
             agent_type=request.agent_type,
             status=execution.status,
-            message=f"{request.agent_type} agent {execution.status}. Check /api/v1/agents/executions/{execution.id} for details."
+            message=f"{request.agent_type} agent queued. Check /api/v1/agents/executions/{execution.id} for details."
         )
 
     except NotImplementedError as e:
@@ -68,11 +73,52 @@ async def run_agent(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Agent execution failed: {str(e)}"
-        )
+
+
+@router.get("/queue")
+async def get_queue_status():
+    """
+    Worker pool usage and number of pending executions per agent type
+    """
+    from app.agents.job_queue import job_queue
+
+    return await asyncio.to_thread(job_queue.stats)
+
+
+@router.get("/budget")
+async def get_llm_budget(
+    days: int = Query(7, ge=1, le=90),
+    db: Session = Depends(get_db)
+):
+    """
+    LLM spend budgets and daily spend per scope (all agents, per agent type)
+    """
+    service = AgentExecutionService(db)
+    return service.get_budget(days)
+
+
+@router.get("/llm-usage")
+async def get_llm_usage(
+    group_by: str = Query("agent", pattern="^(agent|model|day)$"),
+    days: int = Query(7, ge=1, le=90),
+    agent_type: Optional[str] = None,
+    model: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    LLM calls, tokens, cost and latency from the per-call ledger
+
+    Parameters:
+    - group_by: agent, model or day
+    - days: Window in days
+    - agent_type / model: Optional filters
+
+    Calls show up after at most LLM_LEDGER_FLUSH_SECONDS. Streamed calls
+    (kind "stream") carry no provider usage: their tokens are counted
+    locally with the tokenizer, so they can be off by a few percent.
+    """
+    service = AgentExecutionService(db)
+    return service.get_llm_usage(group_by, days, agent_type=agent_type, model=model)
 
 
 @router.get("/executions", response_model=AgentExecutionList)
@@ -119,3 +165,121 @@ async def get_execution_detail(
         )
 
     return execution
+
+
+@router.get("/executions/{execution_id}/llm-calls")
+async def get_execution_llm_calls(
+    execution_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Every LLM call of an execution (model, tokens, latency, cost)
+    """
+    service = AgentExecutionService(db)
+    return service.get_execution_llm_calls(execution_id)
+
+
+@router.post(
+    "/executions/{execution_id}/resume",
+    response_model=RunAgentResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def resume_execution(
+    execution_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Queue a failed or cancelled execution again
+
+    Steps that the earlier attempt completed (e.g. trends already analysed
+    by the LLM, ideas already stored) are restored from checkpoints, so the
+    retry only pays for the remaining work. Tokens and cost keep adding up
+    on the same execution.
+    """
+    from app.agents.job_queue import resume
+
+    try:
+        execution = resume(db, execution_id)
+    except LookupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+    return RunAgentResponse(
+        job_id=f"{execution.agent_type}-{execution.id}",
+        execution_id=execution.id,
+        agent_type=execution.agent_type,
+        status=execution.status,
+        message=f"{execution.agent_type} agent resumed. Check /api/v1/agents/executions/{execution.id} for details."
+    )
+
+
+@router.get("/executions/{execution_id}/events")
+async def stream_execution_events(
+    execution_id: int,
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    db: Session = Depends(get_db)
+):
+    """
+    Server-Sent Events stream of an execution's progress
+
+    Event types: queued, started, stage, trends_stored, trend_analyzed,
+    idea_stored, completed, failed. Every event carries tokens_used and
+    cost_usd so far. The stream ends after completed/failed; reconnecting
+    with Last-Event-ID resumes after that event.
+    """
+    service = AgentExecutionService(db)
+    if not service.get_execution(execution_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Agent execution with id {execution_id} not found"
+        )
+
+    async def stream():
+        async for event in execution_events(execution_id, after_id=last_event_id or 0):
+            yield format_sse(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/executions/{execution_id}/ws")
+async def execution_events_websocket(
+    websocket: WebSocket,
+    execution_id: int,
+    after_id: int = 0
+):
+    """
+    WebSocket stream of an execution's progress (same events as /events)
+
+    Sends one JSON message per event and {"type": "ping"} on idle; closes
+    after completed/failed.
+    """
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        exists = AgentExecutionService(db).get_execution(execution_id) is not None
+    finally:
+        db.close()
+
+    if not exists:
+        await websocket.close(code=4404)
+        return
+
+    await websocket.accept()
+    try:
+        async for event in execution_events(execution_id, after_id=after_id):
+            await websocket.send_json(event if event is not None else {"type": "ping"})
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
@@ -18,6 +18,8 @@ class AgentExecutionCreate(AgentExecutionBase):
     """Schema for creating new agent execution"""
     input_data: Dict[str, Any] = Field(default_factory=dict)
     status: str = Field(default="pending")
+    priority: int = 0
+    queued_at: Optional[datetime] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
     @field_validator('status')
@@ -42,6 +44,7 @@ class AgentExecutionUpdate(BaseModel):
     status: Optional[str] = None
     output_data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     duration_seconds: Optional[int] = None
     llm_tokens_used: Optional[int] = None
@@ -63,6 +66,8 @@ class AgentExecutionOut(AgentExecutionBase):
     """Schema for agent execution output (simple)"""
     id: int
     status: str
+    priority: int = 0
+    queued_at: Optional[datetime] = None
     started_at: datetime
     completed_at: Optional[datetime]
     duration_seconds: Optional[int]
@@ -78,6 +83,8 @@ class AgentExecutionDetailedOut(AgentExecutionBase):
     """Schema for agent execution output with full data"""
     id: int
     status: str
+    priority: int = 0
+    queued_at: Optional[datetime] = None
     input_data: Dict[str, Any]
     output_data: Dict[str, Any]
     started_at: datetime
@@ -86,7 +93,7 @@ class AgentExecutionDetailedOut(AgentExecutionBase):
     llm_tokens_used: int
     llm_cost_usd: Decimal
     error: Optional[str]
-    metadata: Dict[str, Any]
+    metadata: Dict[str, Any] = Field(default_factory=dict, validation_alias="extra_metadata")
 
     class Config:
         from_attributes = True
@@ -116,6 +123,7 @@ class RunAgentRequest(BaseModel):
     """Request model for running an agent"""
     agent_type: str = Field(..., min_length=3, max_length=50)
     params: Dict[str, Any] = Field(default_factory=dict)
+    priority: int = Field(default=0, ge=-10, le=10, description="Higher runs first")
 
     @field_validator('agent_type')
     @classmethod
@@ -129,6 +137,7 @@ class RunAgentRequest(BaseModel):
 class RunAgentResponse(BaseModel):
     """Response for running an agent"""
     job_id: str
+    execution_id: int
     agent_type: str
     status: str
     message: str
@@ -3,10 +3,12 @@ Agent Executions Service - Business Logic Layer
 """
 
 from sqlalchemy.orm import Session
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Union
+from datetime import datetime, timedelta
 import structlog
 
-from app.modules.agents.repository import AgentExecutionRepository
+from app.core.config import settings
+from app.modules.agents.repository import AgentExecutionRepository, LLMCallRepository, LLMSpendRepository
 from app.modules.agents.schemas import (
     AgentExecutionCreate, AgentExecutionUpdate,
     AgentExecutionOut, AgentExecutionDetailedOut,
@@ -107,3 +109,73 @@ class AgentExecutionService:
         """Get aggregated statistics"""
         stats = self.repository.get_stats()
         return AgentStats(**stats)
+
+    def get_budget(self, days: int = 7) -> Dict[str, Any]:
+        """LLM budgets and spend per day and scope (total, agent:<type>)"""
+        today = datetime.utcnow().date()
+        rows = LLMSpendRepository(self.db).get_days(today - timedelta(days=days - 1))
+
+        spend: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            spend.setdefault(row.day.isoformat(), {})[row.scope] = {
+                "cost_usd": float(row.cost_usd or 0),
+                "tokens": row.tokens,
+                "calls": row.calls
+            }
+
+        return {
+            "enabled": settings.LLM_BUDGET_ENABLED,
+            "limits": {
+                "execution_usd": settings.LLM_BUDGET_EXECUTION_USD,
+                "daily_usd": settings.LLM_BUDGET_DAILY_USD,
+                "agent_daily_usd": settings.llm_budget_agent_daily,
+                "degrade_ratio": settings.LLM_BUDGET_DEGRADE_RATIO,
+                "degrade_models": settings.llm_degrade_models
+            },
+            "today": spend.get(today.isoformat(), {}),
+            "days": spend
+        }
+
+    def get_llm_usage(
+        self,
+        group_by: str = "agent",
+        days: int = 7,
+        agent_type: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        LLM calls, tokens, cost and latency from the call ledger
+
+        Args:
+            group_by: "agent", "model" or "day"
+            days: Window in days, ending now
+        """
+        since = datetime.utcnow() - timedelta(days=days)
+        groups = LLMCallRepository(self.db).aggregate(group_by, since, agent_type=agent_type, model=model)
+        return {
+            "group_by": group_by,
+            "days": days,
+            "total": {
+                "calls": sum(g["calls"] for g in groups),
+                "tokens": sum(g["prompt_tokens"] + g["completion_tokens"] for g in groups),
+                "cost_usd": sum(g["cost_usd"] for g in groups)
+            },
+            "groups": groups
+        }
+
+    def get_execution_llm_calls(self, execution_id: int) -> list:
+        """Ledger rows of one execution"""
+        return [
+            {
+                "id": call.id,
+                "model": call.model,
+                "kind": call.kind,
+                "prompt_tokens": call.prompt_tokens,
+                "cached_tokens": call.cached_tokens,
+                "completion_tokens": call.completion_tokens,
+                "latency_ms": call.latency_ms,
+                "cost_usd": float(call.cost_usd or 0),
+                "created_at": call.created_at.isoformat() if call.created_at else None
+            }
+            for call in LLMCallRepository(self.db).get_by_execution(execution_id)
+        ]
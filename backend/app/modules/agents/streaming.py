@@ -0,0 +1,101 @@
+"""
+Execution Event Streaming
+Turns the execution event bus into SSE / WebSocket streams
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.events import TERMINAL_EVENTS, execution_channel, get_event_bus
+from app.modules.agents.repository import AgentExecutionRepository
+
+
+def terminal_snapshot(execution_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Terminal event built from the execution row, if the run has finished
+
+    Covers runs whose live events were not seen by this process (finished
+    elsewhere without Redis, or history already evicted).
+    """
+    db = SessionLocal()
+    try:
+        execution = AgentExecutionRepository(db).get_by_id(execution_id)
+        if execution is None or execution.status not in TERMINAL_EVENTS:
+            return None
+        return {
+            "execution_id": execution_id,
+            "type": execution.status,
+            "ts": execution.completed_at.isoformat() if execution.completed_at else None,
+            "tokens_used": execution.llm_tokens_used or 0,
+            "cost_usd": float(execution.llm_cost_usd or 0),
+            "data": {
+                "duration_seconds": execution.duration_seconds,
+                "output": execution.output_data or {},
+                "error": execution.error
+            }
+        }
+    finally:
+        db.close()
+
+
+async def execution_events(
+    execution_id: int,
+    after_id: int = 0,
+    keepalive: Optional[float] = None
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Events of an execution: history after `after_id`, then live
+
+    Yields None every `keepalive` seconds of silence, and stops after the
+    terminal event (completed / failed / cancelled). The execution row is
+    read on a thread, off the event loop.
+    """
+    keepalive = keepalive or settings.EVENT_KEEPALIVE_SECONDS
+    subscription = get_event_bus().subscribe(execution_channel(execution_id), after_id)
+
+    # Already finished: flush whatever history there is, then close quickly
+    timeout = 0.1 if await asyncio.to_thread(terminal_snapshot, execution_id) else keepalive
+
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(subscription.__anext__())
+
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if done:
+                event = pending.result()
+                pending = None
+                yield event
+                if event["type"] in TERMINAL_EVENTS:
+                    return
+                continue
+
+            final = await asyncio.to_thread(terminal_snapshot, execution_id)
+            if final is not None:
+                yield final
+                return
+
+            yield None
+
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        await subscription.aclose()
+
+
+def format_sse(event: Optional[Dict[str, Any]]) -> str:
+    """Serialize an event (or a keepalive for None) as a Server-Sent Events frame"""
+    if event is None:
+        return ": keepalive\n\n"
+
+    lines = []
+    if event.get("id") is not None:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event, default=str)}")
+    return "\n".join(lines) + "\n\n"
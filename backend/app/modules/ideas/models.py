@@ -5,10 +5,24 @@ SQLAlchemy Models for Ideas
 from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, CheckConstraint, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime
+import re
+import unicodedata
 
 from app.core.database import Base
 
 
+def normalize_title(title: str) -> str:
+    """
+    Duplicate-detection key of an idea title
+
+    Case-folded, NFKC-normalised, punctuation dropped, whitespace collapsed:
+    "AI-помощник  для HR!" and "ai помощник для hr" give the same key.
+    """
+    title = unicodedata.normalize("NFKC", title or "").casefold()
+    title = re.sub(r"[^\w\s]", " ", title)
+    return " ".join(title.split())[:500]
+
+
 class Idea(Base):
     """
     Idea model - business ideas analyzed from trends
@@ -23,6 +37,7 @@ class Idea(Base):
 
     # Content
     title = Column(String(500), nullable=False)
+    normalized_title = Column(String(500), nullable=True, index=True)  # normalize_title(title), for dedup
     description = Column(Text, nullable=True)
     emoji = Column(String(10), nullable=True, default="💡")  # Emoji for card
     source = Column(String(200), nullable=True, default="AI Analysis")  # Trend source
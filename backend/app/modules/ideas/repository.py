@@ -5,9 +5,9 @@ Handles all database operations for ideas
 
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, asc, case
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 
-from app.modules.ideas.models import Idea
+from app.modules.ideas.models import Idea, normalize_title
 from app.modules.ideas.schemas import IdeaCreate, IdeaUpdate
 
 
@@ -88,8 +88,49 @@ class IdeaRepository:
 
     def create(self, idea_data: IdeaCreate) -> Idea:
         """Create new idea"""
-        idea = Idea(
+        idea = self._build(idea_data)
+
+        self.db.add(idea)
+        self.db.commit()
+        self.db.refresh(idea)
+
+        return idea
+
+    def bulk_create(self, ideas_data: List[IdeaCreate]) -> List[int]:
+        """
+        Create many ideas in one transaction
+
+        Returns:
+            New idea IDs, in input order
+        """
+        ideas = [self._build(idea_data) for idea_data in ideas_data]
+
+        self.db.add_all(ideas)
+        self.db.flush()
+        ids = [i.id for i in ideas]  # Read before commit expires the objects
+        self.db.commit()
+        return ids
+
+    def find_by_normalized_titles(self, titles: Iterable[str]) -> Dict[str, int]:
+        """
+        Map normalized title -> id of existing ideas with any of the titles
+
+        One query on the normalized_title index.
+        """
+        keys = list({normalize_title(t) for t in titles})
+        if not keys:
+            return {}
+        rows = (
+            self.db.query(Idea.normalized_title, Idea.id)
+            .filter(Idea.normalized_title.in_(keys))
+            .all()
+        )
+        return {key: idea_id for key, idea_id in rows}
+
+    def _build(self, idea_data: IdeaCreate) -> Idea:
+        return Idea(
             title=idea_data.title,
+            normalized_title=normalize_title(idea_data.title),
             description=idea_data.description,
             emoji=idea_data.emoji,
             source=idea_data.source,
@@ -113,12 +154,6 @@ class IdeaRepository:
             status=idea_data.status
         )
 
-        self.db.add(idea)
-        self.db.commit()
-        self.db.refresh(idea)
-
-        return idea
-
     def update(self, idea_id: int, idea_data: IdeaUpdate) -> Optional[Idea]:
         """Update existing idea"""
         idea = self.get_by_id(idea_id)
@@ -129,6 +164,8 @@ class IdeaRepository:
         update_data = idea_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(idea, field, value)
+        if "title" in update_data:
+            idea.normalized_title = normalize_title(idea.title)
 
         self.db.commit()
         self.db.refresh(idea)
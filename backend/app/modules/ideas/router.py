@@ -60,6 +60,15 @@ async def get_ideas(
     )
 
 
+@router.get("/stats", response_model=IdeaStats)
+async def get_ideas_stats(db: Session = Depends(get_db)):
+    """
+    Get aggregated statistics for ideas
+    """
+    service = IdeaService(db)
+    return service.get_stats()
+
+
 @router.get("/{idea_id}", response_model=IdeaDetailedOut)
 async def get_idea(
     idea_id: int,
@@ -131,15 +140,6 @@ async def delete_idea(
         )
 
 
-@router.get("/stats", response_model=IdeaStats)
-async def get_ideas_stats(db: Session = Depends(get_db)):
-    """
-    Get aggregated statistics for ideas
-    """
-    service = IdeaService(db)
-    return service.get_stats()
-
-
 @router.post("/analyze")
 async def analyze_trends(
     request: AnalyzeRequest,
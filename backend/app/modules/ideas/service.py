@@ -3,7 +3,7 @@ Ideas Service - Business Logic Layer
 """
 
 from sqlalchemy.orm import Session
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 import structlog
 
 from app.modules.ideas.repository import IdeaRepository
@@ -11,7 +11,7 @@ from app.modules.ideas.schemas import (
     IdeaCreate, IdeaUpdate, IdeaOut, IdeaDetailedOut,
     IdeaList, IdeaStats, IdeaScoresDetailed, ScoreDetail
 )
-from app.modules.ideas.models import Idea
+from app.modules.ideas.models import Idea, normalize_title
 
 logger = structlog.get_logger()
 
@@ -143,6 +143,51 @@ class IdeaService:
 
         return IdeaOut.model_validate(idea)
 
+    def create_ideas_bulk(self, ideas_data: List[IdeaCreate]) -> List[Tuple[int, bool]]:
+        """
+        Create a batch of ideas, skipping duplicates by normalized title
+
+        Duplicates are checked against the whole table (indexed
+        normalized_title) and within the batch; new ideas are inserted in
+        one transaction.
+
+        Returns:
+            (idea_id, created) for every input item, in input order
+        """
+        if not ideas_data:
+            return []
+
+        existing = self.repository.find_by_normalized_titles(i.title for i in ideas_data)
+
+        # Per item: (existing_id, index into to_create, created)
+        plan: List[Tuple[Optional[int], Optional[int], bool]] = []
+        to_create: List[IdeaCreate] = []
+        pending = {}
+
+        for idea_data in ideas_data:
+            key = normalize_title(idea_data.title)
+            if key in existing:
+                plan.append((existing[key], None, False))
+            elif key in pending:
+                plan.append((None, pending[key], False))  # Duplicate inside the batch
+            else:
+                pending[key] = len(to_create)
+                plan.append((None, pending[key], True))
+                to_create.append(idea_data)
+
+        new_ids = self.repository.bulk_create(to_create) if to_create else []
+
+        logger.info(
+            "Ideas created in bulk",
+            received=len(ideas_data),
+            created=len(new_ids)
+        )
+
+        return [
+            (existing_id if existing_id is not None else new_ids[index], created)
+            for existing_id, index, created in plan
+        ]
+
     def update_idea(self, idea_id: int, idea_data: IdeaUpdate) -> Optional[IdeaOut]:
         """Update existing idea"""
         idea = self.repository.update(idea_id, idea_data)
@@ -2,7 +2,7 @@
 SQLAlchemy Models for Trends
 """
 
-from sqlalchemy import Column, Integer, String, Text, Float, TIMESTAMP, JSON, func
+from sqlalchemy import Column, Integer, String, Text, Float, TIMESTAMP, JSON, ForeignKey, Index, func
 from datetime import datetime
 
 from app.core.database import Base
@@ -29,7 +29,12 @@ class Trend(Base):
 
     # Metrics
     engagement_score = Column(Integer, default=0, index=True)
-    velocity = Column(Float, default=0.0)  # Growth rate
+    velocity = Column(Float, default=0.0)  # Growth rate (EWMA of engagement per hour)
+    acceleration = Column(Float, default=0.0)  # EWMA of velocity change per hour
+    last_snapshot_at = Column(TIMESTAMP, nullable=True, index=True)
+
+    # Set once idea analysis has looked at the trend, whatever the outcome
+    analyzed_at = Column(TIMESTAMP, nullable=True, index=True)
 
     # Timestamps
     discovered_at = Column(TIMESTAMP, default=datetime.utcnow, index=True)
@@ -52,6 +57,34 @@ class Trend(Base):
             "tags": self.tags or [],
             "engagement_score": self.engagement_score,
             "velocity": self.velocity,
+            "acceleration": self.acceleration or 0.0,
             "discovered_at": self.discovered_at.isoformat() if self.discovered_at else None,
             "metadata": self.extra_metadata or {}
         }
+
+
+class TrendSnapshot(Base):
+    """
+    TrendSnapshot model - append-only engagement time-series for a trend
+
+    One row is written per trend on every scrape; rows are never updated.
+    """
+    __tablename__ = "trend_snapshots"
+    __table_args__ = (
+        Index("idx_trend_snapshots_trend_ts", "trend_id", "ts"),
+    )
+
+    # Primary Key
+    id = Column(Integer, primary_key=True)
+
+    # Foreign Key
+    trend_id = Column(Integer, ForeignKey("trends.id", ondelete="CASCADE"), nullable=False)
+
+    # Observation
+    ts = Column(TIMESTAMP, default=datetime.utcnow, nullable=False)
+    upvotes = Column(Integer, default=0)
+    comments = Column(Integer, default=0)
+    awards = Column(Integer, default=0)
+
+    def __repr__(self):
+        return f"<TrendSnapshot(trend_id={self.trend_id}, ts={self.ts}, upvotes={self.upvotes})>"
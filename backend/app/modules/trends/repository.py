@@ -3,10 +3,11 @@ Trends Repository - Data Access Layer
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, insert, update
 from typing import List, Optional, Dict
+from datetime import datetime
 
-from app.modules.trends.models import Trend
+from app.modules.trends.models import Trend, TrendSnapshot
 from app.modules.trends.schemas import TrendCreate, TrendUpdate
 
 
@@ -189,3 +190,146 @@ class TrendRepository:
             query = query.filter(Trend.url == url)
 
         return query.first()
+
+    def bulk_create(self, trends_data: List[TrendCreate]) -> List[int]:
+        """
+        Create many trends in one transaction
+
+        Returns:
+            New trend IDs, in input order
+        """
+        trends = []
+        for trend_data in trends_data:
+            data = trend_data.model_dump()
+            data['extra_metadata'] = data.pop('metadata', {})
+            trends.append(Trend(**data))
+
+        self.db.add_all(trends)
+        self.db.flush()
+        ids = [t.id for t in trends]  # Read before commit expires the objects
+        self.db.commit()
+        return ids
+
+    def find_by_titles(self, titles: List[str]) -> List[tuple]:
+        """
+        Get (id, title, url) of existing trends with any of the given titles
+
+        Used for batched duplicate detection.
+        """
+        if not titles:
+            return []
+        return (
+            self.db.query(Trend.id, Trend.title, Trend.url)
+            .filter(Trend.title.in_(titles))
+            .all()
+        )
+
+    def bulk_update(self, rows: List[Dict]) -> int:
+        """
+        Update many trends by primary key in one executemany
+
+        Args:
+            rows: Dicts with "id" plus the columns to set
+        """
+        if rows:
+            self.db.execute(update(Trend), rows)
+        self.db.commit()
+        return len(rows)
+
+    def get_by_ids(self, trend_ids: List[int]) -> List[Trend]:
+        """Get several trends in one query"""
+        if not trend_ids:
+            return []
+        return self.db.query(Trend).filter(Trend.id.in_(trend_ids)).all()
+
+    def mark_analyzed(self, trend_ids: List[int], analyzed_at: Optional[datetime] = None) -> int:
+        """Set analyzed_at on several trends in one UPDATE"""
+        if not trend_ids:
+            return 0
+        updated = (
+            self.db.query(Trend)
+            .filter(Trend.id.in_(trend_ids))
+            .update({Trend.analyzed_at: analyzed_at or datetime.utcnow()}, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated
+
+    def append_snapshots(self, snapshots: List[Dict]) -> int:
+        """
+        Append engagement snapshots in a single bulk INSERT
+
+        Also commits any pending changes on the session (e.g. velocity
+        updates made by the service), so both land in one transaction.
+        """
+        if snapshots:
+            self.db.execute(insert(TrendSnapshot), snapshots)
+        self.db.commit()
+        return len(snapshots)
+
+    def get_series(
+        self,
+        trend_id: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 1000
+    ) -> List[tuple]:
+        """
+        Get (ts, upvotes, comments, awards) rows for a trend, oldest first
+
+        Served by the (trend_id, ts) composite index.
+        """
+        query = self.db.query(
+            TrendSnapshot.ts,
+            TrendSnapshot.upvotes,
+            TrendSnapshot.comments,
+            TrendSnapshot.awards
+        ).filter(TrendSnapshot.trend_id == trend_id)
+
+        if since:
+            query = query.filter(TrendSnapshot.ts >= since)
+
+        if until:
+            query = query.filter(TrendSnapshot.ts <= until)
+
+        return query.order_by(TrendSnapshot.ts).limit(limit).all()
+
+    def get_rising(
+        self,
+        since: datetime,
+        limit: int = 20,
+        min_velocity: float = 0.0
+    ) -> List[Trend]:
+        """
+        Get trends that are accelerating, computed entirely in SQL
+
+        Only trends with a snapshot newer than `since` are considered.
+        """
+        return (
+            self.db.query(Trend)
+            .filter(Trend.last_snapshot_at >= since)
+            .filter(Trend.velocity > min_velocity)
+            .filter(Trend.acceleration > 0)
+            .order_by(desc(Trend.acceleration), desc(Trend.velocity))
+            .limit(limit)
+            .all()
+        )
+
+    def get_unanalyzed(self, limit: int = 10, min_engagement: Optional[int] = None) -> List[Trend]:
+        """
+        Get trends idea analysis has not looked at yet, most engaging and fastest first
+
+        Filters on the analyzed_at marker rather than on ideas: cluster
+        members, low-scoring and triaged-out trends never get an idea row
+        but must not be picked again.
+        """
+        query = self.db.query(Trend).filter(Trend.analyzed_at.is_(None))
+
+        if min_engagement is not None:
+            query = query.filter(Trend.engagement_score >= min_engagement)
+
+        return (
+            query
+            .order_by(desc(Trend.engagement_score), desc(Trend.velocity), Trend.id)
+            .limit(limit)
+            .all()
+        )
@@ -5,11 +5,12 @@ Endpoints for trend discovery and management
 
 from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
+from datetime import datetime
 
 from app.core.database import get_db
 from app.modules.trends.service import TrendService
-from app.modules.trends.schemas import TrendCreate, TrendUpdate, TrendOut, TrendList, TrendStats
+from app.modules.trends.schemas import TrendCreate, TrendUpdate, TrendOut, TrendList, TrendStats, TrendSeries
 
 router = APIRouter()
 
@@ -43,6 +44,36 @@ async def get_trends(
     )
 
 
+@router.get("/rising", response_model=List[TrendOut])
+async def get_rising_trends(
+    limit: int = Query(20, ge=1, le=100),
+    window_hours: Optional[int] = Query(None, ge=1, le=24 * 30),
+    min_velocity: float = Query(0.0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    Get accelerating trends
+
+    Ranked by smoothed acceleration, then velocity, from snapshot history.
+
+    Parameters:
+    - limit: Maximum number of trends
+    - window_hours: Only trends re-scraped within this window (default from settings)
+    - min_velocity: Minimum engagement-per-hour velocity
+    """
+    service = TrendService(db)
+    return service.get_rising(limit=limit, window_hours=window_hours, min_velocity=min_velocity)
+
+
+@router.get("/stats", response_model=TrendStats)
+async def get_trends_stats(db: Session = Depends(get_db)):
+    """
+    Get aggregated statistics for trends
+    """
+    service = TrendService(db)
+    return service.get_stats()
+
+
 @router.get("/{trend_id}", response_model=TrendOut)
 async def get_trend(
     trend_id: int,
@@ -63,13 +94,32 @@ async def get_trend(
     return trend
 
 
-@router.get("/stats", response_model=TrendStats)
-async def get_trends_stats(db: Session = Depends(get_db)):
+@router.get("/{trend_id}/series", response_model=TrendSeries)
+async def get_trend_series(
+    trend_id: int,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db)
+):
     """
-    Get aggregated statistics for trends
+    Get engagement time-series for a trend
+
+    Parameters:
+    - since: Start of range (inclusive)
+    - until: End of range (inclusive)
+    - limit: Maximum number of points
     """
     service = TrendService(db)
-    return service.get_stats()
+    series = service.get_series(trend_id, since=since, until=until, limit=limit)
+
+    if not series:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Trend with id {trend_id} not found"
+        )
+
+    return series
 
 
 @router.post("/", response_model=TrendOut, status_code=status.HTTP_201_CREATED)
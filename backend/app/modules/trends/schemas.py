@@ -12,7 +12,7 @@ class TrendBase(BaseModel):
     title: str = Field(..., min_length=5, max_length=500)
     description: Optional[str] = None
     url: Optional[str] = None
-    source: str = Field(..., pattern="^(reddit|google_trends|telegram|vk|youtube|instagram|facebook|product_hunt)$")
+    source: str = Field(..., pattern="^(reddit|google_trends|telegram|vk|youtube|instagram|facebook|product_hunt|hackernews)$")
     category: Optional[str] = Field(None, max_length=50)
     tags: List[str] = Field(default_factory=list, max_items=20)
 
@@ -39,6 +39,7 @@ class TrendOut(TrendBase):
     id: int
     engagement_score: int
     velocity: float
+    acceleration: Optional[float] = 0.0
     discovered_at: datetime
     extra_metadata: Dict[str, Any] = Field(serialization_alias="metadata")
 
@@ -47,6 +48,30 @@ class TrendOut(TrendBase):
         populate_by_name = True  # Allow field name or serialization alias
 
 
+class TrendSnapshotCreate(BaseModel):
+    """Schema for a single engagement observation of a trend"""
+    trend_id: int
+    upvotes: int = Field(default=0, ge=0)
+    comments: int = Field(default=0, ge=0)
+    awards: int = Field(default=0, ge=0)
+
+
+class TrendSeries(BaseModel):
+    """
+    Compact (columnar) engagement time-series for a trend
+
+    Parallel arrays instead of a list of objects keep the payload small
+    for charting clients.
+    """
+    trend_id: int
+    ts: List[datetime]
+    upvotes: List[int]
+    comments: List[int]
+    awards: List[int]
+    velocity: float
+    acceleration: float
+
+
 class TrendList(BaseModel):
     """Schema for paginated trend list"""
     items: List[TrendOut]
@@ -3,16 +3,70 @@ Trends Service - Business Logic Layer
 """
 
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
 import structlog
 
+from app.core.config import settings
 from app.modules.trends.repository import TrendRepository
-from app.modules.trends.schemas import TrendCreate, TrendUpdate, TrendOut, TrendList, TrendStats
+from app.modules.trends.schemas import (
+    TrendCreate, TrendUpdate, TrendOut, TrendList, TrendStats,
+    TrendSnapshotCreate, TrendSeries
+)
 from app.modules.trends.models import Trend
 
 logger = structlog.get_logger()
 
 
+# Weight of one award in snapshot engagement, per source. Only Reddit has
+# (paid) awards; other sources score upvotes + comments * 2, like their scrapers.
+AWARD_WEIGHTS = {"reddit": 10}
+
+
+def snapshot_engagement(upvotes: int, comments: int, awards: int, source: str) -> int:
+    """
+    Engagement score of a snapshot, weighted like the source's scraper
+
+    Reddit: upvotes + comments * 2 + awards * 10 (RedditScraper)
+    Others: upvotes + comments * 2 (points / votes on HN and Product Hunt)
+    """
+    return upvotes + comments * 2 + awards * AWARD_WEIGHTS.get(source, 0)
+
+
+def ewma_update(
+    velocity: float,
+    acceleration: float,
+    prev_engagement: int,
+    engagement: int,
+    hours: float,
+    alpha: float
+) -> Tuple[float, float]:
+    """
+    Exponentially weighted update of velocity and acceleration
+
+    Args:
+        velocity: Current smoothed velocity (engagement per hour)
+        acceleration: Current smoothed acceleration (velocity change per hour)
+        prev_engagement: Engagement at the previous snapshot
+        engagement: Engagement at the new snapshot
+        hours: Hours elapsed between the two snapshots; record_snapshots only
+            passes gaps of at least TREND_SNAPSHOT_MIN_INTERVAL_SECONDS
+        alpha: Smoothing factor (0-1), higher = more weight on new data
+
+    Returns:
+        (new_velocity, new_acceleration); unchanged if no time has passed
+    """
+    if hours <= 0:
+        return velocity, acceleration
+    instant_velocity = (engagement - prev_engagement) / hours
+    new_velocity = alpha * instant_velocity + (1 - alpha) * velocity
+
+    instant_acceleration = (new_velocity - velocity) / hours
+    new_acceleration = alpha * instant_acceleration + (1 - alpha) * acceleration
+
+    return new_velocity, new_acceleration
+
+
 class TrendService:
     """
     Business logic for trends
@@ -93,6 +147,84 @@ class TrendService:
 
         return TrendOut.model_validate(trend)
 
+    def create_trends_bulk(self, trends_data: List[TrendCreate]) -> List[Tuple[int, bool]]:
+        """
+        Create a batch of trends with batched duplicate detection
+
+        Same duplicate rule as create_trend (title, plus url when given),
+        but checked with one query and inserted in one transaction.
+
+        Returns:
+            (trend_id, created) for every input item, in input order
+        """
+        if not trends_data:
+            return []
+
+        existing = self.repository.find_by_titles(list({t.title for t in trends_data}))
+        by_title_url = {(row.title, row.url): row.id for row in existing}
+        by_title = {}
+        for row in existing:
+            by_title.setdefault(row.title, row.id)
+
+        # Per item: (existing_id, index into to_create, created)
+        plan: List[Tuple[Optional[int], Optional[int], bool]] = []
+        to_create: List[TrendCreate] = []
+        pending = {}
+
+        for trend_data in trends_data:
+            key = (trend_data.title, trend_data.url)
+            existing_id = by_title_url.get(key) if trend_data.url else by_title.get(trend_data.title)
+
+            if existing_id is not None:
+                plan.append((existing_id, None, False))
+            elif key in pending:
+                plan.append((None, pending[key], False))  # Duplicate inside the batch
+            else:
+                pending[key] = len(to_create)
+                plan.append((None, pending[key], True))
+                to_create.append(trend_data)
+
+        new_ids = self.repository.bulk_create(to_create) if to_create else []
+
+        logger.info(
+            "Trends created in bulk",
+            received=len(trends_data),
+            created=len(new_ids)
+        )
+
+        return [
+            (existing_id if existing_id is not None else new_ids[index], created)
+            for existing_id, index, created in plan
+        ]
+
+    def reclassify_trends_bulk(self, trends_data: List[TrendCreate]) -> List[Tuple[int, bool]]:
+        """
+        Upsert a batch for reprocessing: create new trends, and refresh
+        category and tags of existing ones
+
+        Engagement and velocity are left alone; they come from live
+        snapshots, not from replayed payloads.
+
+        Returns:
+            (trend_id, created) for every input item, in input order
+        """
+        results = self.create_trends_bulk(trends_data)
+
+        updates = {}
+        for trend_data, (trend_id, created) in zip(trends_data, results):
+            if not created:
+                updates[trend_id] = {
+                    "id": trend_id,
+                    "category": trend_data.category,
+                    "tags": trend_data.tags
+                }
+
+        updated = self.repository.bulk_update(list(updates.values()))
+
+        logger.info("Trends reclassified", received=len(trends_data), updated=updated)
+
+        return results
+
     def update_trend(self, trend_id: int, trend_data: TrendUpdate) -> Optional[TrendOut]:
         """Update existing trend"""
         trend = self.repository.update(trend_id, trend_data)
@@ -140,3 +272,128 @@ class TrendService:
             limit=limit,
             has_more=has_more
         )
+
+    def record_snapshots(
+        self,
+        snapshots: List[TrendSnapshotCreate],
+        observed_at: Optional[datetime] = None
+    ) -> int:
+        """
+        Append engagement snapshots and update velocity incrementally
+
+        The first snapshot of a trend only sets the engagement baseline and
+        resets velocity and acceleration to 0: the scrape-time velocity is
+        lifetime upvotes per hour, a different unit from the engagement
+        deltas folded into the EWMA by every later snapshot. All snapshots
+        and trend updates are written in one transaction.
+
+        A trend re-scraped less than TREND_SNAPSHOT_MIN_INTERVAL_SECONDS after
+        its last snapshot is skipped: over a few minutes, a handful of votes
+        divided by a tiny interval would swing velocity wildly. The next
+        snapshot then measures the change over the whole gap.
+
+        Returns:
+            Number of snapshots written
+        """
+        if not snapshots:
+            return 0
+
+        observed_at = observed_at or datetime.utcnow()
+        alpha = settings.TREND_VELOCITY_ALPHA
+        min_hours = settings.TREND_SNAPSHOT_MIN_INTERVAL_SECONDS / 3600
+        skipped = 0
+
+        trends = {
+            t.id: t for t in self.repository.get_by_ids(list({s.trend_id for s in snapshots}))
+        }
+
+        rows = []
+        for snapshot in snapshots:
+            trend = trends.get(snapshot.trend_id)
+            if trend is None:
+                continue
+
+            engagement = snapshot_engagement(
+                snapshot.upvotes, snapshot.comments, snapshot.awards, trend.source
+            )
+
+            if trend.last_snapshot_at is not None:
+                hours = (observed_at - trend.last_snapshot_at).total_seconds() / 3600
+                if hours < min_hours:
+                    skipped += 1
+                    continue
+                trend.velocity, trend.acceleration = ewma_update(
+                    velocity=trend.velocity or 0.0,
+                    acceleration=trend.acceleration or 0.0,
+                    prev_engagement=trend.engagement_score or 0,
+                    engagement=engagement,
+                    hours=hours,
+                    alpha=alpha
+                )
+            else:
+                trend.velocity, trend.acceleration = 0.0, 0.0
+
+            trend.engagement_score = engagement
+            trend.last_snapshot_at = observed_at
+
+            rows.append({
+                "trend_id": snapshot.trend_id,
+                "ts": observed_at,
+                "upvotes": snapshot.upvotes,
+                "comments": snapshot.comments,
+                "awards": snapshot.awards
+            })
+
+        written = self.repository.append_snapshots(rows)
+
+        logger.info("Trend snapshots recorded", count=written, skipped_too_soon=skipped)
+
+        return written
+
+    def get_series(
+        self,
+        trend_id: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 1000
+    ) -> Optional[TrendSeries]:
+        """Get compact engagement time-series for a trend"""
+        trend = self.repository.get_by_id(trend_id)
+        if not trend:
+            return None
+
+        rows = self.repository.get_series(trend_id, since=since, until=until, limit=limit)
+
+        return TrendSeries(
+            trend_id=trend_id,
+            ts=[r.ts for r in rows],
+            upvotes=[r.upvotes for r in rows],
+            comments=[r.comments for r in rows],
+            awards=[r.awards for r in rows],
+            velocity=trend.velocity or 0.0,
+            acceleration=trend.acceleration or 0.0
+        )
+
+    def get_rising(
+        self,
+        limit: int = 20,
+        window_hours: Optional[int] = None,
+        min_velocity: float = 0.0
+    ) -> List[TrendOut]:
+        """
+        Get accelerating trends seen within the last `window_hours`
+        """
+        window_hours = window_hours or settings.TREND_RISING_WINDOW_HOURS
+        since = datetime.utcnow() - timedelta(hours=window_hours)
+
+        trends = self.repository.get_rising(since=since, limit=limit, min_velocity=min_velocity)
+        return [TrendOut.model_validate(t) for t in trends]
+
+    def get_unanalyzed(self, limit: int = 10, min_engagement: Optional[int] = None) -> List[TrendOut]:
+        """Get trends idea analysis has not looked at yet (best candidates first)"""
+        trends = self.repository.get_unanalyzed(limit=limit, min_engagement=min_engagement)
+        return [TrendOut.model_validate(t) for t in trends]
+
+    def mark_analyzed(self, trend_ids: List[int]) -> int:
+        """Record that idea analysis has looked at these trends"""
+        return self.repository.mark_analyzed(trend_ids)
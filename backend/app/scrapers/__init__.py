@@ -3,10 +3,23 @@ Scrapers Package
 Data collection from various sources
 """
 
+from app.scrapers.archive import ArchiveWriter
 from app.scrapers.base_scraper import BaseScraper
 from app.scrapers.reddit_scraper import RedditScraper
+from app.scrapers.hackernews_scraper import HackerNewsScraper
+from app.scrapers.producthunt_scraper import ProductHuntScraper
+from app.scrapers.runtime import ScraperRuntime, close_runtime, get_runtime, run_with_runtime
+from app.scrapers.scheduler import ScraperScheduler
 
 __all__ = [
+    "ArchiveWriter",
     "BaseScraper",
-    "RedditScraper"
+    "RedditScraper",
+    "HackerNewsScraper",
+    "ProductHuntScraper",
+    "ScraperRuntime",
+    "ScraperScheduler",
+    "close_runtime",
+    "get_runtime",
+    "run_with_runtime"
 ]
@@ -0,0 +1,234 @@
+"""
+Raw Scrape Archive
+Append-only local archive of raw scraper payloads, replayable offline
+
+Layout:
+    SCRAPE_ARCHIVE_DIR/<source>/<YYYY-MM-DD>/<HHMMSS>-<seq>.jsonl.gz
+
+Every raw payload yielded by a scraper is appended as one JSON line to
+the current gzip segment. Segments rotate when they reach
+SCRAPE_ARCHIVE_SEGMENT_MB or when the UTC day changes, so replaying a
+date range only opens the relevant files.
+
+Replay memory-maps each segment and feeds slices of the mapping straight
+into a zlib decompressor, so reprocessing needs no network, no API quota,
+and no full-file reads into Python memory.
+
+Why gzip JSONL and not Arrow IPC (pyarrow is in requirements.txt): raw
+payloads are nested, schemaless API responses whose shape differs per
+source and changes when an API adds a field. Arrow IPC needs a schema up
+front, so it would either break on new fields or store each payload as
+one JSON string column, which is JSONL with extra framing. JSONL keeps
+the payload exactly as fetched, and replay already streams it from mmap.
+"""
+
+import gzip
+import json
+import mmap
+import os
+import time
+import zlib
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+SEGMENT_SUFFIX = ".jsonl.gz"
+_READ_CHUNK = 1 << 20  # Compressed bytes handed to zlib per step
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class ArchiveWriter:
+    """
+    Appends raw payloads of one source to rotating gzip JSONL segments
+
+    Usage:
+        writer = ArchiveWriter("reddit")
+        writer.append(raw)
+        writer.close()
+    """
+
+    def __init__(
+        self,
+        source: str,
+        root_dir: Optional[str] = None,
+        max_segment_bytes: Optional[int] = None
+    ):
+        """
+        Args:
+            source: Scraper source name (directory under the archive root)
+            root_dir: Archive root (defaults to SCRAPE_ARCHIVE_DIR)
+            max_segment_bytes: Rotate after this many compressed bytes
+        """
+        self.source = source
+        self.root_dir = root_dir or settings.SCRAPE_ARCHIVE_DIR
+        self.max_segment_bytes = max_segment_bytes or settings.SCRAPE_ARCHIVE_SEGMENT_MB * 1024 * 1024
+        self.logger = logger.bind(archive=source)
+
+        self._file = None
+        self._gzip = None
+        self._day: Optional[date] = None
+        self._path: Optional[str] = None
+        self._seq = 0
+
+    def append(self, raw: Dict[str, Any]) -> None:
+        """
+        Append one raw payload
+
+        Adds `scraped_at` (unix time) if the payload has none, so replay can
+        reproduce time-dependent fields such as velocity.
+        """
+        if "scraped_at" not in raw:
+            raw = {**raw, "scraped_at": time.time()}
+
+        today = datetime.utcnow().date()
+        if self._gzip is None or today != self._day or self._file.tell() >= self.max_segment_bytes:
+            self._rotate(today)
+
+        line = json.dumps(raw, ensure_ascii=False, separators=(",", ":"), default=str)
+        self._gzip.write(line.encode("utf-8") + b"\n")
+
+    def flush(self) -> None:
+        """Make everything appended so far readable by replay"""
+        if self._gzip is not None:
+            self._gzip.flush()
+
+    def close(self) -> None:
+        """Finish the current segment (writes the gzip trailer)"""
+        if self._gzip is not None:
+            self._gzip.close()
+            self._file.close()
+            self.logger.info("Archive segment closed", path=self._path)
+        self._gzip = None
+        self._file = None
+
+    def _rotate(self, day: date) -> None:
+        self.close()
+
+        directory = os.path.join(self.root_dir, self.source, day.isoformat())
+        os.makedirs(directory, exist_ok=True)
+
+        self._seq += 1
+        stamp = datetime.utcnow().strftime("%H%M%S")
+        self._path = os.path.join(directory, f"{stamp}-{os.getpid()}-{self._seq:04d}{SEGMENT_SUFFIX}")
+        self._day = day
+
+        # Compressed size is tracked on the underlying file for rotation
+        self._file = open(self._path, "ab")
+        self._gzip = gzip.GzipFile(fileobj=self._file, mode="ab")
+
+        self.logger.info("Archive segment opened", path=self._path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def list_segments(
+    source: str,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    root_dir: Optional[str] = None
+) -> List[str]:
+    """
+    Archive segments of a source within [since, until] (UTC days), oldest first
+    """
+    base = os.path.join(root_dir or settings.SCRAPE_ARCHIVE_DIR, source)
+    if not os.path.isdir(base):
+        return []
+
+    segments = []
+    for day_dir in sorted(os.listdir(base)):
+        try:
+            day = date.fromisoformat(day_dir)
+        except ValueError:
+            continue
+        if (since and day < since) or (until and day > until):
+            continue
+
+        directory = os.path.join(base, day_dir)
+        segments.extend(
+            os.path.join(directory, name)
+            for name in sorted(os.listdir(directory))
+            if name.endswith(SEGMENT_SUFFIX)
+        )
+
+    return segments
+
+
+def read_segment(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream payloads from one segment without loading it into memory
+
+    Handles multi-member gzip files (appends from several runs) and stops
+    cleanly at a truncated tail left by a crashed writer.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield from _iter_lines(view, path)
+            finally:
+                view.release()
+
+
+def _iter_lines(view: memoryview, path: str) -> Iterator[Dict[str, Any]]:
+    decompressor = zlib.decompressobj(_GZIP_WBITS)
+    buffer = b""
+    offset = 0
+
+    while offset < len(view):
+        chunk = view[offset:offset + _READ_CHUNK]
+        offset += len(chunk)
+
+        while chunk:
+            try:
+                buffer += decompressor.decompress(chunk)
+            except zlib.error as e:
+                logger.warning("Corrupt archive segment tail", path=path, error=str(e))
+                return
+
+            # Next gzip member starts in the unused bytes
+            chunk = decompressor.unused_data if decompressor.eof else b""
+            if decompressor.eof:
+                decompressor = zlib.decompressobj(_GZIP_WBITS)
+
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line:
+                    yield json.loads(line)
+
+    if buffer:
+        logger.warning("Truncated record at end of archive segment", path=path)
+
+
+async def replay(
+    source: str,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    root_dir: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Async stream of archived raw payloads, for StreamingPipeline sources
+    """
+    segments = list_segments(source, since=since, until=until, root_dir=root_dir)
+
+    logger.info("Replaying scrape archive", source=source, segments=len(segments))
+
+    for path in segments:
+        for raw in read_segment(path):
+            yield raw
+
+
+def get_archive_writer(source: str) -> Optional[ArchiveWriter]:
+    """Archive writer for a scraper, or None if archiving is disabled"""
+    if not settings.SCRAPE_ARCHIVE_ENABLED:
+        return None
+    return ArchiveWriter(source)
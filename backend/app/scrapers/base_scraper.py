@@ -7,6 +7,9 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 import structlog
 
+from app.scrapers.archive import get_archive_writer
+from app.scrapers.runtime import ScraperRuntime, get_runtime
+
 logger = structlog.get_logger()
 
 
@@ -17,19 +20,28 @@ class BaseScraper(ABC):
     Provides:
     - Common interface for scraping
     - Error handling
-    - Rate limiting support
+    - Rate limiting, retries and HTTP caching (via self.http)
     - Data validation
+    - Raw payload archiving for offline replay
     """
 
-    def __init__(self, source_name: str):
+    def __init__(self, source_name: str, runtime: Optional[ScraperRuntime] = None):
         """
         Initialize base scraper
 
         Args:
             source_name: Name of the data source (reddit, twitter, etc.)
+            runtime: HTTP runtime (defaults to the shared one of the event loop)
         """
         self.source_name = source_name
         self.logger = logger.bind(scraper=source_name)
+        self.archive = get_archive_writer(source_name)
+        self._runtime = runtime
+
+    @property
+    def http(self) -> ScraperRuntime:
+        """Rate-limited, retrying, caching HTTP client"""
+        return self._runtime or get_runtime()
 
     @abstractmethod
     async def scrape(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -47,6 +59,34 @@ class BaseScraper(ABC):
         """
         pass
 
+    def archive_raw(self, raw: Dict[str, Any]) -> None:
+        """
+        Append a raw payload to the scrape archive (no-op when disabled)
+
+        Subclasses call this for every payload they fetch, before any
+        processing, so changed processing logic can be replayed later.
+        """
+        if self.archive is None:
+            return
+        try:
+            self.archive.append(raw)
+        except Exception as e:
+            self.logger.warning("Failed to archive raw payload", error=str(e))
+
+    def close_archive(self) -> None:
+        """
+        Finish the archive segment at the end of a scrape
+
+        Writes the gzip trailer and releases the file; the next archive_raw
+        opens a new segment.
+        """
+        if self.archive is None:
+            return
+        try:
+            self.archive.close()
+        except Exception as e:
+            self.logger.warning("Failed to close scrape archive", error=str(e))
+
     def validate_item(self, item: Dict[str, Any]) -> bool:
         """
         Validate a scraped item
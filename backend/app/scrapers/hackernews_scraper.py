@@ -0,0 +1,185 @@
+"""
+Hacker News Scraper
+Scrapes stories from Hacker News via the Algolia HN Search API
+"""
+
+from typing import List, Dict, Any, AsyncIterator, Optional
+import asyncio
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+import structlog
+
+from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.runtime import ScraperRuntime
+from app.scrapers.taxonomy import get_matcher
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+DEFAULT_QUERIES = ["AI agent", "LLM", "GPT", "AI assistant", "automation"]
+
+TIME_FILTERS = {
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400,
+}
+
+
+class HackerNewsScraper(BaseScraper):
+    """
+    Hacker News Scraper (no credentials needed)
+
+    Scrapes:
+    - Current front page stories
+    - Recent stories matching search queries
+    - Points, comments, author
+    """
+
+    def __init__(self, runtime: Optional[ScraperRuntime] = None, base_url: Optional[str] = None):
+        """
+        Args:
+            runtime: HTTP runtime (shared one by default)
+            base_url: API root (defaults to HACKERNEWS_API_URL; point at a local fixture in tests)
+        """
+        super().__init__(source_name="hackernews", runtime=runtime)
+        self.base_url = (base_url or settings.HACKERNEWS_API_URL).rstrip("/")
+        self.matcher = get_matcher()
+
+    async def scrape(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Scrape Hacker News stories
+
+        Args:
+            params: {
+                "queries": ["AI agent", "LLM"],  # empty list = front page only
+                "front_page": True,
+                "limit": 100,
+                "time_filter": "week",  # hour, day, week, month, year
+                "min_points": 10
+            }
+
+        Returns:
+            List of processed stories
+        """
+        stories = []
+
+        async for raw in self.iter_raw(params):
+            post = self.clean_post(raw)
+            if post and self.validate_item(post):
+                stories.append(self.tag_post(post))
+
+        self.logger.info("Hacker News scraping completed", total_posts=len(stories))
+
+        return stories
+
+    async def iter_raw(self, params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream raw story hits; all queries are fetched concurrently
+
+        Yields:
+            Algolia hit dicts (deduplicated by objectID)
+        """
+        queries = params.get("queries", DEFAULT_QUERIES)
+        limit = params.get("limit", 100)
+        min_points = params.get("min_points", 10)
+        window = TIME_FILTERS.get(params.get("time_filter", "week"), TIME_FILTERS["week"])
+        # Hour-aligned so repeated runs hit the same URL and can be answered with 304
+        since = (int(time.time()) - window) // 3600 * 3600
+
+        requests = [
+            self._search(query, since, min_points, max(limit // max(len(queries), 1), 1))
+            for query in queries
+        ]
+        if params.get("front_page", True):
+            requests.append(self._front_page())
+
+        self.logger.info("Scraping Hacker News", queries=queries, limit=limit)
+
+        seen = set()
+        try:
+            for next_done in asyncio.as_completed(requests):
+                try:
+                    hits = await next_done
+                except Exception as e:
+                    self.logger.error("Hacker News request failed", error=str(e))
+                    continue
+
+                for hit in hits:
+                    if hit.get("objectID") in seen or not hit.get("title"):
+                        continue
+                    seen.add(hit.get("objectID"))
+                    hit["scraped_at"] = time.time()
+                    self.archive_raw(hit)
+                    yield hit
+        finally:
+            self.close_archive()
+
+    async def _search(self, query: str, since: int, min_points: int, hits: int) -> List[Dict[str, Any]]:
+        data = await self.http.get_json(f"{self.base_url}/search_by_date", params={
+            "query": query,
+            "tags": "story",
+            "numericFilters": f"created_at_i>{since},points>={min_points}",
+            "hitsPerPage": min(hits, 1000)
+        })
+        return data.get("hits", [])
+
+    async def _front_page(self) -> List[Dict[str, Any]]:
+        data = await self.http.get_json(f"{self.base_url}/search", params={"tags": "front_page"})
+        return data.get("hits", [])
+
+    def clean_post(self, raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Turn a raw Algolia hit into a cleaned post (without category/tags)
+        """
+        try:
+            item_url = f"https://news.ycombinator.com/item?id={raw['objectID']}"
+            points = raw.get("points") or 0
+            comments = raw.get("num_comments") or 0
+
+            scraped_at = raw.get("scraped_at")
+            observed = datetime.utcfromtimestamp(scraped_at) if scraped_at else datetime.utcnow()
+            age_hours = (observed - datetime.utcfromtimestamp(raw["created_at_i"])).total_seconds() / 3600
+
+            return {
+                "title": self.clean_text(raw["title"]),
+                "description": self.clean_text(raw.get("story_text") or ""),
+                "url": item_url,
+                "source": "hackernews",
+                "category": None,
+                "tags": [],
+                "engagement_score": points + comments * 2,
+                "velocity": round(points / max(age_hours, 1), 2),
+                "metadata": {
+                    "hn_id": raw["objectID"],
+                    "author": raw.get("author") or "",
+                    "upvotes": points,
+                    "num_comments": comments,
+                    "awards": 0,
+                    "created_utc": raw["created_at_i"],
+                    "link": raw.get("url") or item_url,
+                    "domain": urlsplit(raw.get("url") or "").hostname or "news.ycombinator.com"
+                }
+            }
+
+        except Exception as e:
+            self.logger.error("Error processing story", story_id=raw.get("objectID"), error=str(e))
+            return None
+
+    def tag_post(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in category and tags of a cleaned post"""
+        categories, keyword_tags = self.matcher.scan(post["title"], post["description"])
+
+        tags = keyword_tags
+        domain = post["metadata"]["domain"]
+        if "github.com" in domain:
+            tags = ["github"] + tags
+        if post["title"].lower().startswith(("show hn", "launch hn")):
+            tags = ["launch"] + tags
+
+        post["category"] = categories[0] if categories else "other"
+        post["tags"] = tags[:10]
+
+        return post
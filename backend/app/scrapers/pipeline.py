@@ -0,0 +1,288 @@
+"""
+Streaming Pipeline
+Async-generator pipeline from scraper to database
+
+    source -> stage -> stage -> ... -> batched sink
+
+Several sources can be fanned into one pipeline with merge_streams().
+
+Every stage runs as its own task and is connected to the next one by a
+bounded asyncio.Queue. A slow consumer (usually the DB write) fills its
+queue and blocks the upstream put, which back-pressures the scraper
+instead of buffering the whole scrape in memory. The sink receives
+batches as soon as they are full or `flush_interval` seconds after the
+first item arrived, so writes start while scraping is still running.
+"""
+
+import asyncio
+import inspect
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+import structlog
+
+logger = structlog.get_logger()
+
+# Stage function: item -> transformed item, or None to drop it
+StageFn = Callable[[Any], Union[Any, Awaitable[Any]]]
+# Sink function: batch -> number of items written (or None)
+SinkFn = Callable[[List[Any]], Union[Optional[int], Awaitable[Optional[int]]]]
+
+_DONE = object()
+
+
+async def _maybe_await(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class StreamingPipeline:
+    """
+    Bounded-queue pipeline of async stages ending in a batched sink
+
+    Usage:
+        pipeline = StreamingPipeline(
+            stages=[("clean", clean), ("tag", tag)],
+            sink=write_batch,
+            batch_size=50
+        )
+        stats = await pipeline.run(scraper.iter_raw(params))
+    """
+
+    def __init__(
+        self,
+        stages: List[Tuple[str, StageFn]],
+        sink: SinkFn,
+        batch_size: int = 50,
+        queue_size: int = 100,
+        flush_interval: float = 1.0,
+        name: str = "pipeline"
+    ):
+        """
+        Args:
+            stages: Ordered (name, fn) pairs; fn may be sync or async
+            sink: Called with each batch; may be sync or async
+            batch_size: Maximum items per sink call
+            queue_size: Capacity of each inter-stage queue
+            flush_interval: Max seconds a partial batch waits before flushing
+            name: Used in logs
+        """
+        self.stages = stages
+        self.sink = sink
+        self.batch_size = max(batch_size, 1)
+        self.queue_size = max(queue_size, 1)
+        self.flush_interval = flush_interval
+        self.logger = logger.bind(pipeline=name)
+
+    async def run(self, source: AsyncIterator[Any]) -> Dict[str, Any]:
+        """
+        Drive `source` through all stages into the sink
+
+        Returns:
+            {
+                "received": 120,
+                "stages": {"clean": {"in": 120, "out": 118}, ...},
+                "batches": 3,
+                "written": 110,
+                "first_write_seconds": 1.8,
+                "seconds": 9.4
+            }
+        """
+        started = time.monotonic()
+        stats: Dict[str, Any] = {
+            "received": 0,
+            "stages": {name: {"in": 0, "out": 0} for name, _ in self.stages},
+            "batches": 0,
+            "written": 0,
+            "first_write_seconds": None,
+        }
+
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+
+        tasks = [asyncio.ensure_future(self._produce(source, queues[0], stats))]
+        for index, (name, fn) in enumerate(self.stages):
+            tasks.append(asyncio.ensure_future(
+                self._stage(name, fn, queues[index], queues[index + 1], stats)
+            ))
+        tasks.append(asyncio.ensure_future(self._drain(queues[-1], stats, started)))
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        stats["seconds"] = round(time.monotonic() - started, 3)
+
+        self.logger.info(
+            "Pipeline completed",
+            received=stats["received"],
+            written=stats["written"],
+            batches=stats["batches"],
+            first_write_seconds=stats["first_write_seconds"],
+            seconds=stats["seconds"]
+        )
+
+        return stats
+
+    async def _produce(self, source: AsyncIterator[Any], queue: asyncio.Queue, stats: Dict[str, Any]):
+        try:
+            async for item in source:
+                stats["received"] += 1
+                await queue.put(item)
+        finally:
+            await queue.put(_DONE)
+
+    async def _stage(
+        self,
+        name: str,
+        fn: StageFn,
+        inbox: asyncio.Queue,
+        outbox: asyncio.Queue,
+        stats: Dict[str, Any]
+    ):
+        counters = stats["stages"][name]
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                await outbox.put(_DONE)
+                return
+
+            counters["in"] += 1
+            result = await _maybe_await(fn(item))
+            if result is not None:
+                counters["out"] += 1
+                await outbox.put(result)
+
+    async def _drain(self, inbox: asyncio.Queue, stats: Dict[str, Any], started: float):
+        loop = asyncio.get_running_loop()
+        batch: List[Any] = []
+        deadline = 0.0
+        pending_get: Optional[asyncio.Future] = None
+
+        try:
+            while True:
+                if pending_get is None:
+                    pending_get = asyncio.ensure_future(inbox.get())
+
+                timeout = max(deadline - loop.time(), 0) if batch else None
+                done, _ = await asyncio.wait({pending_get}, timeout=timeout)
+
+                if not done:
+                    # Partial batch waited long enough
+                    await self._flush(batch, stats, started)
+                    batch = []
+                    continue
+
+                item = pending_get.result()
+                pending_get = None
+
+                if item is _DONE:
+                    break
+
+                if not batch:
+                    deadline = loop.time() + self.flush_interval
+                batch.append(item)
+
+                if len(batch) >= self.batch_size:
+                    await self._flush(batch, stats, started)
+                    batch = []
+
+            await self._flush(batch, stats, started)
+
+        finally:
+            if pending_get is not None and not pending_get.done():
+                pending_get.cancel()
+
+    async def _flush(self, batch: List[Any], stats: Dict[str, Any], started: float):
+        if not batch:
+            return
+
+        written = await _maybe_await(self.sink(batch))
+
+        stats["batches"] += 1
+        stats["written"] += len(batch) if written is None else written
+        if stats["first_write_seconds"] is None:
+            stats["first_write_seconds"] = round(time.monotonic() - started, 3)
+
+
+async def merge_streams(
+    streams: Dict[str, AsyncIterator[Any]],
+    timeout: Optional[float] = None,
+    queue_size: int = 100,
+    report: Optional[Dict[str, Dict[str, Any]]] = None
+) -> AsyncIterator[Any]:
+    """
+    Consume several async sources concurrently and yield their items as one stream
+
+    Each source runs in its own task, so the merged stream finishes when the
+    slowest source does. A source that raises or exceeds `timeout` stops on
+    its own; items it produced before that are kept and the others carry on.
+
+    The timeout budgets time spent waiting on the source itself, not time
+    blocked on back-pressure from downstream.
+
+    Args:
+        streams: name -> async iterator
+        timeout: Per-source budget in seconds (None = unlimited)
+        queue_size: Capacity of the shared queue
+        report: Filled with name -> {"status": "ok" | "timeout" | "error",
+                "items": int, "seconds": float, "error": str}
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(queue_size, 1))
+    report = {} if report is None else report
+
+    async def pump(name: str, stream: AsyncIterator[Any]):
+        entry = report.setdefault(name, {"status": "ok", "items": 0})
+        started = time.monotonic()
+        budget = timeout
+        iterator = stream.__aiter__()
+
+        try:
+            while True:
+                waited = time.monotonic()
+                try:
+                    item = await asyncio.wait_for(iterator.__anext__(), budget)
+                except StopAsyncIteration:
+                    break
+                if budget is not None:
+                    budget -= time.monotonic() - waited
+
+                entry["items"] += 1
+                await queue.put(item)
+
+        except asyncio.TimeoutError:
+            entry["status"] = "timeout"
+            entry["error"] = f"timed out after {timeout}s"
+            logger.warning("Source timed out", source=name, timeout=timeout, items=entry["items"])
+        except Exception as e:
+            entry["status"] = "error"
+            entry["error"] = str(e)
+            logger.error("Source failed", source=name, error=str(e), items=entry["items"])
+        finally:
+            entry["seconds"] = round(time.monotonic() - started, 3)
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                try:
+                    await aclose()
+                except Exception:
+                    pass
+
+        await queue.put(_DONE)
+
+    tasks = [asyncio.ensure_future(pump(name, stream)) for name, stream in streams.items()]
+    remaining = len(tasks)
+
+    try:
+        while remaining:
+            item = await queue.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,220 @@
+"""
+Product Hunt Scraper
+Scrapes launches from the Product Hunt GraphQL API (v2)
+"""
+
+from typing import List, Dict, Any, AsyncIterator, Optional
+import asyncio
+import time
+from datetime import datetime, timezone
+import structlog
+
+from app.scrapers.base_scraper import BaseScraper, ScraperError
+from app.scrapers.runtime import ScraperRuntime
+from app.scrapers.taxonomy import get_matcher
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+DEFAULT_TOPICS = ["artificial-intelligence", "productivity", "developer-tools", "saas"]
+
+TIME_FILTERS = {
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400,
+}
+
+POSTS_QUERY = """
+query Posts($topic: String, $postedAfter: DateTime, $first: Int) {
+  posts(topic: $topic, postedAfter: $postedAfter, first: $first, order: VOTES) {
+    edges {
+      node {
+        id
+        name
+        tagline
+        description
+        url
+        website
+        votesCount
+        commentsCount
+        createdAt
+        topics(first: 10) { edges { node { slug } } }
+      }
+    }
+  }
+}
+"""
+
+
+class ProductHuntScraper(BaseScraper):
+    """
+    Product Hunt Scraper (needs PRODUCTHUNT_API_TOKEN, a developer token)
+
+    Scrapes:
+    - Top launches per topic in the time window
+    - Votes, comments, topics
+    """
+
+    def __init__(
+        self,
+        runtime: Optional[ScraperRuntime] = None,
+        api_url: Optional[str] = None,
+        token: Optional[str] = None
+    ):
+        """
+        Args:
+            runtime: HTTP runtime (shared one by default)
+            api_url: GraphQL endpoint (defaults to PRODUCTHUNT_API_URL; point at a local fixture in tests)
+            token: Developer token (defaults to PRODUCTHUNT_API_TOKEN)
+        """
+        super().__init__(source_name="product_hunt", runtime=runtime)
+        self.api_url = api_url or settings.PRODUCTHUNT_API_URL
+        self.token = token if token is not None else settings.PRODUCTHUNT_API_TOKEN
+        self.matcher = get_matcher()
+
+    async def scrape(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Scrape Product Hunt launches
+
+        Args:
+            params: {
+                "topics": ["artificial-intelligence"],
+                "limit": 100,
+                "time_filter": "week",  # hour, day, week, month, year
+                "min_votes": 10
+            }
+
+        Returns:
+            List of processed launches
+        """
+        launches = []
+
+        async for raw in self.iter_raw(params):
+            post = self.clean_post(raw)
+            if post and self.validate_item(post):
+                launches.append(self.tag_post(post))
+
+        self.logger.info("Product Hunt scraping completed", total_posts=len(launches))
+
+        return launches
+
+    async def iter_raw(self, params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream raw post nodes; all topics are fetched concurrently
+
+        Yields:
+            GraphQL post nodes (deduplicated by id)
+
+        Raises:
+            ScraperError: If no API token is configured
+        """
+        if not self.token:
+            raise ScraperError("PRODUCTHUNT_API_TOKEN is not set")
+
+        topics = params.get("topics", DEFAULT_TOPICS)
+        limit = params.get("limit", 100)
+        min_votes = params.get("min_votes", 10)
+        window = TIME_FILTERS.get(params.get("time_filter", "week"), TIME_FILTERS["week"])
+        since = datetime.fromtimestamp((int(time.time()) - window) // 3600 * 3600, tz=timezone.utc)
+
+        requests = [
+            self._posts(topic, since, min(max(limit // max(len(topics), 1), 1), 50))
+            for topic in topics
+        ]
+
+        self.logger.info("Scraping Product Hunt", topics=topics, limit=limit)
+
+        seen = set()
+        try:
+            for next_done in asyncio.as_completed(requests):
+                try:
+                    nodes = await next_done
+                except Exception as e:
+                    self.logger.error("Product Hunt request failed", error=str(e))
+                    continue
+
+                for node in nodes:
+                    if node.get("id") in seen or not node.get("name"):
+                        continue
+                    if (node.get("votesCount") or 0) < min_votes:
+                        continue
+                    seen.add(node.get("id"))
+                    node["scraped_at"] = time.time()
+                    self.archive_raw(node)
+                    yield node
+        finally:
+            self.close_archive()
+
+    async def _posts(self, topic: str, since: datetime, first: int) -> List[Dict[str, Any]]:
+        data = await self.http.post_json(
+            self.api_url,
+            json={
+                "query": POSTS_QUERY,
+                "variables": {"topic": topic, "postedAfter": since.isoformat(), "first": first}
+            },
+            headers={"Authorization": f"Bearer {self.token}"}
+        )
+        if data.get("errors"):
+            raise ScraperError(f"GraphQL error: {data['errors'][0].get('message')}")
+        return [edge["node"] for edge in data["data"]["posts"]["edges"]]
+
+    def clean_post(self, raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Turn a raw post node into a cleaned post (without category/tags)
+        """
+        try:
+            votes = raw.get("votesCount") or 0
+            comments = raw.get("commentsCount") or 0
+            created = datetime.fromisoformat(raw["createdAt"].replace("Z", "+00:00"))
+
+            scraped_at = raw.get("scraped_at")
+            observed = datetime.fromtimestamp(scraped_at, tz=timezone.utc) if scraped_at else datetime.now(timezone.utc)
+            age_hours = (observed - created).total_seconds() / 3600
+
+            # Tagline first: it is the one-line pitch, the description expands on it
+            description = " ".join(
+                part for part in (raw.get("tagline"), raw.get("description")) if part
+            )
+
+            return {
+                "title": self.clean_text(raw["name"]),
+                "description": self.clean_text(description),
+                "url": raw["url"],
+                "source": "product_hunt",
+                "category": None,
+                "tags": [],
+                "engagement_score": votes + comments * 2,
+                "velocity": round(votes / max(age_hours, 1), 2),
+                "metadata": {
+                    "ph_id": raw["id"],
+                    "upvotes": votes,
+                    "num_comments": comments,
+                    "awards": 0,
+                    "created_utc": int(created.timestamp()),
+                    "website": raw.get("website") or "",
+                    "topics": [
+                        edge["node"]["slug"]
+                        for edge in (raw.get("topics") or {}).get("edges", [])
+                    ]
+                }
+            }
+
+        except Exception as e:
+            self.logger.error("Error processing launch", post_id=raw.get("id"), error=str(e))
+            return None
+
+    def tag_post(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in category and tags of a cleaned post"""
+        categories, keyword_tags = self.matcher.scan(post["title"], post["description"])
+
+        tags = ["launch"] + keyword_tags
+        for topic in post["metadata"]["topics"]:
+            if topic not in tags:
+                tags.append(topic)
+
+        post["category"] = categories[0] if categories else "other"
+        post["tags"] = tags[:10]
+
+        return post
@@ -3,17 +3,74 @@ Reddit Scraper
 Scrapes trending posts from Reddit using PRAW
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional
+import asyncio
+import threading
+import time
 import praw
 from datetime import datetime
 import structlog
 
 from app.scrapers.base_scraper import BaseScraper, ScraperError
+from app.scrapers.taxonomy import get_matcher
 from app.core.config import settings
 
 logger = structlog.get_logger()
 
 
+# PRAW is not thread-safe, so each thread (job-queue pool thread,
+# asyncio.to_thread worker) gets its own client. Authenticating
+# (reddit.user.me()) is a network round trip, so it is done once per thread
+# instead of on every scraper construction. A failed attempt is remembered
+# process-wide for REDDIT_CLIENT_RETRY_SECONDS.
+_reddit_local = threading.local()
+_reddit_error: Optional[str] = None
+_reddit_failed_at = 0.0
+_reddit_lock = threading.Lock()
+
+
+def get_reddit_client() -> praw.Reddit:
+    """
+    Authenticated PRAW client of the calling thread
+
+    Raises:
+        ScraperError: If Reddit could not be reached / authenticated
+    """
+    global _reddit_error, _reddit_failed_at
+
+    reddit = getattr(_reddit_local, "client", None)
+    if reddit is not None:
+        return reddit
+
+    with _reddit_lock:
+        if _reddit_error and time.monotonic() - _reddit_failed_at < settings.REDDIT_CLIENT_RETRY_SECONDS:
+            raise ScraperError(f"Reddit initialization failed: {_reddit_error}")
+
+    try:
+        reddit = praw.Reddit(
+            client_id=settings.REDDIT_CLIENT_ID,
+            client_secret=settings.REDDIT_CLIENT_SECRET,
+            user_agent=settings.REDDIT_USER_AGENT,
+            username=settings.REDDIT_USERNAME,
+            password=settings.REDDIT_PASSWORD
+        )
+
+        # Test connection
+        reddit.user.me()
+        logger.info("Reddit client initialized successfully", thread=threading.current_thread().name)
+
+    except Exception as e:
+        with _reddit_lock:
+            _reddit_error, _reddit_failed_at = str(e), time.monotonic()
+        logger.error("Failed to initialize Reddit client", error=str(e))
+        raise ScraperError(f"Reddit initialization failed: {str(e)}")
+
+    with _reddit_lock:
+        _reddit_error = None
+    _reddit_local.client = reddit
+    return reddit
+
+
 class RedditScraper(BaseScraper):
     """
     Reddit Scraper using PRAW (Python Reddit API Wrapper)
@@ -25,26 +82,30 @@ class RedditScraper(BaseScraper):
     - User engagement signals
     """
 
-    def __init__(self):
+    def __init__(self, offline: bool = False):
+        """
+        Args:
+            offline: Skip the Reddit client; only the processing methods
+                (clean_post, tag_post) are usable, e.g. for archive replay
+        """
         super().__init__(source_name="reddit")
 
-        # Initialize PRAW client
-        try:
-            self.reddit = praw.Reddit(
-                client_id=settings.REDDIT_CLIENT_ID,
-                client_secret=settings.REDDIT_CLIENT_SECRET,
-                user_agent=settings.REDDIT_USER_AGENT,
-                username=settings.REDDIT_USERNAME,
-                password=settings.REDDIT_PASSWORD
-            )
+        # Compiled category/tag matcher (built once per process)
+        self.matcher = get_matcher()
 
-            # Test connection
-            self.reddit.user.me()
-            self.logger.info("Reddit client initialized successfully")
+        self.offline = offline
+        if offline:
+            self.archive = None  # Replayed payloads are already archived
+            return
 
-        except Exception as e:
-            self.logger.error("Failed to initialize Reddit client", error=str(e))
-            raise ScraperError(f"Reddit initialization failed: {str(e)}")
+        # Fail fast if Reddit is unreachable; calls use the client of
+        # whichever thread they run on (see `reddit`)
+        get_reddit_client()
+
+    @property
+    def reddit(self) -> Optional[praw.Reddit]:
+        """PRAW client of the current thread (None when offline)"""
+        return None if self.offline else get_reddit_client()
 
     async def scrape(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -61,6 +122,33 @@ class RedditScraper(BaseScraper):
         Returns:
             List of processed Reddit posts
         """
+        all_posts = []
+
+        async for raw in self.iter_raw(params):
+            post = self.clean_post(raw)
+            if post and self.validate_item(post):
+                all_posts.append(self.tag_post(post))
+
+        self.logger.info(
+            "Reddit scraping completed",
+            total_posts=len(all_posts)
+        )
+
+        return all_posts
+
+    async def iter_raw(self, params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream raw submission payloads, one subreddit at a time
+
+        PRAW is blocking, so each subreddit is fetched in a worker thread;
+        posts of the first subreddit are yielded while the rest are pending.
+
+        Args:
+            params: Same as scrape()
+
+        Yields:
+            Raw submission dicts (see _raw_from_submission)
+        """
         subreddits = params.get("subreddits", ["SideProject", "startups", "Entrepreneur"])
         limit = params.get("limit", 100)
         time_filter = params.get("time_filter", "week")
@@ -74,38 +162,36 @@ class RedditScraper(BaseScraper):
             time_filter=time_filter
         )
 
-        all_posts = []
-
-        for subreddit_name in subreddits:
-            try:
-                posts = self._scrape_subreddit(
-                    subreddit_name,
-                    limit=limit // len(subreddits),
-                    sort=sort,
-                    time_filter=time_filter
-                )
-                all_posts.extend(posts)
-
-                self.logger.info(
-                    "Scraped subreddit",
-                    subreddit=subreddit_name,
-                    posts_count=len(posts)
-                )
-
-            except Exception as e:
-                self.logger.error(
-                    "Failed to scrape subreddit",
-                    subreddit=subreddit_name,
-                    error=str(e)
-                )
-                continue
-
-        self.logger.info(
-            "Reddit scraping completed",
-            total_posts=len(all_posts)
-        )
-
-        return all_posts
+        try:
+            for subreddit_name in subreddits:
+                try:
+                    raws = await asyncio.to_thread(
+                        self._scrape_subreddit,
+                        subreddit_name,
+                        limit=max(limit // len(subreddits), 1),
+                        sort=sort,
+                        time_filter=time_filter
+                    )
+
+                    self.logger.info(
+                        "Scraped subreddit",
+                        subreddit=subreddit_name,
+                        posts_count=len(raws)
+                    )
+
+                except Exception as e:
+                    self.logger.error(
+                        "Failed to scrape subreddit",
+                        subreddit=subreddit_name,
+                        error=str(e)
+                    )
+                    continue
+
+                for raw in raws:
+                    self.archive_raw(raw)
+                    yield raw
+        finally:
+            self.close_archive()
 
     def _scrape_subreddit(
         self,
@@ -115,7 +201,7 @@ class RedditScraper(BaseScraper):
         time_filter: str
     ) -> List[Dict[str, Any]]:
         """
-        Scrape posts from a single subreddit
+        Fetch raw posts from a single subreddit (blocking)
 
         Args:
             subreddit_name: Name of subreddit
@@ -124,7 +210,7 @@ class RedditScraper(BaseScraper):
             time_filter: Time filter for top posts
 
         Returns:
-            List of processed posts
+            List of raw submission dicts
         """
         try:
             subreddit = self.reddit.subreddit(subreddit_name)
@@ -141,13 +227,7 @@ class RedditScraper(BaseScraper):
             else:
                 raise ValueError(f"Unknown sort method: {sort}")
 
-            posts = []
-            for submission in submissions:
-                post = self._process_submission(submission, subreddit_name)
-                if post and self.validate_item(post):
-                    posts.append(post)
-
-            return posts
+            return [self._raw_from_submission(s, subreddit_name) for s in submissions]
 
         except Exception as e:
             self.logger.error(
@@ -157,63 +237,95 @@ class RedditScraper(BaseScraper):
             )
             raise ScraperError(f"Failed to scrape r/{subreddit_name}: {str(e)}")
 
-    def _process_submission(self, submission, subreddit_name: str) -> Dict[str, Any]:
+    def _raw_from_submission(self, submission, subreddit_name: str) -> Dict[str, Any]:
         """
-        Process a Reddit submission into structured data
+        Copy the fields we use out of a PRAW Submission
+
+        The result is plain JSON-serialisable data, detached from PRAW.
+        """
+        return {
+            "id": submission.id,
+            "subreddit": subreddit_name,
+            "title": submission.title,
+            "selftext": submission.selftext,
+            "permalink": submission.permalink,
+            "author": str(submission.author) if submission.author else "[deleted]",
+            "score": submission.score,
+            "upvote_ratio": submission.upvote_ratio,
+            "num_comments": submission.num_comments,
+            "total_awards_received": submission.total_awards_received,
+            "created_utc": submission.created_utc,
+            "link_flair_text": submission.link_flair_text,
+            "is_self": submission.is_self,
+            "domain": submission.domain,
+            "scraped_at": time.time()
+        }
+
+    def clean_post(self, raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Turn a raw submission into a cleaned post (without category/tags)
 
         Args:
-            submission: PRAW Submission object
-            subreddit_name: Name of subreddit
+            raw: Raw submission dict
 
         Returns:
-            Processed post data
+            Processed post data, or None if the payload is malformed
         """
         try:
             # Calculate engagement score
-            engagement_score = self._calculate_engagement(submission)
+            engagement_score = self._calculate_engagement(raw)
 
-            # Extract category based on flair or heuristics
-            category = self._extract_category(submission)
-
-            # Extract tags from title and flair
-            tags = self._extract_tags_from_submission(submission)
-
-            # Calculate velocity (upvotes per hour)
-            post_age_hours = (datetime.utcnow() - datetime.utcfromtimestamp(submission.created_utc)).total_seconds() / 3600
-            velocity = submission.score / max(post_age_hours, 1)  # Avoid division by zero
+            # Calculate velocity (upvotes per hour) as of scrape time
+            scraped_at = raw.get("scraped_at")
+            observed = datetime.utcfromtimestamp(scraped_at) if scraped_at else datetime.utcnow()
+            post_age_hours = (observed - datetime.utcfromtimestamp(raw["created_utc"])).total_seconds() / 3600
+            velocity = raw["score"] / max(post_age_hours, 1)  # Avoid division by zero
 
             return {
-                "title": self.clean_text(submission.title),
-                "description": self.clean_text(submission.selftext) if submission.selftext else "",
-                "url": f"https://reddit.com{submission.permalink}",
+                "title": self.clean_text(raw["title"]),
+                "description": self.clean_text(raw["selftext"]) if raw.get("selftext") else "",
+                "url": f"https://reddit.com{raw['permalink']}",
                 "source": "reddit",
-                "category": category,
-                "tags": tags,
+                "category": None,
+                "tags": [],
                 "engagement_score": engagement_score,
                 "velocity": round(velocity, 2),
                 "metadata": {
-                    "subreddit": subreddit_name,
-                    "author": str(submission.author) if submission.author else "[deleted]",
-                    "upvotes": submission.score,
-                    "upvote_ratio": submission.upvote_ratio,
-                    "num_comments": submission.num_comments,
-                    "awards": submission.total_awards_received,
-                    "created_utc": submission.created_utc,
-                    "flair": submission.link_flair_text if submission.link_flair_text else None,
-                    "is_self": submission.is_self,
-                    "domain": submission.domain
+                    "subreddit": raw["subreddit"],
+                    "author": raw.get("author") or "[deleted]",
+                    "upvotes": raw["score"],
+                    "upvote_ratio": raw.get("upvote_ratio"),
+                    "num_comments": raw["num_comments"],
+                    "awards": raw.get("total_awards_received") or 0,
+                    "created_utc": raw["created_utc"],
+                    "flair": raw.get("link_flair_text") or None,
+                    "is_self": raw.get("is_self", True),
+                    "domain": raw.get("domain") or ""
                 }
             }
 
         except Exception as e:
             self.logger.error(
                 "Error processing submission",
-                submission_id=submission.id,
+                submission_id=raw.get("id"),
                 error=str(e)
             )
             return None
 
-    def _calculate_engagement(self, submission) -> int:
+    def tag_post(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fill in category and tags of a cleaned post
+
+        One matcher pass over title + body gives keyword categories and tags.
+        """
+        categories, keyword_tags = self.matcher.scan(post["title"], post["description"])
+
+        post["category"] = self._extract_category(post, categories)
+        post["tags"] = self._extract_tags_from_submission(post, keyword_tags)
+
+        return post
+
+    def _calculate_engagement(self, raw: Dict[str, Any]) -> int:
         """
         Calculate engagement score from Reddit metrics
 
@@ -221,21 +333,23 @@ class RedditScraper(BaseScraper):
         Comments are weighted 2x because they indicate higher engagement
         Awards are weighted 10x because they cost money
         """
-        score = submission.score
-        comments = submission.num_comments * 2
-        awards = submission.total_awards_received * 10
+        score = raw["score"]
+        comments = raw["num_comments"] * 2
+        awards = (raw.get("total_awards_received") or 0) * 10
 
         return score + comments + awards
 
-    def _extract_category(self, submission) -> str:
+    def _extract_category(self, post: Dict[str, Any], keyword_categories: List[str]) -> str:
         """
-        Extract category from submission
+        Extract category from a cleaned post
 
-        Uses flair, title keywords, or domain heuristics
+        Uses flair first, then the title keyword categories found by the
+        taxonomy matcher (in taxonomy priority order)
         """
         # Check flair first
-        if submission.link_flair_text:
-            flair = submission.link_flair_text.lower()
+        flair = post["metadata"].get("flair")
+        if flair:
+            flair = flair.lower()
             if "product" in flair or "launch" in flair:
                 return "saas"
             elif "question" in flair or "help" in flair:
@@ -243,62 +357,40 @@ class RedditScraper(BaseScraper):
             elif "showcase" in flair or "demo" in flair:
                 return "showcase"
 
-        # Check title keywords
-        title_lower = submission.title.lower()
-
-        if any(word in title_lower for word in ["ai", "ml", "gpt", "chatbot", "automation"]):
-            return "ai"
-        elif any(word in title_lower for word in ["saas", "software", "app", "platform"]):
-            return "saas"
-        elif any(word in title_lower for word in ["marketplace", "e-commerce", "shop"]):
-            return "marketplace"
-        elif any(word in title_lower for word in ["productivity", "tool", "workflow"]):
-            return "productivity"
-        elif any(word in title_lower for word in ["fintech", "crypto", "blockchain", "payment"]):
-            return "fintech"
-        elif any(word in title_lower for word in ["health", "fitness", "wellness"]):
-            return "health"
-        elif any(word in title_lower for word in ["education", "learning", "course"]):
-            return "education"
-        else:
-            return "other"
-
-    def _extract_tags_from_submission(self, submission) -> List[str]:
+        # Title keywords
+        return keyword_categories[0] if keyword_categories else "other"
+
+    def _extract_tags_from_submission(self, post: Dict[str, Any], keyword_tags: List[str]) -> List[str]:
         """
         Extract tags from submission title, flair, and content
 
+        Args:
+            post: Cleaned post
+            keyword_tags: Taxonomy tags found in title + body by the matcher
+
         Returns list of relevant tags
         """
         tags = []
+        metadata = post["metadata"]
 
         # Add flair as tag
-        if submission.link_flair_text:
-            tags.append(submission.link_flair_text.lower())
+        if metadata.get("flair"):
+            tags.append(metadata["flair"].lower())
 
         # Extract hashtags from title
-        title_tags = self.extract_tags(submission.title)
+        title_tags = self.extract_tags(post["title"])
         tags.extend(title_tags)
 
         # Add domain-based tags for link posts
-        if not submission.is_self:
-            if "github.com" in submission.domain:
+        if not metadata.get("is_self", True):
+            domain = metadata.get("domain") or ""
+            if "github.com" in domain:
                 tags.append("github")
-            elif "youtube.com" in submission.domain or "youtu.be" in submission.domain:
+            elif "youtube.com" in domain or "youtu.be" in domain:
                 tags.append("youtube")
 
         # Add keyword-based tags
-        text = f"{submission.title} {submission.selftext}".lower()
-
-        keywords = [
-            "ai", "ml", "gpt", "chatbot", "saas", "productivity",
-            "no-code", "automation", "startup", "mvp", "side-project",
-            "open-source", "api", "mobile", "web", "react", "next.js",
-            "firebase", "supabase", "stripe", "payment"
-        ]
-
-        for keyword in keywords:
-            if keyword in text and keyword not in tags:
-                tags.append(keyword)
+        tags.extend(keyword_tags)
 
         # Remove duplicates and limit
         tags = list(dict.fromkeys(tags))  # Preserve order while removing duplicates
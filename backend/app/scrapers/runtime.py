@@ -0,0 +1,289 @@
+"""
+Scraper Runtime
+Shared HTTP plumbing for API-based scrapers
+
+- One pooled httpx.AsyncClient per event loop (keep-alive, HTTP connection reuse)
+- Per-host token-bucket rate limits (SCRAPER_RATE_LIMITS)
+- Retry with exponential backoff and full jitter, honouring Retry-After
+- Conditional requests: ETag / Last-Modified are replayed and 304 answers
+  are served from an in-memory LRU cache
+
+Every scraper inherits `self.http` from BaseScraper. Tests and local
+fixtures can pass their own runtime (e.g. with httpx.MockTransport or a
+base_url pointing at a local server).
+"""
+
+import asyncio
+import random
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Dict, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+import httpx
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` requests per second with bursts up to `burst`
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = max(rate, 1e-6)
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HttpCache:
+    """
+    LRU cache of validators and bodies for conditional GET requests
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, etag: Optional[str], last_modified: Optional[str], body: bytes) -> None:
+        if not etag and not last_modified:
+            return
+        self._entries[key] = {"etag": etag, "last_modified": last_modified, "body": body}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class ScraperRuntime:
+    """
+    Rate-limited, retrying, caching HTTP client shared by scrapers
+
+    Usage:
+        runtime = get_runtime()
+        data = await runtime.get_json("https://hn.algolia.com/api/v1/search", params={...})
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+        default_rate: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        cache_size: Optional[int] = None
+    ):
+        """
+        Args:
+            client: Pre-built client (e.g. with MockTransport); pooled one by default
+            rate_limits: Host -> requests per second
+            default_rate: Rate for hosts without an explicit limit
+            max_retries: Retries after the first attempt
+            backoff_base: First backoff ceiling in seconds
+            backoff_max: Backoff ceiling
+            cache_size: Max cached conditional responses
+        """
+        self.client = client or httpx.AsyncClient(
+            timeout=settings.SCRAPER_HTTP_TIMEOUT,
+            headers={"User-Agent": settings.REDDIT_USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=settings.SCRAPER_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SCRAPER_MAX_CONNECTIONS
+            ),
+            follow_redirects=True
+        )
+        self.rate_limits = rate_limits if rate_limits is not None else settings.scraper_rate_limits
+        self.default_rate = default_rate or settings.SCRAPER_DEFAULT_RATE
+        self.max_retries = settings.SCRAPER_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = HttpCache(cache_size or settings.SCRAPER_HTTP_CACHE_SIZE)
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.stats = {"requests": 0, "retries": 0, "not_modified": 0}
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.rate_limits.get(host, self.default_rate))
+            self._buckets[host] = bucket
+        return bucket
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Full-jitter backoff; Retry-After (seconds) wins when present"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, bytes]:
+        """
+        Rate-limited conditional GET with retries
+
+        Returns:
+            (status, body); a 304 is returned as (200, cached body)
+
+        Raises:
+            httpx.HTTPError: After the last retry, or on a non-retryable status
+        """
+        request = self.client.build_request("GET", url, params=params, headers=headers)
+        key = str(request.url)
+        host = urlsplit(key).hostname or ""
+
+        cached = self.cache.get(key)
+        if cached:
+            if cached["etag"]:
+                request.headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                request.headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = await self._send(request, host)
+
+        if response.status_code == 304 and cached:
+            self.stats["not_modified"] += 1
+            return 200, cached["body"]
+
+        response.raise_for_status()
+
+        self.cache.put(
+            key,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            response.content
+        )
+        return response.status_code, response.content
+
+    async def _send(self, request: httpx.Request, host: str) -> httpx.Response:
+        """Send with rate limiting; retry transport errors and RETRY_STATUSES"""
+        attempt = 0
+        while True:
+            await self._bucket(host).acquire()
+            self.stats["requests"] += 1
+
+            response = None
+            try:
+                response = await self.client.send(request)
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                error: Exception = httpx.HTTPStatusError(
+                    f"HTTP {response.status_code}", request=request, response=response
+                )
+            except httpx.TransportError as e:
+                error = e
+
+            if attempt >= self.max_retries:
+                raise error
+
+            delay = self._backoff(attempt, response)
+            attempt += 1
+            self.stats["retries"] += 1
+            logger.warning("Scraper request retry", host=host, attempt=attempt, delay=round(delay, 2), error=str(error))
+            await asyncio.sleep(delay)
+
+    async def get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Any:
+        """GET and decode JSON (see get)"""
+        _, body = await self.get(url, params=params, headers=headers)
+        return httpx.Response(200, content=body).json()
+
+    async def post_json(
+        self,
+        url: str,
+        json: Any,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Any:
+        """
+        Rate-limited POST with retries, decoded as JSON (no conditional cache)
+
+        Raises:
+            httpx.HTTPError: After the last retry, or on a non-retryable status
+        """
+        request = self.client.build_request("POST", url, json=json, headers=headers)
+        response = await self._send(request, request.url.host or "")
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+# One runtime per event loop: httpx connection pools are bound to their loop,
+# and Celery tasks / job-queue threads start a fresh loop per run. Loops that
+# end before the process does close theirs with close_runtime (run_with_runtime).
+_runtimes: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ScraperRuntime]" = weakref.WeakKeyDictionary()
+
+
+def get_runtime() -> ScraperRuntime:
+    """Shared runtime of the running event loop"""
+    loop = asyncio.get_running_loop()
+    runtime = _runtimes.get(loop)
+    if runtime is None:
+        runtime = ScraperRuntime()
+        _runtimes[loop] = runtime
+    return runtime
+
+
+async def close_runtime() -> None:
+    """Close the running loop's runtime (its connection pool), if one was created"""
+    runtime = _runtimes.pop(asyncio.get_running_loop(), None)
+    if runtime is not None:
+        await runtime.aclose()
+
+
+def run_with_runtime(coro: Awaitable[T]) -> T:
+    """
+    asyncio.run that closes the loop's pooled clients before the loop ends
+
+    Both the scraper runtime and the async LLM clients (app.agents.clients)
+    are per loop; without closing them every short-lived loop would leave
+    its connection pools and sockets behind.
+    """
+    from app.agents.clients import close_async_clients
+
+    async def main() -> T:
+        try:
+            return await coro
+        finally:
+            await close_runtime()
+            await close_async_clients()
+
+    return asyncio.run(main())
@@ -0,0 +1,68 @@
+"""
+Scraper Scheduler
+Decides which source is scraped when
+
+Sources move at different speeds: the Hacker News front page turns over
+within hours, Product Hunt launches once a day, Reddit sits in between.
+Each source gets its own interval (SCRAPER_SOURCE_INTERVALS, minutes). A
+periodic tick asks `due()` which sources have waited at least their
+interval since their last successful scrape and scrapes only those, most
+overdue first. A failed source keeps its old timestamp, so it is retried on
+the next tick instead of waiting a full interval.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+
+class ScraperScheduler:
+    """
+    Per-source scrape intervals
+
+    Usage:
+        scheduler = ScraperScheduler()
+        sources = scheduler.due({"reddit": last_reddit_scrape, "hackernews": None})
+        # ["hackernews", "reddit"]  (never scraped first, then most overdue)
+    """
+
+    def __init__(self, intervals: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            intervals: Source -> minutes between scrapes (SCRAPER_SOURCE_INTERVALS by
+                default); sources without an interval are never scheduled
+        """
+        self.intervals = intervals if intervals is not None else settings.scraper_source_intervals
+
+    @property
+    def sources(self) -> List[str]:
+        """Scheduled sources"""
+        return list(self.intervals)
+
+    def next_run_at(self, source: str, last_run: Optional[datetime]) -> Optional[datetime]:
+        """
+        When `source` is next due (None if it is not scheduled)
+
+        A source that was never scraped is due immediately (datetime.min).
+        """
+        if source not in self.intervals:
+            return None
+        if last_run is None:
+            return datetime.min
+        return last_run + timedelta(minutes=self.intervals[source])
+
+    def due(self, last_runs: Dict[str, Optional[datetime]], now: Optional[datetime] = None) -> List[str]:
+        """
+        Scheduled sources due at `now`, most overdue first
+
+        Args:
+            last_runs: Source -> UTC time of its last successful scrape (missing or None = never)
+            now: Current UTC time (defaults to datetime.utcnow())
+        """
+        now = now or datetime.utcnow()
+        next_runs = {source: self.next_run_at(source, last_runs.get(source)) for source in self.intervals}
+        return sorted(
+            (source for source, next_run in next_runs.items() if next_run <= now),
+            key=lambda source: next_runs[source]
+        )
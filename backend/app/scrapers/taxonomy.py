@@ -0,0 +1,153 @@
+"""
+Keyword Taxonomy & Matcher
+Single-pass category and tag extraction for scraped posts
+
+All keywords of a taxonomy are compiled into a single prefix-factored
+regex with word-boundary guards, so "ai" matches "AI-powered" but not
+"said". A document is scanned once for both categories and tags, and the
+cost stays flat as the taxonomy grows.
+"""
+
+import json
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# Category -> keywords. Order matters: the first matching category wins.
+DEFAULT_CATEGORIES: Dict[str, List[str]] = {
+    "ai": ["ai", "ml", "gpt", "llm", "chatbot", "chatbots", "automation"],
+    "saas": ["saas", "software", "app", "apps", "platform", "platforms"],
+    "marketplace": ["marketplace", "e-commerce", "ecommerce", "shop"],
+    "productivity": ["productivity", "tool", "tools", "workflow", "workflows"],
+    "fintech": ["fintech", "crypto", "blockchain", "payment", "payments"],
+    "health": ["health", "fitness", "wellness"],
+    "education": ["education", "learning", "course", "courses"],
+}
+
+# Tag keywords (the tag is the keyword itself)
+DEFAULT_TAGS: List[str] = [
+    "ai", "ml", "gpt", "chatbot", "saas", "productivity",
+    "no-code", "automation", "startup", "mvp", "side-project",
+    "open-source", "api", "mobile", "web", "react", "next.js",
+    "firebase", "supabase", "stripe", "payment"
+]
+
+
+def _trie_pattern(keywords: List[str]) -> str:
+    """
+    Build a regex alternation factored by common prefixes
+
+    ["api", "app", "apps"] -> "ap(?:i|ps?)"-style pattern, which lets the
+    regex engine reject most positions after one character instead of
+    trying every keyword in turn.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        is_end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if is_end else "")
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Compiled multi-pattern matcher for a category/tag taxonomy
+
+    Usage:
+        matcher = KeywordMatcher(DEFAULT_CATEGORIES, DEFAULT_TAGS)
+        categories, tags = matcher.scan(title, body)
+    """
+
+    def __init__(self, categories: Dict[str, List[str]], tags: List[str]):
+        """
+        Build the matcher once
+
+        Args:
+            categories: Ordered mapping of category -> keywords
+            tags: Keywords that become tags when found
+        """
+        self._categories: List[Tuple[str, FrozenSet[str]]] = [
+            (category, frozenset(k.lower() for k in keywords))
+            for category, keywords in categories.items()
+        ]
+        self._tags: List[str] = list(dict.fromkeys(t.lower() for t in tags))
+        self._tag_set: FrozenSet[str] = frozenset(self._tags)
+
+        keywords = set(self._tag_set)
+        for _, category_keywords in self._categories:
+            keywords.update(category_keywords)
+
+        self._pattern = re.compile(rf"(?<!\w){_trie_pattern(sorted(keywords))}(?!\w)")
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of taxonomy keywords occurring as whole words in text"""
+        return set(self._pattern.findall(text.lower())) if text else set()
+
+    def scan(self, title: str, body: str = "") -> Tuple[List[str], List[str]]:
+        """
+        Scan a document once and return its categories and tags
+
+        Args:
+            title: Title text (categories are derived from it)
+            body: Body text (contributes tags only)
+
+        Returns:
+            (categories in taxonomy priority order, tags in taxonomy order)
+        """
+        title_hits = self.find(title)
+        hits = title_hits | self.find(body)
+
+        categories = [
+            category for category, keywords in self._categories
+            if not keywords.isdisjoint(title_hits)
+        ]
+        tags = [tag for tag in self._tags if tag in hits]
+
+        return categories, tags
+
+
+def load_taxonomy(path: Optional[str] = None) -> Tuple[Dict[str, List[str]], List[str]]:
+    """
+    Load taxonomy from a JSON file, falling back to the defaults
+
+    File format:
+        {"categories": {"ai": ["ai", "gpt"], ...}, "tags": ["ai", "saas", ...]}
+    """
+    if not path:
+        return DEFAULT_CATEGORIES, DEFAULT_TAGS
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("categories", DEFAULT_CATEGORIES), data.get("tags", DEFAULT_TAGS)
+    except Exception as e:
+        logger.warning("Failed to load taxonomy, using defaults", path=path, error=str(e))
+        return DEFAULT_CATEGORIES, DEFAULT_TAGS
+
+
+@lru_cache(maxsize=None)
+def get_matcher(path: Optional[str] = None) -> KeywordMatcher:
+    """
+    Get the process-wide matcher for a taxonomy (compiled once)
+
+    Args:
+        path: Taxonomy JSON path (defaults to SCRAPER_TAXONOMY_PATH)
+    """
+    categories, tags = load_taxonomy(path or settings.SCRAPER_TAXONOMY_PATH or None)
+    return KeywordMatcher(categories, tags)
@@ -8,7 +8,6 @@ Scheduled Tasks for AI Business Portfolio Manager
 
 from celery import Celery
 from celery.schedules import crontab
-import asyncio
 import os
 from datetime import datetime
 from sqlalchemy.orm import Session
@@ -16,8 +15,10 @@ from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
 from app.agents.trend_scout_agent import TrendScoutAgent
 from app.agents.idea_analyst_agent import IdeaAnalystAgent
+from app.cron.repository import CronRunRepository
 from app.modules.trends.service import TrendService
-from app.modules.ideas.service import IdeaService
+from app.scrapers.runtime import run_with_runtime
+from app.scrapers.scheduler import ScraperScheduler
 
 # Initialize Celery with Redis from environment
 REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
@@ -52,7 +53,7 @@ AI_FOCUS_CATEGORIES = [
 # Источники данных для трендов
 TREND_SOURCES = [
     "reddit",
-    "producthunt",
+    "product_hunt",
     "hackernews",
     "twitter",
     "google_trends",
@@ -88,7 +89,8 @@ def discover_trends_task():
             })
             return execution
 
-        execution = asyncio.run(run())
+        execution = run_with_runtime(run())
+        record_scrapes(db, execution.output_data.get('breakdown_by_source', {}))
 
         trends_count = execution.output_data.get('trends_count', 0)
         print(f"✅ AI trends discovered: {trends_count}")
@@ -110,6 +112,75 @@ def discover_trends_task():
         db.close()
 
 
+def last_scrapes(db: Session, sources) -> dict:
+    """Source -> start time of its last successful scrape (None = never)"""
+    repository = CronRunRepository(db)
+    last_runs = {}
+    for source in sources:
+        run = repository.get_latest(f"scrape:{source}", status="completed")
+        last_runs[source] = run.started_at if run else None
+    return last_runs
+
+
+def record_scrapes(db: Session, breakdown: dict) -> None:
+    """
+    Persist per-source outcomes of a TrendScout run for ScraperScheduler
+
+    Failed or timed-out sources are stored as failed, so they stay due.
+    """
+    repository = CronRunRepository(db)
+    for source, entry in breakdown.items():
+        if entry.get("status") == "unsupported":
+            continue
+        run = repository.start(f"scrape:{source}", owner="trend_scout")
+        status = "completed" if entry.get("status") == "ok" else "failed"
+        repository.finish(run.id, status, result=entry, error=entry.get("error"))
+
+
+@celery_app.task(name='scrape_due_sources')
+def scrape_due_sources_task():
+    """
+    Скрапинг только тех источников, чей интервал истёк
+    Запускается каждые 15 минут; интервалы в SCRAPER_SOURCE_INTERVALS
+
+    ScraperScheduler решает, какой источник когда скрапить: Hacker News
+    часто, Product Hunt раз в несколько часов. Упавший источник остаётся
+    в очереди и повторяется на следующем тике.
+    """
+    db = SessionLocal()
+    try:
+        scheduler = ScraperScheduler()
+        sources = scheduler.due(last_scrapes(db, scheduler.sources))
+        if not sources:
+            return {"status": "success", "sources": [], "trends_count": 0}
+
+        print(f"🔍 [{datetime.now()}] Scraping due sources: {', '.join(sources)}")
+
+        execution = run_with_runtime(TrendScoutAgent(db).run({
+            "sources": sources,
+            "categories": AI_FOCUS_CATEGORIES,
+            "focus": "ai_solutions",
+            "limit": 15,
+        }))
+        breakdown = execution.output_data.get('breakdown_by_source', {})
+        record_scrapes(db, breakdown)
+
+        return {
+            "status": "success",
+            "sources": sources,
+            "trends_count": execution.output_data.get('trends_stored', 0),
+            "failed_sources": execution.output_data.get('failed_sources', []),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    except Exception as e:
+        print(f"❌ Error scraping due sources: {e}")
+        return {"status": "error", "message": str(e)}
+
+    finally:
+        db.close()
+
+
 @celery_app.task(name='analyze_ideas')
 def analyze_ideas_task():
     """
@@ -128,58 +199,35 @@ def analyze_ideas_task():
 
     db = SessionLocal()
     try:
-        trend_service = TrendService(db)
-        idea_service = IdeaService(db)
-        idea_agent = IdeaAnalystAgent(db)
-
-        # Получаем тренды без идей (еще не проанализированные)
-        all_trends = trend_service.get_trends(skip=0, limit=100)
-
-        # Находим тренды, которые еще не анализировались
-        analyzed_trend_ids = set()
-        all_ideas = idea_service.get_ideas(skip=0, limit=1000)
-        for idea in all_ideas.get('items', []):
-            if hasattr(idea, 'trend_id'):
-                analyzed_trend_ids.add(idea.trend_id)
-            elif isinstance(idea, dict):
-                analyzed_trend_ids.add(idea.get('trend_id'))
-
-        unanalyzed_trends = [
-            t for t in all_trends.get('items', [])
-            if (t.id if hasattr(t, 'id') else t.get('id')) not in analyzed_trend_ids
-        ]
-
-        print(f"📊 Found {len(unanalyzed_trends)} unanalyzed trends")
-
-        # Анализируем до 10 новых трендов за раз
-        trends_to_analyze = unanalyzed_trends[:10]
-        ideas_generated = 0
-        total_cost = 0.0
-        verified_ideas = 0
+        # Ещё не проанализированные тренды (analyzed_at IS NULL), лучшие первыми
+        trends_to_analyze = TrendService(db).get_unanalyzed(limit=10)
+
+        print(f"📊 Found {len(trends_to_analyze)} unanalyzed trends")
+        if not trends_to_analyze:
+            return {
+                "status": "success",
+                "ideas_generated": 0,
+                "verified_ideas": 0,
+                "cost": 0.0,
+                "timestamp": datetime.now().isoformat()
+            }
 
         for trend in trends_to_analyze:
-            trend_title = trend.title if hasattr(trend, 'title') else trend.get('title', 'Unknown')
-            trend_id = trend.id if hasattr(trend, 'id') else trend.get('id')
-            print(f"🔬 Deep analyzing: {trend_title}")
-
-            async def run():
-                execution = await idea_agent.run({
-                    "trend_ids": [trend_id],
-                    "focus": "ai_assistants_agents",
-                    "verify_data": True,
-                    "deep_analysis": True,
-                })
-                return execution
-
-            execution = asyncio.run(run())
-
-            if execution.status == "completed":
-                count = execution.output_data.get('ideas_count', 0)
-                verified = execution.output_data.get('verified_count', count)
-                ideas_generated += count
-                verified_ideas += verified
-                total_cost += float(execution.llm_cost_usd)
-                print(f"   ✅ Generated {count} idea(s), {verified} verified")
+            print(f"🔬 Deep analyzing: {trend.title}")
+
+        # Один event loop и одно выполнение агента; LLM-вызовы идут
+        # параллельно (IDEA_ANALYSIS_CONCURRENCY)
+        execution = run_with_runtime(IdeaAnalystAgent(db).run({
+            "trend_ids": [trend.id for trend in trends_to_analyze],
+            "limit": len(trends_to_analyze),
+            "focus": "ai_assistants_agents",
+            "verify_data": True,
+            "deep_analysis": True,
+        }))
+
+        ideas_generated = execution.output_data.get('ideas_generated', 0)
+        verified_ideas = execution.output_data.get('ideas_stored', 0)
+        total_cost = float(execution.llm_cost_usd)
 
         print(f"✅ Total ideas generated: {ideas_generated}")
         print(f"✓ Verified ideas: {verified_ideas}")
@@ -187,6 +235,7 @@ def analyze_ideas_task():
 
         return {
             "status": "success",
+            "execution_id": execution.id,
             "ideas_generated": ideas_generated,
             "verified_ideas": verified_ideas,
             "cost": total_cost,
@@ -226,6 +275,13 @@ celery_app.conf.beat_schedule = {
         'options': {'queue': 'trends'}
     },
 
+    # 1a. Скрапинг источников по их интервалам (SCRAPER_SOURCE_INTERVALS)
+    'scrape-due-sources': {
+        'task': 'scrape_due_sources',
+        'schedule': crontab(minute='*/15'),
+        'options': {'queue': 'trends'}
+    },
+
     # 2. Глубокий анализ и генерация идей в 7:00
     'analyze-ideas-morning': {
         'task': 'analyze_ideas',
@@ -255,26 +311,45 @@ def run_morning_analysis_now():
     """
     Запустить утренний анализ прямо сейчас (без Celery)
     Использование: python -c "from app.tasks.scheduled_tasks import run_morning_analysis_now; run_morning_analysis_now()"
+
+    Runs the shared morning workflow (app.workflows.morning): trend discovery
+    and idea analysis, with market ideas generated in parallel.
     """
+    from app.workflows.morning import format_timings, run_morning_pipeline
+
     print("🌅 Starting manual morning analysis...")
     print("=" * 50)
 
-    # 1. Поиск трендов
-    print("\n📍 Step 1: Discovering AI trends...")
-    trends_result = discover_trends_task()
-    print(f"   Result: {trends_result}")
+    pipeline = run_with_runtime(run_morning_pipeline(
+        {
+            "sources": TREND_SOURCES,
+            "trend_limit": 15,
+            "focus": "ai_solutions",
+            "idea_limit": 10,
+            "min_score": 60,
+        }
+    ))
+
+    print("\n📍 Stages:")
+    for line in format_timings(pipeline):
+        print(f"   {line}")
+
+    def stage_result(name):
+        if name in pipeline["outputs"]:
+            return {"status": "success", **pipeline["outputs"][name]}
+        return {"status": "error", "message": pipeline["stages"].get(name, {}).get("error")}
 
-    # 2. Анализ и генерация идей
-    print("\n📍 Step 2: Analyzing and generating AI ideas...")
-    ideas_result = analyze_ideas_task()
-    print(f"   Result: {ideas_result}")
+    trends_result = stage_result("discover_trends")
+    ideas_result = stage_result("analyze_trends")
 
     print("\n" + "=" * 50)
-    print("✅ Morning analysis completed!")
+    print(f"✅ Morning analysis {pipeline['status']} in {pipeline['seconds']:.1f}s")
     print(f"   Trends: {trends_result.get('trends_count', 0)}")
-    print(f"   Ideas: {ideas_result.get('ideas_generated', 0)}")
+    print(f"   Ideas: {ideas_result.get('ideas_count', 0)}")
 
     return {
         "trends": trends_result,
-        "ideas": ideas_result
+        "ideas": ideas_result,
+        "market": pipeline["outputs"].get("store_market_ideas"),
+        "stages": pipeline["stages"]
     }
@@ -0,0 +1,16 @@
+"""
+Workflows Package
+Declarative DAG pipelines shared by CLI scripts, Celery tasks and cron jobs
+"""
+
+from app.workflows.dag import Pipeline, PipelineError, Stage, StageCache
+from app.workflows.morning import MORNING_PIPELINE, run_morning_pipeline
+
+__all__ = [
+    "Pipeline",
+    "PipelineError",
+    "Stage",
+    "StageCache",
+    "MORNING_PIPELINE",
+    "run_morning_pipeline"
+]
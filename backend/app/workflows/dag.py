@@ -0,0 +1,391 @@
+"""
+DAG Pipeline Engine
+Declarative workflows of typed stages
+
+    pipeline = Pipeline([
+        Stage("trends", discover, params=("sources",), output=dict, cache_ttl=3600),
+        Stage("market", gather_market, output=str),
+        Stage("ideas", analyse, inputs={"trends": "trends", "market": "market"}, output=dict),
+    ])
+    result = await pipeline.run({"sources": ["reddit"]}, targets=["ideas"])
+
+- A stage starts as soon as all of its inputs are ready, so independent
+  stages ("trends" and "market" above) run in parallel
+- Inputs and outputs are typed: upstream output types are checked against
+  the stage function's annotations when the pipeline is built, and every
+  result is checked against the declared output type at run time
+- Stages with cache_ttl reuse a previous output when their inputs and
+  params hash to the same key (in memory, plus JSON files under
+  PIPELINE_CACHE_DIR so CLI and cron runs share it)
+- Per-stage status, timing and cache hits are returned and logged
+- Cancelling a run cancels its stages, including async stages running on
+  a worker thread's own event loop (thread=True)
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+import typing
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+
+class PipelineError(Exception):
+    """Invalid pipeline definition (unknown input, cycle, type mismatch)"""
+
+
+class Stage:
+    """
+    One node of a pipeline
+
+    The function is called with its inputs (upstream outputs) and the
+    selected run params as keyword arguments.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Union[Any, Awaitable[Any]]],
+        inputs: Optional[Dict[str, str]] = None,
+        params: Sequence[str] = (),
+        output: type = object,
+        cache_ttl: Optional[float] = None,
+        thread: bool = False,
+        version: str = "1"
+    ):
+        """
+        Args:
+            name: Unique stage name
+            func: Sync or async callable
+            inputs: Argument name -> upstream stage name
+            params: Run params passed to func (and hashed into the cache key)
+            output: Expected type of the result
+            cache_ttl: Seconds to reuse a cached output; None disables caching
+            thread: Run on a worker thread with its own event loop (for
+                stages that make blocking calls, e.g. the sync LLM client);
+                cancelling the run cancels the stage on that loop
+            version: Bump to invalidate cached outputs after changing func
+        """
+        self.name = name
+        self.func = func
+        self.inputs = inputs or {}
+        self.params = tuple(params)
+        self.output = output
+        self.cache_ttl = cache_ttl
+        self.thread = thread
+        self.version = version
+
+    def input_types(self) -> Dict[str, Any]:
+        """Annotated types of the input arguments"""
+        try:
+            hints = typing.get_type_hints(self.func)
+        except Exception:
+            hints = getattr(self.func, "__annotations__", {})
+        return {arg: hints[arg] for arg in self.inputs if arg in hints}
+
+    def __repr__(self):
+        return f"<Stage({self.name}, inputs={list(self.inputs.values())})>"
+
+
+class StageCache:
+    """
+    Stage outputs keyed by input hash: LRU in memory, JSON files on disk
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 256):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str, ttl: float) -> Tuple[bool, Any]:
+        """(hit, value) for a key stored less than `ttl` seconds ago"""
+        entry = self._entries.get(key)
+        if entry is None and self.directory:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    stored = json.load(f)
+                entry = (stored["stored_at"], stored["value"])
+            except (OSError, ValueError, KeyError):
+                entry = None
+
+        if entry is None or time.time() - entry[0] > ttl:
+            return False, None
+
+        self._remember(key, entry)
+        return True, entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        entry = (time.time(), value)
+        self._remember(key, entry)
+
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": entry[0], "value": value}, f, default=str)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Stage output not cached on disk", key=key, error=str(e))
+
+    def _remember(self, key: str, entry: Tuple[float, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def stable_hash(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Pipeline:
+    """
+    A validated DAG of stages
+
+    Usage:
+        result = await pipeline.run(params, targets=["store_ideas"])
+        # {"status": "completed", "outputs": {...}, "stages": {
+        #     "trends": {"status": "ok", "seconds": 4.2, "cached": False}, ...},
+        #  "seconds": 9.7}
+    """
+
+    def __init__(self, stages: Iterable[Stage], name: str = "pipeline", cache: Optional[StageCache] = None):
+        self.name = name
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise PipelineError(f"Duplicate stage: {stage.name}")
+            self.stages[stage.name] = stage
+
+        self.cache = cache if cache is not None else get_stage_cache()
+        self.order = self._validate()
+
+    def _validate(self) -> List[str]:
+        """Check inputs and types; return stage names in topological order"""
+        for stage in self.stages.values():
+            for arg, upstream in stage.inputs.items():
+                if upstream not in self.stages:
+                    raise PipelineError(f"Stage {stage.name} input {arg!r} refers to unknown stage {upstream!r}")
+
+            for arg, expected in stage.input_types().items():
+                produced = self.stages[stage.inputs[arg]].output
+                expected = typing.get_origin(expected) or expected
+                if (
+                    isinstance(expected, type) and expected is not object
+                    and produced is not object and not issubclass(produced, expected)
+                ):
+                    raise PipelineError(
+                        f"Stage {stage.name} input {arg!r} expects {expected.__name__}, "
+                        f"but {stage.inputs[arg]} produces {produced.__name__}"
+                    )
+
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise PipelineError(f"Cycle: {' -> '.join(path + (name,))}")
+            state[name] = "visiting"
+            for upstream in self.stages[name].inputs.values():
+                visit(upstream, path + (name,))
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, ())
+        return order
+
+    def _needed(self, targets: Optional[Iterable[str]]) -> List[str]:
+        """Stages required for the targets (all stages by default)"""
+        if targets is None:
+            return list(self.order)
+
+        needed = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise PipelineError(f"Unknown target stage: {name}")
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.stages[name].inputs.values())
+        return [name for name in self.order if name in needed]
+
+    async def run(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        targets: Optional[Iterable[str]] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Run the stages needed for `targets`, each as soon as its inputs are ready
+
+        A failed stage marks everything downstream as skipped; independent
+        branches keep running.
+
+        Args:
+            params: Run parameters (each stage receives the ones it declares)
+            targets: Stages whose outputs are wanted (default: all)
+            use_cache: Set False to force every stage to run
+
+        Returns:
+            {"status": "completed" | "failed", "outputs": {stage: output},
+             "stages": {stage: {"status", "seconds", "cached", "error"?}}, "seconds"}
+        """
+        params = params or {}
+        names = self._needed(targets)
+        started = time.monotonic()
+
+        outputs: Dict[str, Any] = {}
+        report: Dict[str, Dict[str, Any]] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(name: str) -> None:
+            stage = self.stages[name]
+            upstream_tasks = [tasks[upstream] for upstream in set(stage.inputs.values())]
+            if upstream_tasks:
+                await asyncio.gather(*upstream_tasks)
+
+            failed = [u for u in stage.inputs.values() if report[u]["status"] != "ok"]
+            if failed:
+                report[name] = {"status": "skipped", "seconds": 0.0, "cached": False, "error": f"upstream {failed[0]} failed"}
+                return
+
+            kwargs = {arg: outputs[upstream] for arg, upstream in stage.inputs.items()}
+            kwargs.update({key: params.get(key) for key in stage.params})
+
+            stage_started = time.monotonic()
+            try:
+                value, cached = await self._run_stage(stage, kwargs, use_cache)
+                outputs[name] = value
+                report[name] = {"status": "ok", "seconds": round(time.monotonic() - stage_started, 3), "cached": cached}
+            except Exception as e:
+                logger.error("Pipeline stage failed", pipeline=self.name, stage=name, error=str(e))
+                report[name] = {
+                    "status": "failed",
+                    "seconds": round(time.monotonic() - stage_started, 3),
+                    "cached": False,
+                    "error": str(e)
+                }
+
+        for name in names:  # Topological order: upstream tasks exist first
+            tasks[name] = asyncio.ensure_future(run_stage(name))
+        await asyncio.gather(*tasks.values())
+
+        status = "completed" if all(r["status"] == "ok" for r in report.values()) else "failed"
+        result = {
+            "status": status,
+            "outputs": outputs,
+            "stages": {name: report[name] for name in names},
+            "seconds": round(time.monotonic() - started, 3)
+        }
+
+        logger.info(
+            "Pipeline finished",
+            pipeline=self.name,
+            status=status,
+            seconds=result["seconds"],
+            stages={name: (r["status"], r["seconds"], r["cached"]) for name, r in result["stages"].items()}
+        )
+        return result
+
+    async def _run_stage(self, stage: Stage, kwargs: Dict[str, Any], use_cache: bool) -> Tuple[Any, bool]:
+        key = None
+        if stage.cache_ttl is not None:
+            key = stable_hash({"pipeline": self.name, "stage": stage.name, "version": stage.version, "inputs": kwargs})
+            if use_cache:
+                hit, value = self.cache.get(key, stage.cache_ttl)
+                if hit:
+                    return value, True
+
+        if inspect.iscoroutinefunction(stage.func):
+            if stage.thread:
+                value = await ThreadRun(stage.func, kwargs).run()
+            else:
+                value = await stage.func(**kwargs)
+        else:
+            value = await asyncio.to_thread(stage.func, **kwargs)
+
+        if stage.output is not object and not isinstance(value, stage.output):
+            raise TypeError(f"Stage {stage.name} returned {type(value).__name__}, expected {stage.output.__name__}")
+
+        if key is not None:
+            self.cache.put(key, value)
+        return value, False
+
+
+class ThreadRun:
+    """
+    An async function run on a worker thread with its own event loop
+
+    Cancelling the awaiting task cancels the function's task on the worker
+    loop (call_soon_threadsafe), so the thread stops at its next await
+    instead of running to completion. A cancel that arrives before the
+    worker loop starts keeps the function from starting at all.
+    """
+
+    def __init__(self, func: Callable[..., Awaitable[Any]], kwargs: Dict[str, Any]):
+        self.func = func
+        self.kwargs = kwargs
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self) -> Any:
+        from app.scrapers.runtime import run_with_runtime
+
+        future = asyncio.get_running_loop().run_in_executor(None, run_with_runtime, self._main())
+        # The worker's CancelledError is expected once we have been cancelled
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            if self._task is None:
+                return
+            try:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:
+                pass  # Worker loop already closed: the function has finished
+
+    async def _main(self) -> Any:
+        with self._lock:
+            if self._cancelled:
+                raise asyncio.CancelledError()
+            self._loop = asyncio.get_running_loop()
+            self._task = asyncio.current_task()
+        return await self.func(**self.kwargs)
+
+
+_stage_cache: Optional[StageCache] = None
+
+
+def get_stage_cache() -> StageCache:
+    """Process-wide stage cache (disk-backed when PIPELINE_CACHE_DIR is set)"""
+    global _stage_cache
+    if _stage_cache is None:
+        _stage_cache = StageCache(settings.PIPELINE_CACHE_DIR or None)
+    return _stage_cache
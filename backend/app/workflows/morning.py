@@ -0,0 +1,188 @@
+"""
+Morning Analysis Workflow
+Утренний анализ: тренды -> кластеры -> анализ -> идеи в базе
+
+Shared by run_morning_analysis.py, scheduled_tasks.run_morning_analysis_now
+and cron.daily_analysis:
+
+    discover_trends ──> analyze_trends          (TrendScout -> IdeaAnalyst:
+                                                 cluster, analyse, store)
+    market_context ──> market_ideas ──> store_market_ideas
+                                                (DailyAnalysisAgent)
+
+The two branches are independent and run in parallel. Scraping and the
+market-ideas LLM call are cached by input hash (PIPELINE_CACHE_TTL_SECONDS),
+so re-running after a failed later stage doesn't pay for them again.
+"""
+
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.workflows.dag import Pipeline, Stage
+
+
+async def discover_trends(sources: List[str], trend_limit: int, focus: str) -> dict:
+    """Run TrendScoutAgent and summarise its execution"""
+    from app.agents.trend_scout_agent import TrendScoutAgent
+
+    db = SessionLocal()
+    try:
+        execution = await TrendScoutAgent(db).run({
+            "sources": sources or ["reddit"],
+            "limit": trend_limit or 15,
+            "focus": focus or "ai_solutions",
+        })
+        return {
+            "execution_id": execution.id,
+            "trends_count": execution.output_data.get("trends_stored", 0),
+            "failed_sources": execution.output_data.get("failed_sources", []),
+            "cost": float(execution.llm_cost_usd or 0)
+        }
+    finally:
+        db.close()
+
+
+async def analyze_trends(
+    trends: dict,
+    trend_ids: Optional[List[int]],
+    idea_limit: int,
+    min_score: int
+) -> dict:
+    """Run IdeaAnalystAgent over the fresh trends (clustered, analysed, stored)"""
+    from app.agents.idea_analyst_agent import IdeaAnalystAgent
+
+    db = SessionLocal()
+    try:
+        execution = await IdeaAnalystAgent(db).run({
+            "trend_ids": trend_ids,
+            "limit": idea_limit or 10,
+            "min_total_score": min_score if min_score is not None else 60,
+            "focus": "ai_assistants_agents",
+        })
+        return {
+            "execution_id": execution.id,
+            "ideas_count": execution.output_data.get("ideas_stored", 0),
+            "avg_score": execution.output_data.get("avg_score", 0),
+            "top_idea": execution.output_data.get("top_idea"),
+            "cost": float(execution.llm_cost_usd or 0)
+        }
+    finally:
+        db.close()
+
+
+async def market_context(analysis_date: str) -> str:
+    """Market context for the day (keyed by date so it is cached per day)"""
+    from app.cron.daily_analysis import DailyAnalysisAgent
+
+    return await DailyAnalysisAgent().gather_market_context(analysis_date)
+
+
+async def market_ideas(context: str, ideas_count: int, market_min_score: int) -> dict:
+    """Generate ideas from the market context and keep the qualified ones"""
+    from app.cron.daily_analysis import DailyAnalysisAgent
+
+    ideas = await DailyAnalysisAgent().generate_ideas(context, ideas_count, market_min_score)
+    if not ideas:
+        # Fail the stage so an empty answer is not cached
+        raise RuntimeError("No ideas generated")
+    qualified = [i for i in ideas if i.get("total_score", 0) >= market_min_score]
+
+    return {
+        "ideas_generated": len(ideas),
+        "ideas_qualified": len(qualified),
+        "ideas": qualified
+    }
+
+
+def store_market_ideas(market: dict) -> dict:
+    """Save the qualified market ideas in one transaction (skipping duplicates)"""
+    from app.cron.daily_analysis import save_ideas
+
+    db = SessionLocal()
+    try:
+        saved_ideas = save_ideas(db, market["ideas"])
+    finally:
+        db.close()
+    return {"saved_ideas": saved_ideas, "saved_count": len(saved_ideas)}
+
+
+MORNING_PIPELINE = Pipeline([
+    Stage(
+        "discover_trends", discover_trends,
+        params=("sources", "trend_limit", "focus"),
+        output=dict, cache_ttl=settings.PIPELINE_CACHE_TTL_SECONDS, thread=True
+    ),
+    Stage(
+        "analyze_trends", analyze_trends,
+        inputs={"trends": "discover_trends"},
+        params=("trend_ids", "idea_limit", "min_score"),
+        output=dict, thread=True
+    ),
+    Stage(
+        "market_context", market_context,
+        params=("analysis_date",),
+        output=str, cache_ttl=settings.PIPELINE_CACHE_TTL_SECONDS
+    ),
+    Stage(
+        "market_ideas", market_ideas,
+        inputs={"context": "market_context"},
+        params=("ideas_count", "market_min_score"),
+        output=dict, cache_ttl=settings.PIPELINE_CACHE_TTL_SECONDS, thread=True
+    ),
+    Stage(
+        "store_market_ideas", store_market_ideas,
+        inputs={"market": "market_ideas"},
+        output=dict
+    ),
+], name="morning")
+
+# Targets of each branch
+TREND_TARGETS = ["analyze_trends"]
+MARKET_TARGETS = ["store_market_ideas"]
+
+
+async def run_morning_pipeline(
+    params: Optional[Dict[str, Any]] = None,
+    targets: Optional[List[str]] = None,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Run (part of) the morning workflow
+
+    Args:
+        params: sources, trend_limit, focus, trend_ids, idea_limit, min_score,
+            ideas_count, market_min_score, analysis_date
+        targets: Stages wanted (default: both branches)
+        use_cache: Set False to force fresh scraping / LLM calls
+
+    Returns:
+        Pipeline result (status, outputs, per-stage timings)
+    """
+    params = {
+        "sources": ["reddit"],
+        "trend_limit": 15,
+        "focus": "ai_solutions",
+        "trend_ids": None,
+        "idea_limit": 10,
+        "min_score": 60,
+        "ideas_count": 5,
+        "market_min_score": 50,
+        "analysis_date": date.today().isoformat(),
+        **(params or {})
+    }
+    return await MORNING_PIPELINE.run(params, targets=targets or TREND_TARGETS + MARKET_TARGETS, use_cache=use_cache)
+
+
+def format_timings(result: Dict[str, Any]) -> List[str]:
+    """One line per stage: name, status, seconds (and cache hits)"""
+    lines = []
+    for name, stage in result["stages"].items():
+        line = f"{name}: {stage['status']} {stage['seconds']:.2f}s"
+        if stage["cached"]:
+            line += " (cache)"
+        if stage.get("error"):
+            line += f" - {stage['error']}"
+        lines.append(line)
+    return lines
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+API Latency Benchmark
+List, detail, stats and search endpoints against a seeded database
+
+Использование:
+    python benchmarks/bench_api.py --scale 100k [--requests 200]
+    python benchmarks/bench_api.py --database-url postgresql://... --no-seed
+
+Requests go through httpx.ASGITransport straight into the FastAPI app, one
+at a time, so the numbers are per-request server latency without network or
+client concurrency. Non-2xx responses are counted as errors per endpoint.
+Trend search uses PostgreSQL full-text functions and is skipped on SQLite.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from common import percentiles, run_metadata, setup_env
+from datagen import SCALES, create_tables, seed_database
+
+POSTGRES_ONLY = {"trends.search"}
+SEARCH_TERMS = ["platform", "solution", "analytics", "network", "intelligence", "system"]
+
+
+def endpoints(trend_count: int, idea_count: int, rng: random.Random) -> List[Tuple[str, str, Callable[[], str]]]:
+    """(name, method, url factory) for every measured endpoint"""
+    deep_skip = max(idea_count - 100, 0)
+    return [
+        ("ideas.list", "GET", lambda: "/api/v1/ideas/?limit=50"),
+        ("ideas.list_top", "GET", lambda: "/api/v1/ideas/?limit=50&sort_by=score&min_score=70"),
+        ("ideas.list_category", "GET", lambda: f"/api/v1/ideas/?limit=50&category={rng.choice(['ai', 'saas', 'fintech'])}"),
+        ("ideas.list_deep_page", "GET", lambda: f"/api/v1/ideas/?limit=50&skip={deep_skip}"),
+        ("ideas.detail", "GET", lambda: f"/api/v1/ideas/{rng.randint(1, max(idea_count, 1))}"),
+        ("ideas.stats", "GET", lambda: "/api/v1/ideas/stats"),
+        ("trends.list", "GET", lambda: "/api/v1/trends/?limit=50"),
+        ("trends.list_engaged", "GET", lambda: "/api/v1/trends/?limit=50&min_engagement=100"),
+        ("trends.detail", "GET", lambda: f"/api/v1/trends/{rng.randint(1, max(trend_count, 1))}"),
+        ("trends.rising", "GET", lambda: "/api/v1/trends/rising"),
+        ("trends.stats", "GET", lambda: "/api/v1/trends/stats"),
+        ("trends.search", "POST", lambda: f"/api/v1/trends/search?limit=20&query={rng.choice(SEARCH_TERMS)}"),
+        ("agents.status", "GET", lambda: "/api/v1/agents/status"),
+        ("agents.executions", "GET", lambda: "/api/v1/agents/executions?limit=50"),
+    ]
+
+
+async def measure(app, targets, requests: int, warmup: int) -> Dict[str, Any]:
+    import httpx
+
+    results = {}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, method, url in targets:
+            samples, errors = [], 0
+            for i in range(warmup + requests):
+                started = time.perf_counter()
+                response = await client.request(method, url())
+                elapsed = time.perf_counter() - started
+                if i < warmup:
+                    continue
+                samples.append(elapsed)
+                if response.status_code >= 400:
+                    errors += 1
+            results[name] = {**percentiles(samples), "errors": errors}
+    return results
+
+
+def run_api(trend_count: int, idea_count: int, requests: int = 100, warmup: int = 5, seed: int = 42) -> Dict[str, Any]:
+    """Latency per endpoint (the database must already be seeded)"""
+    from app.core.config import settings
+    from app.main import app
+
+    create_tables()
+    targets = endpoints(trend_count, idea_count, random.Random(seed))
+    if settings.DATABASE_URL.startswith("sqlite"):
+        targets = [target for target in targets if target[0] not in POSTGRES_ONLY]
+    return asyncio.run(measure(app, targets, requests, warmup))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="1k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=100, help="Measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--no-seed", action="store_true", help="Reuse an already seeded database")
+    parser.add_argument("--database-url", default=None, help="Default: a temporary SQLite file")
+    args = parser.parse_args()
+
+    database_url = setup_env(args.database_url)
+    seeded = None if args.no_seed else seed_database(args.scale, args.seed)
+    trend_count = SCALES[args.scale]
+
+    print(json.dumps({
+        "benchmark": "api",
+        "scale": args.scale,
+        "meta": run_metadata(database_url),
+        "seed": seeded,
+        "results": run_api(trend_count, trend_count // 2, args.requests, args.warmup, args.seed)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Ingest Throughput Benchmark
+Synthetic trends through TrendScout's streaming pipeline into the database
+
+Использование:
+    python benchmarks/bench_ingest.py --scale 100k [--batch-size 200]
+
+Runs the same dedup + batched-write path as live scraping (TrendScoutAgent._ingest,
+StreamingPipeline, TrendService.create_trends_bulk), with the source replaced by
+Faker-generated TrendCreate objects. The second pass re-ingests the first N
+trends to measure the duplicate / snapshot path.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from common import run_metadata, setup_env
+from datagen import SCALES, create_tables, trend_creates
+
+
+async def _items(count: int, seed: int, start: int = 0):
+    for trend in trend_creates(count, seed, start):
+        yield trend
+
+
+def run_ingest(count: int, seed: int = 42, repeat: int = 0) -> dict:
+    """Ingest `count` new trends, then re-ingest the first `repeat` of them"""
+    from app.agents.trend_scout_agent import TrendScoutAgent
+    from app.core.config import settings
+    from app.core.database import SessionLocal
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        agent = TrendScoutAgent(db, offline=True)  # synthetic source, no Reddit login
+        result = {
+            "batch_size": settings.INGEST_BATCH_SIZE,
+            "queue_size": settings.INGEST_QUEUE_SIZE
+        }
+        for name, items, total in (
+            ("new", _items(count, seed), count),
+            ("rescrape", _items(repeat, seed), repeat),
+        ):
+            if not total:
+                continue
+            started = time.perf_counter()
+            counts = asyncio.run(agent._ingest(items, [], seen=set()))
+            seconds = time.perf_counter() - started
+            result[name] = {
+                **counts,
+                "seconds": round(seconds, 3),
+                "trends_per_sec": round(total / seconds)
+            }
+        return result
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="1k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rescrape", type=float, default=0.1, help="Share of trends ingested twice")
+    parser.add_argument("--batch-size", type=int, default=None, help="Override INGEST_BATCH_SIZE")
+    parser.add_argument("--database-url", default=None, help="Default: a temporary SQLite file")
+    args = parser.parse_args()
+
+    overrides = {"INGEST_BATCH_SIZE": args.batch_size} if args.batch_size else {}
+    database_url = setup_env(args.database_url, **overrides)
+    count = SCALES[args.scale]
+
+    print(json.dumps({
+        "benchmark": "ingest",
+        "scale": args.scale,
+        "meta": run_metadata(database_url),
+        "results": run_ingest(count, args.seed, int(count * args.rescrape))
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
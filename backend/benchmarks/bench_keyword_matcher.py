@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher Microbenchmark
+Сравнение старого substring-сканирования с KeywordMatcher на 10k постах
+
+Использование:
+    python benchmarks/bench_keyword_matcher.py [--posts 10000] [--repeat 5] [--extra-keywords 300]
+
+Печатает JSON с временем и числом постов в секунду для обоих вариантов:
+на стандартной таксономии и на расширенной (+N синтетических ключевых слов),
+чтобы было видно, как стоимость растёт с размером таксономии.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.scrapers.taxonomy import DEFAULT_CATEGORIES, DEFAULT_TAGS, KeywordMatcher
+
+WORDS = (
+    "said build launch users growth team market product idea feedback pricing "
+    "customers weekend revenue launch week help question startup mvp ai gpt "
+    "automation saas react next.js stripe api mobile web tool workflow health "
+    "course crypto payment platform app shop marketplace no-code open-source"
+).split()
+
+
+def make_posts(count: int, seed: int = 42):
+    """Generate synthetic (title, body) pairs"""
+    rng = random.Random(seed)
+    posts = []
+    for _ in range(count):
+        title = " ".join(rng.choices(WORDS, k=rng.randint(6, 14)))
+        body = " ".join(rng.choices(WORDS, k=rng.randint(20, 120)))
+        posts.append((title, body))
+    return posts
+
+
+def legacy_scan(categories, tag_keywords, title: str, body: str):
+    """Pre-matcher behaviour: substring tests + linear list membership"""
+    title_lower = title.lower()
+    category = "other"
+    for name, keywords in categories.items():
+        if any(word in title_lower for word in keywords):
+            category = name
+            break
+
+    tags = []
+    text = f"{title} {body}".lower()
+    for keyword in tag_keywords:
+        if keyword in text and keyword not in tags:
+            tags.append(keyword)
+    return category, tags
+
+
+def matcher_scan(matcher: KeywordMatcher, title: str, body: str):
+    categories, tags = matcher.scan(title, body)
+    return (categories[0] if categories else "other"), tags
+
+
+def run_case(posts, categories, tags, repeat: int):
+    """Benchmark legacy vs matcher for one taxonomy"""
+    build_start = time.perf_counter()
+    matcher = KeywordMatcher(categories, tags)
+    build_seconds = time.perf_counter() - build_start
+
+    legacy = bench(lambda t, b: legacy_scan(categories, tags, t, b), posts, repeat)
+    compiled = bench(lambda t, b: matcher_scan(matcher, t, b), posts, repeat)
+
+    return {
+        "keywords": len(set(tags) | {k for kws in categories.values() for k in kws}),
+        "matcher_build_seconds": round(build_seconds, 6),
+        "legacy_seconds": round(legacy, 4),
+        "matcher_seconds": round(compiled, 4),
+        "legacy_posts_per_sec": round(len(posts) / legacy),
+        "matcher_posts_per_sec": round(len(posts) / compiled),
+    }
+
+
+def bench(fn, posts, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for title, body in posts:
+            fn(title, body)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--extra-keywords", type=int, default=300)
+    args = parser.parse_args()
+
+    posts = make_posts(args.posts)
+
+    extra = [f"keyword{i}" for i in range(args.extra_keywords)]
+    extended_tags = DEFAULT_TAGS + extra
+    extended_categories = {**DEFAULT_CATEGORIES, "extra": extra}
+
+    print(json.dumps({
+        "benchmark": "keyword_matcher",
+        "posts": args.posts,
+        "default_taxonomy": run_case(posts, DEFAULT_CATEGORIES, DEFAULT_TAGS, args.repeat),
+        "extended_taxonomy": run_case(posts, extended_categories, extended_tags, args.repeat),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Morning Pipeline Benchmark
+Wall time of the full morning workflow against the fake LLM and search servers
+
+Использование:
+    python benchmarks/bench_morning.py [--trends 200] [--llm-latency-ms 300]
+
+Starts fakes.llm_server and fakes.search_server in-process, points the app
+at them (OPENAI_BASE_URL, MARKET_SEARCH_BASE_URL), seeds unanalysed trends
+for IdeaAnalyst and runs app.workflows.morning.run_morning_pipeline with the
+cache off. TrendScout uses the google_trends source (LLM-generated), so no
+request leaves the machine.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from common import LocalServer, free_port, run_metadata, setup_env
+from datagen import create_tables, insert_rows, trend_rows
+
+
+def run_morning(trends: int = 200, seed: int = 42, idea_limit: int = 10, ideas_count: int = 5) -> dict:
+    """Seed trends, run the pipeline once; the fake servers must already be up"""
+    from app.modules.trends.models import Trend
+    from app.workflows.morning import run_morning_pipeline
+
+    create_tables()
+    insert_rows(Trend, trend_rows(trends, seed))
+
+    started = time.perf_counter()
+    result = asyncio.run(run_morning_pipeline({
+        "sources": ["google_trends"],
+        "idea_limit": idea_limit,
+        "ideas_count": ideas_count,
+    }, use_cache=False))
+    wall = time.perf_counter() - started
+
+    outputs = result.get("outputs", {})
+    return {
+        "status": result["status"],
+        "wall_seconds": round(wall, 3),
+        "pipeline_seconds": result["seconds"],
+        "stages": result["stages"],
+        "trends_stored": outputs.get("discover_trends", {}).get("trends_count"),
+        "ideas_stored": outputs.get("analyze_trends", {}).get("ideas_count"),
+        "market_ideas_saved": outputs.get("store_market_ideas", {}).get("saved_count")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trends", type=int, default=200, help="Unanalysed trends seeded before the run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0, help="Fake LLM time to first token")
+    parser.add_argument("--ms-per-token", type=float, default=2.0)
+    parser.add_argument("--search-latency-ms", type=float, default=200.0)
+    parser.add_argument("--database-url", default=None, help="Default: a temporary SQLite file")
+    args = parser.parse_args()
+
+    from fakes import llm_server, search_server
+
+    llm_port, search_port = free_port(), free_port()
+    database_url = setup_env(
+        args.database_url,
+        OPENAI_BASE_URL=f"http://127.0.0.1:{llm_port}/v1",
+        MARKET_SEARCH_BASE_URL=f"http://127.0.0.1:{search_port}",
+        SERPER_API_KEY="fake",
+        SCRAPER_RATE_LIMITS="127.0.0.1=50"
+    )
+
+    llm_app = llm_server.create_app(latency_ms=args.llm_latency_ms, ms_per_token=args.ms_per_token, seed=args.seed)
+    with LocalServer(llm_app, llm_port), \
+            LocalServer(search_server.create_app(latency_ms=args.search_latency_ms), search_port):
+        results = run_morning(args.trends, args.seed)
+        results["llm_requests"] = llm_app.state.fake.requests
+
+    print(json.dumps({
+        "benchmark": "morning",
+        "trends": args.trends,
+        "meta": run_metadata(database_url),
+        "fake_llm": {"latency_ms": args.llm_latency_ms, "ms_per_token": args.ms_per_token},
+        "results": results
+    }, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark Helpers
+Environment setup, latency statistics and local fake servers shared by the benchmarks
+
+Benchmarks never touch real services: unless DATABASE_URL is given they use
+a throwaway SQLite file, and LLM / search calls go to fakes/ servers started
+in-process.
+"""
+
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def setup_env(database_url: Optional[str] = None, **overrides: str) -> str:
+    """
+    Set the environment the app settings read; call before importing app.*
+
+    Returns:
+        The database URL in use
+    """
+    if database_url is None:
+        database_url = os.environ.get("BENCH_DATABASE_URL") or (
+            f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-'), 'bench.db')}"
+        )
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("OPENAI_API_KEY", "fake")
+    os.environ.setdefault("DEBUG", "false")
+    os.environ.setdefault("JOB_QUEUE_ENABLED", "false")
+    os.environ.setdefault("PIPELINE_CACHE_DIR", "")
+    for key, value in overrides.items():
+        os.environ[key] = str(value)
+
+    import logging
+    import structlog
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    return database_url
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """count, mean, p50/p95/p99 and max of latencies in seconds, reported in ms"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3)
+    }
+
+
+def histogram(samples: List[float]) -> Dict[str, int]:
+    """Latency counts per power-of-two millisecond bucket ("<=1ms", "<=2ms", ...)"""
+    buckets: Dict[str, int] = {}
+    for seconds in sorted(samples):
+        bound = 1
+        while seconds * 1000 > bound:
+            bound *= 2
+        key = f"<={bound}ms"
+        buckets[key] = buckets.get(key, 0) + 1
+    return buckets
+
+
+def run_metadata(database_url: str) -> Dict[str, Any]:
+    """Where and on what a result was measured (for comparing across commits)"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": database_url.split(":", 1)[0]
+    }
+
+
+def free_port() -> int:
+    """An unused local TCP port for a fake server"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalServer:
+    """
+    A fakes/ app served by uvicorn in a background thread
+
+    Usage:
+        with LocalServer(create_app(latency_ms=100), port=8092) as server:
+            os.environ["OPENAI_BASE_URL"] = server.url + "/v1"
+    """
+
+    def __init__(self, app, port: int, host: str = "127.0.0.1"):
+        import uvicorn
+
+        self.url = f"http://{host}:{port}"
+        self.server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self) -> "LocalServer":
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError(f"Fake server on {self.url} did not start")
+            time.sleep(0.02)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generators
+Faker-based trends, ideas and agent executions at 1k / 100k / 1M scale
+
+Использование:
+    python benchmarks/datagen.py --scale 100k [--database-url postgresql://...]
+
+Faker is slow per call, so it fills a pool of phrases, names and words once
+and rows are assembled from the pool with a seeded RNG: a million rows take
+seconds to generate, and the same seed always gives the same data.
+
+Rows are plain dicts for Session.bulk_insert_mappings; trend_creates()
+yields TrendCreate objects for the ingest path.
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from common import run_metadata, setup_env
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+TREND_SOURCES = ["reddit", "google_trends", "hackernews", "product_hunt", "youtube", "telegram"]
+CATEGORIES = ["ai", "saas", "fintech", "health", "education", "ecommerce", "entertainment"]
+IDEA_STATUSES = ["pending", "pending", "pending", "approved", "rejected", "in_development", "launched"]
+AGENT_TYPES = ["trend_scout", "idea_analyst"]
+EXECUTION_STATUSES = ["completed"] * 8 + ["failed", "cancelled"]
+METRICS = ["market_size", "competition", "demand", "monetization", "feasibility", "time_to_market"]
+
+
+class Vocabulary:
+    """Phrase pools drawn from Faker once per seed"""
+
+    def __init__(self, seed: int = 42, size: int = 2000):
+        from faker import Faker
+
+        fake = Faker(["en_US", "ru_RU"])
+        Faker.seed(seed)
+        self.rng = random.Random(seed)
+        self.phrases = [fake.catch_phrase() for _ in range(size)]
+        self.sentences = [fake.sentence(nb_words=14) for _ in range(size)]
+        self.words = list({w.lower() for w in fake.words(nb=size)})
+        self.companies = [fake.company() for _ in range(size // 4)]
+        self.slugs = [fake.slug() for _ in range(size)]
+
+    def title(self, i: int) -> str:
+        # The index keeps titles unique (ingest de-duplicates by title)
+        return f"{self.rng.choice(self.phrases)} for {self.rng.choice(self.companies)} #{i}"
+
+    def text(self, sentences: int = 2) -> str:
+        return " ".join(self.rng.choice(self.sentences) for _ in range(sentences))
+
+    def tags(self) -> List[str]:
+        return self.rng.sample(self.words, k=min(len(self.words), self.rng.randint(2, 6)))
+
+
+def _when(rng: random.Random, days: int = 90) -> datetime:
+    return datetime.utcnow() - timedelta(seconds=rng.randint(0, days * 86400))
+
+
+def trend_rows(count: int, seed: int = 42, start: int = 0, vocab: Optional[Vocabulary] = None) -> Iterator[Dict[str, Any]]:
+    """Trend rows (index start..start+count)"""
+    vocab = vocab or Vocabulary(seed)
+    rng = vocab.rng
+    for i in range(start, start + count):
+        yield {
+            "title": vocab.title(i),
+            "description": vocab.text(),
+            "url": f"https://example.com/{rng.choice(vocab.slugs)}/{i}",
+            "source": rng.choice(TREND_SOURCES),
+            "category": rng.choice(CATEGORIES),
+            "tags": vocab.tags(),
+            "engagement_score": int(rng.paretovariate(1.2) * 50),
+            "velocity": round(rng.uniform(-5, 50), 3),
+            "acceleration": round(rng.uniform(-2, 2), 3),
+            "discovered_at": _when(rng),
+            "extra_metadata": {"synthetic": True}
+        }
+
+
+def trend_creates(count: int, seed: int = 42, start: int = 0) -> Iterator[Any]:
+    """TrendCreate objects, as scrapers hand them to the ingest pipeline"""
+    from app.modules.trends.schemas import TrendCreate
+
+    for row in trend_rows(count, seed, start):
+        yield TrendCreate(
+            title=row["title"],
+            description=row["description"],
+            url=row["url"],
+            source=row["source"],
+            category=row["category"],
+            tags=row["tags"],
+            engagement_score=row["engagement_score"],
+            velocity=row["velocity"],
+            metadata={**row["extra_metadata"], "upvotes": row["engagement_score"], "num_comments": row["engagement_score"] // 10}
+        )
+
+
+def idea_rows(count: int, trend_count: int, seed: int = 42, vocab: Optional[Vocabulary] = None) -> Iterator[Dict[str, Any]]:
+    """Idea rows; trend ids are drawn from 1..trend_count (some ideas have none)"""
+    from app.modules.ideas.models import normalize_title
+
+    vocab = vocab or Vocabulary(seed + 1)
+    rng = vocab.rng
+    for i in range(count):
+        title = vocab.title(i)
+        scores = {f"{metric}_score": rng.randint(20, 95) for metric in METRICS}
+        yield {
+            "trend_id": rng.randint(1, trend_count) if trend_count and rng.random() < 0.9 else None,
+            "title": title,
+            "normalized_title": normalize_title(title),
+            "description": vocab.text(3),
+            "emoji": rng.choice(["🤖", "📊", "🧠", "⚡", "💬"]),
+            "source": rng.choice(TREND_SOURCES),
+            "category": rng.choice(CATEGORIES),
+            "is_trending": int(rng.random() < 0.2),
+            "is_russia_relevant": int(rng.random() < 0.6),
+            "is_armenia_relevant": int(rng.random() < 0.3),
+            "is_global_relevant": int(rng.random() < 0.8),
+            **scores,
+            "investment": rng.randint(5, 500) * 1000,
+            "payback_months": rng.randint(3, 48),
+            "margin": rng.randint(5, 90),
+            "arr": rng.randint(10, 5000) * 1000,
+            "analysis": {metric: {"reasoning": vocab.text(1), "evidence": rng.choice(vocab.companies)} for metric in METRICS},
+            "status": rng.choice(IDEA_STATUSES),
+            "is_favorite": int(rng.random() < 0.05),
+            "is_disliked": int(rng.random() < 0.03),
+            "analyzed_at": _when(rng)
+        }
+
+
+def execution_rows(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """Finished agent executions"""
+    rng = random.Random(seed + 2)
+    for _ in range(count):
+        started = _when(rng)
+        duration = rng.randint(5, 900)
+        status = rng.choice(EXECUTION_STATUSES)
+        yield {
+            "agent_type": rng.choice(AGENT_TYPES),
+            "input_data": {"limit": rng.choice([10, 15, 50])},
+            "output_data": {"synthetic": True},
+            "status": status,
+            "error": "Synthetic failure" if status == "failed" else None,
+            "started_at": started,
+            "completed_at": started + timedelta(seconds=duration),
+            "duration_seconds": duration,
+            "llm_tokens_used": rng.randint(1_000, 200_000),
+            "llm_cost_usd": round(rng.uniform(0.001, 1.5), 6)
+        }
+
+
+def create_tables() -> None:
+    """init_db with every module's models registered"""
+    import app.modules.agents.models  # noqa: F401
+    import app.modules.ideas.models  # noqa: F401
+    import app.modules.trends.models  # noqa: F401
+    from app.core.database import init_db
+
+    init_db()
+
+
+def insert_rows(model, rows: Iterator[Dict[str, Any]], chunk_size: int = 10_000) -> int:
+    """Bulk-insert rows in chunks (one transaction per chunk)"""
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    inserted = 0
+    try:
+        chunk: List[Dict[str, Any]] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                db.bulk_insert_mappings(model, chunk)
+                db.commit()
+                inserted += len(chunk)
+                chunk = []
+        if chunk:
+            db.bulk_insert_mappings(model, chunk)
+            db.commit()
+            inserted += len(chunk)
+    finally:
+        db.close()
+    return inserted
+
+
+def seed_database(scale: str, seed: int = 42, ideas_ratio: float = 0.5, executions_ratio: float = 0.01) -> Dict[str, Any]:
+    """
+    Create the tables and fill them for a scale
+
+    Args:
+        scale: "1k", "100k" or "1m" trends
+        ideas_ratio: Ideas per trend
+        executions_ratio: Agent executions per trend
+
+    Returns:
+        Row counts and seconds per table
+    """
+    from app.modules.agents.models import AgentExecution
+    from app.modules.ideas.models import Idea
+    from app.modules.trends.models import Trend
+
+    create_tables()
+    trends = SCALES[scale]
+    ideas = int(trends * ideas_ratio)
+    executions = max(int(trends * executions_ratio), 10)
+
+    result = {}
+    for name, model, rows in (
+        ("trends", Trend, trend_rows(trends, seed)),
+        ("ideas", Idea, idea_rows(ideas, trends, seed)),
+        ("agent_executions", AgentExecution, execution_rows(executions, seed)),
+    ):
+        started = time.perf_counter()
+        count = insert_rows(model, rows)
+        seconds = time.perf_counter() - started
+        result[name] = {"rows": count, "seconds": round(seconds, 3), "rows_per_sec": round(count / seconds)}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="1k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", default=None, help="Default: a temporary SQLite file")
+    args = parser.parse_args()
+
+    database_url = setup_env(args.database_url)
+    print(json.dumps({
+        "benchmark": "seed",
+        "scale": args.scale,
+        "meta": run_metadata(database_url),
+        "database_url": database_url,
+        "tables": seed_database(args.scale, args.seed)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+HTTP Load Test
+Concurrent virtual users replaying a frontend traffic mix against one app worker
+
+Использование:
+    python benchmarks/load_test.py --scale 100k --users 50 --duration 30
+    python benchmarks/load_test.py --db-mode compare --users 100
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --no-seed --ideas 5000
+
+By default the app (app.main) is started in a child process under uvicorn,
+one worker, on a seeded SQLite file (or --database-url), so the load
+generator does not share its GIL. With --url the load goes to an already
+running server instead.
+
+Each virtual user loops: pick an endpoint by weight (--mix), send, record
+latency and status. Reported per endpoint: throughput, p50/p95/p99, error
+rate and a latency histogram.
+
+--db-mode: the routes are `async def` handlers using the sync SQLAlchemy
+session, so every query blocks the event loop ("loop", the app as shipped).
+"threadpool" serves the same handlers as FastAPI runs plain `def`
+endpoints, in the worker threadpool; "compare" runs both back to back.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from common import free_port, histogram, percentiles, run_metadata, setup_env
+from datagen import CATEGORIES, SCALES, create_tables, seed_database
+
+DEFAULT_MIX = "ideas.list=25,ideas.filtered=20,ideas.detail=30,ideas.favorite=5,ideas.stats=10,trends.stats=5,trends.list=5"
+DB_MODES = ["loop", "threadpool", "compare"]
+
+
+def request_factory(name: str, ideas: int, rng: random.Random) -> Tuple[str, str]:
+    """(method, path) for one request of an endpoint in the mix"""
+    idea_id = rng.randint(1, max(ideas, 1))
+    if name == "ideas.list":
+        return "GET", f"/api/v1/ideas/?limit=20&skip={rng.choice([0, 0, 0, 20, 40])}"
+    if name == "ideas.filtered":
+        filters = rng.choice([
+            f"category={rng.choice(CATEGORIES)}",
+            "sort_by=score&min_score=70",
+            "is_trending=true",
+            "status=pending&sort_by=score",
+        ])
+        return "GET", f"/api/v1/ideas/?limit=20&{filters}"
+    if name == "ideas.detail":
+        return "GET", f"/api/v1/ideas/{idea_id}"
+    if name == "ideas.favorite":
+        return "POST", f"/api/v1/ideas/{idea_id}/favorite"
+    if name == "ideas.stats":
+        return "GET", "/api/v1/ideas/stats"
+    if name == "trends.list":
+        return "GET", "/api/v1/trends/?limit=20"
+    if name == "trends.stats":
+        return "GET", "/api/v1/trends/stats"
+    raise ValueError(f"Unknown endpoint in mix: {name}")
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """'ideas.list=25,ideas.detail=30' -> {name: weight}"""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.strip().partition("=")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def run_load(
+    base_url: str,
+    mix: Dict[str, float],
+    ideas: int,
+    users: int,
+    duration: float,
+    think_ms: float = 0.0,
+    seed: int = 42,
+    timeout: float = 30.0
+) -> Dict[str, Any]:
+    """Drive `users` concurrent loops for `duration` seconds"""
+    import httpx
+
+    names, weights = list(mix), list(mix.values())
+    samples: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, Dict[str, int]] = {name: {} for name in names}
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        deadline = time.monotonic() + duration
+
+        async def user(index: int) -> None:
+            rng = random.Random(seed + index)
+            while time.monotonic() < deadline:
+                name = rng.choices(names, weights)[0]
+                method, path = request_factory(name, ideas, rng)
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, path)
+                    error = str(response.status_code) if response.status_code >= 400 else None
+                except httpx.HTTPError as e:
+                    error = type(e).__name__
+                samples[name].append(time.perf_counter() - started)
+                if error:
+                    errors[name][error] = errors[name].get(error, 0) + 1
+                if think_ms:
+                    await asyncio.sleep(rng.expovariate(1000 / think_ms))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user(i) for i in range(users)))
+        elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name in names:
+        count = len(samples[name])
+        failed = sum(errors[name].values())
+        endpoints[name] = {
+            "requests": count,
+            "rps": round(count / elapsed, 1),
+            "error_rate": round(failed / count, 4) if count else 0.0,
+            "errors": errors[name],
+            "latency": percentiles(samples[name]),
+            "histogram": histogram(samples[name])
+        }
+
+    everything = [s for name in names for s in samples[name]]
+    failed = sum(sum(e.values()) for e in errors.values())
+    return {
+        "users": users,
+        "seconds": round(elapsed, 2),
+        "requests": len(everything),
+        "rps": round(len(everything) / elapsed, 1),
+        "error_rate": round(failed / len(everything), 4) if everything else 0.0,
+        "latency": percentiles(everything),
+        "endpoints": endpoints
+    }
+
+
+def serve_in_threadpool(app) -> int:
+    """
+    Re-register the app's `async def` routes as sync endpoints
+
+    FastAPI runs sync endpoints in its worker threadpool, so blocking
+    session calls stop holding the event loop. The handlers never await
+    anything, so their coroutine completes on the first step.
+
+    Returns:
+        Number of routes switched
+    """
+    from fastapi.routing import APIRoute, request_response
+
+    def as_sync(handler):
+        def endpoint(**kwargs):
+            coroutine = handler(**kwargs)
+            try:
+                coroutine.send(None)
+            except StopIteration as done:
+                return done.value
+            coroutine.close()
+            raise RuntimeError(f"{handler.__name__} awaits; it cannot run in the threadpool")
+        return endpoint
+
+    switched = 0
+    for route in app.routes:
+        if isinstance(route, APIRoute) and asyncio.iscoroutinefunction(route.dependant.call):
+            route.dependant.call = as_sync(route.dependant.call)
+            route.app = request_response(route.get_route_handler())
+            switched += 1
+    return switched
+
+
+class AppProcess:
+    """app.main served by uvicorn in a child process (see --serve)"""
+
+    def __init__(self, db_mode: str):
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.command = [sys.executable, os.path.abspath(__file__), "--serve", str(self.port), "--db-mode", db_mode]
+
+    def __enter__(self) -> "AppProcess":
+        import httpx
+
+        self.process = subprocess.Popen(self.command, env=os.environ.copy(), stdout=sys.stderr)
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                if httpx.get(self.url + "/health", timeout=1.0).status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline or self.process.poll() is not None:
+                self.process.kill()
+                raise RuntimeError(f"App did not start on {self.url}")
+            time.sleep(0.1)
+
+    def __exit__(self, *exc) -> None:
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def serve(port: int, db_mode: str) -> None:
+    """Child process: run the app on `port` in the given DB mode"""
+    import uvicorn
+
+    setup_env(os.environ.get("DATABASE_URL"))
+    from app.main import app
+
+    if db_mode == "threadpool":
+        serve_in_threadpool(app)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="1k", help="Trends seeded (ideas = half)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds per run")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Mean pause between a user's requests")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request client timeout, seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint=weight,...")
+    parser.add_argument("--db-mode", choices=DB_MODES, default="loop")
+    parser.add_argument("--url", default=None, help="Load an already running server instead of starting one")
+    parser.add_argument("--ideas", type=int, default=None, help="Idea id range for details/favourites (default: seeded count)")
+    parser.add_argument("--no-seed", action="store_true", help="Reuse an already seeded database")
+    parser.add_argument("--database-url", default=None, help="Default: a temporary SQLite file")
+    parser.add_argument("--serve", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.db_mode)
+        return
+
+    mix = parse_mix(args.mix)
+    ideas = args.ideas or SCALES[args.scale] // 2
+    report: Dict[str, Any] = {"benchmark": "load", "scale": args.scale, "mix": mix, "runs": {}}
+
+    if args.url:
+        if args.db_mode != "loop":
+            parser.error("--db-mode needs the in-process server (drop --url)")
+        report["meta"] = run_metadata(args.database_url or "remote://")
+        report["runs"]["remote"] = asyncio.run(
+            run_load(args.url, mix, ideas, args.users, args.duration, args.think_ms, args.seed, args.timeout)
+        )
+        print(json.dumps(report, indent=2))
+        return
+
+    database_url = setup_env(args.database_url)
+    report["meta"] = run_metadata(database_url)
+    report["seed"] = None if args.no_seed else seed_database(args.scale, args.seed)
+    create_tables()
+
+    modes = ["loop", "threadpool"] if args.db_mode == "compare" else [args.db_mode]
+    for mode in modes:
+        print(f"Loading {mode} for {args.duration:.0f}s with {args.users} users...", file=sys.stderr)
+        with AppProcess(mode) as server:
+            report["runs"][mode] = asyncio.run(
+                run_load(server.url, mix, ideas, args.users, args.duration, args.think_ms, args.seed, args.timeout)
+            )
+
+    if len(report["runs"]) == 2:
+        loop, pool = report["runs"]["loop"], report["runs"]["threadpool"]
+        report["comparison"] = {
+            "rps_ratio": round(pool["rps"] / loop["rps"], 3) if loop["rps"] else None,
+            "p95_ms": {"loop": loop["latency"].get("p95_ms"), "threadpool": pool["latency"].get("p95_ms")},
+            "p99_ms": {"loop": loop["latency"].get("p99_ms"), "threadpool": pool["latency"].get("p99_ms")}
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
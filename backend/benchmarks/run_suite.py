@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Seed, ingest, API latency and morning pipeline in one JSON report
+
+Использование:
+    python benchmarks/run_suite.py --scale 100k --output bench-100k.json
+    python benchmarks/run_suite.py --scale 100k --compare bench-main.json
+
+Each benchmark runs in its own process (settings are read at import time,
+and each gets a fresh database unless --database-url is given). With
+--compare, metrics that got worse than --threshold relative to the earlier
+report are listed and the exit code is 1, so a CI job can fail on them.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+from common import run_metadata
+from datagen import SCALES
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Metric name -> True when bigger is better
+METRICS = {
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "seconds": False,
+    "wall_seconds": False,
+    "rows_per_sec": True,
+    "trends_per_sec": True,
+    "errors": False,
+}
+
+
+def run_benchmark(script: str, args: List[str]) -> Dict[str, Any]:
+    """Run one benchmark script and return its JSON report"""
+    completed = subprocess.run(
+        [sys.executable, os.path.join(BENCH_DIR, script), *args],
+        capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1:] or ["exit code %d" % completed.returncode]}
+    return json.loads(completed.stdout)
+
+
+def flatten(report: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """(dotted.path, value) for every known metric in a report"""
+    if isinstance(report, dict):
+        for key, value in report.items():
+            if key == "meta":
+                continue
+            path = f"{prefix}.{key}" if prefix else key
+            if key in METRICS and isinstance(value, (int, float)):
+                yield path, value
+            else:
+                yield from flatten(value, path)
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Metrics that regressed by more than `threshold` (0.2 = 20%)"""
+    before = dict(flatten(old))
+    regressions = []
+    for path, value in flatten(new):
+        previous = before.get(path)
+        if previous is None:
+            continue
+        higher_is_better = METRICS[path.rsplit(".", 1)[-1]]
+        if previous == 0:
+            worse = value > 0 and not higher_is_better
+            change = None
+        else:
+            change = (value - previous) / previous
+            worse = -change > threshold if higher_is_better else change > threshold
+        if worse:
+            regressions.append({
+                "metric": path,
+                "before": previous,
+                "after": value,
+                "change": round(change, 3) if change is not None else None
+            })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="1k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=100, help="Measured requests per API endpoint")
+    parser.add_argument("--skip", action="append", default=[], choices=["ingest", "api", "morning"])
+    parser.add_argument("--output", default=None, help="Write the report here (default: stdout only)")
+    parser.add_argument("--compare", default=None, help="Earlier report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown, 0.2 = 20%%")
+    parser.add_argument("--database-url", default=None, help="Default: a temporary SQLite file per benchmark")
+    args = parser.parse_args()
+
+    common = ["--seed", str(args.seed)]
+    if args.database_url:
+        common += ["--database-url", args.database_url]
+
+    report: Dict[str, Any] = {
+        "suite": "backend",
+        "scale": args.scale,
+        "meta": run_metadata(args.database_url or "sqlite://"),
+        "benchmarks": {}
+    }
+    plan = [
+        ("ingest", "bench_ingest.py", ["--scale", args.scale]),
+        ("api", "bench_api.py", ["--scale", args.scale, "--requests", str(args.requests)]),
+        ("morning", "bench_morning.py", []),
+    ]
+    for name, script, extra in plan:
+        if name in args.skip:
+            continue
+        print(f"Running {name}...", file=sys.stderr)
+        report["benchmarks"][name] = run_benchmark(script, extra + common)
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        report["compared_to"] = previous.get("meta", {}).get("commit")
+        report["regressions"] = compare(previous, report, args.threshold)
+        exit_code = 1 if report["regressions"] else 0
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
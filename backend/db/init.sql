@@ -19,20 +19,23 @@ CREATE TABLE IF NOT EXISTS trends (
     title VARCHAR(500) NOT NULL,
     description TEXT,
     url TEXT,
-    source VARCHAR(50) NOT NULL,  -- reddit, google_trends, telegram, vk, youtube, instagram
+    source VARCHAR(50) NOT NULL,  -- reddit, hackernews, google_trends, telegram, vk, youtube, instagram
     category VARCHAR(50),
     tags TEXT[],
 
     -- Metrics
     engagement_score INTEGER DEFAULT 0,
     velocity FLOAT DEFAULT 0,  -- Trend velocity (growth rate)
+    acceleration FLOAT DEFAULT 0,  -- Smoothed change of velocity
+    last_snapshot_at TIMESTAMP,
+    analyzed_at TIMESTAMP,  -- Set once idea analysis has looked at the trend
 
     -- Metadata
     discovered_at TIMESTAMP DEFAULT NOW(),
     metadata JSONB DEFAULT '{}',
 
     -- Constraints
-    CONSTRAINT valid_source CHECK (source IN ('reddit', 'google_trends', 'telegram', 'vk', 'youtube', 'instagram', 'facebook', 'product_hunt')),
+    CONSTRAINT valid_source CHECK (source IN ('reddit', 'google_trends', 'telegram', 'vk', 'youtube', 'instagram', 'facebook', 'product_hunt', 'hackernews')),
     CONSTRAINT valid_engagement CHECK (engagement_score >= 0)
 );
 
@@ -41,6 +44,7 @@ CREATE INDEX IF NOT EXISTS idx_trends_source ON trends(source);
 CREATE INDEX IF NOT EXISTS idx_trends_category ON trends(category);
 CREATE INDEX IF NOT EXISTS idx_trends_engagement ON trends(engagement_score DESC);
 CREATE INDEX IF NOT EXISTS idx_trends_discovered ON trends(discovered_at DESC);
+CREATE INDEX IF NOT EXISTS ix_trends_analyzed_at ON trends(analyzed_at);
 CREATE INDEX IF NOT EXISTS idx_trends_tags ON trends USING GIN(tags);
 CREATE INDEX IF NOT EXISTS idx_trends_metadata ON trends USING GIN(metadata);
 
@@ -49,9 +53,29 @@ CREATE INDEX IF NOT EXISTS idx_trends_search ON trends USING GIN(to_tsvector('en
 
 -- Comments
 COMMENT ON TABLE trends IS 'Discovered trends from various data sources';
-COMMENT ON COLUMN trends.velocity IS 'Growth rate of the trend (engagement per day)';
+COMMENT ON COLUMN trends.velocity IS 'Growth rate of the trend (EWMA of engagement per hour)';
 COMMENT ON COLUMN trends.metadata IS 'Flexible JSON field for source-specific data';
 
+-- ============================================================================
+-- Table: trend_snapshots
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS trend_snapshots (
+    id SERIAL PRIMARY KEY,
+    trend_id INTEGER NOT NULL REFERENCES trends(id) ON DELETE CASCADE,
+    ts TIMESTAMP NOT NULL DEFAULT NOW(),
+    upvotes INTEGER DEFAULT 0,
+    comments INTEGER DEFAULT 0,
+    awards INTEGER DEFAULT 0
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_trend_snapshots_trend_ts ON trend_snapshots(trend_id, ts);
+CREATE INDEX IF NOT EXISTS ix_trends_last_snapshot_at ON trends(last_snapshot_at);
+
+-- Comments
+COMMENT ON TABLE trend_snapshots IS 'Append-only engagement time-series, one row per trend per scrape';
+
 -- ============================================================================
 -- Table: ideas
 -- ============================================================================
@@ -60,6 +84,7 @@ CREATE TABLE IF NOT EXISTS ideas (
     id SERIAL PRIMARY KEY,
     trend_id INTEGER REFERENCES trends(id) ON DELETE CASCADE,
     title VARCHAR(500) NOT NULL,
+    normalized_title VARCHAR(500),  -- case/punctuation-insensitive key for duplicate detection
     description TEXT,
 
     -- Scores (0-100 for each metric)
@@ -98,6 +123,7 @@ CREATE TABLE IF NOT EXISTS ideas (
 CREATE INDEX IF NOT EXISTS idx_ideas_total_score ON ideas(total_score DESC);
 CREATE INDEX IF NOT EXISTS idx_ideas_status ON ideas(status);
 CREATE INDEX IF NOT EXISTS idx_ideas_trend ON ideas(trend_id);
+CREATE INDEX IF NOT EXISTS ix_ideas_normalized_title ON ideas(normalized_title);
 CREATE INDEX IF NOT EXISTS idx_ideas_analyzed ON ideas(analyzed_at DESC);
 
 -- Comments
@@ -164,6 +190,11 @@ CREATE TABLE IF NOT EXISTS agent_executions (
     status VARCHAR(20) DEFAULT 'pending',  -- pending, running, completed, failed
     error TEXT,
 
+    -- Job queue
+    priority INTEGER NOT NULL DEFAULT 0,  -- higher runs first
+    queued_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+
     -- Timing
     started_at TIMESTAMP DEFAULT NOW(),
     completed_at TIMESTAMP,
@@ -171,7 +202,7 @@ CREATE TABLE IF NOT EXISTS agent_executions (
 
     -- Cost tracking
     llm_tokens_used INTEGER DEFAULT 0,
-    llm_cost_usd DECIMAL(10, 4) DEFAULT 0,
+    llm_cost_usd DECIMAL(12, 6) DEFAULT 0,
 
     -- Metadata
     metadata JSONB DEFAULT '{}',
@@ -183,11 +214,101 @@ CREATE TABLE IF NOT EXISTS agent_executions (
 CREATE INDEX IF NOT EXISTS idx_executions_agent ON agent_executions(agent_type);
 CREATE INDEX IF NOT EXISTS idx_executions_status ON agent_executions(status);
 CREATE INDEX IF NOT EXISTS idx_executions_started ON agent_executions(started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_executions_queue ON agent_executions(status, priority, id);
 
 -- Comments
 COMMENT ON TABLE agent_executions IS 'Log of all AI agent executions for monitoring and analytics';
 COMMENT ON COLUMN agent_executions.llm_cost_usd IS 'Estimated cost of LLM API calls for this execution';
 
+-- ============================================================================
+-- Table: agent_checkpoints
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS agent_checkpoints (
+    id SERIAL PRIMARY KEY,
+    execution_id INTEGER NOT NULL REFERENCES agent_executions(id) ON DELETE CASCADE,
+    step_key VARCHAR(200) NOT NULL,  -- trend:42, idea_stored:42, ...
+    payload JSONB DEFAULT '{}',
+    created_at TIMESTAMP DEFAULT NOW(),
+
+    CONSTRAINT uq_agent_checkpoints_step UNIQUE (execution_id, step_key)
+);
+
+-- Comments
+COMMENT ON TABLE agent_checkpoints IS 'Completed steps of agent executions, reloaded when a failed run is resumed';
+
+-- ============================================================================
+-- Table: llm_spend
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS llm_spend (
+    day DATE NOT NULL,
+    scope VARCHAR(100) NOT NULL,  -- total, agent:idea_analyst
+    cost_usd DECIMAL(12, 6) NOT NULL DEFAULT 0,
+    tokens INTEGER NOT NULL DEFAULT 0,
+    calls INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW(),
+
+    PRIMARY KEY (day, scope)
+);
+
+-- Comments
+COMMENT ON TABLE llm_spend IS 'Daily LLM spend counters shared by all workers for budget enforcement';
+
+-- ============================================================================
+-- Table: llm_calls
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS llm_calls (
+    id SERIAL PRIMARY KEY,
+    execution_id INTEGER REFERENCES agent_executions(id) ON DELETE SET NULL,
+    agent_type VARCHAR(50) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    kind VARCHAR(20) NOT NULL DEFAULT 'chat',  -- chat, stream (tokens counted locally), embedding, hedge (estimated cancelled duplicate)
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    latency_ms INTEGER,
+    cost_usd DECIMAL(14, 8) NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_llm_calls_created ON llm_calls(created_at);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_agent_created ON llm_calls(agent_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_llm_calls_execution ON llm_calls(execution_id);
+
+-- Comments
+COMMENT ON TABLE llm_calls IS 'Ledger of LLM calls: tokens, latency and cost per call';
+
+-- ============================================================================
+-- Table: job_locks / cron_runs
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS job_locks (
+    name VARCHAR(100) PRIMARY KEY,  -- cron:daily-analysis
+    owner VARCHAR(200) NOT NULL,  -- host:pid:token of the holder
+    acquired_at TIMESTAMP DEFAULT NOW(),
+    expires_at TIMESTAMP NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS cron_runs (
+    id SERIAL PRIMARY KEY,
+    job VARCHAR(100) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',  -- running, completed, failed
+    owner VARCHAR(200),
+    started_at TIMESTAMP DEFAULT NOW(),
+    completed_at TIMESTAMP,
+    result JSONB,
+    error TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_cron_runs_job_started ON cron_runs(job, started_at);
+
+-- Comments
+COMMENT ON TABLE job_locks IS 'Leases that keep a cron job to one run across replicas';
+COMMENT ON TABLE cron_runs IS 'Status and result of each cron job run';
+
 -- ============================================================================
 -- Table: users (Optional - for multi-user support)
 -- ============================================================================
@@ -278,6 +399,23 @@ WHERE started_at > NOW() - INTERVAL '30 days'
 GROUP BY agent_type, status
 ORDER BY agent_type, status;
 
+-- LLM cost and latency per day, agent and model
+CREATE OR REPLACE VIEW llm_cost_daily AS
+SELECT
+    DATE(created_at) as day,
+    agent_type,
+    model,
+    COUNT(*) as calls,
+    SUM(prompt_tokens) as prompt_tokens,
+    SUM(cached_tokens) as cached_tokens,
+    SUM(completion_tokens) as completion_tokens,
+    SUM(cost_usd) as total_cost_usd,
+    AVG(latency_ms) as avg_latency_ms,
+    PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY latency_ms) as p95_latency_ms
+FROM llm_calls
+GROUP BY DATE(created_at), agent_type, model
+ORDER BY day DESC, total_cost_usd DESC;
+
 -- ============================================================================
 -- Functions & Triggers
 -- ============================================================================
@@ -368,7 +506,7 @@ ANALYZE agent_executions;
 DO $$
 BEGIN
     RAISE NOTICE 'Database schema initialized successfully!';
-    RAISE NOTICE 'Tables created: trends, ideas, businesses, agent_executions, users';
+    RAISE NOTICE 'Tables created: trends, trend_snapshots, ideas, businesses, agent_executions, users';
     RAISE NOTICE 'Views created: top_ideas, recent_trends_by_source, business_performance, agent_stats';
     RAISE NOTICE 'Ready for application startup.';
 END $$;
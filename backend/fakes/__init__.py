@@ -0,0 +1,4 @@
+"""
+Local Fake Services
+Offline stand-ins for external APIs, for tests and benchmarks
+"""
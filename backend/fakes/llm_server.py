@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+Fake LLM Server
+OpenAI-compatible chat completions, embeddings and batches with deterministic answers
+
+Использование:
+    python -m fakes.llm_server --port 8092 --latency-ms 300 --ms-per-token 5
+
+Then point the app at it:
+    OPENAI_BASE_URL=http://127.0.0.1:8092/v1 OPENAI_API_KEY=fake
+
+Answers are schema-valid JSON built from templates for the prompts the
+agents send (recognised by their wording):
+
+- TrendScoutAgent: Reddit fallback ({"trends": [...]}) and Google Trends
+- IdeaAnalystAgent: triage scores ({"scores": [{"id", "score"}]}) and the
+  deep analysis of one trend
+- DailyAnalysisAgent: idea chunks ({"ideas": [...]})
+
+Anything else gets {"answer": "ok"} (JSON mode) or a short text. Content is
+seeded by a hash of the model and prompt, so the same request always gets
+the same answer.
+
+Timing and usage:
+- --latency-ms before the first token, --ms-per-token after each token
+- --tail-rate / --tail-ms: that share of requests is slower (tail latency)
+- --error-rate: that share of requests fails with 429 (retry-after-ms) or 503
+- usage is counted at --chars-per-token characters per token; answers over
+  max_tokens are cut off with finish_reason "length"
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+# ============================================================================
+# Templates
+# ============================================================================
+
+AI_KINDS = ["AI-помощник", "AI-агент", "AI-инструмент", "AI-копилот", "AI-сервис"]
+AUDIENCES = [
+    "бухгалтеров", "юристов", "врачей частных клиник", "репетиторов", "владельцев кофеен",
+    "HR-специалистов", "риелторов", "интернет-магазинов", "логистических компаний", "автосервисов",
+    "фрилансеров", "стоматологий", "фитнес-клубов", "застройщиков", "маркетплейс-селлеров",
+    "школ программирования", "ресторанов", "страховых агентов", "турагентств", "IT-аутсорса",
+]
+TASKS = [
+    "разбор входящих документов", "ответы клиентам 24/7", "прогноз спроса", "поиск ошибок в договорах",
+    "планирование расписания", "подготовка отчётности", "контроль дебиторки", "генерация описаний товаров",
+    "квалификация лидов", "мониторинг цен конкурентов", "онбординг сотрудников", "анализ отзывов",
+    "составление смет", "проверка комплаенса", "персональные рекомендации", "обработка звонков",
+]
+TREND_CATEGORIES = ["ai", "saas", "fintech", "health", "education", "productivity", "automation"]
+IDEA_CATEGORIES = ["ai", "saas", "fintech", "health", "education", "ecommerce", "entertainment"]
+METRICS = ["market_size", "competition", "demand", "monetization", "feasibility", "time_to_market"]
+EMOJIS = ["🤖", "📊", "🧠", "⚡", "🛠️", "💬", "📈", "🩺", "🎓", "🛒"]
+
+
+def _rng(*parts: str) -> random.Random:
+    return random.Random(hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest())
+
+
+def _titles(rng: random.Random, count: int) -> List[Tuple[str, str, str]]:
+    """Distinct (kind, audience, task) combinations"""
+    combos = [(audience, task) for audience in AUDIENCES for task in TASKS]
+    picked = rng.sample(combos, k=min(count, len(combos)))
+    return [(rng.choice(AI_KINDS), audience, task) for audience, task in picked]
+
+
+def _reasoning(rng: random.Random, metric: str, subject: str) -> Dict[str, str]:
+    return {
+        "reasoning": f"Оценка «{metric}» для «{subject}»: рынок растёт на {rng.randint(15, 60)}% в год, "
+                     f"аудитория {rng.randint(10, 900)} тыс. компаний.",
+        "evidence": f"Отчёт отрасли {rng.randint(2024, 2026)}, обсуждения на Reddit и Habr"
+    }
+
+
+def reddit_trends(rng: random.Random, count: int) -> Dict[str, Any]:
+    trends = []
+    for kind, audience, task in _titles(rng, count):
+        trends.append({
+            "title": f"{kind} для {audience}: {task}",
+            "description": f"Автоматизирует {task} для {audience}, экономя до {rng.randint(5, 20)} часов в неделю",
+            "category": rng.choice(TREND_CATEGORIES),
+            "tags": ["AI", kind.split("-")[1], task.split()[0]],
+            "engagement_score": rng.randint(50, 5000),
+            "problem_type": rng.choice(["business", "personal"]),
+            "ai_type": rng.choice(["assistant", "agent", "tool"])
+        })
+    return {"trends": trends}
+
+
+def google_trends(rng: random.Random, count: int) -> Dict[str, Any]:
+    trends = []
+    for kind, audience, task in _titles(rng, count):
+        trends.append({
+            "title": f"{task.capitalize()} with AI for {audience}",
+            "description": f"Searches for AI {task} grew {rng.randint(20, 400)}% this quarter",
+            "category": rng.choice(TREND_CATEGORIES),
+            "tags": ["AI", "trend"],
+            "velocity": round(rng.uniform(0.1, 1.0), 2)
+        })
+    return {"trends": trends}
+
+
+def triage_scores(rng: random.Random, ids: List[int]) -> Dict[str, Any]:
+    return {"scores": [{"id": trend_id, "score": rng.randint(10, 95)} for trend_id in ids]}
+
+
+def idea_analysis(rng: random.Random, trend_title: str) -> Dict[str, Any]:
+    kind, audience, task = _titles(rng, 1)[0]
+    title = f"{kind} для {audience}: {task}"
+    return {
+        "title": title,
+        "description": f"Решает проблему «{trend_title}» для {audience} путём автоматизации ({task})",
+        "emoji": rng.choice(EMOJIS),
+        "category": rng.choice(IDEA_CATEGORIES),
+        "ai_type": rng.choice(["assistant", "agent", "tool"]),
+        "problem_solved": f"{task.capitalize()} отнимает много времени у {audience}",
+        "target_audience": audience,
+        "is_russia_relevant": rng.random() < 0.7,
+        "is_armenia_relevant": rng.random() < 0.4,
+        "is_global_relevant": rng.random() < 0.8,
+        "scores": {
+            metric: {"score": rng.randint(45, 92), **_reasoning(rng, metric, title)}
+            for metric in METRICS
+        },
+        "financial": {
+            "investment": rng.randint(10, 300) * 1000,
+            "payback_months": rng.randint(3, 36),
+            "margin": rng.randint(15, 80),
+            "arr": rng.randint(50, 2000) * 1000
+        }
+    }
+
+
+def daily_ideas(rng: random.Random, count: int, focus: str) -> Dict[str, Any]:
+    ideas = []
+    for kind, audience, task in _titles(rng, count):
+        title = f"{kind} для {audience}: {task}"
+        idea = {
+            "title": title,
+            "description": f"{kind} берёт на себя {task} для {audience}. Фокус: {focus or 'AI'}.",
+            "emoji": rng.choice(EMOJIS),
+            "source": "Fake LLM",
+            "category": rng.choice(IDEA_CATEGORIES),
+            "is_russia_relevant": rng.random() < 0.7,
+            "is_armenia_relevant": rng.random() < 0.4,
+            "is_global_relevant": rng.random() < 0.8,
+            **{f"{metric}_score": rng.randint(60, 90) for metric in METRICS},
+            "investment": rng.randint(20, 500) * 1000,
+            "payback_months": rng.randint(6, 24),
+            "margin": rng.randint(30, 80),
+            "arr": rng.randint(100, 3000) * 1000,
+            "analysis": {metric: _reasoning(rng, metric, title) for metric in METRICS}
+        }
+        ideas.append(idea)
+    return {"ideas": ideas}
+
+
+def _number(pattern: str, text: str, default: int) -> int:
+    match = re.search(pattern, text)
+    return int(match.group(1)) if match else default
+
+
+def answer_for(model: str, messages: List[Dict[str, Any]], json_mode: bool) -> str:
+    """Deterministic answer text for a chat request"""
+    prompt = "\n".join(str(m.get("content") or "") for m in messages)
+    rng = _rng(model, prompt)
+
+    if "Оцени потенциал каждого тренда" in prompt:
+        ids = [int(i) for i in re.findall(r"^\s*(\d+)\. ", prompt, re.MULTILINE)]
+        answer = triage_scores(rng, ids)
+    elif '"financial"' in prompt and "Анализируемый тренд" in prompt:
+        title = re.search(r"Название: (.+)", prompt)
+        answer = idea_analysis(rng, title.group(1).strip() if title else "тренд")
+    elif '"ideas"' in prompt:
+        focus = re.search(r"ФОКУС этой подборки: (.+)", prompt)
+        answer = daily_ideas(rng, _number(r"Создай (\d+)", prompt, 2), focus.group(1).strip() if focus else "")
+    elif "Google Trends" in prompt:
+        answer = google_trends(rng, _number(r"Generate (\d+)", prompt, 10))
+    elif '"trends"' in prompt:
+        answer = reddit_trends(rng, _number(r"Сгенерируй (\d+)", prompt, 10))
+    elif json_mode:
+        answer = {"answer": "ok"}
+    else:
+        return "ok"
+    return json.dumps(answer, ensure_ascii=False)
+
+
+def embedding_for(text: str, dim: int) -> List[float]:
+    """
+    Unit vector from hashed words: texts sharing words are close,
+    so clustering behaves like it does on real embeddings
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for word in re.findall(r"\w+", text.lower()):
+        digest = hashlib.md5(word.encode("utf-8")).digest()
+        index = int.from_bytes(digest[:4], "little") % dim
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = float(np.linalg.norm(vector))
+    if norm == 0:
+        vector[0] = 1.0
+        norm = 1.0
+    return (vector / norm).round(6).tolist()
+
+
+# ============================================================================
+# Server
+# ============================================================================
+
+class FakeLLM:
+    """Timing, failure injection and token accounting of the fake server"""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        ms_per_token: float = 0.0,
+        tail_rate: float = 0.0,
+        tail_ms: float = 0.0,
+        error_rate: float = 0.0,
+        chars_per_token: float = 4.0,
+        embedding_dim: int = 1536,
+        seed: int = 0
+    ):
+        self.latency_ms = latency_ms
+        self.ms_per_token = ms_per_token
+        self.tail_rate = tail_rate
+        self.tail_ms = tail_ms
+        self.error_rate = error_rate
+        self.chars_per_token = chars_per_token
+        self.embedding_dim = embedding_dim
+        self.random = random.Random(seed)
+        self.requests = 0
+
+    def tokens(self, text: str) -> int:
+        return math.ceil(len(text or "") / self.chars_per_token)
+
+    def pieces(self, text: str) -> Iterator[str]:
+        """The answer split into 'tokens' for streaming"""
+        size = max(1, int(self.chars_per_token))
+        for i in range(0, len(text), size):
+            yield text[i:i + size]
+
+    def first_token_delay(self) -> float:
+        delay = self.latency_ms
+        if self.tail_rate and self.random.random() < self.tail_rate:
+            delay += self.tail_ms
+        return delay / 1000
+
+    def maybe_fail(self) -> Optional[JSONResponse]:
+        self.requests += 1
+        if not self.error_rate or self.random.random() >= self.error_rate:
+            return None
+        if self.random.random() < 0.5:
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached (fake)", "type": "requests", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after-ms": "200"}
+            )
+        return JSONResponse(
+            {"error": {"message": "The server is overloaded (fake)", "type": "server_error"}},
+            status_code=503
+        )
+
+    def completion(self, body: Dict[str, Any]) -> Tuple[str, str, Dict[str, int]]:
+        """(content, finish_reason, usage) of a chat request"""
+        messages = body.get("messages") or []
+        json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+        content = answer_for(body.get("model", ""), messages, json_mode)
+
+        finish_reason = "stop"
+        max_tokens = body.get("max_tokens")
+        if max_tokens and self.tokens(content) > max_tokens:
+            content = content[:int(max_tokens * self.chars_per_token)]
+            finish_reason = "length"
+
+        prompt_tokens = sum(self.tokens(str(m.get("content") or "")) + 4 for m in messages) + 2
+        completion_tokens = self.tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+        return content, finish_reason, usage
+
+
+def create_app(**options: Any) -> FastAPI:
+    """
+    Args:
+        **options: FakeLLM settings (latency_ms, ms_per_token, tail_rate,
+            tail_ms, error_rate, chars_per_token, embedding_dim, seed)
+    """
+    app = FastAPI(title="Fake LLM")
+    fake = FakeLLM(**options)
+    app.state.fake = fake
+    files: Dict[str, bytes] = {}
+    batches: Dict[str, Dict[str, Any]] = {}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        failure = fake.maybe_fail()
+        await asyncio.sleep(fake.first_token_delay())
+        if failure is not None:
+            return failure
+
+        content, finish_reason, usage = fake.completion(body)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        model = body.get("model", "gpt-4o-mini")
+
+        if not body.get("stream"):
+            await asyncio.sleep(usage["completion_tokens"] * fake.ms_per_token / 1000)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": finish_reason
+                }],
+                "usage": usage
+            }
+
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None, **extra: Any) -> str:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                **extra
+            }
+            return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+        async def events():
+            yield chunk({"role": "assistant", "content": ""})
+            for piece in fake.pieces(content):
+                if fake.ms_per_token:
+                    await asyncio.sleep(fake.ms_per_token / 1000)
+                yield chunk({"content": piece})
+            yield chunk({}, finish_reason)
+            if include_usage:
+                yield f"data: {json.dumps({'id': completion_id, 'object': 'chat.completion.chunk', 'created': created, 'model': model, 'choices': [], 'usage': usage})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        failure = fake.maybe_fail()
+        await asyncio.sleep(fake.first_token_delay())
+        if failure is not None:
+            return failure
+
+        texts = body.get("input") or []
+        if isinstance(texts, str):
+            texts = [texts]
+        dim = int(body.get("dimensions") or fake.embedding_dim)
+        tokens = sum(fake.tokens(str(t)) for t in texts)
+        return {
+            "object": "list",
+            "model": body.get("model", "text-embedding-3-small"),
+            "data": [
+                {"object": "embedding", "index": i, "embedding": embedding_for(str(text), dim)}
+                for i, text in enumerate(texts)
+            ],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens}
+        }
+
+    # Batch API: uploaded JSONL is answered right away (status "completed")
+
+    @app.post("/v1/files")
+    async def upload_file(request: Request):
+        form = await request.form()  # multipart (python-multipart)
+        upload = form["file"]
+        data = await upload.read()
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        files[file_id] = data
+        return _file_object(file_id, upload.filename or "input.jsonl", len(data), form.get("purpose", "batch"))
+
+    @app.get("/v1/files/{file_id}/content")
+    async def file_content(file_id: str):
+        if file_id not in files:
+            raise HTTPException(status_code=404, detail="File not found")
+        return PlainTextResponse(files[file_id].decode("utf-8"), media_type="application/jsonl")
+
+    @app.post("/v1/batches")
+    async def create_batch(request: Request):
+        body = await request.json()
+        data = files.get(body.get("input_file_id", ""))
+        if data is None:
+            raise HTTPException(status_code=404, detail="Input file not found")
+
+        lines, failed = [], 0
+        for line in data.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if item.get("url", body.get("endpoint")) == "/v1/embeddings":
+                texts = item["body"].get("input") or []
+                texts = [texts] if isinstance(texts, str) else texts
+                response_body = {
+                    "object": "list",
+                    "data": [
+                        {"object": "embedding", "index": i, "embedding": embedding_for(str(t), fake.embedding_dim)}
+                        for i, t in enumerate(texts)
+                    ],
+                    "usage": {"prompt_tokens": sum(fake.tokens(str(t)) for t in texts)}
+                }
+            else:
+                content, finish_reason, usage = fake.completion(item.get("body") or {})
+                response_body = {
+                    "object": "chat.completion",
+                    "model": (item.get("body") or {}).get("model"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": finish_reason}],
+                    "usage": usage
+                }
+            lines.append(json.dumps({
+                "id": f"batch_req_{uuid.uuid4().hex[:16]}",
+                "custom_id": item.get("custom_id"),
+                "response": {"status_code": 200, "body": response_body},
+                "error": None
+            }, ensure_ascii=False))
+
+        output_id = f"file-{uuid.uuid4().hex[:24]}"
+        files[output_id] = ("\n".join(lines) + "\n").encode("utf-8")
+        now = int(time.time())
+        batch = {
+            "id": f"batch_{uuid.uuid4().hex[:24]}",
+            "object": "batch",
+            "endpoint": body.get("endpoint"),
+            "input_file_id": body.get("input_file_id"),
+            "completion_window": body.get("completion_window", "24h"),
+            "status": "completed",
+            "output_file_id": output_id,
+            "error_file_id": None,
+            "created_at": now,
+            "completed_at": now,
+            "request_counts": {"total": len(lines) + failed, "completed": len(lines), "failed": failed},
+            "metadata": body.get("metadata")
+        }
+        batches[batch["id"]] = batch
+        return batch
+
+    @app.get("/v1/batches/{batch_id}")
+    async def get_batch(batch_id: str):
+        if batch_id not in batches:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        return batches[batch_id]
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [
+            {"id": model, "object": "model", "owned_by": "fake"}
+            for model in ("gpt-4o", "gpt-4o-mini", "gpt-3.5-turbo", "text-embedding-3-small")
+        ]}
+
+    @app.get("/stats")
+    async def stats():
+        return {"requests": fake.requests}
+
+    return app
+
+
+def _file_object(file_id: str, filename: str, size: int, purpose: str) -> Dict[str, Any]:
+    return {
+        "id": file_id,
+        "object": "file",
+        "bytes": size,
+        "created_at": int(time.time()),
+        "filename": filename,
+        "purpose": purpose,
+        "status": "processed"
+    }
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="OpenAI-compatible fake LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8092)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay before the first token")
+    parser.add_argument("--ms-per-token", type=float, default=0.0, help="Delay per generated token")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="Share of requests that are slow")
+    parser.add_argument("--tail-ms", type=float, default=0.0, help="Extra delay of slow requests")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 429/503")
+    parser.add_argument("--chars-per-token", type=float, default=4.0, help="Usage accounting granularity")
+    parser.add_argument("--embedding-dim", type=int, default=1536)
+    parser.add_argument("--seed", type=int, default=0, help="Seed of tail/error sampling")
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(
+            latency_ms=args.latency_ms,
+            ms_per_token=args.ms_per_token,
+            tail_rate=args.tail_rate,
+            tail_ms=args.tail_ms,
+            error_rate=args.error_rate,
+            chars_per_token=args.chars_per_token,
+            embedding_dim=args.embedding_dim,
+            seed=args.seed
+        ),
+        host=args.host,
+        port=args.port,
+        log_level="warning"
+    )
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Fake Search Server
+Serper-compatible POST /search that answers from deterministic fixtures
+
+Использование:
+    python -m fakes.search_server --port 8091 --latency-ms 300
+
+Then point the app at it:
+    MARKET_SEARCH_BASE_URL=http://127.0.0.1:8091 SERPER_API_KEY=fake \
+    SCRAPER_RATE_LIMITS=127.0.0.1=50
+
+Results are derived from a hash of the query, so the same query always gets
+the same answer. Some snippets are shared between queries (as real search
+results are) to exercise de-duplication.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+COMMON_SNIPPETS = [
+    ("AI agents are the top investment theme of the year",
+     "Jan 12, 2026 ... Investors poured record funding into autonomous AI agents for sales, support and back-office automation.",
+     "https://techcrunch.com/ai-agents-funding"),
+    ("YC batch: half of startups build with AI",
+     "Over half of the latest Y Combinator batch are building AI-native products, from vertical copilots to agent infrastructure.",
+     "https://www.ycombinator.com/blog/batch-ai"),
+]
+
+TOPICS = [
+    "AI copilots for accountants", "voice agents for clinics", "AI for legal document review",
+    "agentic workflow automation for SMBs", "AI tutoring platforms", "local LLM hosting for enterprises",
+    "AI-powered recruiting assistants", "e-commerce content generation", "AI customer support for marketplaces",
+    "compliance monitoring with LLMs", "AI in logistics route planning", "personal finance assistants",
+]
+
+
+class SearchRequest(BaseModel):
+    q: str
+    num: int = 10
+
+
+def fixture_results(query: str, num: int) -> dict:
+    """Deterministic Serper-shaped response for a query"""
+    rng = random.Random(hashlib.sha256(query.encode("utf-8")).hexdigest())
+    organic = []
+    for position, topic in enumerate(rng.sample(TOPICS, k=min(num, len(TOPICS))), start=1):
+        slug = topic.lower().replace(" ", "-")
+        organic.append({
+            "title": f"{topic.capitalize()}: market overview",
+            "snippet": f"{rng.randint(2, 9)} days ago — Demand for {topic} grows {rng.randint(20, 300)}% "
+                       f"year over year as companies look for ways to cut costs with AI ({query}).",
+            "link": f"https://example.com/{slug}",
+            "position": position
+        })
+    news = [
+        {"title": title, "snippet": snippet, "link": link, "date": "1 day ago"}
+        for title, snippet, link in COMMON_SNIPPETS
+    ]
+    return {"searchParameters": {"q": query, "num": num}, "news": news, "organic": organic[:num]}
+
+
+def create_app(latency_ms: float = 0.0) -> FastAPI:
+    app = FastAPI(title="Fake Search")
+
+    @app.post("/search")
+    async def search(request: SearchRequest):
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return fixture_results(request.q, request.num)
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serper-compatible fixture server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.latency_ms), host=args.host, port=args.port, log_level="warning")
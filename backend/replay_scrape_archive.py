@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Scrape Archive Replay
+Повторная обработка сохранённых сырых данных скраперов без сети
+
+Использование:
+    python replay_scrape_archive.py [--source reddit] [--since 2026-09-01] [--until 2026-09-30]
+
+Этот скрипт:
+1. Читает архив SCRAPE_ARCHIVE_DIR (gzip JSONL сегменты, через mmap)
+2. Прогоняет сырые посты через текущую очистку, категоризацию и теги
+3. Создаёт новые тренды и обновляет категории/теги существующих
+
+API Reddit и квота не используются.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import date
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+from app.agents.trend_scout_agent import TrendScoutAgent
+
+
+async def main(args) -> dict:
+    """Повторная обработка архива"""
+    db = SessionLocal()
+
+    try:
+        # Без логина в Reddit: повтор архива не ходит в сеть
+        agent = TrendScoutAgent(db, offline=True)
+        return await agent.reprocess_archive(
+            source=args.source,
+            since=date.fromisoformat(args.since) if args.since else None,
+            until=date.fromisoformat(args.until) if args.until else None
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay the raw scrape archive")
+    parser.add_argument("--source", default="reddit")
+    parser.add_argument("--since", help="First UTC day, YYYY-MM-DD")
+    parser.add_argument("--until", help="Last UTC day, YYYY-MM-DD")
+
+    result = asyncio.run(main(parser.parse_args()))
+
+    print(json.dumps(result, indent=2, default=str))
@@ -0,0 +1,91 @@
+"""
+Test configuration
+
+Settings are read at import time, so the environment is set before any
+app module is imported: a throwaway SQLite database, a dummy OpenAI key and
+no in-process job queue.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='tests-'), 'test.db')}")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DEBUG", "false")
+os.environ.setdefault("JOB_QUEUE_ENABLED", "false")
+os.environ.setdefault("PIPELINE_CACHE_DIR", "")
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """Session on a freshly created schema (all tables dropped afterwards)"""
+    from app.core.database import Base, SessionLocal, engine
+    import app.modules.agents.models  # noqa: F401
+    import app.modules.ideas.models  # noqa: F401
+    import app.modules.trends.models  # noqa: F401
+    import app.cron.models  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+class LedgerRecorder:
+    """Stands in for the llm_calls ledger; keeps the recorded rows"""
+
+    def __init__(self):
+        self.rows = []
+
+    def record(self, **row):
+        self.rows.append(row)
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    from app.agents import base_agent
+
+    recorder = LedgerRecorder()
+    monkeypatch.setattr(base_agent, "get_ledger", lambda: recorder)
+    return recorder
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """
+    Point BaseAgent's async OpenAI client at fakes/llm_server.py (in-process)
+
+    Call with FakeLLM options (latency_ms, error_rate, ...); returns the
+    FakeLLM of the app. Circuit breakers start closed and backoff is short.
+    """
+    import httpx
+    from openai import AsyncOpenAI
+
+    from app.agents import base_agent, resilience
+    from app.core.config import settings
+    from fakes import llm_server
+
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(settings, "LLM_RETRY_BACKOFF_BASE", 0.01)
+
+    def install(**options):
+        app = llm_server.create_app(**options)
+        client = AsyncOpenAI(
+            api_key="fake",
+            base_url="http://fake-llm.test/v1",
+            max_retries=0,
+            http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+        )
+        monkeypatch.setattr(base_agent, "get_async_openai_client", lambda: client)
+        return app.state.fake
+
+    return install
@@ -0,0 +1,113 @@
+"""
+Raw scrape archive: segment roundtrip, mmap replay and offline reprocessing
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import time
+from datetime import date
+
+import pytest
+
+from app.core.config import settings
+from app.modules.trends.models import Trend
+from app.scrapers import archive, reddit_scraper
+from app.scrapers.archive import ArchiveWriter, list_segments, read_segment
+
+
+def reddit_payload(index: int) -> dict:
+    return {
+        "id": f"p{index}",
+        "title": f"AI agent for invoices #{index}",
+        "selftext": f"Automates accounting with an LLM assistant, variant {index * 7919}",
+        "permalink": f"/r/SaaS/comments/p{index}/",
+        "subreddit": "SaaS",
+        "score": 100 + index,
+        "num_comments": 10,
+        "created_utc": time.time() - 7200,
+    }
+
+
+def write_day(root, source: str, day: str, payloads) -> str:
+    directory = os.path.join(root, source, day)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"000000-1-0001{archive.SEGMENT_SUFFIX}")
+    with gzip.open(path, "ab") as f:
+        for payload in payloads:
+            f.write(json.dumps(payload).encode() + b"\n")
+    return path
+
+
+def test_segments_rotate_and_roundtrip(tmp_path):
+    payloads = [reddit_payload(i) for i in range(2000)]
+
+    with ArchiveWriter("reddit", root_dir=str(tmp_path), max_segment_bytes=16 * 1024) as writer:
+        for payload in payloads:
+            writer.append(payload)
+
+    segments = list_segments("reddit", root_dir=str(tmp_path))
+    assert len(segments) > 1
+
+    replayed = [raw for path in segments for raw in read_segment(path)]
+    assert [raw["id"] for raw in replayed] == [payload["id"] for payload in payloads]
+    assert all("scraped_at" in raw for raw in replayed)
+    assert replayed[5]["selftext"] == payloads[5]["selftext"]
+
+
+def test_multi_member_segment_and_truncated_tail(tmp_path):
+    path = write_day(tmp_path, "reddit", "2026-09-01", [reddit_payload(0), reddit_payload(1)])
+    # A second run appended a member to the same file
+    write_day(tmp_path, "reddit", "2026-09-01", [reddit_payload(2)])
+    # ...and a crashed writer left half a member behind
+    tail = gzip.compress(json.dumps(reddit_payload(3)).encode() + b"\n")
+    with open(path, "ab") as f:
+        f.write(tail[:len(tail) // 2])
+
+    assert [raw["id"] for raw in read_segment(path)] == ["p0", "p1", "p2"]
+
+
+def test_replay_filters_days(tmp_path):
+    write_day(tmp_path, "hackernews", "2026-08-31", [{"objectID": "a"}])
+    write_day(tmp_path, "hackernews", "2026-09-01", [{"objectID": "b"}])
+    write_day(tmp_path, "hackernews", "2026-09-02", [{"objectID": "c"}])
+
+    async def main():
+        return [
+            raw["objectID"]
+            async for raw in archive.replay(
+                "hackernews",
+                since=date(2026, 9, 1),
+                until=date(2026, 9, 1),
+                root_dir=str(tmp_path)
+            )
+        ]
+
+    assert asyncio.run(main()) == ["b"]
+
+
+def test_reprocess_runs_offline(db, tmp_path, monkeypatch):
+    from app.agents.trend_scout_agent import TrendScoutAgent
+
+    def no_network():
+        pytest.fail("Reddit client built during archive replay")
+
+    monkeypatch.setattr(reddit_scraper, "get_reddit_client", no_network)
+    monkeypatch.setattr(settings, "SCRAPE_ARCHIVE_DIR", str(tmp_path))
+
+    with ArchiveWriter("reddit") as writer:
+        for i in range(30):
+            writer.append(reddit_payload(i))
+
+    agent = TrendScoutAgent(db, offline=True)
+    counts = asyncio.run(agent.reprocess_archive("reddit"))
+
+    assert counts["discovered"] == 30
+    assert counts["stored"] == 30
+    assert counts["snapshots"] == 0
+    assert db.query(Trend).filter(Trend.source == "reddit").count() == 30
+
+    again = asyncio.run(agent.reprocess_archive("reddit"))
+    assert again["stored"] == 0
+    assert db.query(Trend).count() == 30
@@ -0,0 +1,126 @@
+"""
+LLM budget governor (app.agents.budget): admit, degrade or refuse
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.agents.budget import TOTAL_SCOPE, BudgetExceededError, BudgetGovernor, agent_scope
+from app.agents.pricing import calculate_cost
+from app.core.config import settings
+from app.cron.daily_analysis import DailyAnalysisAgent
+
+MESSAGES = [{"role": "user", "content": "Rate this idea"}]
+
+
+@pytest.fixture
+def budgets(monkeypatch):
+    """Execution budget only (no daily scopes), 0.8 degrade ratio"""
+    monkeypatch.setattr(settings, "LLM_BUDGET_ENABLED", True)
+    monkeypatch.setattr(settings, "LLM_BUDGET_DAILY_USD", 0.0)
+    monkeypatch.setattr(settings, "LLM_BUDGET_AGENT_DAILY_USD", "")
+    monkeypatch.setattr(settings, "LLM_BUDGET_DEGRADE_RATIO", 0.8)
+    monkeypatch.setattr(settings, "LLM_DEGRADE_MODELS", "gpt-4o=gpt-4o-mini")
+
+
+@pytest.fixture
+def flat_governor():
+    # gpt-4o: $0.10 per call, gpt-4o-mini: $0.01, whatever the token counts
+    prices = {"gpt-4o": 0.10, "gpt-4o-mini": 0.01}
+    return BudgetGovernor("daily_analysis", lambda model, prompt, completion: prices[model])
+
+
+@pytest.mark.parametrize("spent, expected", [
+    ({}, (None, None)),
+    ({"execution": 0.65}, (None, None)),  # 0.75 <= 0.8
+    ({"execution": 0.75}, (None, "execution")),  # 0.85 > 0.8
+    ({"execution": 0.95}, ("execution", None)),
+    ({"execution": 0.95, TOTAL_SCOPE: 8.0}, ("execution", TOTAL_SCOPE)),
+    ({TOTAL_SCOPE: 9.95}, (TOTAL_SCOPE, None)),
+], ids=["admit", "below-ratio", "soft", "over", "over-and-soft", "daily-over"])
+def test_pressure(budgets, spent, expected):
+    limits = {"execution": 1.0, TOTAL_SCOPE: 10.0}
+
+    assert BudgetGovernor._pressure(limits, spent, 0.1) == expected
+
+
+def test_admits_below_the_ratio(budgets, flat_governor):
+    decision = flat_governor.check("gpt-4o", MESSAGES, 1000, execution_spent=0.5, execution_limit=1.0)
+
+    assert decision["action"] == "admit"
+    assert decision["model"] == "gpt-4o"
+    assert "scope" not in decision
+
+
+def test_degrades_past_the_ratio_and_when_over(budgets, flat_governor):
+    soft = flat_governor.check("gpt-4o", MESSAGES, 1000, execution_spent=0.75, execution_limit=1.0)
+    over = flat_governor.check("gpt-4o", MESSAGES, 1000, execution_spent=0.95, execution_limit=1.0)
+
+    for decision in (soft, over):
+        assert decision["action"] == "degrade"
+        assert decision["model"] == "gpt-4o-mini"
+        assert decision["requested_model"] == "gpt-4o"
+        assert decision["scope"] == "execution"
+    assert "nearly used" in soft["reason"]
+    assert "exceeded" in over["reason"]
+
+
+def test_refuses_when_nothing_fits(budgets, flat_governor):
+    decision = flat_governor.check("gpt-4o", MESSAGES, 1000, execution_spent=0.995, execution_limit=1.0)
+
+    assert decision["action"] == "refuse"
+    assert decision["model"] == "gpt-4o"
+    assert decision["spent_usd"] == 0.995
+    assert "exceeded" in decision["reason"]
+
+
+def test_soft_pressure_without_cheaper_model_still_admits(budgets, flat_governor, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_DEGRADE_MODELS", "")
+
+    soft = flat_governor.check("gpt-4o", MESSAGES, 1000, execution_spent=0.75, execution_limit=1.0)
+    over = flat_governor.check("gpt-4o", MESSAGES, 1000, execution_spent=0.95, execution_limit=1.0)
+
+    assert soft["action"] == "admit"
+    assert soft["scope"] == "execution"
+    assert over["action"] == "refuse"
+
+
+def test_daily_agent_budget_is_shared_through_the_database(db, budgets, flat_governor, monkeypatch):
+    from app.modules.agents.repository import LLMSpendRepository
+
+    monkeypatch.setattr(settings, "LLM_BUDGET_AGENT_DAILY_USD", "daily_analysis=1")
+    # Spent by another worker today
+    LLMSpendRepository(db).add_spend(
+        datetime.utcnow().date(), [TOTAL_SCOPE, agent_scope("daily_analysis")], 0.95, 1000
+    )
+
+    decision = flat_governor.check("gpt-4o", MESSAGES, 1000, execution_spent=0.0, execution_limit=100.0)
+
+    assert decision["action"] == "degrade"
+    assert decision["scope"] == agent_scope("daily_analysis")
+    assert decision["spent_usd"] == pytest.approx(0.95)
+
+
+def test_agent_calls_are_degraded_and_refused(db, budgets, fake_llm, ledger):
+    fake = fake_llm()
+    agent = DailyAnalysisAgent()
+    # 1000 completion tokens: ~$0.01 on gpt-4o, ~$0.0006 on gpt-4o-mini
+    assert calculate_cost("gpt-4o", 10, 1000) > 0.005 > calculate_cost("gpt-4o-mini", 10, 1000)
+    agent.budget_usd = 0.05
+
+    async def call():
+        return await agent.acall_llm(MESSAGES, model="gpt-4o", max_tokens=1000)
+
+    agent.cost_usd = 0.0
+    asyncio.run(call())
+    agent.cost_usd = 0.045
+    asyncio.run(call())
+    assert [row["model"] for row in ledger.rows] == ["gpt-4o", "gpt-4o-mini"]
+
+    requests = fake.requests
+    agent.cost_usd = 0.06
+    with pytest.raises(BudgetExceededError):
+        asyncio.run(call())
+    assert fake.requests == requests  # Refused before reaching the provider
@@ -0,0 +1,142 @@
+"""
+LLM circuit breaker (app.agents.resilience): closed -> open -> half-open -> closed
+"""
+
+import asyncio
+
+import pytest
+
+from app.agents import resilience
+from app.agents.resilience import CircuitBreaker, CircuitOpenError
+from app.core.config import settings
+from app.cron.daily_analysis import DailyAnalysisAgent
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience, "time", clock)
+    return clock
+
+
+class Overloaded(Exception):
+    status_code = 503
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("gpt-4o", failures=3, cooldown=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # Resets the streak
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 10
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_call()
+    assert error.value.retry_in == pytest.approx(20)
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker("gpt-4o", failures=1, cooldown=30)
+    breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.state == "half_open"
+    breaker.before_call()  # The probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # Everyone else waits for its verdict
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+    breaker.before_call()
+
+
+def test_failed_probe_reopens_for_a_full_cooldown(clock):
+    breaker = CircuitBreaker("gpt-4o", failures=1, cooldown=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.before_call()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 29
+    assert breaker.state == "open"
+    clock.now += 1
+    assert breaker.state == "half_open"
+
+
+def test_probe_without_verdict_is_released(clock):
+    breaker = CircuitBreaker("gpt-4o", failures=1, cooldown=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.before_call()
+
+    breaker.release_probe()  # e.g. a 400 or a cancelled hedge
+    assert breaker.state == "half_open"
+    breaker.before_call()  # Next probe
+
+
+def test_sync_call_stops_retrying_once_open(clock, monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {"gpt-4o": CircuitBreaker("gpt-4o", failures=2, cooldown=30)})
+    monkeypatch.setattr(settings, "LLM_RETRY_ATTEMPTS", 5)
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt, error=None: 0)
+    sent = []
+
+    def send():
+        sent.append(1)
+        raise Overloaded("overloaded")
+
+    with pytest.raises(Overloaded):
+        resilience.call("gpt-4o", send)
+    assert len(sent) == 2  # Opened on the 2nd failure; the other 3 retries are skipped
+
+    with pytest.raises(CircuitOpenError):
+        resilience.call("gpt-4o", send)
+    assert len(sent) == 2
+
+    # After the cooldown, a successful probe closes it again
+    clock.now += 30
+    assert resilience.call("gpt-4o", lambda: "ok") == "ok"
+    assert resilience.get_breaker("gpt-4o").state == "closed"
+
+
+def test_agent_fails_fast_against_a_failing_provider(db, fake_llm, ledger, monkeypatch):
+    fake = fake_llm(error_rate=1.0)
+    monkeypatch.setattr(settings, "LLM_FAILOVER_ENABLED", False)
+    monkeypatch.setattr(settings, "LLM_BREAKER_FAILURES", 3)
+    monkeypatch.setattr(settings, "LLM_RETRY_ATTEMPTS", 3)
+    monkeypatch.setattr(settings, "LLM_RETRY_BACKOFF_MAX", 0.01)
+    agent = DailyAnalysisAgent()
+    messages = [{"role": "user", "content": "ping"}]
+
+    async def call():
+        return await agent.acall_llm(messages, model="gpt-4o-mini", max_tokens=50)
+
+    with pytest.raises(Exception) as first:
+        asyncio.run(call())
+    assert not isinstance(first.value, CircuitOpenError)
+    assert fake.requests == 3
+    assert resilience.breaker_states()["gpt-4o-mini"]["state"] == "open"
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(call())
+    assert fake.requests == 3  # Failed fast, the provider was not called
+    assert ledger.rows == []
@@ -0,0 +1,37 @@
+"""
+Pooled LLM clients (app.agents.clients)
+"""
+
+import asyncio
+
+from app.agents import clients
+from app.scrapers.runtime import run_with_runtime
+
+
+def test_async_client_is_shared_within_a_loop():
+    async def main():
+        return clients.get_async_openai_client(), clients.get_async_openai_client()
+
+    first, second = run_with_runtime(main())
+    assert first is second
+
+
+def test_run_with_runtime_closes_the_loops_clients():
+    async def main():
+        return clients.get_async_openai_client()
+
+    client = run_with_runtime(main())
+
+    assert client.is_closed()
+    assert len(clients._async_clients) == 0
+
+
+def test_each_loop_gets_its_own_client():
+    async def main():
+        client = clients.get_async_openai_client()
+        await clients.close_async_clients()
+        return client
+
+    first = asyncio.run(main())
+    second = asyncio.run(main())
+    assert first is not second
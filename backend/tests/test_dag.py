@@ -0,0 +1,148 @@
+"""
+DAG pipeline engine (app.workflows.dag)
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.workflows.dag import Pipeline, PipelineError, Stage, StageCache
+
+
+def make_pipeline(stages):
+    return Pipeline(stages, name="test", cache=StageCache())
+
+
+def test_stages_run_after_their_inputs_and_independent_ones_in_parallel():
+    events = []
+
+    async def source(name, delay):
+        events.append(("start", name))
+        await asyncio.sleep(delay)
+        events.append(("end", name))
+        return name
+
+    async def slow() -> str:
+        return await source("slow", 0.2)
+
+    async def fast() -> str:
+        return await source("fast", 0.1)
+
+    async def join(a: str, b: str) -> str:
+        events.append(("start", "join"))
+        return f"{a}+{b}"
+
+    pipeline = make_pipeline([
+        Stage("join", join, inputs={"a": "slow", "b": "fast"}, output=str),
+        Stage("slow", slow, output=str),
+        Stage("fast", fast, output=str),
+    ])
+    result = asyncio.run(pipeline.run())
+
+    assert result["status"] == "completed"
+    assert result["outputs"]["join"] == "slow+fast"
+    assert events[:2] == [("start", "slow"), ("start", "fast")]
+    assert events[-1] == ("start", "join")
+    assert result["seconds"] < 0.3
+
+
+def test_cached_stage_reuses_output_for_same_params():
+    calls = []
+
+    def count(n: int) -> int:
+        calls.append(n)
+        return n * 2
+
+    pipeline = make_pipeline([Stage("count", count, params=("n",), output=int, cache_ttl=60)])
+
+    first = asyncio.run(pipeline.run({"n": 3}))
+    second = asyncio.run(pipeline.run({"n": 3}))
+    other = asyncio.run(pipeline.run({"n": 4}))
+    forced = asyncio.run(pipeline.run({"n": 3}, use_cache=False))
+
+    assert first["outputs"]["count"] == second["outputs"]["count"] == 6
+    assert second["stages"]["count"]["cached"] is True
+    assert other["stages"]["count"]["cached"] is False
+    assert forced["stages"]["count"]["cached"] is False
+    assert calls == [3, 4, 3]
+
+
+def test_failed_stage_skips_downstream_only():
+    async def broken() -> dict:
+        raise RuntimeError("boom")
+
+    async def independent() -> int:
+        return 1
+
+    pipeline = make_pipeline([
+        Stage("broken", broken, output=dict),
+        Stage("after", lambda upstream: upstream, inputs={"upstream": "broken"}),
+        Stage("independent", independent, output=int),
+    ])
+    result = asyncio.run(pipeline.run())
+
+    assert result["status"] == "failed"
+    assert result["stages"]["broken"]["status"] == "failed"
+    assert result["stages"]["broken"]["error"] == "boom"
+    assert result["stages"]["after"]["status"] == "skipped"
+    assert result["stages"]["independent"]["status"] == "ok"
+
+
+def test_wrong_output_type_fails_the_stage():
+    async def stage() -> str:
+        return 42
+
+    result = asyncio.run(make_pipeline([Stage("stage", stage, output=str)]).run())
+    assert result["stages"]["stage"]["status"] == "failed"
+
+
+def test_invalid_definitions_are_rejected():
+    async def produce() -> str:
+        return ""
+
+    async def consume(value: int) -> int:
+        return value
+
+    with pytest.raises(PipelineError, match="expects int"):
+        make_pipeline([
+            Stage("produce", produce, output=str),
+            Stage("consume", consume, inputs={"value": "produce"}, output=int),
+        ])
+
+    with pytest.raises(PipelineError, match="Cycle"):
+        make_pipeline([
+            Stage("a", consume, inputs={"value": "b"}),
+            Stage("b", consume, inputs={"value": "a"}),
+        ])
+
+
+def test_cancelling_a_run_stops_thread_stages():
+    ticks = []
+    stopped = threading.Event()
+
+    async def worker() -> int:
+        try:
+            while True:
+                ticks.append(threading.get_ident())
+                await asyncio.sleep(0.02)
+        finally:
+            stopped.set()
+
+    pipeline = make_pipeline([Stage("worker", worker, output=int, thread=True)])
+
+    async def main():
+        run = asyncio.ensure_future(pipeline.run())
+        await asyncio.sleep(0.2)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+
+    asyncio.run(main())
+    assert stopped.wait(1.0)
+    assert ticks and ticks[0] != threading.get_ident()
+
+    count = len(ticks)
+    time.sleep(0.1)
+    assert len(ticks) == count
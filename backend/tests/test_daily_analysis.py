@@ -0,0 +1,63 @@
+"""
+DailyAnalysisAgent idea generation against the fake LLM server (fakes/llm_server.py)
+"""
+
+import asyncio
+
+from app.cron.daily_analysis import SCORE_KEYS, DailyAnalysisAgent
+
+
+def test_generate_ideas_streams_through_base_agent(db, fake_llm, ledger):
+    fake_llm()
+    agent = DailyAnalysisAgent()
+
+    ideas = asyncio.run(agent.generate_ideas("Дата анализа: 2026-01-01", count=4, min_score=50))
+
+    assert len(ideas) == 4
+    assert all(isinstance(idea[key], int) for idea in ideas for key in SCORE_KEYS)
+    assert [i["total_score"] for i in ideas] == sorted((i["total_score"] for i in ideas), reverse=True)
+    assert ledger.rows
+    assert {row["kind"] for row in ledger.rows} == {"stream"}
+    assert {row["agent_type"] for row in ledger.rows} == {"daily_analysis"}
+    assert agent.tokens_used > 0
+
+
+def test_failed_requests_are_not_charged(db, fake_llm, ledger, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "LLM_RETRY_ATTEMPTS", 1)
+    fake = fake_llm(error_rate=1.0)
+    agent = DailyAnalysisAgent()
+
+    ideas = asyncio.run(agent.generate_ideas("Дата анализа: 2026-01-01", count=4, min_score=50))
+
+    assert ideas == []
+    assert fake.requests > 0
+    # No stream was ever opened, so nothing reached the provider's bill
+    assert ledger.rows == []
+    assert agent.tokens_used == 0
+
+
+def test_run_daily_analysis_reports_failed_store(monkeypatch):
+    from app.cron import daily_analysis
+    from app.workflows import morning
+
+    async def pipeline(params, targets=None):
+        return {
+            "status": "failed",
+            "outputs": {"market_context": "ctx", "market_ideas": {
+                "ideas_generated": 2, "ideas_qualified": 1, "ideas": [{"title": "Idea"}]
+            }},
+            "stages": {
+                "market_context": {"status": "ok", "seconds": 0.1, "cached": False},
+                "market_ideas": {"status": "ok", "seconds": 0.1, "cached": False},
+                "store_market_ideas": {"status": "failed", "seconds": 0.1, "cached": False, "error": "db down"},
+            }
+        }
+
+    monkeypatch.setattr(morning, "run_morning_pipeline", pipeline)
+    result = asyncio.run(daily_analysis.run_daily_analysis(ideas_count=2))
+
+    assert result["status"] == "error"
+    assert "db down" in result["message"]
+    assert result["ideas_qualified"] == 1
@@ -0,0 +1,91 @@
+"""
+Execution event bus and streaming (app.core.events, app.modules.agents.streaming)
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import types
+
+from app.core import events
+from app.modules.agents import streaming
+
+
+class FakeRedis:
+    """Blocking client whose every INCR takes `delay` seconds"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.seq = {}
+        self.published = []
+
+    def incr(self, key):
+        time.sleep(self.delay)
+        self.seq[key] = self.seq.get(key, 0) + 1
+        return self.seq[key]
+
+    def pipeline(self):
+        client = self
+
+        class Pipeline:
+            def __getattr__(self, name):
+                def op(*args):
+                    if name == "publish":
+                        client.published.append(args)
+                return op
+
+            def execute(self):
+                pass
+
+        return Pipeline()
+
+
+def redis_bus(monkeypatch, delay):
+    client = FakeRedis(delay)
+    module = types.ModuleType("redis")
+    module.Redis = types.SimpleNamespace(from_url=lambda url: client)
+    module.asyncio = types.ModuleType("redis.asyncio")
+    monkeypatch.setitem(sys.modules, "redis", module)
+    monkeypatch.setitem(sys.modules, "redis.asyncio", module.asyncio)
+    return events.RedisEventBus("redis://test"), client
+
+
+def test_redis_publish_does_not_wait_for_redis(monkeypatch):
+    bus, client = redis_bus(monkeypatch, delay=0.05)
+
+    started = time.monotonic()
+    for i in range(5):
+        bus.publish("execution:1", {"type": "stage", "n": i})
+    assert time.monotonic() - started < 0.05
+
+    assert bus.flush()
+
+    payloads = [events.json.loads(payload) for _, payload in client.published]
+    assert [p["n"] for p in payloads] == [0, 1, 2, 3, 4]
+    assert [p["id"] for p in payloads] == [1, 2, 3, 4, 5]
+
+
+def test_execution_events_read_the_row_off_the_loop(monkeypatch):
+    monkeypatch.setattr(events, "_bus", events.InMemoryEventBus())
+    threads = []
+
+    def snapshot(execution_id):
+        threads.append(threading.get_ident())
+        return None
+
+    monkeypatch.setattr(streaming, "terminal_snapshot", snapshot)
+
+    async def main():
+        received = []
+        async for event in streaming.execution_events(5, keepalive=0.05):
+            received.append(event)
+            if event is None:
+                events.publish_execution_event(5, "completed")
+        return received
+
+    received = asyncio.run(main())
+
+    assert received[0] is None
+    assert received[-1]["type"] == "completed"
+    assert threads and threading.get_ident() not in threads
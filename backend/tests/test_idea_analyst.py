@@ -0,0 +1,41 @@
+"""
+IdeaAnalystAgent trend bookkeeping (no LLM calls: analysis is stubbed)
+"""
+
+import asyncio
+
+from app.agents.idea_analyst_agent import IdeaAnalystAgent
+from app.modules.trends.schemas import TrendCreate
+
+
+class StubIdea:
+    def model_dump(self, mode=None):
+        return {}
+
+
+def test_every_looked_at_trend_is_marked_analyzed(db, monkeypatch):
+    agent = IdeaAnalystAgent(db)
+    (failing, _), (low_score, _), (other, _) = agent.trend_service.create_trends_bulk([
+        TrendCreate(title="Trend that fails", source="reddit", engagement_score=900),
+        TrendCreate(title="Trend that scores low", source="reddit", engagement_score=500),
+        TrendCreate(title="Another low scorer", source="reddit", engagement_score=300),
+    ])
+
+    async def analyze(trend, cluster=None):
+        if trend.id == failing:
+            raise RuntimeError("provider down")
+        return {"total_score": 10, "create_data": StubIdea(), "raw": None}
+
+    monkeypatch.setattr(agent, "_analyze_trend", analyze)
+
+    output = asyncio.run(agent.execute({
+        "limit": 5,
+        "min_total_score": 60,
+        "cluster_trends": False,
+        "triage": False
+    }))
+
+    assert output["trends_analyzed"] == 3
+    assert output["ideas_stored"] == 0
+    # Low scorers are done with; the failed analysis is retried next run
+    assert [t.id for t in agent.trend_service.get_unanalyzed(limit=10)] == [failing]
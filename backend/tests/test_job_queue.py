@@ -0,0 +1,64 @@
+"""
+Agent job queue: claims, per-type limits and shutdown
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from app.agents.job_queue import AgentJobQueue
+from app.modules.agents.repository import AgentExecutionRepository
+from app.modules.agents.schemas import AgentExecutionCreate, AgentExecutionUpdate
+
+
+def queue_job(repository, agent_type, priority=0):
+    return repository.create(AgentExecutionCreate(
+        agent_type=agent_type, input_data={}, status="pending", priority=priority
+    )).id
+
+
+def test_claim_next_honours_priority_and_type_limits(db):
+    repository = AgentExecutionRepository(db)
+    scout_a = queue_job(repository, "trend_scout")
+    scout_b = queue_job(repository, "trend_scout", priority=5)
+    analyst = queue_job(repository, "idea_analyst")
+    limits = {"trend_scout": 1, "idea_analyst": 2}
+
+    assert repository.claim_next(limits).id == scout_b
+    # trend_scout is at its limit: the older scout job waits, the analyst runs
+    assert repository.claim_next(limits).id == analyst
+    assert repository.claim_next(limits) is None
+
+    repository.update(scout_b, AgentExecutionUpdate(status="completed"))
+    assert repository.claim_next(limits).id == scout_a
+
+
+def test_claim_next_skips_types_without_a_limit(db):
+    repository = AgentExecutionRepository(db)
+    queue_job(repository, "dev_agent")
+
+    assert repository.claim_next({"trend_scout": 1}) is None
+    assert repository.claim_next({}) is None
+
+
+def test_stop_gives_up_on_jobs_after_timeout(monkeypatch):
+    queue = AgentJobQueue(workers=1, concurrency={}, poll_seconds=0.05)
+    heartbeats = []
+    monkeypatch.setattr(queue, "_heartbeat", lambda: heartbeats.append(list(queue._running)))
+
+    async def main():
+        queue._executor = ThreadPoolExecutor(max_workers=1)
+        queue._dispatcher = asyncio.ensure_future(asyncio.sleep(3600))
+        stuck = asyncio.ensure_future(asyncio.sleep(3600))
+        queue._running[7] = stuck
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await queue.stop(timeout=0.2)
+        elapsed = loop.time() - started
+        stuck.cancel()
+        return elapsed
+
+    elapsed = asyncio.run(main())
+    assert elapsed < 1.0
+    # Kept heart-beating the stuck job while waiting for it
+    assert heartbeats and heartbeats[0] == [7]
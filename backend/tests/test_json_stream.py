@@ -0,0 +1,64 @@
+"""
+Incremental JSON array parsing (app.agents.json_stream)
+"""
+
+import json
+
+from app.agents.json_stream import JsonArrayStream
+
+ANSWER = json.dumps({"ideas": [
+    {"title": "First", "tags": ["a", "b"], "note": 'brace } and "quote" in text'},
+    {"title": "Second", "nested": {"depth": [1, {"x": 2}]}},
+    {"title": "Third"},
+]}, ensure_ascii=False)
+
+
+def feed_in_chunks(parser, text, size):
+    items = []
+    for i in range(0, len(text), size):
+        items.extend(parser.feed(text[i:i + size]))
+    return items
+
+
+def test_items_are_emitted_as_they_close():
+    parser = JsonArrayStream()
+    first_close = ANSWER.index("}, {") + 1
+
+    assert parser.feed(ANSWER[:first_close - 1]) == []
+    assert [i["title"] for i in parser.feed(ANSWER[first_close - 1:first_close])] == ["First"]
+    assert [i["title"] for i in parser.feed(ANSWER[first_close:])] == ["Second", "Third"]
+    assert parser.close() == []
+    assert parser.items_emitted == 3
+    assert parser.text == ANSWER
+
+
+def test_chunking_does_not_matter():
+    for size in (1, 3, 7, 64):
+        parser = JsonArrayStream()
+        items = feed_in_chunks(parser, ANSWER, size) + parser.close()
+        assert items == json.loads(ANSWER)["ideas"]
+
+
+def test_truncated_answer_keeps_closed_items():
+    cut = ANSWER.index('{"title": "Third"') + 5
+    parser = JsonArrayStream()
+
+    items = feed_in_chunks(parser, ANSWER[:cut], 5) + parser.close()
+
+    assert [i["title"] for i in items] == ["First", "Second"]
+    assert parser.array_found and not parser.array_closed
+
+
+def test_root_array_and_single_object():
+    parser = JsonArrayStream()
+    assert parser.feed('[{"a": 1}, {"a": 2}]') == [{"a": 1}, {"a": 2}]
+
+    parser = JsonArrayStream()
+    assert parser.feed('{"title": "Only one", "score": 80}') == []
+    assert parser.close() == [{"title": "Only one", "score": 80}]
+
+
+def test_malformed_item_is_skipped():
+    parser = JsonArrayStream()
+    items = parser.feed('{"ideas": [{"a": tru}, {"a": 2}]}')
+    assert items == [{"a": 2}]
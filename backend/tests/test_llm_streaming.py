@@ -0,0 +1,75 @@
+"""
+BaseAgent.astream_llm_json against the fake LLM server (fakes/llm_server.py)
+"""
+
+import asyncio
+from contextlib import aclosing
+
+import openai
+import pytest
+
+from app.agents import tokens
+from app.cron.daily_analysis import IDEAS_SYSTEM_PROMPT, DailyAnalysisAgent
+
+
+@pytest.fixture
+def closed_streams(monkeypatch):
+    closed = []
+    close = openai.AsyncStream.close
+
+    async def recording_close(self):
+        closed.append(self)
+        await close(self)
+
+    monkeypatch.setattr(openai.AsyncStream, "close", recording_close)
+    return closed
+
+
+def ideas_messages(agent, count):
+    return [
+        {"role": "system", "content": IDEAS_SYSTEM_PROMPT},
+        {"role": "user", "content": agent._ideas_prompt("Дата анализа: 2026-01-01", count, 50, "B2B")}
+    ]
+
+
+def test_stream_usage_matches_provider_count(db, fake_llm, ledger, closed_streams, monkeypatch, request):
+    # Same ~4 characters per token as the fake server
+    monkeypatch.setattr(tokens, "tiktoken", None)
+    tokens._encoding.cache_clear()
+    request.addfinalizer(tokens._encoding.cache_clear)
+    fake_llm()
+    agent = DailyAnalysisAgent()
+    messages = ideas_messages(agent, 3)
+
+    async def main():
+        items = [item async for item in agent.astream_llm_json(messages, model="gpt-4o", max_tokens=6000)]
+        reply = await agent.acall_llm(messages, model="gpt-4o", max_tokens=6000, json_mode=True)
+        return items, reply
+
+    items, reply = asyncio.run(main())
+
+    assert len(items) == 3
+    stream_row, chat_row = ledger.rows
+    assert stream_row["kind"] == "stream"
+    assert stream_row["completion_tokens"] == chat_row["completion_tokens"] == reply["usage"]["completion_tokens"]
+    assert stream_row["prompt_tokens"] == chat_row["prompt_tokens"]
+    assert len(closed_streams) == 1
+
+
+def test_consumer_stopping_early_closes_the_stream(db, fake_llm, ledger, closed_streams):
+    fake_llm()
+    agent = DailyAnalysisAgent()
+    messages = ideas_messages(agent, 3)
+
+    async def main():
+        async with aclosing(agent.astream_llm_json(messages, model="gpt-4o", max_tokens=6000)) as stream:
+            async for item in stream:
+                return item
+
+    first = asyncio.run(main())
+
+    assert first["title"]
+    assert len(closed_streams) == 1
+    # Charged for what was streamed before the stop
+    assert len(ledger.rows) == 1
+    assert 0 < ledger.rows[0]["completion_tokens"]
@@ -0,0 +1,130 @@
+"""
+Cron job leases (app.cron.locks): acquire, renew, takeover and lost leases
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.cron.locks import DatabaseLease, LeaseLostError, get_latest_run, run_with_lease, start_run
+from app.cron.models import JobLock
+
+
+def expire(db, name: str) -> None:
+    """Make a lease look like its holder stopped renewing one TTL ago"""
+    db.query(JobLock).filter(JobLock.name == name).update(
+        {JobLock.expires_at: datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+
+
+def test_acquire_is_exclusive_and_reentrant(db):
+    first = DatabaseLease("cron:test", ttl_seconds=60)
+    second = DatabaseLease("cron:test", ttl_seconds=60)
+
+    assert first.acquire()
+    assert not second.acquire()
+    assert first.acquire()  # Same owner again
+    assert first.holder() == second.holder() == first.owner
+
+
+def test_renew_extends_only_our_lease(db):
+    first = DatabaseLease("cron:test", ttl_seconds=60)
+    second = DatabaseLease("cron:test", ttl_seconds=60)
+    assert first.acquire()
+    before = db.query(JobLock).one().expires_at
+
+    time.sleep(0.01)
+    assert first.renew()
+    db.expire_all()
+    assert db.query(JobLock).one().expires_at > before
+
+    assert not second.renew()
+    assert first.holder() == first.owner
+
+
+def test_expired_lease_is_taken_over(db):
+    first = DatabaseLease("cron:test", ttl_seconds=60)
+    second = DatabaseLease("cron:test", ttl_seconds=60)
+    assert first.acquire()
+
+    expire(db, "cron:test")
+    assert first.holder() is None
+
+    assert second.acquire()
+    assert second.holder() == second.owner
+    # The old holder finds out on its next renewal
+    assert not first.renew()
+
+    # Releasing someone else's lease is a no-op
+    first.release()
+    assert second.holder() == second.owner
+    second.release()
+    assert first.holder() is None
+
+
+def test_lost_lease_cancels_the_job(db):
+    lease = DatabaseLease("cron:test", ttl_seconds=0.3)
+    thief = DatabaseLease("cron:test", ttl_seconds=60)
+    assert lease.acquire()
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return {"done": True}
+
+    async def main():
+        job = asyncio.ensure_future(run_with_lease(lease, "test-job", work))
+        await asyncio.sleep(0.05)
+        expire(db, "cron:test")
+        assert thief.acquire()
+        await job
+
+    started = time.monotonic()
+    with pytest.raises(LeaseLostError):
+        asyncio.run(main())
+
+    # Noticed by the heartbeat (every TTL/3), not after the job's 5 seconds
+    assert time.monotonic() - started < 1
+    assert cancelled == [True]
+    run = get_latest_run("test-job")
+    assert run["status"] == "failed"
+    assert "lost" in run["error"]
+    # The thief's lease survives the loser's release
+    assert thief.holder() == thief.owner
+
+
+def test_completed_job_records_result_and_releases(db):
+    lease = DatabaseLease("cron:test", ttl_seconds=0.3)
+    assert lease.acquire()
+
+    async def work():
+        await asyncio.sleep(0.25)  # Outlives the TTL: heartbeats keep the lease
+        return {"ideas": 3}
+
+    assert asyncio.run(run_with_lease(lease, "test-job", work)) == {"ideas": 3}
+
+    run = get_latest_run("test-job")
+    assert run["status"] == "completed"
+    assert run["result"] == {"ideas": 3}
+    assert lease.holder() is None
+
+
+def test_abandoned_run_is_reported_failed(db):
+    lease = DatabaseLease("cron:test", ttl_seconds=60)
+    assert lease.acquire()
+    start_run("test-job", lease.owner)
+
+    # Holder still alive: the run is reported as running
+    assert get_latest_run("test-job", lease=lease)["status"] == "running"
+
+    expire(db, "cron:test")
+    run = get_latest_run("test-job", lease=lease)
+    assert run["status"] == "failed"
+    assert run["error"].startswith("abandoned")
@@ -0,0 +1,107 @@
+"""
+Market search context against the fake search server (fakes/search_server.py)
+"""
+
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from app.agents.tokens import count_tokens
+from app.core.config import settings
+from app.cron.market_search import SerperSearch, gather_search_context
+from app.scrapers.runtime import ScraperRuntime
+from fakes import search_server
+
+QUERIES = [
+    "AI startups funding",
+    "AI agents market size",
+    "vertical SaaS trends",
+    "LLM tooling demand",
+    "AI for SMB automation",
+    "voice AI adoption",
+]
+
+
+def make_backend(latency_ms: float = 0.0, base_url: str = "http://search.test"):
+    app = search_server.create_app(latency_ms=latency_ms)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    runtime = ScraperRuntime(client=client, rate_limits={}, default_rate=1000.0)
+    return SerperSearch("fake", base_url=base_url, runtime=runtime), runtime
+
+
+def unique_day() -> str:
+    # The stage cache is process-wide; a fresh "day" keeps tests independent
+    return f"test-{uuid.uuid4().hex}"
+
+
+def test_queries_run_concurrently():
+    async def main():
+        backend, runtime = make_backend(latency_ms=200)
+        started = time.monotonic()
+        context = await gather_search_context(QUERIES, day=unique_day(), backend=backend)
+        elapsed = time.monotonic() - started
+        await runtime.aclose()
+        return context, elapsed, runtime.stats["requests"]
+
+    context, elapsed, requests = asyncio.run(main())
+    assert context
+    assert requests == len(QUERIES)
+    # Sequential would take 6 * 0.2s
+    assert elapsed < 0.6
+
+
+def test_results_are_cached_per_day_and_base_url():
+    async def main():
+        day = unique_day()
+        backend, runtime = make_backend()
+        first = await gather_search_context(QUERIES, day=day, backend=backend)
+        after_first = runtime.stats["requests"]
+
+        second = await gather_search_context(QUERIES, day=day, backend=backend)
+        after_same_day = runtime.stats["requests"]
+
+        await gather_search_context(QUERIES, day=unique_day(), backend=backend)
+        after_new_day = runtime.stats["requests"]
+
+        other, other_runtime = make_backend(base_url="http://other-search.test")
+        await gather_search_context(QUERIES, day=day, backend=other)
+
+        await runtime.aclose()
+        await other_runtime.aclose()
+        return first, second, after_first, after_same_day, after_new_day, other_runtime.stats["requests"]
+
+    first, second, after_first, after_same_day, after_new_day, other_requests = asyncio.run(main())
+    assert second == first
+    assert after_same_day == after_first == len(QUERIES)
+    assert after_new_day == 2 * len(QUERIES)
+    assert other_requests == len(QUERIES)
+
+
+def test_shared_snippets_are_deduplicated():
+    async def main():
+        backend, runtime = make_backend()
+        context = await gather_search_context(QUERIES, day=unique_day(), backend=backend)
+        await runtime.aclose()
+        return context
+
+    context = asyncio.run(main())
+    lines = context.splitlines()
+    assert len(lines) == len(set(lines))
+    for title, _, _ in search_server.COMMON_SNIPPETS:
+        assert sum(title in line for line in lines) == 1
+
+
+def test_context_fits_token_budget(monkeypatch):
+    monkeypatch.setattr(settings, "MARKET_CONTEXT_TOKEN_BUDGET", 150)
+
+    async def main():
+        backend, runtime = make_backend()
+        context = await gather_search_context(QUERIES, day=unique_day(), backend=backend)
+        await runtime.aclose()
+        return context
+
+    context = asyncio.run(main())
+    assert context
+    assert count_tokens(context) <= 150
@@ -0,0 +1,55 @@
+"""
+LLM pricing (app.agents.pricing): longest-prefix matching and cost maths
+"""
+
+import pytest
+
+from app.agents import pricing
+from app.agents.pricing import DEFAULT_PRICES, calculate_cost, get_price
+from app.core.config import settings
+
+
+@pytest.mark.parametrize("model, family", [
+    ("gpt-4o", "gpt-4o"),
+    ("gpt-4o-2024-08-06", "gpt-4o"),
+    ("gpt-4o-mini", "gpt-4o-mini"),  # Not the shorter "gpt-4o"
+    ("gpt-4o-mini-2024-07-18", "gpt-4o-mini"),
+    ("gpt-4-turbo-2024-04-09", "gpt-4-turbo"),  # Not "gpt-4"
+    ("gpt-4-0613", "gpt-4"),
+    ("claude-opus-4-5-20251101", "claude-opus-4-5"),  # Not "claude-opus-4"
+    ("claude-opus-4-20250514", "claude-opus-4"),
+    ("claude-3-5-haiku-20241022", "claude-3-5-haiku"),
+    ("claude-3-haiku-20240307", "claude-3-haiku"),
+])
+def test_longest_prefix_wins(model, family):
+    assert get_price(model) == DEFAULT_PRICES[family]
+
+
+def test_unknown_model_is_priced_at_the_most_expensive_row():
+    most_expensive = max(DEFAULT_PRICES.values(), key=lambda p: p[0] + p[2])
+
+    assert get_price("mystery-model-1") == most_expensive
+    assert "mystery-model-1" in pricing._warned_models
+
+
+def test_overrides_extend_and_replace_the_table(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PRICES", {
+        "gpt-4o": [5, 2.5, 20],
+        "my-finetune": [3, 12],  # [input, output]: no cache discount
+    })
+
+    assert get_price("gpt-4o-2024-08-06") == (5.0, 2.5, 20.0)
+    assert get_price("my-finetune-v2") == (3.0, 3.0, 12.0)
+    assert get_price("gpt-4o-mini") == DEFAULT_PRICES["gpt-4o-mini"]
+
+
+def test_calculate_cost_discounts_cached_prompt_tokens():
+    # gpt-4o: $2.50 input, $1.25 cached input, $10 output per 1M tokens
+    assert calculate_cost("gpt-4o", 1_000_000, 0) == pytest.approx(2.5)
+    assert calculate_cost("gpt-4o", 1_000_000, 1_000_000, cached_tokens=400_000) == pytest.approx(
+        0.6 * 2.5 + 0.4 * 1.25 + 10
+    )
+    # Cached tokens are capped at the prompt size
+    assert calculate_cost("gpt-4o", 1000, 0, cached_tokens=5000) == pytest.approx(1000 * 1.25 / 1_000_000)
+    # Small calls are not rounded away
+    assert calculate_cost("gpt-4o-mini", 10, 5) > 0
@@ -0,0 +1,121 @@
+"""
+ProductHuntScraper against a local GraphQL fixture (httpx.MockTransport)
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.scrapers.base_scraper import ScraperError
+from app.scrapers.producthunt_scraper import ProductHuntScraper
+from app.scrapers.runtime import ScraperRuntime
+
+
+def node(post_id: str, name: str, votes: int, topics=("artificial-intelligence",), hours_ago: float = 10):
+    created = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+    return {
+        "id": post_id,
+        "name": name,
+        "tagline": "AI agent that answers support tickets",
+        "description": "Plugs into your helpdesk.",
+        "url": f"https://www.producthunt.com/posts/{post_id}",
+        "website": "https://example.com",
+        "votesCount": votes,
+        "commentsCount": 5,
+        "createdAt": created.isoformat().replace("+00:00", "Z"),
+        "topics": {"edges": [{"node": {"slug": slug}} for slug in topics]},
+    }
+
+
+POSTS = {
+    "artificial-intelligence": [node("1", "SupportBot", 300), node("2", "Tiny", 3)],
+    "productivity": [node("1", "SupportBot", 300), node("3", "FocusAI", 120, topics=("productivity",))],
+}
+
+
+@pytest.fixture(autouse=True)
+def no_archive(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPE_ARCHIVE_ENABLED", False)
+
+
+def make_scraper(handler, token="test-token") -> ProductHuntScraper:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    runtime = ScraperRuntime(client=client, rate_limits={}, default_rate=1000.0, backoff_base=0.01)
+    return ProductHuntScraper(runtime=runtime, api_url="https://ph.test/graphql", token=token)
+
+
+def graphql_handler(requests):
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append((request.headers.get("Authorization"), body["variables"]))
+        edges = [{"node": dict(item)} for item in POSTS.get(body["variables"]["topic"], [])]
+        return httpx.Response(200, json={"data": {"posts": {"edges": edges}}})
+    return handler
+
+
+def test_scrape_merges_topics_and_filters_votes():
+    requests = []
+    scraper = make_scraper(graphql_handler(requests))
+
+    async def main():
+        posts = await scraper.scrape({"topics": ["artificial-intelligence", "productivity"], "min_votes": 10})
+        await scraper.http.aclose()
+        return posts
+
+    posts = asyncio.run(main())
+
+    assert sorted(post["title"] for post in posts) == ["FocusAI", "SupportBot"]
+    assert {auth for auth, _ in requests} == {"Bearer test-token"}
+    assert sorted(variables["topic"] for _, variables in requests) == ["artificial-intelligence", "productivity"]
+
+    support = next(post for post in posts if post["title"] == "SupportBot")
+    assert support["source"] == "product_hunt"
+    assert support["description"] == "AI agent that answers support tickets Plugs into your helpdesk."
+    assert support["metadata"]["upvotes"] == 300
+    assert support["metadata"]["num_comments"] == 5
+    assert support["engagement_score"] == 310
+    assert 25 <= support["velocity"] <= 35
+    assert support["tags"][0] == "launch"
+    assert "artificial-intelligence" in support["tags"]
+
+
+def test_missing_token_is_an_error():
+    scraper = make_scraper(graphql_handler([]), token="")
+
+    async def main():
+        try:
+            await scraper.scrape({})
+        finally:
+            await scraper.http.aclose()
+
+    with pytest.raises(ScraperError):
+        asyncio.run(main())
+
+
+def test_graphql_errors_skip_the_topic():
+    def handler(request):
+        if json.loads(request.content)["variables"]["topic"] == "broken":
+            return httpx.Response(200, json={"errors": [{"message": "bad topic"}]})
+        return graphql_handler([])(request)
+
+    scraper = make_scraper(handler)
+
+    async def main():
+        posts = await scraper.scrape({"topics": ["broken", "productivity"]})
+        await scraper.http.aclose()
+        return posts
+
+    assert sorted(post["title"] for post in asyncio.run(main())) == ["FocusAI", "SupportBot"]
+
+
+def test_clean_post_uses_scrape_time_for_velocity():
+    scraper = ProductHuntScraper(token="x")
+    raw = node("9", "Later", 100, hours_ago=50)
+    raw["scraped_at"] = time.time() - 40 * 3600  # scraped 10 hours after launch
+
+    assert scraper.clean_post(raw)["velocity"] == pytest.approx(10, abs=0.1)
@@ -0,0 +1,130 @@
+"""
+ScraperRuntime against local HTTP fixtures (httpx.MockTransport)
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.scrapers.runtime import ScraperRuntime, get_runtime, run_with_runtime
+
+
+def make_runtime(handler, **kwargs) -> ScraperRuntime:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    kwargs.setdefault("backoff_base", 0.01)
+    return ScraperRuntime(client=client, **kwargs)
+
+
+def test_rate_limit_spaces_requests_per_host():
+    def handler(request):
+        return httpx.Response(200, json={"ok": True})
+
+    async def main():
+        runtime = make_runtime(handler, rate_limits={"api.test": 20.0}, default_rate=1000.0)
+        started = time.monotonic()
+        # 20 requests fit in the burst, the other 10 wait for tokens (~0.5s)
+        await asyncio.gather(*(runtime.get_json("https://api.test/items") for _ in range(30)))
+        limited = time.monotonic() - started
+
+        started = time.monotonic()
+        await asyncio.gather(*(runtime.get_json("https://other.test/items") for _ in range(30)))
+        unlimited = time.monotonic() - started
+
+        await runtime.aclose()
+        return limited, unlimited
+
+    limited, unlimited = asyncio.run(main())
+    assert limited >= 0.45
+    assert unlimited < 0.2
+
+
+def test_retries_429_and_503_then_succeeds():
+    statuses = [429, 503, 200]
+    seen = []
+
+    def handler(request):
+        status = statuses[len(seen)]
+        seen.append(status)
+        headers = {"Retry-After": "0"} if status == 429 else {}
+        return httpx.Response(status, json={"status": status}, headers=headers)
+
+    async def main():
+        runtime = make_runtime(handler, max_retries=3)
+        data = await runtime.get_json("https://api.test/items")
+        await runtime.aclose()
+        return data, runtime.stats
+
+    data, stats = asyncio.run(main())
+    assert data == {"status": 200}
+    assert seen == [429, 503, 200]
+    assert stats["retries"] == 2
+    assert stats["requests"] == 3
+
+
+def test_gives_up_after_max_retries():
+    def handler(request):
+        return httpx.Response(503)
+
+    async def main():
+        runtime = make_runtime(handler, max_retries=1)
+        try:
+            await runtime.get("https://api.test/items")
+        finally:
+            await runtime.aclose()
+        return runtime
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(main())
+
+
+def test_non_retryable_status_is_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(404)
+
+    async def main():
+        runtime = make_runtime(handler, max_retries=3)
+        try:
+            await runtime.get("https://api.test/missing")
+        finally:
+            await runtime.aclose()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(main())
+    assert len(calls) == 1
+
+
+def test_etag_revalidation_serves_304_from_cache():
+    validators = []
+
+    def handler(request):
+        validators.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"items": [1, 2, 3]}, headers={"ETag": '"v1"'})
+
+    async def main():
+        runtime = make_runtime(handler)
+        first = await runtime.get_json("https://api.test/items", params={"page": 1})
+        second = await runtime.get_json("https://api.test/items", params={"page": 1})
+        await runtime.aclose()
+        return first, second, runtime.stats
+
+    first, second, stats = asyncio.run(main())
+    assert first == second == {"items": [1, 2, 3]}
+    assert validators == [None, '"v1"']
+    assert stats["not_modified"] == 1
+
+
+def test_run_with_runtime_closes_the_loop_runtime():
+    async def main():
+        runtime = get_runtime()
+        assert get_runtime() is runtime
+        return runtime
+
+    runtime = run_with_runtime(main())
+    assert runtime.client.is_closed
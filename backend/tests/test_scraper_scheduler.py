@@ -0,0 +1,62 @@
+"""
+ScraperScheduler: which source is scraped when
+"""
+
+from datetime import datetime, timedelta
+
+from app.scrapers.scheduler import ScraperScheduler
+from app.tasks.scheduled_tasks import last_scrapes, record_scrapes
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+INTERVALS = {"hackernews": 60, "reddit": 180, "product_hunt": 360}
+
+
+def test_never_scraped_sources_are_due_first():
+    scheduler = ScraperScheduler(INTERVALS)
+    last_runs = {"hackernews": NOW - timedelta(minutes=90), "reddit": None}
+
+    assert scheduler.due(last_runs, now=NOW) == ["reddit", "product_hunt", "hackernews"]
+
+
+def test_sources_wait_for_their_own_interval():
+    scheduler = ScraperScheduler(INTERVALS)
+    last_runs = {source: NOW - timedelta(minutes=120) for source in INTERVALS}
+
+    assert scheduler.due(last_runs, now=NOW) == ["hackernews"]
+    assert scheduler.due(last_runs, now=NOW + timedelta(minutes=60)) == ["hackernews", "reddit"]
+    assert scheduler.next_run_at("product_hunt", last_runs["product_hunt"]) == NOW + timedelta(minutes=240)
+
+
+def test_most_overdue_source_comes_first():
+    scheduler = ScraperScheduler(INTERVALS)
+    last_runs = {
+        "hackernews": NOW - timedelta(minutes=70),  # 10 min overdue
+        "reddit": NOW - timedelta(minutes=300),  # 120 min overdue
+        "product_hunt": NOW - timedelta(minutes=10),
+    }
+
+    assert scheduler.due(last_runs, now=NOW) == ["reddit", "hackernews"]
+
+
+def test_unscheduled_sources_are_ignored():
+    scheduler = ScraperScheduler({"hackernews": 60})
+
+    assert scheduler.due({"google_trends": None}, now=NOW) == ["hackernews"]
+    assert scheduler.next_run_at("google_trends", None) is None
+
+
+def test_failed_sources_stay_due(db):
+    record_scrapes(db, {
+        "hackernews": {"status": "ok", "items": 12},
+        "reddit": {"status": "timeout", "items": 0, "error": "timed out after 120s"},
+        "twitter": {"status": "unsupported", "items": 0},
+    })
+
+    last_runs = last_scrapes(db, list(INTERVALS) + ["twitter"])
+    assert last_runs["hackernews"] is not None
+    assert last_runs["reddit"] is None
+    assert last_runs["twitter"] is None
+
+    scheduler = ScraperScheduler(INTERVALS)
+    assert scheduler.due(last_runs, now=last_runs["hackernews"] + timedelta(minutes=1)) == ["reddit", "product_hunt"]
@@ -0,0 +1,69 @@
+"""
+KeywordMatcher: whole-word matching with the prefix-factored regex
+"""
+
+import random
+import re
+
+import pytest
+
+from app.scrapers.taxonomy import DEFAULT_CATEGORIES, DEFAULT_TAGS, KeywordMatcher
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return KeywordMatcher(DEFAULT_CATEGORIES, DEFAULT_TAGS)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("AI-powered CRM", {"ai"}),
+    ("She said it was fine", set()),
+    ("Check your email", set()),
+    ("(AI), GPT!", {"ai", "gpt"}),
+    ("AI's next move", {"ai"}),
+    ("nocode vs no-code", {"no-code"}),
+    ("Written in code", set()),
+    ("Built with Next.js and Supabase", {"next.js", "supabase"}),
+    ("nextjs", set()),
+    ("two apps, one app, an application", {"apps", "app"}),
+    ("APIs", set()),
+    ("ai_agent and aiнейросеть", set()),
+    ("", set()),
+])
+def test_find_matches_whole_words_only(matcher, text, expected):
+    assert matcher.find(text) == expected
+
+
+def test_find_agrees_with_per_keyword_search(matcher):
+    keywords = sorted(set(DEFAULT_TAGS) | {k for ks in DEFAULT_CATEGORIES.values() for k in ks})
+    fillers = ["said", "email", "the", "application", "-", ".", " ", "_", "x", "apis", "apps"]
+    rng = random.Random(42)
+
+    for _ in range(500):
+        text = "".join(rng.choice(keywords + fillers) for _ in range(rng.randint(1, 12)))
+        expected = {
+            keyword for keyword in keywords
+            if re.search(rf"(?<!\w){re.escape(keyword)}(?!\w)", text)
+        }
+        assert matcher.find(text) == expected, text
+
+
+def test_scan_takes_categories_from_title_in_priority_order(matcher):
+    categories, tags = matcher.scan("Stripe payments app with GPT", "open-source MVP, React frontend")
+
+    assert categories == ["ai", "saas", "fintech"]
+    # "payments" is a category keyword, not the "payment" tag
+    assert tags == ["gpt", "mvp", "open-source", "react", "stripe"]
+
+
+def test_body_only_contributes_tags(matcher):
+    categories, tags = matcher.scan("Weekly digest", "an AI chatbot for health")
+
+    assert categories == []
+    assert tags == ["ai", "chatbot"]
+
+
+def test_custom_taxonomy_is_case_insensitive():
+    matcher = KeywordMatcher({"Dev": ["Rust", "Go"]}, ["WASM"])
+
+    assert matcher.scan("Rust to WASM", "go go go") == (["Dev"], ["wasm"])
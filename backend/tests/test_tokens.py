@@ -0,0 +1,67 @@
+"""
+Token counting fallbacks (app.agents.tokens)
+"""
+
+import pytest
+
+from app.agents import tokens
+
+
+class FakeEncoding:
+    name = "cl100k_base"
+
+    def encode(self, text, disallowed_special=()):
+        return text.split()
+
+
+class OldTiktoken:
+    """tiktoken 0.5.x: no gpt-4o mapping, no o200k_base"""
+
+    @staticmethod
+    def encoding_for_model(model):
+        raise KeyError(f"Could not automatically map {model} to a tokeniser")
+
+    @staticmethod
+    def get_encoding(name):
+        if name != "cl100k_base":
+            raise ValueError(f"Unknown encoding {name}")
+        return FakeEncoding()
+
+
+class OfflineTiktoken:
+    """tiktoken that cannot fetch its BPE files"""
+
+    @staticmethod
+    def encoding_for_model(model):
+        raise OSError("network unreachable")
+
+    @staticmethod
+    def get_encoding(name):
+        raise OSError("network unreachable")
+
+
+@pytest.fixture
+def fake_tiktoken(monkeypatch):
+    def install(module):
+        monkeypatch.setattr(tokens, "tiktoken", module)
+        tokens._encoding.cache_clear()
+
+    yield install
+    tokens._encoding.cache_clear()
+
+
+def test_unknown_model_falls_back_to_cl100k(fake_tiktoken):
+    fake_tiktoken(OldTiktoken)
+    assert tokens.count_tokens("one two three", model="gpt-4o") == 3
+    messages = [{"role": "user", "content": "one two"}]
+    assert tokens.count_message_tokens(messages, model="gpt-4o-mini") == 2 + 4 + 2
+
+
+def test_unloadable_encoding_falls_back_to_estimate(fake_tiktoken):
+    fake_tiktoken(OfflineTiktoken)
+    assert tokens.count_tokens("x" * 40, model="gpt-4o") == 10
+
+
+def test_no_tiktoken_uses_estimate(fake_tiktoken):
+    fake_tiktoken(None)
+    assert tokens.count_tokens("x" * 9) == 3
@@ -0,0 +1,108 @@
+"""
+TrendScoutAgent ingest: batched DB writes run off the event loop
+"""
+
+import asyncio
+import threading
+import time
+
+from app.agents.trend_scout_agent import TrendScoutAgent
+from app.core.config import settings
+from app.modules.trends.models import Trend
+from app.modules.trends.schemas import TrendCreate
+
+
+def trend(index: int) -> TrendCreate:
+    return TrendCreate(
+        title=f"AI agent for invoices #{index}",
+        url=f"https://news.ycombinator.com/item?id={index}",
+        source="hackernews",
+        category="ai",
+        engagement_score=10,
+        metadata={"upvotes": 10, "num_comments": 1}
+    )
+
+
+async def trends(count: int):
+    for index in range(count):
+        yield trend(index)
+
+
+def test_sink_writes_on_a_worker_thread(db, monkeypatch):
+    monkeypatch.setattr(settings, "INGEST_BATCH_SIZE", 10)
+    agent = TrendScoutAgent(db, offline=True)
+
+    write_threads = []
+    create_trends_bulk = agent.trend_service.create_trends_bulk
+
+    def slow_create(batch):
+        write_threads.append(threading.get_ident())
+        time.sleep(0.1)  # A slow DB round trip
+        return create_trends_bulk(batch)
+
+    monkeypatch.setattr(agent.trend_service, "create_trends_bulk", slow_create)
+
+    async def main():
+        ticks = 0
+        done = False
+
+        async def ticker():
+            nonlocal ticks
+            while not done:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.ensure_future(ticker())
+        counts = await agent._ingest(trends(30), [], seen=set())
+        done = True
+        await ticking
+        return counts, threading.get_ident(), ticks
+
+    counts, loop_thread, ticks = asyncio.run(main())
+
+    assert counts["stored"] == 30
+    assert db.query(Trend).count() == 30
+    assert len(write_threads) == 3
+    assert loop_thread not in write_threads
+    # 3 x 0.1s of writes; a blocked loop would barely tick
+    assert ticks >= 15
+
+
+def test_cancelled_ingest_waits_for_the_write(db, monkeypatch):
+    monkeypatch.setattr(settings, "INGEST_BATCH_SIZE", 5)
+    monkeypatch.setattr(settings, "INGEST_FLUSH_SECONDS", 0.01)
+    agent = TrendScoutAgent(db, offline=True)
+
+    started = threading.Event()
+    finished = []
+    create_trends_bulk = agent.trend_service.create_trends_bulk
+
+    def slow_create(batch):
+        started.set()
+        time.sleep(0.2)
+        result = create_trends_bulk(batch)
+        finished.append(len(batch))
+        return result
+
+    monkeypatch.setattr(agent.trend_service, "create_trends_bulk", slow_create)
+
+    async def endless():
+        index = 0
+        while True:
+            yield trend(index)
+            index += 1
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.ensure_future(agent._ingest(endless(), [], seen=set()))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        # The write in flight completed before the cancellation surfaced
+        return list(finished)
+
+    assert asyncio.run(main()) == [5]
@@ -0,0 +1,65 @@
+"""
+Trend selection for idea analysis and snapshot velocity (app.modules.trends)
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.modules.trends.schemas import TrendCreate, TrendSnapshotCreate
+from app.modules.trends.service import TrendService, snapshot_engagement
+
+
+def make_trends(service: TrendService, *engagements: int, source: str = "reddit"):
+    trends = [
+        TrendCreate(title=f"Trend number {i}", source=source, engagement_score=engagement)
+        for i, engagement in enumerate(engagements)
+    ]
+    return [trend_id for trend_id, _ in service.create_trends_bulk(trends)]
+
+
+def test_unanalyzed_skips_marked_trends(db):
+    service = TrendService(db)
+    low, high, member = make_trends(service, 100, 500, 300)
+
+    assert [t.id for t in service.get_unanalyzed(limit=10)] == [high, member, low]
+
+    # A cluster member that never got an idea row of its own
+    assert service.mark_analyzed([high, member]) == 2
+    assert [t.id for t in service.get_unanalyzed(limit=10)] == [low]
+    assert [t.id for t in service.get_unanalyzed(limit=10, min_engagement=200)] == []
+
+
+def test_awards_only_count_on_reddit():
+    assert snapshot_engagement(100, 10, 2, "reddit") == 140
+    assert snapshot_engagement(100, 10, 2, "hackernews") == 120
+    assert snapshot_engagement(100, 10, 0, "product_hunt") == 120
+
+
+def test_close_snapshots_are_skipped(db, monkeypatch):
+    monkeypatch.setattr(settings, "TREND_VELOCITY_ALPHA", 0.5)
+    monkeypatch.setattr(settings, "TREND_SNAPSHOT_MIN_INTERVAL_SECONDS", 900)
+    service = TrendService(db)
+    (trend_id,) = make_trends(service, 0, source="hackernews")
+    start = datetime(2026, 10, 19, 9, 0)
+
+    def snapshot(upvotes: int, at: datetime) -> int:
+        return service.record_snapshots(
+            [TrendSnapshotCreate(trend_id=trend_id, upvotes=upvotes, comments=0, awards=3)],
+            observed_at=at
+        )
+
+    assert snapshot(100, start) == 1  # Baseline
+    # 5 more points a minute later would read as 300/h; not recorded
+    assert snapshot(105, start + timedelta(minutes=1)) == 0
+    trend = service.repository.get_by_id(trend_id)
+    assert trend.velocity == 0.0
+    assert trend.engagement_score == 100
+
+    # An hour after the baseline: +60 points/h, half-weighted by the EWMA
+    assert snapshot(160, start + timedelta(hours=1)) == 1
+    db.refresh(trend)
+    assert trend.engagement_score == 160  # HN: awards are not weighted
+    assert trend.velocity == pytest.approx(30.0)
+    assert len(service.get_series(trend_id).ts) == 2